@@ -21,6 +21,9 @@ def add_performance_indexes():
         "CREATE INDEX IF NOT EXISTS idx_profiles_section ON profiles(section_id, college_id)",
         "CREATE INDEX IF NOT EXISTS idx_profiles_institution ON profiles(institution_id)",
         
+        # User listing keyset pagination
+        "CREATE INDEX IF NOT EXISTS idx_users_created_at_id ON users(created_at, id)",
+        
         # UserRole indexes
         "CREATE INDEX IF NOT EXISTS idx_user_roles_user_role ON user_roles(user_id, role)",
         "CREATE INDEX IF NOT EXISTS idx_user_roles_college ON user_roles(college_id, role)",
@@ -7,7 +7,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 from pydantic import BaseModel
 
-from app.core.database import get_db
+from app.core.database import get_db, use_reporting_db
 from app.api.auth import get_current_user
 from app.api.users import get_current_admin_or_super
 from app.models.user import User, UserRole, RoleEnum
@@ -20,7 +20,10 @@ from app.models.company_training import CompanyRole, Round
 from app.models.coding_lab import CodingLab, LabSubmission
 from app.models.job import JobApplication
 
-router = APIRouter(prefix="/analytics/drilldown", tags=["analytics-drilldown"])
+router = APIRouter(
+    prefix="/analytics/drilldown", tags=["analytics-drilldown"],
+    dependencies=[Depends(use_reporting_db)]  # Read-only scans: reporting pool / read replica
+)
 
 
 # ==================== Helper Functions ====================
@@ -53,7 +56,7 @@ def get_student_ids_by_filters(
     section_name: Optional[str] = None
 ) -> List[int]:
     """Get student IDs based on filters"""
-    query = db.query(Profile.user_id).join(UserRole).filter(
+    query = db.query(Profile.user_id).join(UserRole, UserRole.user_id == Profile.user_id).filter(
         UserRole.role == RoleEnum.STUDENT
     )
     
@@ -0,0 +1,114 @@
+"""Applicant Ranking API endpoints - batch ATS ranking of a job's applicants"""
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models.job import Job
+from app.models.user import User, UserRole, RoleEnum
+from app.models.profile import Profile
+from app.models.resume_analytics import JobApplicantScore, JobRankingRun
+from app.schemas.job import JobRankingRunResponse, RankedApplicantResponse, RankedApplicantPage
+from app.api.auth import get_current_admin
+from app.services.applicant_ranking import fail_if_stale, start_ranking_run
+
+router = APIRouter(prefix="/jobs", tags=["applicant-ranking"])
+
+
+def _get_job_for_admin(job_id: int, current_user: User, db: Session) -> Job:
+    """Load a job, verifying a regular admin belongs to the job's college"""
+    job = db.query(Job).filter(Job.id == job_id).first()
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+
+    user_roles = db.query(UserRole).filter(UserRole.user_id == current_user.id).all()
+    role_names = [role.role for role in user_roles]
+
+    if RoleEnum.SUPER_ADMIN not in role_names:
+        admin_role = next((role for role in user_roles if role.role == RoleEnum.ADMIN), None)
+        if not admin_role or admin_role.college_id != job.college_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="You can only rank applicants for jobs from your own college"
+            )
+
+    return job
+
+
+@router.post("/{job_id}/ranking", response_model=JobRankingRunResponse, status_code=status.HTTP_202_ACCEPTED)
+async def start_job_ranking(
+    job_id: int,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Score every applicant of a job with the ATS scorer in the background (Admin or Super Admin)"""
+    job = _get_job_for_admin(job_id, current_user, db)
+    return start_ranking_run(db, job, current_user.id)
+
+
+@router.get("/{job_id}/ranking/status", response_model=JobRankingRunResponse)
+async def get_job_ranking_status(
+    job_id: int,
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Get progress of the latest ranking run for a job"""
+    _get_job_for_admin(job_id, current_user, db)
+
+    run = db.query(JobRankingRun).filter(
+        JobRankingRun.job_id == job_id
+    ).order_by(JobRankingRun.id.desc()).first()
+
+    if not run:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No ranking has been run for this job"
+        )
+
+    fail_if_stale(db, run)
+    return run
+
+
+@router.get("/{job_id}/ranking", response_model=RankedApplicantPage)
+async def get_job_ranking(
+    job_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Get applicants of a job ordered by their persisted ATS rank"""
+    _get_job_for_admin(job_id, current_user, db)
+
+    total = db.query(JobApplicantScore).filter(JobApplicantScore.job_id == job_id).count()
+
+    rows = db.query(JobApplicantScore, Profile).outerjoin(
+        Profile, Profile.user_id == JobApplicantScore.user_id
+    ).filter(
+        JobApplicantScore.job_id == job_id
+    ).order_by(
+        JobApplicantScore.rank
+    ).offset(skip).limit(limit).all()
+
+    items = [
+        RankedApplicantResponse(
+            rank=score.rank,
+            score=score.score,
+            job_application_id=score.job_application_id,
+            user_id=score.user_id,
+            full_name=profile.full_name if profile else None,
+            email=profile.email if profile else None,
+            roll_number=profile.roll_number if profile else None,
+            department=profile.department if profile else None,
+            has_resume=score.has_resume,
+            breakdown=score.breakdown,
+            missing_keywords=score.missing_keywords,
+            scored_at=score.scored_at,
+        )
+        for score, profile in rows
+    ]
+
+    return RankedApplicantPage(job_id=job_id, total=total, skip=skip, limit=limit, items=items)
@@ -1,7 +1,7 @@
 """Attendance API endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy import and_, or_, func, select, bindparam
 from typing import List, Optional
 from datetime import date, datetime
 from app.core.database import get_db
@@ -15,6 +15,9 @@ from app.schemas.attendance import (
     AttendanceApprovalRequest
 )
 from app.api.auth import get_current_user
+from app.services.attendance_analytics import (
+    build_attendance_analytics, cube_enabled, refresh_attendance_cube
+)
 
 router = APIRouter(prefix="/attendance", tags=["attendance"])
 
@@ -92,327 +95,236 @@ async def mark_attendance(
     is_admin = RoleEnum.ADMIN in role_names or RoleEnum.SUPER_ADMIN in role_names
     is_faculty = RoleEnum.FACULTY in role_names
     today = date.today()
+    records = attendance_data.records
+    
+    from app.models.academic import Subject, Section, Department, Semester
+    
+    # Prefetch everything the batch refers to (constant number of queries)
+    student_ids = {record.student_id for record in records}
+    students = {u.id: u for u in db.query(User).filter(User.id.in_(student_ids)).all()}
+    student_profiles = {p.user_id: p for p in db.query(Profile).filter(Profile.user_id.in_(student_ids)).all()}
+    
+    subject_names = {record.subject for record in records if not record.subject_id and record.subject}
+    subject_ids_by_name = {}
+    if subject_names:
+        for subject_obj in db.query(Subject).filter(
+            Subject.name.in_(subject_names),
+            Subject.college_id == college_id
+        ).order_by(Subject.id.desc()).all():
+            subject_ids_by_name[subject_obj.name] = subject_obj.id  # Lowest id wins
+    
+    section_ids = {record.section_id for record in records if record.section_id and not record.section}
+    section_names = dict(
+        db.query(Section.id, Section.name).filter(Section.id.in_(section_ids)).all()
+    ) if section_ids else {}
+    
+    department_names = {p.department for p in student_profiles.values() if p.department}
+    department_ids = {}
+    if department_names:
+        for dept in db.query(Department).filter(
+            Department.name.in_(department_names),
+            Department.college_id == college_id
+        ).order_by(Department.id.desc()).all():
+            department_ids[dept.name] = dept.id
+    
+    # A slot is matched on student, date and period plus subject_id, or subject name without one
+    def slot_key(student_id, att_date, period_num, subject_id, subject_name):
+        if subject_id:
+            return (student_id, att_date, period_num, "id", subject_id)
+        return (student_id, att_date, period_num, "name", subject_name)
+    
+    # Existing attendance for these students on these dates
+    existing_by_slot = {}
+    batch_dates = {record.date for record in records}
+    existing_rows = db.query(Attendance).filter(
+        Attendance.student_id.in_(student_ids),
+        Attendance.date.in_(batch_dates)
+    ).order_by(Attendance.id.desc()).all()
+    for existing in existing_rows:
+        # Lowest id wins when legacy duplicates exist
+        existing_by_slot[slot_key(existing.student_id, existing.date, existing.period_number, existing.subject_id, None)] = existing
+        existing_by_slot[slot_key(existing.student_id, existing.date, existing.period_number, None, existing.subject)] = existing
+    existing_ids = {existing.id for existing in existing_rows}
     
-    processed_records = []  # Track successfully processed records
     errors = []
+    processed = []  # (student_id, date, existing attendance id or new slot key) per saved record
+    new_rows = {}  # slot key -> insert values
+    updated_rows = {}  # attendance id -> (attendance, update values)
     
-    try:
-        for record in attendance_data.records:
-            try:
-                # Validate student exists
-                student = db.query(User).filter(User.id == record.student_id).first()
-                if not student:
-                    errors.append(f"Student with ID {record.student_id} not found")
-                    continue
-                
-                # Get student profile
-                student_profile = db.query(Profile).filter(Profile.user_id == record.student_id).first()
-                if not student_profile:
-                    errors.append(f"Profile not found for student {record.student_id}")
-                    continue
-                
-                # Get subject_id - prioritize from record, then look up by name
-                subject_id = record.subject_id if hasattr(record, 'subject_id') and record.subject_id else None
-                if not subject_id and record.subject:
-                    from app.models.academic import Subject
-                    subject_obj = db.query(Subject).filter(
-                        Subject.name == record.subject,
-                        Subject.college_id == college_id
-                    ).first()
-                    if subject_obj:
-                        subject_id = subject_obj.id
-                
-                if not subject_id and not record.subject:
-                    errors.append(f"Subject ID or name required for student {record.student_id}")
-                    continue
-                
-                # Get section_id and section name
-                section_id = record.section_id if hasattr(record, 'section_id') and record.section_id else None
-                section_name = record.section if hasattr(record, 'section') and record.section else None
-                if section_id and not section_name:
-                    from app.models.academic import Section
-                    section_obj = db.query(Section).filter(Section.id == section_id).first()
-                    if section_obj:
-                        section_name = section_obj.name
-                
-                # Get department_id from student profile
-                department_id = None
-                if student_profile.department:
-                    from app.models.academic import Department
-                    dept = db.query(Department).filter(
-                        Department.name == student_profile.department,
-                        Department.college_id == college_id
-                    ).first()
-                    if dept:
-                        department_id = dept.id
-                
-                # Check if attendance already exists - use a more comprehensive check
-                # This handles race conditions better by checking all relevant fields
-                period_num = record.period_number if hasattr(record, 'period_number') and record.period_number is not None else None
-                
-                existing_query = db.query(Attendance).filter(
-                    and_(
-                        Attendance.student_id == record.student_id,
-                        Attendance.date == record.date
-                    )
-                )
-                
-                # Add period filter if provided
-                if period_num is not None:
-                    existing_query = existing_query.filter(Attendance.period_number == period_num)
-                else:
-                    # If no period specified, match records with no period
-                    existing_query = existing_query.filter(Attendance.period_number.is_(None))
-                
-                # Add subject filter - check both subject_id and subject name
-                if subject_id:
-                    existing_query = existing_query.filter(Attendance.subject_id == subject_id)
-                elif record.subject:
-                    existing_query = existing_query.filter(Attendance.subject == record.subject)
-                
-                # Get the first matching record
-                existing = existing_query.first()
-                
-                # If found, update it instead of creating duplicate
-                if existing:
-                    # Update existing record
-                    # Allow faculty and admins to update past attendance (faculty can update for their assigned subjects)
-                    # Only restrict if user is neither admin nor faculty
-                    if existing.date < today and not is_admin and not is_faculty:
-                        errors.append(f"Cannot update past attendance for student {record.student_id} on {existing.date}")
-                        continue
-                    
-                    existing.status = record.status
-                    existing.marked_by = current_user.id
-                    if section_name:
-                        existing.section = section_name
-                    if section_id:
-                        existing.section_id = section_id
-                    if hasattr(record, 'period_number') and record.period_number is not None:
-                        existing.period_number = record.period_number
-                    if hasattr(record, 'semester_id') and record.semester_id:
-                        existing.semester_id = record.semester_id
-                    if subject_id:
-                        existing.subject_id = subject_id
-                    if hasattr(record, 'notes'):
-                        existing.notes = record.notes
-                    existing.approval_status = "pending"
-                    
-                    processed_records.append({
-                        'attendance': existing,
-                        'student': student,
-                        'student_profile': student_profile,
-                        'is_update': True
-                    })
-                else:
-                    # Create new record - use try/except to handle race conditions
-                    try:
-                        new_attendance = Attendance(
-                            student_id=record.student_id,
-                            subject_id=subject_id,
-                            subject=record.subject,
-                            date=record.date,
-                            status=record.status,
-                            semester_id=record.semester_id if hasattr(record, 'semester_id') and record.semester_id else None,
-                            period_number=record.period_number if hasattr(record, 'period_number') and record.period_number is not None else None,
-                            section=section_name,
-                            section_id=section_id,
-                            department_id=department_id,
-                            college_id=college_id,
-                            marked_by=current_user.id,
-                            notes=record.notes if hasattr(record, 'notes') else None,
-                            approval_status="pending"
-                        )
-                        db.add(new_attendance)
-                        # Flush to check for unique constraint violations before commit
-                        db.flush()
-                        processed_records.append({
-                            'attendance': new_attendance,
-                            'student': student,
-                            'student_profile': student_profile,
-                            'is_update': False
-                        })
-                    except Exception as create_error:
-                        # If unique constraint violation, try to find and update the existing record
-                        if "UNIQUE constraint failed" in str(create_error) or "unique_student_subject_date_period" in str(create_error):
-                            # Rollback the failed insert
-                            db.rollback()
-                            # Expire all objects to ensure we see the latest database state
-                            db.expire_all()
-                            
-                            # Re-query to get the record that was just created by another process
-                            # Use the same comprehensive query as the initial check
-                            existing_query = db.query(Attendance).filter(
-                                and_(
-                                    Attendance.student_id == record.student_id,
-                                    Attendance.date == record.date
-                                )
-                            )
-                            
-                            # Add period filter
-                            if period_num is not None:
-                                existing_query = existing_query.filter(Attendance.period_number == period_num)
-                            else:
-                                existing_query = existing_query.filter(Attendance.period_number.is_(None))
-                            
-                            # Add subject filter - check both subject_id and subject name
-                            if subject_id:
-                                existing_query = existing_query.filter(Attendance.subject_id == subject_id)
-                            elif record.subject:
-                                existing_query = existing_query.filter(Attendance.subject == record.subject)
-                            
-                            # Try to find the existing record
-                            existing = existing_query.first()
-                            
-                            # If still not found, try a broader search (without period/subject filters)
-                            if not existing:
-                                logger.warning(f"Could not find existing record with exact match, trying broader search for student {record.student_id}")
-                                existing_query = db.query(Attendance).filter(
-                                    and_(
-                                        Attendance.student_id == record.student_id,
-                                        Attendance.date == record.date
-                                    )
-                                )
-                                existing = existing_query.first()
-                            
-                            if existing:
-                                # Update the existing record
-                                # Allow faculty and admins to update past attendance (faculty can update for their assigned subjects)
-                                # Only restrict if user is neither admin nor faculty
-                                if existing.date < today and not is_admin and not is_faculty:
-                                    errors.append(f"Cannot update past attendance for student {record.student_id} on {existing.date}")
-                                    continue
-                                
-                                existing.status = record.status
-                                existing.marked_by = current_user.id
-                                if section_name:
-                                    existing.section = section_name
-                                if section_id:
-                                    existing.section_id = section_id
-                                if hasattr(record, 'period_number') and record.period_number is not None:
-                                    existing.period_number = record.period_number
-                                if hasattr(record, 'semester_id') and record.semester_id:
-                                    existing.semester_id = record.semester_id
-                                if subject_id:
-                                    existing.subject_id = subject_id
-                                if hasattr(record, 'notes'):
-                                    existing.notes = record.notes
-                                existing.approval_status = "pending"
-                                
-                                processed_records.append({
-                                    'attendance': existing,
-                                    'student': student,
-                                    'student_profile': student_profile,
-                                    'is_update': True
-                                })
-                                logger.info(f"Successfully updated existing attendance record for student {record.student_id}")
-                            else:
-                                # If we still can't find it, log the error but don't fail completely
-                                # This might happen in rare race conditions - we'll let the commit handle it
-                                error_msg = f"Could not find existing attendance record for student {record.student_id} after unique constraint violation. This may be a race condition."
-                                logger.warning(error_msg)
-                                # Don't add to errors - let it be handled by the commit phase
-                                # The record might have been created by another process and will be visible on commit
-                                continue
-                        else:
-                            # For other errors, re-raise to be caught by outer exception handler
-                            raise
-                
-            except Exception as e:
-                error_msg = f"Error processing attendance for student {record.student_id}: {str(e)}"
-                errors.append(error_msg)
-                logger.error(error_msg, exc_info=True)
-                continue
+    for record in records:
+        student = students.get(record.student_id)
+        if not student:
+            errors.append(f"Student with ID {record.student_id} not found")
+            continue
         
-        # Commit all changes at once
-        if processed_records:
-            try:
-                db.commit()
-                # Refresh all attendance objects to get updated timestamps
-                for proc_record in processed_records:
-                    db.refresh(proc_record['attendance'])
-            except Exception as e:
-                db.rollback()
-                error_msg = f"Failed to save attendance: {str(e)}"
-                logger.error(error_msg, exc_info=True)
-                
-                # Check for unique constraint violation
-                if "UNIQUE constraint failed" in str(e) or "unique_student_subject_date_period" in str(e):
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Attendance record already exists for this student, subject, date, and period. The record may have been created by another process. Please refresh and try again."
-                    )
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=error_msg
-                )
+        student_profile = student_profiles.get(record.student_id)
+        if not student_profile:
+            errors.append(f"Profile not found for student {record.student_id}")
+            continue
         
-        # Build responses for all processed records
-        result = []
-        for proc_record in processed_records:
-            attendance = proc_record['attendance']
-            student = proc_record['student']
-            student_profile = proc_record['student_profile']
-            
-            # Get subject and semester info
-            subject = None
-            if attendance.subject_id:
-                from app.models.academic import Subject
-                subject = db.query(Subject).filter(Subject.id == attendance.subject_id).first()
-            semester = None
-            if attendance.semester_id:
-                from app.models.academic import Semester
-                semester = db.query(Semester).filter(Semester.id == attendance.semester_id).first()
-            
-            result.append(AttendanceResponse(
-                id=attendance.id,
-                student_id=attendance.student_id,
-                subject_id=attendance.subject_id,
-                subject=attendance.subject,
-                date=attendance.date,
-                status=attendance.status,
-                semester_id=attendance.semester_id,
-                period_number=attendance.period_number,
-                section=attendance.section,
-                section_id=attendance.section_id,
-                notes=attendance.notes,
-                college_id=attendance.college_id,
-                department_id=attendance.department_id,
-                marked_by=attendance.marked_by,
-                created_at=attendance.created_at,
-                updated_at=attendance.updated_at,
-                approval_status=attendance.approval_status,
-                approved_by=attendance.approved_by,
-                approval_notes=attendance.approval_notes,
-                approval_date=attendance.approval_date,
-                student_name=student_profile.full_name,
-                student_email=student.email,
-                student_roll_number=student_profile.roll_number,
-                subject_code=subject.code if subject else None,
-                semester_name=semester.name if semester else None
-            ))
+        # Get subject_id - prioritize from record, then look up by name
+        subject_id = record.subject_id or subject_ids_by_name.get(record.subject)
+        if not subject_id and not record.subject:
+            errors.append(f"Subject ID or name required for student {record.student_id}")
+            continue
         
-        # If we have errors but also some successes, log warnings
-        if errors:
-            logger.warning(f"Partial success: {len(result)} saved, {len(errors)} errors: {errors[:5]}")
+        section_id = record.section_id or None
+        section_name = record.section or (section_names.get(section_id) if section_id else None)
+        department_id = department_ids.get(student_profile.department) if student_profile.department else None
+        period_num = record.period_number
         
-        if not result and errors:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Failed to save attendance: {', '.join(errors[:5])}"
+        key = slot_key(record.student_id, record.date, period_num, subject_id, record.subject)
+        if key in new_rows:
+            # Repeated in this batch - the later record wins
+            new_rows[key].update(
+                status=record.status,
+                semester_id=record.semester_id or new_rows[key]["semester_id"],
+                section=section_name or new_rows[key]["section"],
+                section_id=section_id or new_rows[key]["section_id"],
+                notes=record.notes
             )
+            processed.append((record.student_id, record.date, key))
+            continue
         
-        return result
+        existing = existing_by_slot.get(key)
+        if existing:
+            # Allow faculty and admins to update past attendance (faculty can update for their assigned subjects)
+            # Only restrict if user is neither admin nor faculty
+            if existing.date < today and not is_admin and not is_faculty:
+                errors.append(f"Cannot update past attendance for student {record.student_id} on {existing.date}")
+                continue
+            
+            _, values = updated_rows.setdefault(existing.id, (existing, {}))
+            values.update(status=record.status, marked_by=current_user.id, notes=record.notes, approval_status="pending")
+            if section_name:
+                values["section"] = section_name
+            if section_id:
+                values["section_id"] = section_id
+            if record.semester_id:
+                values["semester_id"] = record.semester_id
+            if subject_id:
+                values["subject_id"] = subject_id
+            processed.append((record.student_id, record.date, existing.id))
+            continue
         
-    except HTTPException:
-        raise
+        new_rows[key] = dict(
+            student_id=record.student_id,
+            subject_id=subject_id,
+            subject=record.subject,
+            date=record.date,
+            status=record.status,
+            semester_id=record.semester_id or None,
+            period_number=period_num,
+            section=section_name,
+            section_id=section_id,
+            department_id=department_id,
+            college_id=college_id,
+            marked_by=current_user.id,
+            notes=record.notes,
+            approval_status="pending"
+        )
+        processed.append((record.student_id, record.date, key))
+    
+    if errors:
+        logger.warning(f"Attendance batch: {len(errors)} record(s) rejected: {errors[:5]}")
+    if not processed:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Failed to save attendance: {', '.join(errors[:5])}"
+        )
+    
+    # Student details for the response (ORM objects expire on commit)
+    student_info = {
+        student_id: (students[student_id].email, student_profiles[student_id].full_name, student_profiles[student_id].roll_number)
+        for student_id, _, _ in processed
+    }
+    
+    # One multi-row INSERT for new slots and one executemany UPDATE for existing ones
+    try:
+        table = Attendance.__table__
+        if new_rows:
+            db.execute(table.insert(), list(new_rows.values()))
+        if updated_rows:
+            columns = sorted({column for _, values in updated_rows.values() for column in values})
+            params = []
+            for attendance_id, (existing, values) in updated_rows.items():
+                row = {column: getattr(existing, column) for column in columns}
+                row.update(values)
+                row["attendance_id"] = attendance_id
+                params.append(row)
+            db.execute(
+                table.update()
+                .where(table.c.id == bindparam("attendance_id"))
+                .values(updated_at=func.now(), **{column: bindparam(column) for column in columns}),
+                params
+            )
+        refresh_attendance_cube(db, {(student_id, att_date) for student_id, att_date, _ in processed})
+        db.commit()
     except Exception as e:
         db.rollback()
-        logger.error(f"Unexpected error in mark_attendance: {str(e)}", exc_info=True)
+        error_msg = f"Failed to save attendance: {str(e)}"
+        logger.error(error_msg, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Internal server error: {str(e)}"
+            detail=error_msg
         )
+    
+    # Reload the written rows for the response (one query)
+    saved_by_id = {}
+    inserted_by_slot = {}
+    for attendance in db.query(Attendance).filter(
+        Attendance.student_id.in_({student_id for student_id, _, _ in processed}),
+        Attendance.date.in_({att_date for _, att_date, _ in processed})
+    ).all():
+        saved_by_id[attendance.id] = attendance
+        if attendance.id not in existing_ids:
+            inserted_by_slot[slot_key(
+                attendance.student_id, attendance.date, attendance.period_number,
+                attendance.subject_id, attendance.subject
+            )] = attendance
+    saved = [
+        inserted_by_slot.get(ref) if isinstance(ref, tuple) else saved_by_id.get(ref)
+        for _, _, ref in processed
+    ]
+    subject_ids = {a.subject_id for a in saved if a and a.subject_id}
+    semester_ids = {a.semester_id for a in saved if a and a.semester_id}
+    subject_codes = dict(db.query(Subject.id, Subject.code).filter(Subject.id.in_(subject_ids)).all()) if subject_ids else {}
+    semester_names = dict(db.query(Semester.id, Semester.name).filter(Semester.id.in_(semester_ids)).all()) if semester_ids else {}
+    
+    result = []
+    for attendance in saved:
+        if attendance is None:
+            continue
+        student_email, student_name, roll_number = student_info[attendance.student_id]
+        result.append(AttendanceResponse(
+            id=attendance.id,
+            student_id=attendance.student_id,
+            subject_id=attendance.subject_id,
+            subject=attendance.subject,
+            date=attendance.date,
+            status=attendance.status,
+            semester_id=attendance.semester_id,
+            period_number=attendance.period_number,
+            section=attendance.section,
+            section_id=attendance.section_id,
+            notes=attendance.notes,
+            college_id=attendance.college_id,
+            department_id=attendance.department_id,
+            marked_by=attendance.marked_by,
+            created_at=attendance.created_at,
+            updated_at=attendance.updated_at,
+            approval_status=attendance.approval_status,
+            approved_by=attendance.approved_by,
+            approval_notes=attendance.approval_notes,
+            approval_date=attendance.approval_date,
+            student_name=student_name,
+            student_email=student_email,
+            student_roll_number=roll_number,
+            subject_code=subject_codes.get(attendance.subject_id),
+            semester_name=semester_names.get(attendance.semester_id)
+        ))
+    
+    return result
 
 
 @router.get("/students", response_model=List[dict])
@@ -821,6 +733,7 @@ async def update_attendance(
         attendance.notes = attendance_data.notes
     
     attendance.approval_status = "pending"  # Reset approval if edited
+    refresh_attendance_cube(db, [(attendance.student_id, attendance.date)])
     db.commit()
     db.refresh(attendance)
     
@@ -881,7 +794,9 @@ async def delete_attendance(
             detail="Attendance record not found"
         )
     
+    cell = (attendance.student_id, attendance.date)
     db.delete(attendance)
+    refresh_attendance_cube(db, [cell])
     db.commit()
     
     return None
@@ -1009,17 +924,19 @@ async def get_attendance_analytics(
     profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
     college_id = profile.college_id if profile else None
     
-    # Build base query
-    query = db.query(Attendance)
+    # Filters apply to either the attendance table or the daily cube (same column names)
+    filters = []
+    # Name-only subject/section matches need the raw attendance rows
+    use_cube = cube_enabled()
     
     # Apply role-based filtering
     if is_student and not is_admin and not is_hod and not is_faculty:
         # Students can only see their own analytics
-        query = query.filter(Attendance.student_id == current_user.id)
+        filters.append(lambda t: t.student_id == current_user.id)
     elif is_faculty and not is_admin:
         # Faculty can see analytics for their assigned subjects
         if college_id:
-            query = query.filter(Attendance.college_id == college_id)
+            filters.append(lambda t: t.college_id == college_id)
         if subject_id:
             from app.models.academic import SubjectAssignment
             assignment_subject_ids = db.query(SubjectAssignment.subject_id).filter(
@@ -1029,316 +946,60 @@ async def get_attendance_analytics(
                     SubjectAssignment.subject_id == subject_id
                 )
             ).subquery()
-            query = query.filter(Attendance.subject_id.in_(assignment_subject_ids))
+            filters.append(lambda t: t.subject_id.in_(select(assignment_subject_ids.c.subject_id)))
     elif is_hod and not is_admin:
         # HOD can see analytics for their department
         if profile and profile.department:
             from app.models.academic import Department
             dept = db.query(Department).filter(Department.name == profile.department).first()
             if dept:
-                query = query.filter(Attendance.department_id == dept.id)
+                hod_department_id = dept.id
+                filters.append(lambda t: t.department_id == hod_department_id)
     elif is_admin and college_id:
         # College admin can see analytics for their college
-        query = query.filter(Attendance.college_id == college_id)
+        filters.append(lambda t: t.college_id == college_id)
     # Super admin can see all
     
     # Apply filters
     if student_id:
-        query = query.filter(Attendance.student_id == student_id)
+        filters.append(lambda t: t.student_id == student_id)
     
     # Handle subject filter - support both subject_id and subject name
     if subject_id:
-        query = query.filter(Attendance.subject_id == subject_id)
+        filters.append(lambda t: t.subject_id == subject_id)
     elif subject:
         # Look up subject by name
         from app.models.academic import Subject
         subject_obj = db.query(Subject).filter(Subject.name == subject).first()
         if subject_obj:
-            query = query.filter(Attendance.subject_id == subject_obj.id)
+            filters.append(lambda t: t.subject_id == subject_obj.id)
         else:
             # Also try matching by subject field in attendance (for backward compatibility)
-            query = query.filter(Attendance.subject == subject)
+            filters.append(lambda t: t.subject == subject)
+            use_cube = False
     
     # Handle section filter - support both section_id and section name
     if section_id:
-        query = query.filter(Attendance.section_id == section_id)
+        filters.append(lambda t: t.section_id == section_id)
     elif section:
         # Look up section by name
         from app.models.academic import Section
         section_obj = db.query(Section).filter(Section.name == section).first()
         if section_obj:
-            query = query.filter(Attendance.section_id == section_obj.id)
+            filters.append(lambda t: t.section_id == section_obj.id)
         else:
             # Also try matching by section field in attendance (for backward compatibility)
-            query = query.filter(Attendance.section == section)
+            filters.append(lambda t: t.section == section)
+            use_cube = False
     
     if department:
         from app.models.academic import Department
         dept = db.query(Department).filter(Department.name == department).first()
         if dept:
-            query = query.filter(Attendance.department_id == dept.id)
+            filters.append(lambda t: t.department_id == dept.id)
     if date_from:
-        query = query.filter(Attendance.date >= date_from)
+        filters.append(lambda t: t.date >= date_from)
     if date_to:
-        query = query.filter(Attendance.date <= date_to)
+        filters.append(lambda t: t.date <= date_to)
     
-    # Get all attendance records
-    records = query.all()
-    
-    if not records:
-        # Return structure matching frontend expectations
-        return {
-            "summary": {
-                "total_records": 0,
-                "present_count": 0,
-                "absent_count": 0,
-                "late_count": 0,
-                "attendance_percentage": 0.0
-            },
-            "by_subject": {},
-            "by_date": {},
-            "by_student": []
-        }
-    
-    # Calculate overall statistics
-    total_records = len(records)
-    present_count = sum(1 for r in records if r.status == "present")
-    absent_count = sum(1 for r in records if r.status == "absent")
-    late_count = sum(1 for r in records if r.status == "late")
-    excused_count = sum(1 for r in records if r.status == "excused")
-    present_percentage = (present_count / total_records * 100) if total_records > 0 else 0.0
-    
-    # Get unique students and subjects
-    student_ids = set(r.student_id for r in records)
-    subject_ids = set(r.subject_id for r in records if r.subject_id)
-    section_ids = set(r.section_id for r in records if r.section_id)
-    dates = set(r.date for r in records)
-    period_numbers = set(r.period_number for r in records if r.period_number is not None)
-    
-    # Subject-wise statistics
-    subject_stats = []
-    for subj_id in subject_ids:
-        subject_records = [r for r in records if r.subject_id == subj_id]
-        if not subject_records:
-            continue
-        
-        from app.models.academic import Subject
-        subject = db.query(Subject).filter(Subject.id == subj_id).first()
-        if not subject:
-            continue
-        
-        subj_students = set(r.student_id for r in subject_records)
-        subj_present = sum(1 for r in subject_records if r.status == "present")
-        subj_absent = sum(1 for r in subject_records if r.status == "absent")
-        subj_late = sum(1 for r in subject_records if r.status == "late")
-        subj_excused = sum(1 for r in subject_records if r.status == "excused")
-        subj_total = len(subject_records)
-        subj_present_pct = (subj_present / subj_total * 100) if subj_total > 0 else 0.0
-        
-        subject_stats.append({
-            "subject_id": subj_id,
-            "subject_name": subject.name,
-            "subject_code": subject.code,
-            "total_classes": len(dates),
-            "total_students": len(subj_students),
-            "total_records": subj_total,
-            "present": subj_present,
-            "absent": subj_absent,
-            "late": subj_late,
-            "excused": subj_excused,
-            "present_percentage": round(subj_present_pct, 2)
-        })
-    
-    # Student-wise statistics
-    student_stats = []
-    for stud_id in student_ids:
-        student_records = [r for r in records if r.student_id == stud_id]
-        if not student_records:
-            continue
-        
-        student = db.query(User).filter(User.id == stud_id).first()
-        student_profile = db.query(Profile).filter(Profile.user_id == stud_id).first()
-        if not student or not student_profile:
-            continue
-        
-        stud_present = sum(1 for r in student_records if r.status == "present")
-        stud_absent = sum(1 for r in student_records if r.status == "absent")
-        stud_late = sum(1 for r in student_records if r.status == "late")
-        stud_excused = sum(1 for r in student_records if r.status == "excused")
-        stud_total = len(student_records)
-        stud_present_pct = (stud_present / stud_total * 100) if stud_total > 0 else 0.0
-        
-        # Subject-wise breakdown for this student
-        stud_subject_stats = []
-        for subj_id in set(r.subject_id for r in student_records if r.subject_id):
-            subj_records = [r for r in student_records if r.subject_id == subj_id]
-            from app.models.academic import Subject
-            subject = db.query(Subject).filter(Subject.id == subj_id).first()
-            if subject:
-                subj_present = sum(1 for r in subj_records if r.status == "present")
-                subj_total = len(subj_records)
-                subj_pct = (subj_present / subj_total * 100) if subj_total > 0 else 0.0
-                stud_subject_stats.append({
-                    "subject_id": subj_id,
-                    "subject_name": subject.name,
-                    "total_classes": subj_total,
-                    "present": subj_present,
-                    "present_percentage": round(subj_pct, 2)
-                })
-        
-        student_stats.append({
-            "student_id": stud_id,
-            "student_name": student_profile.full_name,
-            "student_email": student.email,
-            "roll_number": student_profile.roll_number,
-            "total_classes": stud_total,
-            "present": stud_present,
-            "absent": stud_absent,
-            "late": stud_late,
-            "excused": stud_excused,
-            "present_percentage": round(stud_present_pct, 2),
-            "subject_wise_breakdown": stud_subject_stats
-        })
-    
-    # Daily statistics
-    daily_stats = []
-    for att_date in sorted(dates):
-        daily_records = [r for r in records if r.date == att_date]
-        daily_present = sum(1 for r in daily_records if r.status == "present")
-        daily_absent = sum(1 for r in daily_records if r.status == "absent")
-        daily_late = sum(1 for r in daily_records if r.status == "late")
-        daily_excused = sum(1 for r in daily_records if r.status == "excused")
-        daily_total = len(daily_records)
-        daily_present_pct = (daily_present / daily_total * 100) if daily_total > 0 else 0.0
-        
-        daily_stats.append({
-            "date": att_date.isoformat(),
-            "total_students": len(set(r.student_id for r in daily_records)),
-            "total_records": daily_total,
-            "present": daily_present,
-            "absent": daily_absent,
-            "late": daily_late,
-            "excused": daily_excused,
-            "present_percentage": round(daily_present_pct, 2)
-        })
-    
-    # Section-wise statistics
-    section_stats = []
-    for sect_id in section_ids:
-        section_records = [r for r in records if r.section_id == sect_id]
-        if not section_records:
-            continue
-        
-        from app.models.academic import Section
-        section = db.query(Section).filter(Section.id == sect_id).first()
-        if not section:
-            continue
-        
-        sect_students = set(r.student_id for r in section_records)
-        sect_present = sum(1 for r in section_records if r.status == "present")
-        sect_absent = sum(1 for r in section_records if r.status == "absent")
-        sect_late = sum(1 for r in section_records if r.status == "late")
-        sect_excused = sum(1 for r in section_records if r.status == "excused")
-        sect_total = len(section_records)
-        sect_present_pct = (sect_present / sect_total * 100) if sect_total > 0 else 0.0
-        
-        section_stats.append({
-            "section_id": sect_id,
-            "section_name": section.name,
-            "total_students": len(sect_students),
-            "total_records": sect_total,
-            "present": sect_present,
-            "absent": sect_absent,
-            "late": sect_late,
-            "excused": sect_excused,
-            "present_percentage": round(sect_present_pct, 2)
-        })
-    
-    # Period-wise statistics
-    period_stats = []
-    for period_num in sorted(period_numbers):
-        period_records = [r for r in records if r.period_number == period_num]
-        if not period_records:
-            continue
-        
-        period_present = sum(1 for r in period_records if r.status == "present")
-        period_absent = sum(1 for r in period_records if r.status == "absent")
-        period_late = sum(1 for r in period_records if r.status == "late")
-        period_excused = sum(1 for r in period_records if r.status == "excused")
-        period_total = len(period_records)
-        period_present_pct = (period_present / period_total * 100) if period_total > 0 else 0.0
-        
-        period_stats.append({
-            "period_number": period_num,
-            "total_records": period_total,
-            "present": period_present,
-            "absent": period_absent,
-            "late": period_late,
-            "excused": period_excused,
-            "present_percentage": round(period_present_pct, 2)
-        })
-    
-    # Transform data to match frontend expectations
-    # Convert subject_stats array to by_subject object
-    by_subject = {}
-    for stat in subject_stats:
-        subject_key = stat.get("subject_name") or stat.get("subject_code") or f"Subject_{stat['subject_id']}"
-        by_subject[subject_key] = {
-            "total": stat["total_records"],
-            "present": stat["present"],
-            "absent": stat["absent"],
-            "late": stat["late"]
-        }
-    
-    # Convert daily_stats array to by_date object
-    by_date = {}
-    for stat in daily_stats:
-        date_key = stat["date"]
-        by_date[date_key] = {
-            "total": stat["total_records"],
-            "present": stat["present"],
-            "absent": stat["absent"],
-            "late": stat["late"]
-        }
-    
-    # Transform student_stats to match frontend format
-    by_student = []
-    for stat in student_stats:
-        by_student.append({
-            "student_id": stat["student_id"],
-            "student_name": stat["student_name"],
-            "roll_number": stat["roll_number"],
-            "total": stat["total_classes"],
-            "present": stat["present"],
-            "absent": stat["absent"],
-            "late": stat["late"],
-            "percentage": round(stat["present_percentage"], 2)
-        })
-    
-    return {
-        "summary": {
-            "total_records": total_records,
-            "present_count": present_count,
-            "absent_count": absent_count,
-            "late_count": late_count,
-            "attendance_percentage": round(present_percentage, 2)
-        },
-        "by_subject": by_subject,
-        "by_date": by_date,
-        "by_student": by_student,
-        # Keep original structure for backward compatibility
-        "total_students": len(student_ids),
-        "total_classes": len(dates),
-        "overall_stats": {
-            "present": present_count,
-            "absent": absent_count,
-            "late": late_count,
-            "excused": excused_count,
-            "present_percentage": round(present_percentage, 2)
-        },
-        "subject_wise_stats": subject_stats,
-        "student_wise_stats": student_stats,
-        "daily_stats": daily_stats,
-        "section_wise_stats": section_stats,
-        "period_wise_stats": period_stats
-    }
+    return build_attendance_analytics(db, filters, use_cube=use_cube)
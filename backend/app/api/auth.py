@@ -1,9 +1,12 @@
 """Authentication API endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import Optional
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.core.security import (
     verify_password,
     get_password_hash,
@@ -30,11 +33,8 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
+def _token_user_id(credentials: HTTPAuthorizationCredentials) -> int:
+    """User id of a valid access token"""
     token = credentials.credentials
     payload = decode_token(token)
     
@@ -51,7 +51,34 @@ def get_current_user(
             detail="Invalid token"
         )
     
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    return int(user_id)
+
+
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get current authenticated user"""
+    user_id = _token_user_id(credentials)
+    
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    return user
+
+
+async def get_current_user_async(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    """Get current authenticated user (for endpoints using get_async_db)"""
+    user_id = _token_user_id(credentials)
+    
+    user = await db.get(User, user_id)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -86,6 +113,20 @@ def get_optional_user(
         return None
 
 
+async def get_optional_user_async(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+    db: AsyncSession = Depends(get_async_db)
+) -> Optional[User]:
+    """Get current user if authenticated, otherwise None (for endpoints using get_async_db)"""
+    if not credentials:
+        return None
+    
+    try:
+        return await db.get(User, _token_user_id(credentials))
+    except Exception:
+        return None
+
+
 def get_current_admin(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
@@ -202,8 +243,13 @@ def get_current_hod_or_faculty(
     return current_user
 
 
+def _verify_any_password(candidates, password_hash: str) -> bool:
+    """Whether any candidate password matches the bcrypt hash"""
+    return any(verify_password(candidate, password_hash) for candidate in candidates)
+
+
 @router.post("/login", response_model=Token)
-async def login(user_data: UserLogin, db: Session = Depends(get_db)):
+async def login(user_data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """User login endpoint - supports multiple login methods.
     
     Username options (can use any of these):
@@ -221,19 +267,23 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
     # Try to find user by email first
     if user_data.email:
         email_lower = user_data.email.lower().strip()
-        user = db.query(User).filter(User.email == email_lower).first()
+        user = (await db.execute(select(User).where(User.email == email_lower).limit(1))).scalars().first()
         
         # If not found by email, try finding by roll_number (for students)
         if not user:
-            profile = db.query(Profile).filter(Profile.roll_number == user_data.email.strip().upper()).first()
+            profile = (await db.execute(
+                select(Profile).where(Profile.roll_number == user_data.email.strip().upper()).limit(1)
+            )).scalars().first()
             if profile:
-                user = db.query(User).filter(User.id == profile.user_id).first()
+                user = await db.get(User, profile.user_id)
         
         # If still not found, try finding by staff_id/faculty_id (for staff)
         if not user:
-            profile = db.query(Profile).filter(Profile.staff_id == user_data.email.strip().upper()).first()
+            profile = (await db.execute(
+                select(Profile).where(Profile.staff_id == user_data.email.strip().upper()).limit(1)
+            )).scalars().first()
             if profile:
-                user = db.query(User).filter(User.id == profile.user_id).first()
+                user = await db.get(User, profile.user_id)
     
     if not user:
         raise HTTPException(
@@ -242,8 +292,8 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
         )
     
     # Get user profile and roles to determine login method
-    profile = db.query(Profile).filter(Profile.user_id == user.id).first()
-    user_roles = db.query(UserRole).filter(UserRole.user_id == user.id).all()
+    profile = (await db.execute(select(Profile).where(Profile.user_id == user.id).limit(1))).scalars().first()
+    user_roles = (await db.execute(select(UserRole).where(UserRole.user_id == user.id))).scalars().all()
     is_student = any(role.role.value == 'student' for role in user_roles)
     is_staff = any(role.role.value in ['faculty', 'hod', 'admin', 'super_admin'] for role in user_roles)
     
@@ -260,27 +310,17 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
         # Students can login with roll_number (uppercase) or user.id (uppercase) or their password
         roll_number_match = profile and profile.roll_number and password_upper == profile.roll_number.upper()
         user_id_match = password_upper == str(user.id).upper()
-        password_valid = (
-            verify_password(password_original, user.password_hash) or
-            verify_password(password_upper, user.password_hash) or
-            roll_number_match or
-            user_id_match
-        )
+        password_valid = bool(roll_number_match or user_id_match)
     elif is_staff:
         # Staff (faculty, HOD, admin, super_admin) can login with staff_id (uppercase) or user.id (uppercase) or stored password
         staff_id_match = profile and profile.staff_id and password_upper == profile.staff_id.upper()
         user_id_match = password_upper == str(user.id).upper()
-        password_valid = (
-            verify_password(password_original, user.password_hash) or
-            verify_password(password_upper, user.password_hash) or
-            staff_id_match or
-            user_id_match
-        )
-    else:
-        # Other users: try both original and uppercase password
-        password_valid = (
-            verify_password(password_original, user.password_hash) or
-            verify_password(password_upper, user.password_hash)
+        password_valid = bool(staff_id_match or user_id_match)
+    
+    if not password_valid:
+        # bcrypt is deliberately slow CPU work: run it in the threadpool, not on the event loop
+        password_valid = await run_in_threadpool(
+            _verify_any_password, (password_original, password_upper), user.password_hash
         )
     
     if not password_valid:
@@ -305,7 +345,7 @@ async def login(user_data: UserLogin, db: Session = Depends(get_db)):
     
     # Check if user's college is active (if user belongs to a college)
     if profile and profile.college_id:
-        college = db.query(College).filter(College.id == profile.college_id).first()
+        college = await db.get(College, profile.college_id)
         if college and college.is_active != "true":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -371,7 +411,7 @@ async def signup(user_data: UserSignup, db: Session = Depends(get_db)):
 
 
 @router.post("/refresh", response_model=Token)
-async def refresh_token(token_data: RefreshTokenRequest, db: Session = Depends(get_db)):
+async def refresh_token(token_data: RefreshTokenRequest, db: AsyncSession = Depends(get_async_db)):
     """Refresh access token"""
     payload = decode_token(token_data.refresh_token)
     
@@ -382,7 +422,7 @@ async def refresh_token(token_data: RefreshTokenRequest, db: Session = Depends(g
         )
     
     user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == int(user_id)).first()
+    user = await db.get(User, int(user_id))
     
     if not user:
         raise HTTPException(
@@ -480,7 +520,7 @@ async def change_password(
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(current_user: User = Depends(get_current_user)):
+async def get_current_user_info(current_user: User = Depends(get_current_user_async)):
     """Get current user information"""
     return current_user
 
@@ -21,6 +21,7 @@ from app.models.academic import (
 )
 from app.api.auth import get_current_user
 from app.core.security import get_password_hash
+from app.services.problem_catalog import problem_catalog
 from app.models.audit_log import AuditLog
 from app.models.college import College
 from app.models.institution import Institution
@@ -1375,6 +1376,7 @@ async def bulk_upload_coding_problems(
                     update_sql = text(f"UPDATE coding_problems SET {', '.join(update_fields)} WHERE id = :id")
                     db.execute(update_sql, update_params)
                     db.flush()
+                    problem_catalog.mark_changed(db)  # Raw SQL skips the catalog's mapper hooks
                     
                     results["success"].append({
                         "index": idx,
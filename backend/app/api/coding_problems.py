@@ -1,19 +1,20 @@
 """Coding Problems API - Super Admin only, year-based visibility"""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, load_only
-from sqlalchemy import and_, or_, func, cast, String
+from sqlalchemy.orm import Session
+from sqlalchemy import and_, cast, String
 from typing import List, Optional
 from datetime import datetime
 import hashlib
 import time
 
-from app.core.database import get_db, engine
+from app.core.database import get_db
 from app.api.auth import get_current_user, get_current_super_admin
 from app.models.user import User
 from app.models.quiz import CodingProblem
 from app.models.user_saved_code import UserSavedCode
 from app.models.profile import Profile
 from app.models.coding_submission import CodingSubmission
+from app.services.problem_catalog import parse_year_to_int
 from pydantic import BaseModel
 
 router = APIRouter(prefix="/coding-problems", tags=["coding-problems"])
@@ -149,44 +150,6 @@ class TestCaseRunRequest(BaseModel):
 
 # ==================== Helper Functions ====================
 
-def parse_year_to_int(year_str: str) -> Optional[int]:
-    """Parse year string to integer (1-4)
-    
-    Handles formats like:
-    - "1st", "2nd", "3rd", "4th"
-    - "1", "2", "3", "4"
-    - "First", "Second", etc.
-    """
-    if isinstance(year_str, int):
-        return year_str if 1 <= year_str <= 4 else None
-    
-    if not isinstance(year_str, str):
-        return None
-    
-    year_str = year_str.strip().lower()
-    
-    # Remove ordinal suffixes
-    year_str = year_str.replace('st', '').replace('nd', '').replace('rd', '').replace('th', '')
-    
-    # Try direct number
-    try:
-        year = int(year_str)
-        if 1 <= year <= 4:
-            return year
-    except:
-        pass
-    
-    # Try word format
-    year_map = {
-        'first': 1, 'second': 2, 'third': 3, 'fourth': 4,
-        'one': 1, 'two': 2, 'three': 3, 'four': 4
-    }
-    if year_str in year_map:
-        return year_map[year_str]
-    
-    return None
-
-
 def get_student_year(user: User, db: Session) -> Optional[int]:
     """Get student's year as integer (1-4)"""
     profile = db.query(Profile).filter(Profile.user_id == user.id).first()
@@ -272,6 +235,66 @@ async def debug_endpoint(
         }
 
 
+def _as_json_list(value) -> list:
+    """JSON list column value, tolerating JSON strings and comma-separated legacy data"""
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        return list(value.values())
+    if isinstance(value, str):
+        try:
+            import json
+            parsed = json.loads(value)
+            return parsed if isinstance(parsed, list) else [value]
+        except ValueError:
+            return [value] if value else []
+    return []
+
+
+def problem_list_response(problem: CodingProblem) -> CodingProblemResponse:
+    """Listing item of a problem, normalising legacy column formats"""
+    year_value = problem.year
+    if not isinstance(year_value, int):
+        year_value = parse_year_to_int(year_value) or 1
+    
+    return CodingProblemResponse(
+        id=problem.id,
+        title=problem.title or "",
+        description=problem.description or "",
+        input_format=problem.input_format,
+        output_format=problem.output_format,
+        constraints=problem.constraints,
+        sample_input=problem.sample_input,
+        sample_output=problem.sample_output,
+        difficulty=problem.difficulty or "Unknown",
+        tags=_as_json_list(problem.tags),
+        year=year_value,
+        allowed_languages=_as_json_list(problem.allowed_languages),
+        restricted_languages=_as_json_list(problem.restricted_languages),
+        recommended_languages=_as_json_list(problem.recommended_languages),
+        starter_code_python=problem.starter_code_python,
+        starter_code_c=problem.starter_code_c,
+        starter_code_cpp=problem.starter_code_cpp,
+        starter_code_java=problem.starter_code_java,
+        starter_code_javascript=problem.starter_code_javascript,
+        time_limit=problem.time_limit or 5,
+        memory_limit=problem.memory_limit or 256,
+        test_cases=[case for case in _as_json_list(problem.test_cases) if isinstance(case, dict)],
+        is_active=bool(problem.is_active),
+        created_by=problem.created_by,
+        created_at=problem.created_at,
+        updated_at=problem.updated_at,
+        scope_type=problem.scope_type or "svnapro",
+        college_id=problem.college_id,
+        department=problem.department,
+        section_id=problem.section_id,
+        year_str=problem.year_str,
+        problem_code=problem.problem_code
+    )
+
+
 @router.get("/", response_model=List[CodingProblemResponse])
 async def list_problems(
     difficulty: Optional[str] = Query(None),
@@ -283,834 +306,104 @@ async def list_problems(
     scope_type: Optional[str] = Query(None, description="Filter by scope (svnapro/college/department/section)"),
     solved: Optional[bool] = Query(None, description="Filter by solved status (students only)"),
     search: Optional[str] = Query(None, description="Search in title and description"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=1000),
     # academic_year_id parameter removed - column doesn't exist in database
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """List coding problems - year-based visibility for students
     
-    - Students: Only see problems where problem.year <= student.year
-    - Super Admin: See all problems
+    - Students: Only see problems where problem.year <= student.year, within their scope
+    - Super Admin and institution students: See all problems
     - Filters: difficulty, year, language, tags, complexity, scope_type, solved status, search
+    
+    Visibility and filters are evaluated on the cached problem catalog; only
+    the rows of the requested page (newest first, or best search matches
+    first) are loaded.
     """
     import logging
     import traceback
-    import sys
+    from app.models.user import UserRole, RoleEnum
+    from app.services.problem_catalog import (
+        ALL_PROBLEMS_BUCKET, audience_bucket, filter_entries, problem_catalog
+    )
+    from app.services.search import search_ids, search_terms
     logger = logging.getLogger(__name__)
     
-    # CRITICAL: Print immediately to stderr so it shows in docker logs
-    print("=" * 80, file=sys.stderr)
-    print("[LOG] ========== CODING PROBLEMS LIST ENDPOINT CALLED ==========", file=sys.stderr)
-    print(f"[LOG] Timestamp: {datetime.utcnow().isoformat()}", file=sys.stderr)
-    print(f"[LOG] User ID: {current_user.id if current_user else None}", file=sys.stderr)
-    print(f"[LOG] User Email: {current_user.email if current_user else None}", file=sys.stderr)
-    print(f"[LOG] Parameters:", file=sys.stderr)
-    print(f"[LOG]   - is_active: {is_active} (type: {type(is_active).__name__})", file=sys.stderr)
-    print(f"[LOG]   - difficulty: {difficulty}", file=sys.stderr)
-    print(f"[LOG]   - year: {year}", file=sys.stderr)
-    print(f"[LOG]   - language: {language}", file=sys.stderr)
-    print(f"[LOG]   - tags: {tags}", file=sys.stderr)
-    print(f"[LOG]   - scope_type: {scope_type}", file=sys.stderr)
-    print(f"[LOG]   - solved: {solved}", file=sys.stderr)
-    print(f"[LOG]   - search: {search}", file=sys.stderr)
-    print("=" * 80, file=sys.stderr)
-    sys.stderr.flush()  # Force flush
-    
-    # Ensure errors are printed to stdout/stderr
-    logger.info(f"[LOG] list_problems called with is_active={is_active}, user_id={current_user.id if current_user else None}")
-    
-    # Wrap entire function in try-catch to prevent any unhandled exceptions
-    try:
-        # Ensure we have a valid user
-        print("[LOG] Step 1: Validating user...", file=sys.stderr)
-        sys.stderr.flush()
-        if not current_user or not hasattr(current_user, 'id') or not current_user.id:
-            logger.error("[LOG] Invalid user object in list_problems")
-            print("[LOG] ❌ Invalid user - returning 401", file=sys.stderr)
-            sys.stderr.flush()
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Authentication required"
-            )
-        print(f"[LOG] ✅ User validated: ID={current_user.id}", file=sys.stderr)
-        sys.stderr.flush()
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"[LOG] Error validating user: {e}")
-        logger.error(traceback.format_exc())
-        print(f"[LOG] ❌ User validation error: {e}", file=sys.stderr)
-        sys.stderr.flush()
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Authentication required"
-        )
+    if is_active is None:
+        is_active = True  # Default to active problems only
+    if difficulty and complexity and difficulty != complexity:
+        return []
     
     try:
-        print("[LOG] Step 2: Checking user roles...", file=sys.stderr)
-        sys.stderr.flush()
-        from app.models.user import UserRole, RoleEnum
+        role_names = {
+            role for (role,) in db.query(UserRole.role).filter(UserRole.user_id == current_user.id)
+        }
+        sees_everything = RoleEnum.SUPER_ADMIN in role_names or RoleEnum.INSTITUTION_STUDENT in role_names
         
-        # Check if user is super admin
-        user_roles = db.query(UserRole).filter(UserRole.user_id == current_user.id).all()
-        role_names = [role.role for role in user_roles]
-        is_super_admin = RoleEnum.SUPER_ADMIN in role_names
-        print(f"[LOG] ✅ User roles checked: {[r.value for r in role_names]}, is_super_admin={is_super_admin}", file=sys.stderr)
-        sys.stderr.flush()
-    except Exception as e:
-        # If there's an error checking roles, assume not super admin
-        logger.error(f"[LOG] Error checking user roles: {e}")
-        logger.error(traceback.format_exc())
-        print(f"[LOG] ⚠️  Error checking roles, defaulting to not super admin: {e}", file=sys.stderr)
-        sys.stderr.flush()
-        is_super_admin = False
-    
-    # CRITICAL: Check columns FIRST and use raw SQL if year_str is missing
-    # This prevents SQLAlchemy from trying to build a query with missing columns
-    print("[LOG] Step 3: Checking database schema...", file=sys.stderr)
-    sys.stderr.flush()
-    from sqlalchemy import text, inspect
-    from sqlalchemy.exc import ProgrammingError, InternalError
-    
-    use_raw_sql = False
-    try:
-        inspector = inspect(engine)
-        if 'coding_problems' in inspector.get_table_names():
-            columns = [col['name'] for col in inspector.get_columns('coding_problems')]
-            print(f"[LOG] Found {len(columns)} columns in coding_problems table", file=sys.stderr)
-            print(f"[LOG] Columns: {', '.join(columns[:10])}{'...' if len(columns) > 10 else ''}", file=sys.stderr)
-            sys.stderr.flush()
-            
-            # Check for critical columns that might be missing
-            missing_columns = []
-            if 'year_str' not in columns:
-                missing_columns.append('year_str')
-            if 'section' not in columns:
-                missing_columns.append('section')
-            
-            if missing_columns:
-                print(f"[LOG] ⚠️  Missing columns detected: {missing_columns} - will use raw SQL", file=sys.stderr)
-                sys.stderr.flush()
-                use_raw_sql = True
-            else:
-                print("[LOG] ✅ All required columns exist - can use ORM", file=sys.stderr)
-                sys.stderr.flush()
-                # Try to add it in background
-                try:
-                    print("[LOG] Attempting to add year_str column...", file=sys.stderr)
-                    sys.stderr.flush()
-                    conn = engine.connect()
-                    trans = conn.begin()
-                    try:
-                        conn.execute(text("ALTER TABLE coding_problems ADD COLUMN year_str VARCHAR(20)"))
-                        trans.commit()
-                        print("[LOG] ✅ year_str column added successfully", file=sys.stderr)
-                        sys.stderr.flush()
-                        use_raw_sql = False  # Can use ORM now
-                    except Exception as add_error:
-                        trans.rollback()
-                        error_msg = str(add_error).lower()
-                        if "already exists" not in error_msg and "duplicate" not in error_msg:
-                            print(f"[LOG] ⚠️  Error adding column: {add_error}", file=sys.stderr)
-                            sys.stderr.flush()
-                        else:
-                            print(f"[LOG] ℹ️  Column already exists (expected): {add_error}", file=sys.stderr)
-                            sys.stderr.flush()
-                    finally:
-                        conn.close()
-                except Exception as e:
-                    print(f"[LOG] ⚠️  Migration error: {e}", file=sys.stderr)
-                    sys.stderr.flush()
+        solved_ids = None
+        if sees_everything:
+            bucket = ALL_PROBLEMS_BUCKET
         else:
-            print("[LOG] ⚠️  coding_problems table not found!", file=sys.stderr)
-            sys.stderr.flush()
-    except Exception as migration_check_error:
-        print(f"[LOG] ❌ Could not check columns: {migration_check_error}", file=sys.stderr)
-        print(f"[LOG] Traceback: {traceback.format_exc()}", file=sys.stderr)
-        sys.stderr.flush()
-        use_raw_sql = True  # Use raw SQL as fallback
-    
-    # Handle is_active parameter
-    print("[LOG] Step 4: Processing parameters...", file=sys.stderr)
-    sys.stderr.flush()
-    if is_active is None:
-        is_active = True  # Default to active problems only
-    elif isinstance(is_active, str):
-        is_active = is_active.lower() in ('true', '1', 'yes')
-    print(f"[LOG] ✅ Processed is_active: {is_active}", file=sys.stderr)
-    sys.stderr.flush()
-    
-    # CRITICAL FIX: Execute query - use raw SQL if columns missing, otherwise use ORM
-    problems = []
-    
-    if use_raw_sql:
-        # Use raw SQL immediately if columns are missing
-        print("[LOG] Step 5: Using RAW SQL query method", file=sys.stderr)
-        sys.stderr.flush()
-        # Will be handled in raw SQL section below
-    else:
-        # Build and execute ORM query
-        print("[LOG] Step 5: Using ORM query method", file=sys.stderr)
-        sys.stderr.flush()
-        try:
-            query = db.query(CodingProblem)
-            
-            # Apply filters
-            if difficulty:
-                query = query.filter(CodingProblem.difficulty == difficulty)
-            
-            if complexity:
-                query = query.filter(CodingProblem.difficulty == complexity)
-            
-            query = query.filter(CodingProblem.is_active == is_active)
-            
-            if year:
-                try:
-                    query = query.filter(
-                        or_(
-                            CodingProblem.year == year,
-                            CodingProblem.year == str(year),
-                            CodingProblem.year == f"{year}st" if year == 1 else f"{year}nd" if year == 2 else f"{year}rd" if year == 3 else f"{year}th"
-                        )
-                    )
-                except Exception as e:
-                    logging.warning(f"Year filter error, skipping: {e}")
-            
-            if language:
-                query = query.filter(
-                    or_(
-                        CodingProblem.allowed_languages.contains([language]),
-                        CodingProblem.restricted_languages.contains([language]),
-                        CodingProblem.recommended_languages.contains([language])
-                    )
+            profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
+            student_year = parse_year_to_int(profile.present_year) if profile and profile.present_year else None
+            bucket = audience_bucket(profile, student_year)
+            # Solved status filter (students with a year only)
+            if solved is not None and student_year:
+                solved_ids = frozenset(
+                    problem_id for (problem_id,) in db.query(CodingSubmission.problem_id).filter(
+                        CodingSubmission.user_id == current_user.id,
+                        CodingSubmission.status == "accepted"
+                    ).distinct()
                 )
-            
-            if tags:
-                tag_list = [tag.strip() for tag in tags.split(',') if tag.strip()]
-                for tag in tag_list:
-                    query = query.filter(CodingProblem.tags.contains([tag]))
-            
-            if scope_type:
-                query = query.filter(CodingProblem.scope_type == scope_type)
-            
-            # academic_year_id filtering removed - column doesn't exist in database
-            
-            if search:
-                search_term = f"%{search.lower()}%"
-                query = query.filter(
-                    or_(
-                        func.lower(CodingProblem.title).like(search_term),
-                        func.lower(CodingProblem.description).like(search_term)
-                    )
-                )
-            
-            now = datetime.utcnow()
-            query = query.filter(
-                or_(
-                    CodingProblem.expiry_date.is_(None),
-                    CodingProblem.expiry_date > now
-                )
-            )
-            
-            # Execute ORM query
-            print(f"[LOG] Executing ORM query...", file=sys.stderr)
-            sys.stderr.flush()
-            # CRITICAL: Use load_only to explicitly exclude non-existent columns
-            # This prevents SQLAlchemy from trying to SELECT columns that don't exist
-            try:
-                # Explicitly load only columns that exist - exclude academic_year_id and section
-                problems = query.options(
-                    load_only(
-                        CodingProblem.id, CodingProblem.title, CodingProblem.description,
-                        CodingProblem.input_format, CodingProblem.output_format,
-                        CodingProblem.constraints, CodingProblem.sample_input,
-                        CodingProblem.sample_output, CodingProblem.difficulty,
-                        CodingProblem.tags, CodingProblem.year, CodingProblem.year_str,
-                        CodingProblem.allowed_languages, CodingProblem.restricted_languages,
-                        CodingProblem.recommended_languages, CodingProblem.starter_code_python,
-                        CodingProblem.starter_code_c, CodingProblem.starter_code_cpp,
-                        CodingProblem.starter_code_java, CodingProblem.starter_code_javascript,
-                        CodingProblem.time_limit, CodingProblem.memory_limit,
-                        CodingProblem.test_cases, CodingProblem.is_active,
-                        CodingProblem.created_by, CodingProblem.expiry_date,
-                        CodingProblem.scope_type, CodingProblem.college_id,
-                        CodingProblem.department, CodingProblem.section_id,
-                        CodingProblem.problem_code, CodingProblem.created_at,
-                        CodingProblem.updated_at
-                        # NOTE: academic_year_id and section explicitly excluded
-                    )
-                ).order_by(CodingProblem.created_at.desc()).limit(1000).all()  # Limit for performance
-                print(f"[LOG] ✅ ORM query successful: found {len(problems)} problems", file=sys.stderr)
-                sys.stderr.flush()
-            except (ProgrammingError, InternalError) as immediate_error:
-                # If query fails immediately, rollback and switch to raw SQL
-                error_str = str(immediate_error).lower()
-                print(f"[LOG] ❌ Immediate ORM query error: {immediate_error}", file=sys.stderr)
-                sys.stderr.flush()
-                try:
-                    db.rollback()
-                    print(f"[LOG] ✅ Transaction rolled back after immediate error", file=sys.stderr)
-                    sys.stderr.flush()
-                except:
-                    pass
-                raise immediate_error  # Re-raise to be caught by outer handler
-        except (ProgrammingError, InternalError) as query_error:
-            error_str = str(query_error).lower()
-            print(f"[LOG] ❌ ORM query failed with database error: {query_error}", file=sys.stderr)
-            sys.stderr.flush()
-            # CRITICAL: Rollback the failed transaction before trying raw SQL
-            try:
-                db.rollback()
-                print(f"[LOG] ✅ Transaction rolled back successfully", file=sys.stderr)
-                sys.stderr.flush()
-            except Exception as rollback_error:
-                print(f"[LOG] ⚠️  Rollback error (may be expected): {rollback_error}", file=sys.stderr)
-                sys.stderr.flush()
-            
-            if "undefinedcolumn" in error_str or ("column" in error_str and "does not exist" in error_str):
-                print(f"[LOG] ⚠️  Column error detected - falling back to raw SQL", file=sys.stderr)
-                sys.stderr.flush()
-                use_raw_sql = True  # Switch to raw SQL
-            else:
-                print(f"[LOG] ⚠️  Non-column database error - falling back to raw SQL", file=sys.stderr)
-                sys.stderr.flush()
-                use_raw_sql = True  # Fallback to raw SQL
-        except Exception as e:
-            logger.error(f"[LOG] Unexpected error in ORM query: {e}")
-            logger.error(traceback.format_exc())
-            print(f"[LOG] ❌ Unexpected ORM error: {e}", file=sys.stderr)
-            print(f"[LOG] Traceback: {traceback.format_exc()}", file=sys.stderr)
-            sys.stderr.flush()
-            # CRITICAL: Rollback the failed transaction
-            try:
-                db.rollback()
-                print(f"[LOG] ✅ Transaction rolled back after unexpected error", file=sys.stderr)
-                sys.stderr.flush()
-            except Exception as rollback_error:
-                print(f"[LOG] ⚠️  Rollback error: {rollback_error}", file=sys.stderr)
-                sys.stderr.flush()
-            use_raw_sql = True  # Fallback to raw SQL
-    
-    # Execute raw SQL if needed (either from start or as fallback)
-    if use_raw_sql:
-        print("[LOG] Step 6: Executing RAW SQL query...", file=sys.stderr)
-        sys.stderr.flush()
-        # CRITICAL: Ensure transaction is clean before raw SQL
-        try:
-            db.rollback()
-            print(f"[LOG] ✅ Transaction rolled back before raw SQL", file=sys.stderr)
-            sys.stderr.flush()
-        except Exception as rollback_error:
-            print(f"[LOG] ⚠️  Pre-rollback check: {rollback_error}", file=sys.stderr)
-            sys.stderr.flush()
         
-        try:
-            # Get list of existing columns
-            inspector = inspect(engine)
-            if 'coding_problems' in inspector.get_table_names():
-                existing_columns = [col['name'] for col in inspector.get_columns('coding_problems')]
-                print(f"[LOG] Found {len(existing_columns)} existing columns for raw SQL", file=sys.stderr)
-                sys.stderr.flush()
-                
-                # Build SELECT with only existing columns (safe columns that should always exist)
-                safe_columns = ['id', 'title', 'description', 'input_format', 'output_format', 
-                               'constraints', 'sample_input', 'sample_output', 'difficulty', 
-                               'tags', 'year', 'allowed_languages', 'restricted_languages', 
-                               'recommended_languages', 'starter_code_python', 'starter_code_c', 
-                               'starter_code_cpp', 'starter_code_java', 'starter_code_javascript', 
-                               'time_limit', 'memory_limit', 'test_cases', 'is_active', 
-                               'created_by', 'created_at', 'updated_at', 'scope_type', 
-                               'college_id', 'department', 'section_id', 'expiry_date']
-                
-                # Filter to only columns that actually exist
-                select_columns = [col for col in safe_columns if col in existing_columns]
-                
-                # Add optional columns if they exist (section and academic_year_id removed - don't exist in database)
-                optional_columns = ['year_str', 'problem_code']
-                for col in optional_columns:
-                    if col in existing_columns:
-                        select_columns.append(col)
-                
-                # Build WHERE clause
-                where_parts = []
-                
-                if is_active is not None:
-                    where_parts.append(f"is_active = {str(is_active).lower()}")
-                else:
-                    where_parts.append("is_active = true")
-                
-                where_parts.append("(expiry_date IS NULL OR expiry_date > NOW())")
-                
-                # Add other filters if needed (simplified for raw SQL)
-                if difficulty and 'difficulty' in existing_columns:
-                    difficulty_escaped = difficulty.replace("'", "''")
-                    where_parts.append(f"difficulty = '{difficulty_escaped}'")
-                
-                if scope_type and 'scope_type' in existing_columns:
-                    scope_type_escaped = scope_type.replace("'", "''")
-                    where_parts.append(f"scope_type = '{scope_type_escaped}'")
-                
-                # Build and execute raw SQL
-                sql = f"""
-                    SELECT {', '.join(select_columns)}
-                    FROM coding_problems
-                    WHERE {' AND '.join(where_parts)}
-                    ORDER BY created_at DESC
-                """
-                print(f"[LOG] Executing raw SQL query with {len(select_columns)} columns", file=sys.stderr)
-                print(f"[LOG] SQL: {sql[:200]}...", file=sys.stderr)
-                sys.stderr.flush()
-                
-                result = db.execute(text(sql))
-                rows = result.fetchall()
-                print(f"[LOG] ✅ Raw SQL query successful: found {len(rows)} rows", file=sys.stderr)
-                sys.stderr.flush()
-                
-                # Convert rows to objects with proper type handling
-                for row in rows:
-                    row_dict = {}
-                    for idx, col_name in enumerate(select_columns):
-                        value = row[idx]
-                        # Handle JSON columns
-                        if col_name in ['tags', 'allowed_languages', 'restricted_languages', 
-                                       'recommended_languages', 'test_cases']:
-                            if isinstance(value, str):
-                                try:
-                                    import json
-                                    value = json.loads(value)
-                                except:
-                                    value = [] if col_name != 'test_cases' else []
-                            elif value is None:
-                                value = [] if col_name != 'test_cases' else []
-                        row_dict[col_name] = value
-                    
-                    # Create a simple object that mimics CodingProblem
-                    class ProblemObj:
-                        def __init__(self, d):
-                            for k, v in d.items():
-                                setattr(self, k, v)
-                    
-                    problem = ProblemObj(row_dict)
-                    problems.append(problem)
-                
-                print(f"[LOG] ✅ Loaded {len(problems)} problems via raw SQL", file=sys.stderr)
-                sys.stderr.flush()
-        except Exception as sql_error:
-            print(f"[LOG] ❌ Raw SQL failed: {sql_error}", file=sys.stderr)
-            print(f"[LOG] Traceback: {traceback.format_exc()}", file=sys.stderr)
-            sys.stderr.flush()
-            logger.error(f"[LOG] Raw SQL error: {sql_error}")
-            logger.error(traceback.format_exc())
-            problems = []
-    
-    # Apply year filter in Python if database query failed or for better compatibility
-    print(f"[LOG] Step 7: Post-processing {len(problems)} problems...", file=sys.stderr)
-    sys.stderr.flush()
-    if year and problems:
-        filtered_by_year = []
-        for problem in problems:
-            problem_year = problem.year
-            if isinstance(problem_year, str):
-                problem_year = parse_year_to_int(problem_year)
-            elif problem_year is None:
-                continue  # Skip problems with no year
-            
-            if problem_year == year:
-                filtered_by_year.append(problem)
-        problems = filtered_by_year
-    
-    # Year-based and scope-based filtering for students (after fetching, to handle string years)
-    if not is_super_admin:
-        # Check if user is an institution student (they can see ALL problems, no year filtering)
-        user_roles = db.query(UserRole).filter(UserRole.user_id == current_user.id).all()
-        role_names = [role.role for role in user_roles]
-        is_institution_student = RoleEnum.INSTITUTION_STUDENT in role_names
+        entries = filter_entries(
+            problem_catalog.visible(db, bucket),
+            is_active=is_active,
+            difficulty=difficulty or complexity,
+            year=year,
+            language=language,
+            tags=[tag.strip() for tag in tags.split(',') if tag.strip()] if tags else None,
+            scope_type=scope_type,
+            solved_ids=solved_ids,
+            solved=solved,
+        )
+        if not entries:
+            return []
         
-        if is_institution_student:
-            # Institution students can see ALL problems - no year or scope filtering needed
-            print(f"[LOG] Institution student detected - showing all problems (no filtering)", file=sys.stderr)
-            sys.stderr.flush()
+        if search_terms(search):
+            # Full-text search, best matches first, restricted to the visible problems
+            visible_ids = {entry.id for entry in entries}
+            ordered_ids = [
+                problem_id for problem_id in search_ids(db, "coding_problems", search)
+                if problem_id in visible_ids
+            ]
         else:
-            # Regular college students: apply year and scope filtering
-            student_year = get_student_year(current_user, db)
-            student_profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
-            
-            print(f"[LOG] Student filtering - student_year: {student_year}, profile: {student_profile.full_name if student_profile else None}", file=sys.stderr)
-            print(f"[LOG] Total problems before student filtering: {len(problems)}", file=sys.stderr)
-            sys.stderr.flush()
-            
-            if student_year:
-                # Filter problems by year and scope after converting string years to integers
-                filtered_problems = []
-                for problem in problems:
-                    problem_year = problem.year
-                    if isinstance(problem_year, str):
-                        problem_year = parse_year_to_int(problem_year) or 1
-                    elif problem_year is None:
-                        # If problem has no year, make it visible to all students (default to year 1)
-                        problem_year = 1
-                        print(f"[LOG] Problem {getattr(problem, 'id', 'unknown')} has no year, defaulting to 1", file=sys.stderr)
-                        sys.stderr.flush()
-                    
-                    # Year check: problem.year <= student.year (students can see problems for their year and below)
-                    if problem_year > student_year:
-                        print(f"[LOG] Skipping problem {getattr(problem, 'id', 'unknown')}: problem_year={problem_year} > student_year={student_year}", file=sys.stderr)
-                        sys.stderr.flush()
-                        continue
-                    
-                    # Scope check: 
-                    # - "svnapro": visible to all students (no scope filtering)
-                    # - "college": visible if student.college_id matches problem.college_id
-                    # - "department": visible if student.college_id and department match
-                    # - "section": visible if student.section_id matches problem.section_id
-                    # Get scope_type safely (handle None or missing attribute)
-                    problem_scope = getattr(problem, 'scope_type', None) or "svnapro"
-                    
-                    scope_match = False
-                    if problem_scope == "svnapro" or not problem_scope:
-                        # SvnaPro problems visible to all (or if scope_type is None/empty)
-                        scope_match = True
-                        print(f"[LOG] Problem {getattr(problem, 'id', 'unknown')}: SvnaPro scope - visible to all", file=sys.stderr)
-                        sys.stderr.flush()
-                    elif problem_scope == "college":
-                        # College-level: check college_id match
-                        if student_profile and student_profile.college_id and getattr(problem, 'college_id', None):
-                            if student_profile.college_id == problem.college_id:
-                                scope_match = True
-                                print(f"[LOG] Problem {getattr(problem, 'id', 'unknown')}: College scope match", file=sys.stderr)
-                                sys.stderr.flush()
-                            else:
-                                print(f"[LOG] Problem {getattr(problem, 'id', 'unknown')}: College scope mismatch (student={student_profile.college_id}, problem={problem.college_id})", file=sys.stderr)
-                                sys.stderr.flush()
-                        elif not getattr(problem, 'college_id', None):
-                            # If problem has no college_id, treat as svnapro
-                            scope_match = True
-                            print(f"[LOG] Problem {getattr(problem, 'id', 'unknown')}: College scope but no college_id - treating as svnapro", file=sys.stderr)
-                            sys.stderr.flush()
-                    elif problem_scope == "department":
-                        # Department-level: check college_id and department match
-                        if student_profile and student_profile.college_id and getattr(problem, 'college_id', None):
-                            if (student_profile.college_id == problem.college_id and 
-                                student_profile.department and getattr(problem, 'department', None) and
-                                student_profile.department.lower() == problem.department.lower()):
-                                scope_match = True
-                                print(f"[LOG] Problem {getattr(problem, 'id', 'unknown')}: Department scope match", file=sys.stderr)
-                                sys.stderr.flush()
-                    elif problem_scope == "section":
-                        # Section-level: check section_id match OR section name match
-                        section_match = False
-                        if student_profile:
-                            # Check by section_id (exact match)
-                            if student_profile.section_id and getattr(problem, 'section_id', None):
-                                if student_profile.section_id == problem.section_id:
-                                    section_match = True
-                            # Note: section name matching removed - section column doesn't exist in database
-                            # Only section_id matching is supported
-                        if section_match:
-                            # Also check year match for section-level problems
-                            if getattr(problem, 'year_str', None) and student_profile.present_year:
-                                # Match year string (e.g., "1st" matches "1st")
-                                if problem.year_str.lower() != student_profile.present_year.lower():
-                                    section_match = False
-                                    print(f"[LOG] Problem {getattr(problem, 'id', 'unknown')}: Section match but year mismatch", file=sys.stderr)
-                                    sys.stderr.flush()
-                            if section_match:
-                                scope_match = True
-                                print(f"[LOG] Problem {getattr(problem, 'id', 'unknown')}: Section scope match", file=sys.stderr)
-                                sys.stderr.flush()
-                    
-                    if scope_match:
-                        filtered_problems.append(problem)
-                        print(f"[LOG] ✅ Problem {getattr(problem, 'id', 'unknown')} added to filtered list", file=sys.stderr)
-                        sys.stderr.flush()
-                    else:
-                        print(f"[LOG] ❌ Problem {getattr(problem, 'id', 'unknown')} filtered out by scope", file=sys.stderr)
-                        sys.stderr.flush()
-                
-                problems = filtered_problems
-                print(f"[LOG] ✅ After student filtering: {len(problems)} problems remain", file=sys.stderr)
-                sys.stderr.flush()
-                
-                # Solved status filter (for students only)
-                if solved is not None:
-                    # Get all problem IDs the student has solved
-                    solved_problem_ids = set()
-                    if solved:
-                        submissions = db.query(CodingSubmission).filter(
-                            CodingSubmission.user_id == current_user.id,
-                            CodingSubmission.status == "accepted"
-                        ).all()
-                        solved_problem_ids = {s.problem_id for s in submissions}
-                    
-                    if solved:
-                        # Show only solved problems
-                        problems = [p for p in problems if p.id in solved_problem_ids]
-                    else:
-                        # Show only unsolved problems
-                        problems = [p for p in problems if p.id not in solved_problem_ids]
-            else:
-                # If student has no year set, show only svnapro problems (no year restriction)
-                print(f"[LOG] ⚠️  Student has no year set - showing only svnapro problems", file=sys.stderr)
-                sys.stderr.flush()
-                filtered_problems = []
-                for problem in problems:
-                    # Only show svnapro problems if student has no year
-                    if not problem.scope_type or problem.scope_type == "svnapro":
-                        filtered_problems.append(problem)
-                problems = filtered_problems
-            problems = filtered_problems
-            print(f"[LOG] ✅ After no-year filtering: {len(problems)} svnapro problems", file=sys.stderr)
-            sys.stderr.flush()
-    
-    # Convert to response format
-    print(f"[LOG] Step 8: Converting {len(problems)} problems to response format...", file=sys.stderr)
-    sys.stderr.flush()
-    
-    # CRITICAL: Access all problem attributes while session is still active
-    # Store problem data in dictionaries to avoid lazy loading issues after session closes
-    problem_data_list = []
-    for problem in problems:
-        try:
-            # Extract all needed data while session is active
-            problem_data = {
-                'id': problem.id,
-                'title': problem.title or "",
-                'description': problem.description or "",
-                'input_format': getattr(problem, 'input_format', None),
-                'output_format': getattr(problem, 'output_format', None),
-                'constraints': getattr(problem, 'constraints', None),
-                'sample_input': getattr(problem, 'sample_input', None),
-                'sample_output': getattr(problem, 'sample_output', None),
-                'difficulty': getattr(problem, 'difficulty', None),
-                'tags': problem.tags if isinstance(problem.tags, list) else (problem.tags.split(',') if isinstance(problem.tags, str) else []),
-                'year': problem.year,
-                'allowed_languages': problem.allowed_languages or [],
-                'restricted_languages': problem.restricted_languages or [],
-                'recommended_languages': problem.recommended_languages or [],
-                'starter_code_python': getattr(problem, 'starter_code_python', None),
-                'starter_code_c': getattr(problem, 'starter_code_c', None),
-                'starter_code_cpp': getattr(problem, 'starter_code_cpp', None),
-                'starter_code_java': getattr(problem, 'starter_code_java', None),
-                'starter_code_javascript': getattr(problem, 'starter_code_javascript', None),
-                'time_limit': getattr(problem, 'time_limit', 5) or 5,
-                'memory_limit': getattr(problem, 'memory_limit', 256) or 256,
-                'test_cases': problem.test_cases,
-                'is_active': problem.is_active if isinstance(problem.is_active, bool) else str(problem.is_active).lower() == 'true',
-                'created_by': getattr(problem, 'created_by', None) if hasattr(problem, 'created_by') else None,
-                'created_at': getattr(problem, 'created_at', datetime.utcnow()),
-                'updated_at': getattr(problem, 'updated_at', None),
-                'scope_type': getattr(problem, 'scope_type', None) or "svnapro",
-                'college_id': getattr(problem, 'college_id', None),
-                'department': getattr(problem, 'department', None),
-                'section_id': getattr(problem, 'section_id', None),
-                'year_str': getattr(problem, 'year_str', None),
-                'problem_code': getattr(problem, 'problem_code', None)
-            }
-            problem_data_list.append(problem_data)
-        except Exception as e:
-            print(f"[ERROR] Failed to extract data from problem {getattr(problem, 'id', 'unknown')}: {e}", file=sys.stderr)
-            sys.stderr.flush()
-            continue
-    
-    print(f"[LOG] Extracted data from {len(problem_data_list)} problems, now converting to response format...", file=sys.stderr)
-    sys.stderr.flush()
-    
-    result = []
-    try:
-        for idx, problem_data in enumerate(problem_data_list):
-            if idx == 0:
-                print(f"[DEBUG] Processing first problem: ID={problem_data['id']}, year={problem_data['year']}, is_active={problem_data['is_active']}", file=sys.stderr)
-                sys.stderr.flush()
+            ordered_ids = [entry.id for entry in entries]
+        
+        page_ids = ordered_ids[skip:skip + limit]
+        if not page_ids:
+            return []
+        problems_by_id = {
+            problem.id: problem
+            for problem in db.query(CodingProblem).filter(CodingProblem.id.in_(page_ids))
+        }
+        page = [problems_by_id[problem_id] for problem_id in page_ids if problem_id in problems_by_id]
+        
+        result = []
+        for problem in page:
             try:
-                # Use pre-extracted data to avoid lazy loading issues
-                # Convert year to integer if it's a string (handle old data format)
-                year_value = problem_data['year']
-                if isinstance(year_value, str):
-                    year_value = parse_year_to_int(year_value) or 1
-                elif year_value is None:
-                    year_value = 1
-                
-                # Ensure year_value is always an int
-                if not isinstance(year_value, int):
-                    try:
-                        year_value = int(year_value) if year_value is not None else 1
-                    except:
-                        year_value = 1
-                
-                # Handle test_cases - ensure it's a list
-                test_cases = problem_data['test_cases']
-                if test_cases is None:
-                    test_cases = []
-                elif isinstance(test_cases, dict):
-                    # If it's a dict, convert to list format
-                    test_cases = list(test_cases.values()) if test_cases else []
-                elif not isinstance(test_cases, list):
-                    test_cases = []
-                
-                # Handle tags - ensure it's a list
-                tags = problem_data['tags']
-                if tags is None:
-                    tags = []
-                elif isinstance(tags, str):
-                    # If tags is a string, try to parse it
-                    try:
-                        import json
-                        tags = json.loads(tags)
-                    except:
-                        tags = [tags]
-                elif not isinstance(tags, list):
-                    tags = []
-                
-                # Handle languages - ensure they're lists
-                allowed_languages = problem_data['allowed_languages']
-                if isinstance(allowed_languages, str):
-                    try:
-                        import json
-                        allowed_languages = json.loads(allowed_languages)
-                    except:
-                        allowed_languages = [allowed_languages] if allowed_languages else []
-                elif not isinstance(allowed_languages, list):
-                    allowed_languages = []
-                
-                restricted_languages = problem_data['restricted_languages']
-                if isinstance(restricted_languages, str):
-                    try:
-                        import json
-                        restricted_languages = json.loads(restricted_languages)
-                    except:
-                        restricted_languages = [restricted_languages] if restricted_languages else []
-                elif not isinstance(restricted_languages, list):
-                    restricted_languages = []
-                
-                recommended_languages = problem_data['recommended_languages']
-                if isinstance(recommended_languages, str):
-                    try:
-                        import json
-                        recommended_languages = json.loads(recommended_languages)
-                    except:
-                        recommended_languages = [recommended_languages] if recommended_languages else []
-                elif not isinstance(recommended_languages, list):
-                    recommended_languages = []
-                
-                # Ensure time_limit and memory_limit are ints
-                time_limit_value = problem_data['time_limit']
-                if not isinstance(time_limit_value, int):
-                    try:
-                        time_limit_value = int(time_limit_value)
-                    except:
-                        time_limit_value = 5
-                
-                memory_limit_value = problem_data['memory_limit']
-                if not isinstance(memory_limit_value, int):
-                    try:
-                        memory_limit_value = int(memory_limit_value)
-                    except:
-                        memory_limit_value = 256
-                
-                # Ensure is_active is a bool
-                is_active_value = problem_data['is_active']
-                if not isinstance(is_active_value, bool):
-                    is_active_value = str(is_active_value).lower() in ('true', '1', 'yes')
-                
-                try:
-                    response_obj = CodingProblemResponse(
-                        id=problem_data['id'],
-                        title=problem_data['title'],
-                        description=problem_data['description'],
-                        input_format=problem_data['input_format'],
-                        output_format=problem_data['output_format'],
-                        constraints=problem_data['constraints'],
-                        sample_input=problem_data['sample_input'],
-                        sample_output=problem_data['sample_output'],
-                        difficulty=problem_data['difficulty'] or "Unknown",
-                        tags=tags,
-                        year=year_value,
-                        allowed_languages=allowed_languages,
-                        restricted_languages=restricted_languages,
-                        recommended_languages=recommended_languages,
-                        starter_code_python=problem_data['starter_code_python'],
-                        starter_code_c=problem_data['starter_code_c'],
-                        starter_code_cpp=problem_data['starter_code_cpp'],
-                        starter_code_java=problem_data['starter_code_java'],
-                        starter_code_javascript=problem_data['starter_code_javascript'],
-                        time_limit=time_limit_value,
-                        memory_limit=memory_limit_value,
-                        test_cases=test_cases,
-                        is_active=is_active_value,
-                        created_by=problem_data['created_by'],
-                        created_at=problem_data['created_at'],
-                        updated_at=problem_data['updated_at'],
-                        scope_type=problem_data['scope_type'],
-                        college_id=problem_data['college_id'],
-                        department=problem_data['department'],
-                        section_id=problem_data['section_id'],
-                        year_str=problem_data['year_str'],
-                        problem_code=problem_data['problem_code']
-                    )
-                    result.append(response_obj)
-                    if len(result) % 5 == 0:
-                        print(f"[LOG] Converted {len(result)} problems so far...", file=sys.stderr)
-                        sys.stderr.flush()
-                except Exception as validation_error:
-                    # Log validation error with problem details
-                    print(f"[VALIDATION ERROR] Problem ID {problem.id}: {validation_error}", file=sys.stderr)
-                    print(f"[VALIDATION ERROR] Problem data: year={year_value}, created_at={created_at_value}, is_active={is_active_value}", file=sys.stderr)
-                    print(f"[VALIDATION ERROR] Problem title: {problem.title}", file=sys.stderr)
-                    print(f"[VALIDATION ERROR] Problem scope_type: {getattr(problem, 'scope_type', None)}", file=sys.stderr)
-                    logger.error(f"Validation error for problem {problem.id}: {validation_error}")
-                    import traceback
-                    error_trace = traceback.format_exc()
-                    logger.error(error_trace)
-                    print(f"[VALIDATION ERROR] Full traceback:\n{error_trace}", file=sys.stderr)
-                    sys.stderr.flush()
-                    # Skip this problem instead of failing entire request
-                    continue
+                result.append(problem_list_response(problem))
             except Exception as e:
-                # Skip problematic records and log error
-                problem_id = getattr(problem, 'id', 'unknown')
-                print(f"[ERROR] Error processing problem {problem_id}: {e}", file=sys.stderr)
-                logger.error(f"Error processing problem {problem_id}: {e}")
-                import traceback
-                error_trace = traceback.format_exc()
-                logger.error(error_trace)
-                print(f"[ERROR] Full traceback:\n{error_trace}", file=sys.stderr)
-                sys.stderr.flush()
-                continue
-        
-        print(f"[LOG] ✅ Response conversion complete: {len(result)} problems ready", file=sys.stderr)
-        print(f"[LOG] ========== ENDPOINT SUCCESS - RETURNING {len(result)} PROBLEMS ==========", file=sys.stderr)
-        print("=" * 80, file=sys.stderr)
-        sys.stderr.flush()
+                # Skip problematic records instead of failing the whole list
+                logger.error(f"Error converting coding problem {problem.id}: {e}")
         return result
-    except HTTPException as http_ex:
-        # Only re-raise authentication errors, return empty list for everything else
-        if http_ex.status_code == status.HTTP_401_UNAUTHORIZED:
-            print(f"[LOG] ❌ Authentication error - re-raising 401", file=sys.stderr)
-            sys.stderr.flush()
-            raise
-        print(f"[LOG] ⚠️  HTTPException caught (non-auth), returning empty list: {http_ex.detail}", file=sys.stderr)
-        print(f"[LOG] Status code: {http_ex.status_code}", file=sys.stderr)
-        print("=" * 80, file=sys.stderr)
-        sys.stderr.flush()
-        logger.warning(f"[LOG] HTTPException in list_problems: {http_ex.detail}")
-        return []
     except Exception as e:
-        # Print to stderr so it shows in docker logs
-        error_trace = traceback.format_exc()
-        print("=" * 80, file=sys.stderr)
-        print(f"[LOG] ❌❌❌ CRITICAL ERROR in list_problems ❌❌❌", file=sys.stderr)
-        print(f"[LOG] Error: {e}", file=sys.stderr)
-        print(f"[LOG] Error type: {type(e).__name__}", file=sys.stderr)
-        print(f"[LOG] Full traceback:", file=sys.stderr)
-        print(error_trace, file=sys.stderr)
-        print("=" * 80, file=sys.stderr)
-        print("[LOG] ⚠️  Returning empty list instead of 500 error to prevent frontend crash", file=sys.stderr)
-        print(f"[LOG] ========== ENDPOINT ERROR - RETURNING EMPTY LIST ==========", file=sys.stderr)
-        print("=" * 80, file=sys.stderr)
-        sys.stderr.flush()
-        logger.error(f"[LOG] CRITICAL ERROR in list_problems: {e}")
-        logger.error(f"[LOG] Traceback: {error_trace}")
-        # NEVER raise 500 - always return empty list
+        logger.error(f"Error listing coding problems: {e}")
+        logger.error(traceback.format_exc())
+        # Never fail the listing - the frontend expects a list
+        db.rollback()
         return []
 
 
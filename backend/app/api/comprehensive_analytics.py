@@ -6,7 +6,7 @@ from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta, date
 from pydantic import BaseModel
 
-from app.core.database import get_db
+from app.core.database import get_db, use_reporting_db
 from app.api.auth import get_current_user
 from app.models.user import User, UserRole, RoleEnum
 from app.models.profile import Profile
@@ -116,6 +116,7 @@ async def track_activity(
             if not progress:
                 progress = StudentProgress(user_id=current_user.id)
                 db.add(progress)
+                db.flush()  # Apply the column defaults (zero counters) before incrementing
             
             # Update progress based on activity type
             if activity.activity_type == ActivityType.CODING_PROBLEM_STARTED:
@@ -181,6 +182,7 @@ async def start_session(
         if not progress:
             progress = StudentProgress(user_id=current_user.id)
             db.add(progress)
+            db.flush()  # Apply the column defaults (zero counters) before incrementing
         progress.total_sessions += 1
         
         db.commit()
@@ -262,6 +264,8 @@ async def end_session(
 
 
 # ==================== Analytics Retrieval Endpoints ====================
+# Read-only retrieval runs on the reporting pool (use_reporting_db); my-progress creates
+# the progress row on first use, so it stays on the interactive pool
 
 @router.get("/student/my-progress")
 async def get_my_progress(
@@ -346,7 +350,7 @@ async def get_my_progress(
     }
 
 
-@router.get("/student/{student_id}/detailed")
+@router.get("/student/{student_id}/detailed", dependencies=[Depends(use_reporting_db)])
 async def get_student_detailed_analytics(
     student_id: int,
     start_date: Optional[str] = Query(None),
@@ -587,7 +591,7 @@ async def get_student_detailed_analytics(
     }
 
 
-@router.get("/feature/{feature_name}")
+@router.get("/feature/{feature_name}", dependencies=[Depends(use_reporting_db)])
 async def get_feature_analytics(
     feature_name: str,
     start_date: Optional[str] = Query(None),
@@ -716,7 +720,7 @@ async def get_feature_analytics(
     }
 
 
-@router.get("/dashboard/comprehensive")
+@router.get("/dashboard/comprehensive", dependencies=[Depends(use_reporting_db)])
 async def get_comprehensive_dashboard(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
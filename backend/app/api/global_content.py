@@ -1,21 +1,23 @@
 """Global content management API (quizzes, coding problems) with scope-based access"""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session, load_only
 from sqlalchemy import or_, and_, cast, Integer, func, cast, String
 from typing import List, Optional
-import re
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.models.user import User, UserRole, RoleEnum
 from app.models.profile import Profile
 from app.models.quiz import Quiz, CodingProblem, QuizAttempt
 from app.models.academic import Section
-from app.api.auth import get_current_user, get_optional_user as auth_get_optional_user
+from app.api.auth import get_current_user, get_current_user_async, get_optional_user as auth_get_optional_user
 from app.schemas.global_content import (
     QuizCreate, QuizUpdate, QuizResponse,
     CodingProblemCreate, CodingProblemUpdate, CodingProblemResponse,
-    QuizAttemptCreate, QuizAttemptUpdate, QuizAttemptResponse, QuizAnswerSchema
+    QuizAttemptCreate, QuizAttemptUpdate, QuizAttemptResponse, QuizAnswerSchema, QuizGradingResponse
 )
+from app.services.quiz_attempt_engine import quiz_attempt_engine
+from app.services.quiz_grading import grade_quiz_attempts
 from datetime import datetime
 
 
@@ -403,6 +405,7 @@ async def create_quiz(
 async def list_quizzes(
     is_active: Optional[bool] = None,
     scope_type: Optional[str] = Query(None, description="Filter by scope: 'svnapro' or 'college'"),
+    search: Optional[str] = Query(None, description="Search title, description and subject"),
     current_user: Optional[User] = Depends(auth_get_optional_user),
     db: Session = Depends(get_db)
 ):
@@ -412,9 +415,14 @@ async def list_quizzes(
     - scope_type='svnapro' shows only SvnaPro quizzes
     - scope_type='college' shows only college-scoped quizzes
     - If not specified, shows all visible quizzes
+    - search: full-text search, best matches first
     """
     query = db.query(Quiz)
     
+    if search:
+        from app.services.search import apply_search
+        query = apply_search(query, Quiz, "quizzes", search, db)
+    
     # Filter by active status
     if is_active is not None:
         query = query.filter(Quiz.is_active == is_active)
@@ -782,6 +790,7 @@ async def update_quiz(
     quiz.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(quiz)
+    quiz_attempt_engine.invalidate_quiz(quiz.id)
     return quiz
 
 
@@ -809,6 +818,7 @@ async def delete_quiz(
     
     db.delete(quiz)
     db.commit()
+    quiz_attempt_engine.invalidate_quiz(quiz_id)
     return None
 
 
@@ -853,7 +863,7 @@ async def start_quiz_attempt(
     if existing:
         # Return existing attempt with server-calculated remaining time
         attempt_dict = {c.name: getattr(existing, c.name) for c in existing.__table__.columns}
-        attempt_dict['answers'] = existing.answers or []
+        attempt_dict['answers'] = quiz_attempt_engine.pending_answers(existing.id, existing.answers)
         
         # Calculate server-side remaining time
         if quiz.duration_minutes > 0:
@@ -882,30 +892,27 @@ async def start_quiz_attempt(
 @router.get("/quiz-attempts/{attempt_id}/remaining-time")
 async def get_remaining_time(
     attempt_id: int,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get server-validated remaining time for quiz attempt"""
-    attempt = db.query(QuizAttempt).filter(QuizAttempt.id == attempt_id).first()
-    if not attempt:
+    """Get server-validated remaining time for quiz attempt (served from the attempt engine cache)"""
+    # The engine loads attempts and quizzes it has not cached through a sync Session; run_sync
+    # gives it one on the async connection so a cache miss does not block the event loop
+    state = await db.run_sync(quiz_attempt_engine.get_attempt, attempt_id)
+    if not state:
         raise HTTPException(status_code=404, detail="Attempt not found")
     
-    if attempt.user_id != current_user.id:
+    if state.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    if attempt.is_submitted:
+    if state.is_submitted:
         return {"remaining_time_seconds": 0, "is_expired": True}
     
-    quiz = attempt.quiz
     now = datetime.utcnow()
+    seconds_left = await db.run_sync(quiz_attempt_engine.seconds_left, state, now)
     
-    if quiz.duration_minutes > 0:
-        start_time = attempt.started_at
-        duration_ms = quiz.duration_minutes * 60 * 1000
-        elapsed = (now - start_time).total_seconds() * 1000
-        remaining_ms = max(0, duration_ms - elapsed)
-        remaining_seconds = int(remaining_ms / 1000)
-        
+    if seconds_left is not None:
+        remaining_seconds = int(seconds_left)
         return {
             "remaining_time_seconds": remaining_seconds,
             "is_expired": remaining_seconds <= 0,
@@ -926,44 +933,45 @@ async def update_quiz_attempt(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Update quiz attempt with answers"""
-    attempt = db.query(QuizAttempt).filter(QuizAttempt.id == attempt_id).first()
-    if not attempt:
+    """Update quiz attempt with answers
+    
+    `answer_deltas` (question_index -> answer, null clears) only touches those
+    questions; `answers` replaces the full list. Answers are buffered by the
+    attempt engine and persisted in batches.
+    """
+    state = quiz_attempt_engine.get_attempt(db, attempt_id)
+    if not state:
         raise HTTPException(status_code=404, detail="Attempt not found")
     
-    if attempt.user_id != current_user.id:
+    if state.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="Not authorized")
     
-    if attempt.is_submitted:
+    if state.is_submitted:
         raise HTTPException(status_code=400, detail="Quiz already submitted")
     
     # Check if quiz time expired (server-side validation)
-    quiz = attempt.quiz
-    now = datetime.utcnow()
-    if quiz.duration_minutes > 0:
-        start_time = attempt.started_at
-        duration_ms = quiz.duration_minutes * 60 * 1000
-        elapsed_ms = (now - start_time).total_seconds() * 1000
-        remaining_ms = duration_ms - elapsed_ms
-        
-        if remaining_ms <= 0:
-            # Time expired - auto-submit
-            attempt.is_auto_submitted = True
-            attempt.auto_submitted_at = now
-            attempt.is_submitted = True
-            db.commit()
-            raise HTTPException(status_code=400, detail="Quiz time expired")
-    
-    # Update answers
-    if attempt_data.answers is not None:
-        attempt.answers = [a.model_dump() if hasattr(a, 'model_dump') else a for a in attempt_data.answers]
-    
-    db.commit()
-    db.refresh(attempt)
+    seconds_left = quiz_attempt_engine.seconds_left(db, state)
+    if seconds_left is not None and seconds_left <= 0:
+        # Time expired - auto-submit what was saved so far
+        attempt = db.query(QuizAttempt).filter(QuizAttempt.id == attempt_id).with_for_update().first()
+        if attempt and not attempt.is_submitted:
+            quiz_attempt_engine.submit(db, attempt, auto_submitted=True)
+        raise HTTPException(status_code=400, detail="Quiz time expired")
+    
+    quiz_attempt_engine.record_answers(
+        db,
+        state,
+        changes={
+            index: answer.model_dump() if answer is not None else None
+            for index, answer in attempt_data.answer_deltas.items()
+        } if attempt_data.answer_deltas else None,
+        full_answers=[a.model_dump() for a in attempt_data.answers] if attempt_data.answers is not None else None
+    )
+    if state.is_submitted:
+        # Submitted through another worker before these answers were written
+        raise HTTPException(status_code=400, detail="Quiz already submitted")
     
-    attempt_dict = {c.name: getattr(attempt, c.name) for c in attempt.__table__.columns}
-    attempt_dict['answers'] = attempt.answers or []
-    return attempt_dict
+    return state.to_dict()
 
 
 @router.post("/quiz-attempts/{attempt_id}/submit", response_model=QuizAttemptResponse)
@@ -972,8 +980,8 @@ async def submit_quiz(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Submit quiz attempt and auto-grade"""
-    attempt = db.query(QuizAttempt).filter(QuizAttempt.id == attempt_id).first()
+    """Submit quiz attempt and auto-grade (buffered answers are merged in the same transaction)"""
+    attempt = db.query(QuizAttempt).filter(QuizAttempt.id == attempt_id).with_for_update().first()
     if not attempt:
         raise HTTPException(status_code=404, detail="Attempt not found")
     
@@ -983,99 +991,40 @@ async def submit_quiz(
     if attempt.is_submitted:
         return attempt
     
-    # Mark as submitted
-    attempt.is_submitted = True
-    attempt.submitted_at = datetime.utcnow()
-    
-    # Auto-grade
-    quiz = attempt.quiz
-    total_score = 0.0
-    max_score = 0.0
-    questions = quiz.questions if isinstance(quiz.questions, list) else []
-    answers = attempt.answers or []
-    
-    # Create answer map by question index
-    answer_map = {ans.get('question_index'): ans for ans in answers if isinstance(ans, dict)}
-    
-    for idx, question in enumerate(questions):
-        if not isinstance(question, dict):
-            continue
-            
-        max_score += question.get('marks', 1)
-        answer = answer_map.get(idx)
-        
-        if answer:
-            points_earned = 0.0
-            question_type = question.get('question_type', 'mcq')
-            user_answer = answer.get('answer')
-            
-            # Grade based on question type
-            negative_marking = question.get('negative_marking', 0.0)
-            allow_negative = quiz.allow_negative_marking if hasattr(quiz, 'allow_negative_marking') else False
-            
-            if question_type == 'mcq':
-                correct_answer = question.get('correct_answer', '').upper()
-                if user_answer and str(user_answer).upper() == correct_answer:
-                    points_earned = question.get('marks', 1)
-                elif allow_negative and negative_marking > 0:
-                    # Apply negative marking for wrong answer
-                    points_earned = -negative_marking
-            elif question_type == 'true_false':
-                correct_bool = question.get('is_true', False)
-                # Handle both boolean and string answers
-                user_bool = None
-                if isinstance(user_answer, bool):
-                    user_bool = user_answer
-                elif isinstance(user_answer, str):
-                    user_bool = user_answer.lower() in ['true', 't', '1', 'yes']
-                elif user_answer is not None:
-                    user_bool = bool(user_answer)
-                
-                if user_bool is not None and user_bool == correct_bool:
-                    points_earned = question.get('marks', 1)
-                elif allow_negative and negative_marking > 0:
-                    # Apply negative marking for wrong answer
-                    points_earned = -negative_marking
-            elif question_type == 'fill_blank':
-                # Normalize fill-in-the-blank answers: case-insensitive, trim, remove periods, normalize spaces
-                def normalize_fill_blank_answer(text: str) -> str:
-                    if not text:
-                        return ""
-                    # Convert to lowercase, strip whitespace
-                    normalized = str(text).strip().lower()
-                    # Remove periods/full stops
-                    normalized = normalized.replace('.', '')
-                    # Normalize multiple spaces to single space
-                    normalized = re.sub(r'\s+', ' ', normalized)
-                    return normalized.strip()
-                
-                correct_text = normalize_fill_blank_answer(question.get('correct_answer_text', ''))
-                user_answer_normalized = normalize_fill_blank_answer(str(user_answer) if user_answer else '')
-                if user_answer_normalized and user_answer_normalized == correct_text:
-                    points_earned = question.get('marks', 1)
-            
-            # Update answer with points
-            answer['points_earned'] = points_earned
-            answer['max_points'] = question.get('marks', 1)
-            answer['is_correct'] = points_earned > 0
-            total_score += points_earned
-    
-    # Ensure score doesn't go below 0 (even with negative marking)
-    attempt.total_score = max(0, total_score)
-    attempt.max_score = max_score
-    attempt.percentage = (attempt.total_score / attempt.max_score * 100) if max_score > 0 else 0
-    attempt.is_graded = True
-    attempt.graded_at = datetime.utcnow()
-    attempt.answers = answers  # Update with graded answers
-    
-    db.commit()
-    db.refresh(attempt)
+    attempt = quiz_attempt_engine.submit(db, attempt)
     
     attempt_dict = {c.name: getattr(attempt, c.name) for c in attempt.__table__.columns}
     attempt_dict['answers'] = attempt.answers or []
     return attempt_dict
 
 
+@router.post("/quizzes/{quiz_id}/grade", response_model=QuizGradingResponse)
+async def grade_quiz(
+    quiz_id: int,
+    regrade: bool = Query(False, description="Re-grade every submitted attempt, e.g. after correcting the answer key"),
+    current_user_tuple = Depends(get_current_content_creator),
+    db: Session = Depends(get_db)
+):
+    """Bulk-grade a quiz's pending attempts, auto-submitting expired ones (creator or super admin only)"""
+    current_user, user_info = current_user_tuple
+    quiz = db.query(Quiz).filter(Quiz.id == quiz_id).first()
+    if not quiz:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found"
+        )
+    
+    if not user_info["is_super_admin"] and quiz.created_by != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only grade quizzes you created"
+        )
+    
+    # Persist buffered autosaves so expired attempts are graded with their latest answers
+    quiz_attempt_engine.flush()
+    return grade_quiz_attempts(db, quiz, regrade=regrade)
+
+
 @router.get("/quiz-attempts/{attempt_id}", response_model=QuizAttemptResponse)
 async def get_quiz_attempt(
     attempt_id: int,
@@ -1091,7 +1040,10 @@ async def get_quiz_attempt(
         raise HTTPException(status_code=403, detail="Not authorized")
     
     attempt_dict = {c.name: getattr(attempt, c.name) for c in attempt.__table__.columns}
-    attempt_dict['answers'] = attempt.answers or []
+    if attempt.is_submitted:
+        attempt_dict['answers'] = attempt.answers or []
+    else:
+        attempt_dict['answers'] = quiz_attempt_engine.pending_answers(attempt.id, attempt.answers)
     return attempt_dict
 
 
@@ -15,7 +15,7 @@ from app.models.coding_lab import CodingLab
 from app.models.intelligent_lab import (
     LabSessionEnhanced, SessionMaterial, LabTest, TestQuestion, 
     TestAttempt, TestAnswer, StudentSessionProgress, StudentLabProgress,
-    LabLeaderboard, MaterialType, TestType, QuestionType
+    MaterialType, TestType, QuestionType
 )
 from app.models.coding_lab import LabMode  # Import LabMode for mode-based configuration
 from app.schemas.intelligent_lab import (
@@ -25,8 +25,9 @@ from app.schemas.intelligent_lab import (
     TestQuestionCreate, TestQuestionResponse,
     TestAttemptCreate, TestAttemptResponse, TestAnswerCreate, TestAnswerResponse,
     StudentSessionProgressResponse, StudentLabProgressResponse,
-    LabLeaderboardResponse
+    LabLeaderboardResponse, LeaderboardEntry
 )
+from app.services.lab_leaderboard import lab_leaderboard
 import logging
 import json
 
@@ -594,61 +595,32 @@ async def get_student_session_progress(
 @router.get("/labs/{lab_id}/leaderboard", response_model=LabLeaderboardResponse)
 async def get_lab_leaderboard(
     lab_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get leaderboard for a lab"""
+    """Get a page of the live leaderboard for a lab, with the caller's own rank"""
     lab = db.query(CodingLab).filter(CodingLab.id == lab_id).first()
     if not lab:
         raise HTTPException(status_code=404, detail="Lab not found")
     
-    # Get or create leaderboard
-    leaderboard = db.query(LabLeaderboard).filter(LabLeaderboard.lab_id == lab_id).first()
-    
-    if not leaderboard:
-        # Calculate rankings
-        progress_list = db.query(StudentLabProgress).filter(
-            StudentLabProgress.lab_id == lab_id
-        ).order_by(desc(StudentLabProgress.overall_percentage)).all()
-        
-        rankings = []
-        for idx, prog in enumerate(progress_list, 1):
-            user = db.query(User).filter(User.id == prog.user_id).first()
-            rankings.append({
-                "user_id": prog.user_id,
-                "user_name": user.full_name if user else "Unknown",
-                "rank": idx,
-                "score": prog.total_score,
-                "completion_percentage": prog.completion_percentage,
-                "exercises_completed": prog.exercises_completed,
-                "tests_passed": prog.tests_passed
-            })
-        
-        avg_score = sum(p.overall_percentage for p in progress_list) / len(progress_list) if progress_list else 0
-        top_score = progress_list[0].overall_percentage if progress_list else 0
-        
-        leaderboard = LabLeaderboard(
-            lab_id=lab_id,
-            rankings=json.dumps(rankings),
-            total_participants=len(progress_list),
-            average_score=avg_score,
-            top_score=top_score
-        )
-        db.add(leaderboard)
-        db.commit()
-        db.refresh(leaderboard)
-    
-    # Parse rankings
-    rankings_data = json.loads(leaderboard.rankings) if isinstance(leaderboard.rankings, str) else leaderboard.rankings
-    
-    return {
-        "lab_id": leaderboard.lab_id,
-        "rankings": rankings_data,
-        "total_participants": leaderboard.total_participants,
-        "average_score": leaderboard.average_score,
-        "top_score": leaderboard.top_score,
-        "last_updated": leaderboard.last_updated
-    }
+    leaderboard = lab_leaderboard.get_page(db, lab_id, skip=skip, limit=limit)
+    leaderboard["my_rank"] = lab_leaderboard.get_rank(db, lab_id, current_user.id)
+    return leaderboard
+
+
+@router.get("/labs/{lab_id}/leaderboard/me", response_model=LeaderboardEntry)
+async def get_my_lab_rank(
+    lab_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the current user's leaderboard entry for a lab"""
+    entry = lab_leaderboard.get_rank(db, lab_id, current_user.id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="No progress recorded for this lab")
+    return entry
 
 
 # ==================== Student Assignment Management ====================
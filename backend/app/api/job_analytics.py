@@ -9,9 +9,8 @@ from app.core.database import get_db
 from app.models.job import Job, JobApplication
 from app.models.job_round import JobRound, JobApplicationRound
 from app.models.user import User, UserRole, RoleEnum
-from app.models.profile import Profile
-from app.models.academic import Department
 from app.api.auth import get_current_user, get_current_admin
+from app.services.job_analytics import empty_job_analytics, job_analytics_cache
 
 router = APIRouter(prefix="/jobs", tags=["job-analytics"])
 
@@ -27,7 +26,11 @@ async def get_job_analytics(
     current_user: User = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
-    """Get comprehensive job analytics (College Admin and HOD only)"""
+    """Get comprehensive job analytics (College Admin and HOD only)
+    
+    Aggregated with GROUP BY queries and cached per (college, job); see
+    app.services.job_analytics.
+    """
     try:
         user_roles = db.query(UserRole).filter(UserRole.user_id == current_user.id).all()
         role_names = [role.role for role in user_roles]
@@ -42,178 +45,13 @@ async def get_job_analytics(
                 if admin_role and admin_role.college_id:
                     college_id = admin_role.college_id
         
-        # Build query
-        query = db.query(Job).filter(Job.is_active == True)
-        
-        if college_id:
-            query = query.filter(Job.college_id == college_id)
-        
-        if job_id:
-            query = query.filter(Job.id == job_id)
-        
-        jobs = query.all()
+        return job_analytics_cache.get(db, college_id, job_id)
     except Exception as e:
         # Return empty structure on any error
         import logging
         logger = logging.getLogger(__name__)
         logger.error(f"Error in get_job_analytics: {str(e)}", exc_info=True)
-        return {
-            "total_jobs": 0,
-            "total_applications": 0,
-            "selected_count": 0,
-            "overall_selection_rate": 0,
-            "jobs": [],
-            "round_wise_stats": [],
-            "year_wise_stats": [],
-            "branch_wise_stats": []
-        }
-    
-    if not jobs:
-        return {
-            "total_jobs": 0,
-            "total_applications": 0,
-            "selected_count": 0,
-            "overall_selection_rate": 0,
-            "jobs": [],
-            "round_wise_stats": [],
-            "year_wise_stats": [],
-            "branch_wise_stats": []
-        }
-    
-    # Get all job IDs
-    job_ids = [job.id for job in jobs]
-    
-    # Total applications
-    total_applications = db.query(JobApplication).filter(
-        JobApplication.job_id.in_(job_ids)
-    ).count()
-    
-    # Round-wise statistics
-    round_stats = []
-    for job in jobs:
-        rounds = db.query(JobRound).filter(
-            JobRound.job_id == job.id,
-            JobRound.is_active == True
-        ).order_by(JobRound.order).all()
-        
-        for round_obj in rounds:
-            round_statuses = db.query(JobApplicationRound).filter(
-                JobApplicationRound.round_id == round_obj.id
-            ).all()
-            
-            qualified = sum(1 for s in round_statuses if s.status == "QUALIFIED")
-            rejected = sum(1 for s in round_statuses if s.status == "REJECTED")
-            absent = sum(1 for s in round_statuses if s.status == "ABSENT")
-            pending = sum(1 for s in round_statuses if s.status == "PENDING")
-            total = len(round_statuses)
-            
-            pass_rate = (qualified / total * 100) if total > 0 else 0
-            
-            round_stats.append({
-                "job_id": job.id,
-                "job_title": f"{job.company} - {job.role}",
-                "round_id": round_obj.id,
-                "round_name": round_obj.name,
-                "round_order": round_obj.order,
-                "total_students": total,
-                "qualified": qualified,
-                "rejected": rejected,
-                "absent": absent,
-                "pending": pending,
-                "pass_rate": round(pass_rate, 2)
-            })
-    
-    # Year-wise statistics
-    year_stats = []
-    applications = db.query(JobApplication).filter(
-        JobApplication.job_id.in_(job_ids)
-    ).all()
-    
-    year_counts = {}
-    for app in applications:
-        profile = db.query(Profile).filter(Profile.user_id == app.user_id).first()
-        if profile and profile.present_year:
-            year = profile.present_year
-            if year not in year_counts:
-                year_counts[year] = {"total": 0, "selected": 0}
-            year_counts[year]["total"] += 1
-            if app.status == "Selected":
-                year_counts[year]["selected"] += 1
-    
-    for year, counts in year_counts.items():
-        selection_rate = (counts["selected"] / counts["total"] * 100) if counts["total"] > 0 else 0
-        year_stats.append({
-            "year": year,
-            "total_applications": counts["total"],
-            "selected": counts["selected"],
-            "selection_rate": round(selection_rate, 2)
-        })
-    
-    # Branch-wise statistics
-    branch_stats = []
-    branch_counts = {}
-    for app in applications:
-        profile = db.query(Profile).filter(Profile.user_id == app.user_id).first()
-        if profile:
-            dept_name = profile.department
-            dept_code = None
-            if profile.department_id:
-                dept = db.query(Department).filter(Department.id == profile.department_id).first()
-                if dept:
-                    dept_code = dept.code
-                    dept_name = dept.name
-            
-            branch_key = dept_code or dept_name or "Unknown"
-            if branch_key not in branch_counts:
-                branch_counts[branch_key] = {"total": 0, "selected": 0}
-            branch_counts[branch_key]["total"] += 1
-            if app.status == "Selected":
-                branch_counts[branch_key]["selected"] += 1
-    
-    for branch, counts in branch_counts.items():
-        selection_rate = (counts["selected"] / counts["total"] * 100) if counts["total"] > 0 else 0
-        branch_stats.append({
-            "branch": branch,
-            "total_applications": counts["total"],
-            "selected": counts["selected"],
-            "selection_rate": round(selection_rate, 2)
-        })
-    
-    # Overall selection rate
-    selected_count = db.query(JobApplication).filter(
-        JobApplication.job_id.in_(job_ids),
-        JobApplication.status == "Selected"
-    ).count()
-    
-    overall_selection_rate = (selected_count / total_applications * 100) if total_applications > 0 else 0
-    
-    # Job-wise summary
-    job_summaries = []
-    for job in jobs:
-        job_apps = db.query(JobApplication).filter(JobApplication.job_id == job.id).all()
-        job_selected = sum(1 for app in job_apps if app.status == "Selected")
-        job_selection_rate = (job_selected / len(job_apps) * 100) if job_apps else 0
-        
-        job_summaries.append({
-            "job_id": job.id,
-            "company": job.company,
-            "role": job.role,
-            "total_applications": len(job_apps),
-            "selected": job_selected,
-            "selection_rate": round(job_selection_rate, 2),
-            "company_logo": job.company_logo
-        })
-    
-    return {
-        "total_jobs": len(jobs),
-        "total_applications": total_applications,
-        "selected_count": selected_count,
-        "overall_selection_rate": round(overall_selection_rate, 2),
-        "jobs": job_summaries,
-        "round_wise_stats": round_stats,
-        "year_wise_stats": year_stats,
-        "branch_wise_stats": branch_stats
-    }
+        return empty_job_analytics()
 
 
 @router.get("/student-status")
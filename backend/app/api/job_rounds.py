@@ -18,6 +18,7 @@ from app.schemas.job_round import (
     BulkRoundUpdateRequest
 )
 from app.api.auth import get_current_user, get_current_admin
+from app.services.round_results import ingest_round_results, promote_round_students
 
 router = APIRouter(prefix="/job-rounds", tags=["job-rounds"])
 
@@ -353,7 +354,11 @@ async def bulk_upload_round_results(
     current_user: User = Depends(get_current_admin),
     db: Session = Depends(get_db)
 ):
-    """Bulk upload round results from Excel/CSV (College Admin only)"""
+    """Bulk upload round results from Excel/CSV (College Admin only)
+    
+    The sheet is applied set-based (see app.services.round_results): one
+    lookup query per kind of record and bulk writes, in one transaction.
+    """
     round_obj = db.query(JobRound).filter(JobRound.id == round_id).first()
     if not round_obj:
         raise HTTPException(
@@ -409,233 +414,8 @@ async def bulk_upload_round_results(
             if row_dict:
                 data.append(row_dict)
     
-    # Validate and process data
-    results = {
-        "success": [],
-        "failed": [],
-        "total": len(data)
-    }
-    
-    # Get all rounds for this job to determine next round
-    all_rounds = db.query(JobRound).filter(
-        JobRound.job_id == job.id,
-        JobRound.is_active == True
-    ).order_by(JobRound.order).all()
-    
-    current_round_index = next((i for i, r in enumerate(all_rounds) if r.id == round_id), -1)
-    next_round = all_rounds[current_round_index + 1] if current_round_index >= 0 and current_round_index + 1 < len(all_rounds) else None
-    
-    for idx, row in enumerate(data, start=2):  # Start at 2 (row 1 is header)
-        try:
-            # Normalize keys
-            normalized_row = {k.lower().strip(): v for k, v in row.items()}
-            
-            # Validate Round ID if provided (for consistency check)
-            round_id_str = normalized_row.get('round_id', '').strip()
-            if round_id_str:
-                try:
-                    provided_round_id = int(round_id_str)
-                    if provided_round_id != round_id:
-                        results["failed"].append({
-                            "row": idx,
-                            "error": f"Round ID mismatch: Template has Round ID {provided_round_id}, but uploading to Round ID {round_id}. Please use the correct template for this round.",
-                            "data": row
-                        })
-                        continue
-                except ValueError:
-                    # Round ID is optional, so invalid format is not critical
-                    pass
-            
-            # Extract required fields - Roll Number is the primary identifier
-            roll_number = normalized_row.get('roll_number', '').strip()
-            if not roll_number:
-                # Try legacy 'student_id' for backward compatibility
-                roll_number = normalized_row.get('student_id', '').strip()
-                if not roll_number:
-                    results["failed"].append({
-                        "row": idx,
-                        "error": "Missing roll_number (required - this is the primary identifier for tracking)",
-                        "data": row
-                    })
-                    continue
-            
-            # Find student by roll number
-            profile = db.query(Profile).filter(Profile.roll_number == roll_number).first()
-            if not profile:
-                results["failed"].append({
-                    "row": idx,
-                    "error": f"Student not found with roll number: {roll_number}",
-                    "data": row
-                })
-                continue
-            
-            student_id = profile.user_id
-            
-            status_value = normalized_row.get('status', '').strip().upper()
-            if status_value not in ['QUALIFIED', 'REJECTED', 'ABSENT']:
-                results["failed"].append({
-                    "row": idx,
-                    "error": f"Invalid status: {status_value}. Must be QUALIFIED, REJECTED, or ABSENT",
-                    "data": row
-                })
-                continue
-            
-            remarks = normalized_row.get('remarks', '').strip() or None
-            
-            # Get or create application (for external applications, create if doesn't exist)
-            application = db.query(JobApplication).filter(
-                JobApplication.job_id == job.id,
-                JobApplication.user_id == student_id
-            ).first()
-            
-            if not application:
-                # Auto-create application for students who applied externally
-                # This allows tracking progress even if they didn't apply through the system
-                application = JobApplication(
-                    job_id=job.id,
-                    user_id=student_id,
-                    status="Applied",
-                    notes="Application created automatically - student applied externally"
-                )
-                db.add(application)
-                db.flush()  # Flush to get the application ID
-            
-            # Verify student eligibility (year/branch)
-            profile = db.query(Profile).filter(Profile.user_id == student_id).first()
-            if profile:
-                # Check year eligibility
-                if job.eligible_years:
-                    user_year = profile.present_year
-                    if user_year:
-                        from app.core.year_utils import parse_year, format_year
-                        user_year_normalized = parse_year(user_year)
-                        user_year_formatted = format_year(user_year_normalized) if user_year_normalized else None
-                        eligible_years_list = job.eligible_years if isinstance(job.eligible_years, list) else [job.eligible_years]
-                        
-                        year_match = False
-                        for eligible_year in eligible_years_list:
-                            if eligible_year is None:
-                                continue
-                            eligible_year_normalized = parse_year(str(eligible_year))
-                            if user_year_normalized and eligible_year_normalized and user_year_normalized == eligible_year_normalized:
-                                year_match = True
-                                break
-                            if str(user_year).upper().strip() == str(eligible_year).upper().strip():
-                                year_match = True
-                                break
-                        
-                        if not year_match:
-                            results["failed"].append({
-                                "row": idx,
-                                "error": f"Student {student_id} is not eligible for this job (year mismatch)",
-                                "data": row
-                            })
-                            continue
-                
-                # Check branch eligibility
-                if job.eligibility_type == "branch" and job.eligible_branches:
-                    user_dept_name = profile.department
-                    user_dept_code = None
-                    if profile.department_id:
-                        from app.models.academic import Department
-                        dept = db.query(Department).filter(Department.id == profile.department_id).first()
-                        if dept:
-                            user_dept_code = dept.code
-                    
-                    eligible_branches_list = job.eligible_branches if isinstance(job.eligible_branches, list) else [job.eligible_branches]
-                    branch_match = False
-                    
-                    for branch in eligible_branches_list:
-                        if branch is None:
-                            continue
-                        branch_normalized = str(branch).upper().strip()
-                        if user_dept_name and user_dept_name.upper().strip() == branch_normalized:
-                            branch_match = True
-                            break
-                        if user_dept_code and user_dept_code.upper().strip() == branch_normalized:
-                            branch_match = True
-                            break
-                    
-                    if not branch_match:
-                        results["failed"].append({
-                            "row": idx,
-                            "error": f"Student {student_id} is not eligible for this job (branch mismatch)",
-                            "data": row
-                        })
-                        continue
-            
-            # Check if student was in previous round (if not first round)
-            if current_round_index > 0:
-                prev_round = all_rounds[current_round_index - 1]
-                prev_round_status = db.query(JobApplicationRound).filter(
-                    JobApplicationRound.job_application_id == application.id,
-                    JobApplicationRound.round_id == prev_round.id
-                ).first()
-                
-                if not prev_round_status or prev_round_status.status != "QUALIFIED":
-                    results["failed"].append({
-                        "row": idx,
-                        "error": f"Student {student_id} did not qualify in previous round",
-                        "data": row
-                    })
-                    continue
-            
-            # Create or update round status
-            round_status = db.query(JobApplicationRound).filter(
-                JobApplicationRound.job_application_id == application.id,
-                JobApplicationRound.round_id == round_id
-            ).first()
-            
-            if round_status:
-                round_status.status = status_value
-                round_status.remarks = remarks
-                round_status.updated_by = current_user.id
-                round_status.updated_at = datetime.utcnow()
-            else:
-                round_status = JobApplicationRound(
-                    job_application_id=application.id,
-                    round_id=round_id,
-                    status=status_value,
-                    remarks=remarks,
-                    updated_by=current_user.id
-                )
-                db.add(round_status)
-            
-            # If qualified and there's a next round, auto-create entry for next round
-            if status_value == "QUALIFIED" and next_round:
-                next_round_status = db.query(JobApplicationRound).filter(
-                    JobApplicationRound.job_application_id == application.id,
-                    JobApplicationRound.round_id == next_round.id
-                ).first()
-                
-                if not next_round_status:
-                    next_round_status = JobApplicationRound(
-                        job_application_id=application.id,
-                        round_id=next_round.id,
-                        status="PENDING",
-                        updated_by=current_user.id
-                    )
-                    db.add(next_round_status)
-            
-            # Update application status
-            if status_value == "QUALIFIED" and next_round:
-                application.current_round = next_round.name
-            elif status_value in ["REJECTED", "ABSENT"]:
-                application.status = "Rejected"
-                application.current_round = round_obj.name
-            
-            results["success"].append({
-                "row": idx,
-                "student_id": student_id,
-                "status": status_value
-            })
-            
-        except Exception as e:
-            results["failed"].append({
-                "row": idx,
-                "error": str(e),
-                "data": row
-            })
+    # Validate and apply all rows with prefetched lookups and bulk writes
+    results = ingest_round_results(db, job, round_obj, data, current_user.id)
     
     db.commit()
     
@@ -969,22 +749,19 @@ async def bulk_promote_students(
             detail="No next round found. This is the final round."
         )
     
-    # Get students in current round (any status - no qualification required)
-    query = db.query(JobApplicationRound).filter(
-        JobApplicationRound.round_id == round_id
-    )
+    # Students in current round (any status - no qualification required)
+    application_ids = None
     
     # If specific student IDs provided, filter by them
     if student_ids and len(student_ids) > 0:
         # Get applications for these student IDs
-        applications = db.query(JobApplication).filter(
-            JobApplication.job_id == job.id,
-            JobApplication.user_id.in_(student_ids)
-        ).all()
-        application_ids = [app.id for app in applications]
-        if application_ids:
-            query = query.filter(JobApplicationRound.job_application_id.in_(application_ids))
-        else:
+        application_ids = [
+            application_id for (application_id,) in db.query(JobApplication.id).filter(
+                JobApplication.job_id == job.id,
+                JobApplication.user_id.in_(student_ids)
+            )
+        ]
+        if not application_ids:
             # No applications found for these student IDs
             return {
                 "message": "No students found for the selected student IDs",
@@ -992,41 +769,9 @@ async def bulk_promote_students(
                 "already_promoted": 0
             }
     
-    round_statuses = query.all()
-    
-    promoted_count = 0
-    already_promoted = 0
-    
-    for round_status in round_statuses:
-        # Check if already in next round
-        next_round_status = db.query(JobApplicationRound).filter(
-            JobApplicationRound.job_application_id == round_status.job_application_id,
-            JobApplicationRound.round_id == next_round.id
-        ).first()
-        
-        if not next_round_status:
-            # Create entry in next round
-            next_round_status = JobApplicationRound(
-                job_application_id=round_status.job_application_id,
-                round_id=next_round.id,
-                status="PENDING",
-                updated_by=current_user.id
-            )
-            db.add(next_round_status)
-            promoted_count += 1
-            
-            # Update application current_round and status
-            application = db.query(JobApplication).filter(
-                JobApplication.id == round_status.job_application_id
-            ).first()
-            if application:
-                application.current_round = next_round.name
-                
-                # If promoted to "Selected" round, mark as job cracked
-                if next_round.name.lower() == "selected":
-                    application.status = "Selected"
-        else:
-            already_promoted += 1
+    promoted_count, already_promoted = promote_round_students(
+        db, round_id, next_round, current_user.id, application_ids=application_ids
+    )
     
     db.commit()
     
@@ -1,5 +1,6 @@
 """Job/Placement API endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Body
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import datetime
@@ -7,7 +8,7 @@ import csv
 import io
 from openpyxl import load_workbook
 from pydantic import BaseModel
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.config import get_settings
 from app.models.job import Job, JobApplication
 from app.models.user import User, UserRole, RoleEnum
@@ -16,7 +17,8 @@ from app.schemas.job import (
     JobCreate, JobUpdate, JobResponse,
     JobApplicationCreate, JobApplicationUpdate, JobApplicationResponse
 )
-from app.api.auth import get_current_user, get_optional_user
+from app.api.auth import get_current_user, get_optional_user, get_optional_user_async
+from app.services.search import apply_search
 
 settings = get_settings()
 
@@ -149,10 +151,24 @@ async def list_jobs(
     is_active: Optional[bool] = None,
     job_type: Optional[str] = None,
     search: Optional[str] = None,
-    current_user: Optional[User] = Depends(get_optional_user),
-    db: Session = Depends(get_db)
+    current_user: Optional[User] = Depends(get_optional_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """List jobs - All jobs are global (available to all registered students)"""
+    # The eligibility rules run on a sync Session over the async connection (run_sync),
+    # so their queries wait on the event loop instead of blocking it
+    return await db.run_sync(_list_jobs, skip, limit, is_active, job_type, search, current_user)
+
+
+def _list_jobs(
+    db: Session,
+    skip: int,
+    limit: int,
+    is_active: Optional[bool],
+    job_type: Optional[str],
+    search: Optional[str],
+    current_user: Optional[User]
+) -> List[Job]:
     query = db.query(Job)
     
     # Filter by active status
@@ -163,16 +179,9 @@ async def list_jobs(
     if job_type:
         query = query.filter(Job.job_type == job_type)
     
-    # Search filter (title, company, role)
+    # Full-text search (title, company, role), best matches first
     if search:
-        search_term = f"%{search.lower()}%"
-        query = query.filter(
-            db.or_(
-                Job.title.ilike(search_term),
-                Job.company.ilike(search_term),
-                Job.role.ilike(search_term)
-            )
-        )
+        query = apply_search(query, Job, "jobs", search, db)
     
     # IMPORTANT: All jobs are accessible to all students by default
     # Filter by eligibility criteria only (not by college_id)
@@ -323,8 +332,9 @@ async def list_jobs(
                 if is_eligible:
                     eligible_jobs.append(job)
             
-            # Return only eligible jobs for students (sorted by posted_date)
-            eligible_jobs.sort(key=lambda j: j.posted_date if j.posted_date else j.id, reverse=True)
+            # Return only eligible jobs for students (sorted by posted_date, or by relevance when searching)
+            if not search:
+                eligible_jobs.sort(key=lambda j: j.posted_date if j.posted_date else j.id, reverse=True)
             return eligible_jobs[skip:skip+limit]
     
     # For non-logged-in users, return all active jobs
@@ -219,9 +219,20 @@ async def create_mock_interview(
             if interviewer_profile and interviewer_profile.full_name:
                 interviewer_name = interviewer_profile.full_name
     
-    # Send email invitations
+    # Create response with students
+    response_dict = {
+        **new_interview.__dict__,
+        'students': students_info,
+        'student_ids': student_ids
+    }
+    
+    from app.schemas.mock_interview import MockInterviewResponse
+    response = MockInterviewResponse(**response_dict)
+    
+    # Queue email invitations; the background sender delivers them after the commit
     try:
         email_results = send_interview_invitations(
+            db,
             student_emails=student_emails,
             student_names=student_names,
             interviewer_email=interviewer_email,
@@ -234,20 +245,14 @@ async def create_mock_interview(
             venue=interview_data.venue,
             description=interview_data.description
         )
-        logger.info(f"Email sending results: {email_results}")
+        db.commit()
+        logger.info(f"Email queueing results: {email_results}")
     except Exception as e:
-        logger.error(f"Failed to send interview invitation emails: {str(e)}")
+        db.rollback()
+        logger.error(f"Failed to queue interview invitation emails: {str(e)}")
         # Don't fail the interview creation if email fails
     
-    # Create response with students
-    response_dict = {
-        **new_interview.__dict__,
-        'students': students_info,
-        'student_ids': student_ids
-    }
-    
-    from app.schemas.mock_interview import MockInterviewResponse
-    return MockInterviewResponse(**response_dict)
+    return response
 
 
 @router.get("/my", response_model=List[MockInterviewResponse])
@@ -1,9 +1,10 @@
 """Notification API endpoints"""
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, select
 from typing import List, Optional
-from app.core.database import get_db
+from app.core.database import get_async_db, get_db
 from app.models.notification import Notification
 from app.models.user_notification import UserNotification
 from app.models.user import User, UserRole, RoleEnum
@@ -11,7 +12,7 @@ from app.models.profile import Profile
 from app.schemas.notification import (
     NotificationCreate, NotificationResponse, NotificationListResponse, UserNotificationResponse
 )
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user, get_current_user_async
 from datetime import datetime
 import logging
 
@@ -260,29 +261,36 @@ async def get_my_notifications(
     is_read: Optional[bool] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get current user's notifications"""
-    query = db.query(UserNotification).filter(
+    query = select(UserNotification).where(
         UserNotification.user_id == current_user.id
     )
     
     if is_read is not None:
-        query = query.filter(UserNotification.is_read == is_read)
+        query = query.where(UserNotification.is_read == is_read)
     
-    user_notifications = query.order_by(
+    user_notifications = (await db.execute(query.order_by(
         UserNotification.created_at.desc()
-    ).offset(skip).limit(limit).all()
+    ).offset(skip).limit(limit))).scalars().all()
+    
+    # Load notification details (one query for the page)
+    notification_ids = {user_notif.notification_id for user_notif in user_notifications}
+    notifications = {}
+    if notification_ids:
+        notifications = {
+            notification.id: notification
+            for notification in (await db.execute(select(Notification).where(
+                Notification.id.in_(notification_ids),
+                Notification.is_active == True
+            ))).scalars()
+        }
     
-    # Load notification details
     result = []
     for user_notif in user_notifications:
-        notification = db.query(Notification).filter(
-            Notification.id == user_notif.notification_id,
-            Notification.is_active == True
-        ).first()
-        
+        notification = notifications.get(user_notif.notification_id)
         if notification:
             result.append({
                 "id": user_notif.id,
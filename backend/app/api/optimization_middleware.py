@@ -1,34 +1,72 @@
 """Optimization middleware for API performance"""
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
 import time
+import uuid
 import logging
 
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import http_request_duration_seconds, http_requests_in_progress, http_requests_total
+from app.core import query_tracking
+
 logger = logging.getLogger(__name__)
 
+SLOW_REQUEST_SECONDS = 2.0
+UNMATCHED_ROUTE = "<unmatched>"  # 404s and mounted apps; raw paths would explode label cardinality
+
+
+class PerformanceMiddleware:
+    """Record request metrics, log slow requests and add performance headers
+
+    A plain ASGI middleware (BaseHTTPMiddleware alone costs more than the
+    metrics budget). Latency is labelled by route template, read from the
+    route FastAPI stores in the scope once it has matched the request.
+    With query tracking on, the request's SQL count and time are added too.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        method = scope["method"]
+        request_id = uuid.uuid4().hex
+        status_code = 500
+        query_stats, query_token = query_tracking.begin_request()
+
+        async def send_with_headers(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add performance headers
+                headers = MutableHeaders(scope=message)
+                headers["X-Response-Time"] = f"{time.perf_counter() - start_time:.3f}s"
+                headers["X-Request-ID"] = request_id
+                if query_stats is not None:
+                    headers["X-DB-Query-Count"] = str(query_stats.count)
+                    headers["X-DB-Query-Time"] = f"{query_stats.duration * 1000:.1f}ms"
+            await send(message)
 
-class PerformanceMiddleware(BaseHTTPMiddleware):
-    """Middleware to log slow requests and add performance headers"""
-    
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Calculate duration
-        duration = time.time() - start_time
-        
-        # Log slow requests
-        if duration > 2.0:  # Log requests taking more than 2 seconds
-            logger.warning(
-                f"Slow request: {request.method} {request.url.path} "
-                f"took {duration:.2f}s"
-            )
-        
-        # Add performance headers
-        response.headers["X-Response-Time"] = f"{duration:.3f}s"
-        response.headers["X-Request-ID"] = str(id(request))
-        
-        return response
+        http_requests_in_progress.inc(method)
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            duration = time.perf_counter() - start_time
+            http_requests_in_progress.dec(method)
+            route = scope.get("route")
+            template = getattr(route, "path", None) or UNMATCHED_ROUTE
+            http_request_duration_seconds.observe(duration, method, template)
+            http_requests_total.inc(method, template, str(status_code))
+            if query_stats is not None:
+                query_tracking.end_request(query_stats, query_token, method, template)
 
+            # Log slow requests
+            if duration > SLOW_REQUEST_SECONDS:
+                logger.warning(
+                    f"Slow request: {method} {scope['path']} ({template}) "
+                    f"took {duration:.2f}s [request {request_id}]"
+                )
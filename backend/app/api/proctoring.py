@@ -10,12 +10,24 @@ from app.api.auth import get_current_user, get_current_faculty, get_current_admi
 from app.models.user import User
 from app.models.proctoring import ProctoringViolation, ProctoringSession, ViolationType, ViolationSeverity
 from app.models.coding_lab import CodingLab
-from pydantic import BaseModel
+from app.services.proctoring_summary import violation_summary_cache
+from pydantic import BaseModel, Field
 from typing import Dict, Any
+from collections import Counter
+
+MAX_VIOLATION_BATCH = 500
+
+# Session counter column for each violation type (others only count towards total_violations)
+SESSION_COUNTER_COLUMNS = {
+    ViolationType.TAB_SWITCH: ProctoringSession.tab_switches,
+    ViolationType.FULLSCREEN_EXIT: ProctoringSession.fullscreen_exits,
+    ViolationType.WINDOW_BLUR: ProctoringSession.window_blurs,
+    ViolationType.COPY_PASTE: ProctoringSession.copy_paste_events,
+    ViolationType.DEVTOOLS: ProctoringSession.devtools_opens,
+}
 
 # Inline schemas
-class ViolationCreate(BaseModel):
-    lab_id: int
+class ViolationEvent(BaseModel):
     violation_type: str
     severity: str = "low"
     details: Optional[Dict[str, Any]] = None
@@ -25,6 +37,18 @@ class ViolationCreate(BaseModel):
     submission_id: Optional[int] = None
     timestamp: Optional[datetime] = None
 
+class ViolationCreate(ViolationEvent):
+    lab_id: int
+
+class ViolationBatchCreate(BaseModel):
+    lab_id: int
+    violations: List[ViolationEvent] = Field(..., min_length=1, max_length=MAX_VIOLATION_BATCH)
+
+class ViolationBatchResponse(BaseModel):
+    session_id: int
+    recorded: int
+    total_violations: int
+
 class ViolationResponse(BaseModel):
     id: int
     lab_id: int
@@ -108,96 +132,150 @@ async def create_proctoring_session(
     db.add(session)
     db.commit()
     db.refresh(session)
+    violation_summary_cache.record_session(session.lab_id, started=True)
     
     return SessionResponse.model_validate(session)
 
 
-@router.post("/violations", response_model=ViolationResponse, status_code=status.HTTP_201_CREATED)
-async def record_violation(
-    violation_data: ViolationCreate,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
-):
-    """Record a proctoring violation"""
+def _ingest_violations(
+    db: Session,
+    lab_id: int,
+    user_id: int,
+    events: List[ViolationEvent]
+) -> tuple:
+    """Store a batch of violations and bump the session counters in place
+
+    Counters are incremented with a single UPDATE (col = col + n) on the
+    locked session row and the JSON summary is merged with this batch's
+    counts, so the cost of an event does not depend on how many came
+    before it. Returns (session, violations).
+    """
     # Verify lab exists and is proctored
-    lab = db.query(CodingLab).filter(CodingLab.id == violation_data.lab_id).first()
+    lab = db.query(CodingLab).filter(CodingLab.id == lab_id).first()
     if not lab:
         raise HTTPException(status_code=404, detail="Lab not found")
     
     if not lab.is_proctored:
         raise HTTPException(status_code=400, detail="Lab is not proctored")
     
+    try:
+        parsed = [
+            (ViolationType(event.violation_type), ViolationSeverity(event.severity), event)
+            for event in events
+        ]
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid violation: {e}")
+    
+    now = datetime.utcnow()
+    
     # Get or create active session
     session = db.query(ProctoringSession).filter(
-        ProctoringSession.lab_id == violation_data.lab_id,
-        ProctoringSession.user_id == current_user.id,
+        ProctoringSession.lab_id == lab_id,
+        ProctoringSession.user_id == user_id,
         ProctoringSession.is_active == True
-    ).first()
+    ).with_for_update().first()
     
-    if not session:
+    new_session = session is None
+    if new_session:
         # Create session if doesn't exist
         session = ProctoringSession(
-            lab_id=violation_data.lab_id,
-            user_id=current_user.id,
-            started_at=datetime.utcnow(),
+            lab_id=lab_id,
+            user_id=user_id,
+            started_at=now,
             is_active=True,
-            last_activity=datetime.utcnow()
+            last_activity=now,
+            total_violations=0,
+            violation_summary={'by_type': {}, 'by_severity': {}}
         )
         db.add(session)
         db.flush()
     
-    # Create violation record
-    violation = ProctoringViolation(
-        lab_id=violation_data.lab_id,
-        user_id=current_user.id,
-        session_id=session.id,
-        submission_id=violation_data.submission_id,
-        violation_type=ViolationType(violation_data.violation_type),
-        severity=ViolationSeverity(violation_data.severity),
-        details=violation_data.details,
-        description=violation_data.description,
-        time_spent_seconds=violation_data.time_spent_seconds,
-        problem_id=violation_data.problem_id,
-        timestamp=violation_data.timestamp or datetime.utcnow()
-    )
-    
-    db.add(violation)
+    violations = [
+        ProctoringViolation(
+            lab_id=lab_id,
+            user_id=user_id,
+            session_id=session.id,
+            submission_id=event.submission_id,
+            violation_type=violation_type,
+            severity=severity,
+            details=event.details,
+            description=event.description,
+            time_spent_seconds=event.time_spent_seconds,
+            problem_id=event.problem_id,
+            timestamp=event.timestamp or now
+        )
+        for violation_type, severity, event in parsed
+    ]
+    db.add_all(violations)
+    
+    type_counts = Counter(violation_type for violation_type, _, _ in parsed)
+    severity_counts = Counter(severity.value for _, severity, _ in parsed)
+    by_type = {violation_type.value: count for violation_type, count in type_counts.items()}
+    
+    # Merge this batch into the stored summary (row is locked above)
+    summary = session.violation_summary or {}
+    merged = {
+        'by_type': dict(summary.get('by_type') or {}),
+        'by_severity': dict(summary.get('by_severity') or {}),
+    }
+    for key, count in by_type.items():
+        merged['by_type'][key] = merged['by_type'].get(key, 0) + count
+    for key, count in severity_counts.items():
+        merged['by_severity'][key] = merged['by_severity'].get(key, 0) + count
     
     # Update session violation counts
-    session.total_violations += 1
-    if violation.violation_type == ViolationType.TAB_SWITCH:
-        session.tab_switches += 1
-    elif violation.violation_type == ViolationType.FULLSCREEN_EXIT:
-        session.fullscreen_exits += 1
-    elif violation.violation_type == ViolationType.WINDOW_BLUR:
-        session.window_blurs += 1
-    elif violation.violation_type == ViolationType.COPY_PASTE:
-        session.copy_paste_events += 1
-    elif violation.violation_type == ViolationType.DEVTOOLS:
-        session.devtools_opens += 1
-    
-    # Update violation summary
-    violations = db.query(ProctoringViolation).filter(
-        ProctoringViolation.session_id == session.id
-    ).all()
-    
-    summary = {
-        'by_type': {},
-        'by_severity': {}
+    values = {
+        ProctoringSession.total_violations: ProctoringSession.total_violations + len(parsed),
+        ProctoringSession.violation_summary: merged,
+        ProctoringSession.last_activity: now,
     }
-    for v in violations:
-        summary['by_type'][v.violation_type.value] = summary['by_type'].get(v.violation_type.value, 0) + 1
-        summary['by_severity'][v.severity.value] = summary['by_severity'].get(v.severity.value, 0) + 1
-    
-    session.violation_summary = summary
-    session.last_activity = datetime.utcnow()
+    for violation_type, count in type_counts.items():
+        column = SESSION_COUNTER_COLUMNS.get(violation_type)
+        if column is not None:
+            values[column] = column + count
+    db.query(ProctoringSession).filter(
+        ProctoringSession.id == session.id
+    ).update(values, synchronize_session=False)
     
     db.commit()
+    
+    violation_summary_cache.record_violations(
+        lab_id, user_id, by_type, dict(severity_counts), new_session=new_session
+    )
+    return session, violations
+
+
+@router.post("/violations", response_model=ViolationResponse, status_code=status.HTTP_201_CREATED)
+async def record_violation(
+    violation_data: ViolationCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Record a proctoring violation"""
+    _, violations = _ingest_violations(db, violation_data.lab_id, current_user.id, [violation_data])
+    violation = violations[0]
     db.refresh(violation)
     
     return ViolationResponse.model_validate(violation)
 
 
+@router.post("/violations/batch", response_model=ViolationBatchResponse, status_code=status.HTTP_201_CREATED)
+async def record_violations_batch(
+    batch: ViolationBatchCreate,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Record a buffer of proctoring violations in one request"""
+    session, violations = _ingest_violations(db, batch.lab_id, current_user.id, batch.violations)
+    db.refresh(session)
+    
+    return ViolationBatchResponse(
+        session_id=session.id,
+        recorded=len(violations),
+        total_violations=session.total_violations
+    )
+
+
 @router.get("/sessions/{lab_id}", response_model=List[SessionResponse])
 async def get_lab_sessions(
     lab_id: int,
@@ -256,39 +334,7 @@ async def get_violation_summary(
     db: Session = Depends(get_db)
 ):
     """Get violation summary for a lab"""
-    violations = db.query(ProctoringViolation).filter(
-        ProctoringViolation.lab_id == lab_id
-    ).all()
-    
-    sessions = db.query(ProctoringSession).filter(
-        ProctoringSession.lab_id == lab_id
-    ).all()
-    
-    summary = {
-        'total_violations': len(violations),
-        'total_sessions': len(sessions),
-        'active_sessions': len([s for s in sessions if s.is_active]),
-        'by_type': {},
-        'by_severity': {},
-        'by_user': {}
-    }
-    
-    for violation in violations:
-        # By type
-        v_type = violation.violation_type.value
-        summary['by_type'][v_type] = summary['by_type'].get(v_type, 0) + 1
-        
-        # By severity
-        v_severity = violation.severity.value
-        summary['by_severity'][v_severity] = summary['by_severity'].get(v_severity, 0) + 1
-        
-        # By user
-        user_id = violation.user_id
-        if user_id not in summary['by_user']:
-            summary['by_user'][user_id] = 0
-        summary['by_user'][user_id] += 1
-    
-    return ViolationSummaryResponse(**summary)
+    return ViolationSummaryResponse(**violation_summary_cache.get(db, lab_id))
 
 
 @router.put("/sessions/{session_id}/end", response_model=SessionResponse)
@@ -306,6 +352,7 @@ async def end_proctoring_session(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
     
+    was_active = session.is_active
     session.ended_at = datetime.utcnow()
     session.is_active = False
     
@@ -315,6 +362,8 @@ async def end_proctoring_session(
     
     db.commit()
     db.refresh(session)
+    if was_active:
+        violation_summary_cache.record_session(session.lab_id, started=False)
     
     return SessionResponse.model_validate(session)
 
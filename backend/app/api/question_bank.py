@@ -11,6 +11,7 @@ from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.question_bank import QuestionBank
 from app.models.profile import Profile
+from app.services.search import apply_search
 from app.schemas.question_bank import (
     QuestionBankCreate,
     QuestionBankUpdate,
@@ -224,12 +225,17 @@ async def list_questions(
     college_id: Optional[int] = None,
     department_id: Optional[int] = None,
     is_active: Optional[bool] = True,
+    search: Optional[str] = Query(None, description="Search question text, topic and subject"),
     current_user: Optional[User] = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """List questions from question bank with filters"""
     query = db.query(QuestionBank)
     
+    # Full-text search, best matches first
+    if search:
+        query = apply_search(query, QuestionBank, "question_banks", search, db)
+    
     # Apply filters
     if question_type:
         query = query.filter(QuestionBank.question_type == question_type)
@@ -4,21 +4,28 @@ Provides analytics and reporting for quizzes
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, case
 from typing import List, Optional, Dict, Any
-from app.core.database import get_db
+from app.core.database import get_db, use_reporting_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.models.quiz import Quiz, QuizAttempt
 from app.models.profile import Profile
 from app.models.academic import Department, Section
+from app.services.quiz_export import (
+    CSV_MEDIA_TYPE, XLSX_MEDIA_TYPE, export_filename, get_passing_marks,
+    iter_result_rows, stream_csv, stream_xlsx
+)
 import logging
-from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/quiz-analytics", tags=["quiz-analytics"])
+router = APIRouter(
+    prefix="/quiz-analytics", tags=["quiz-analytics"],
+    dependencies=[Depends(use_reporting_db)]  # Read-only scans and exports: reporting pool / read replica
+)
 
 
 def get_content_creator(
@@ -48,6 +55,8 @@ def get_content_creator(
 @router.get("/quiz/{quiz_id}")
 async def get_quiz_analytics(
     quiz_id: int,
+    skip: int = Query(0, ge=0, description="Offset into the attempt details"),
+    limit: int = Query(1000, ge=1, le=5000, description="Maximum attempt details returned"),
     current_user_tuple = Depends(get_content_creator),
     db: Session = Depends(get_db)
 ):
@@ -68,13 +77,25 @@ async def get_quiz_analytics(
                     detail="You can only view analytics for quizzes you created or quizzes in your college"
                 )
     
-    # Get all attempts for this quiz
-    attempts = db.query(QuizAttempt).filter(
-        QuizAttempt.quiz_id == quiz_id,
-        QuizAttempt.is_submitted == True
-    ).all()
+    passing_marks = get_passing_marks(quiz)
+    submitted = and_(QuizAttempt.quiz_id == quiz_id, QuizAttempt.is_submitted == True)
     
-    total_attempts = len(attempts)
+    def count_where(condition):
+        return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+    
+    # Statistics and score distribution in one aggregate query
+    stats = db.query(
+        func.count(QuizAttempt.id),
+        func.coalesce(func.sum(QuizAttempt.total_score), 0.0),
+        count_where(QuizAttempt.total_score >= passing_marks),
+        count_where(QuizAttempt.percentage <= 20),
+        count_where(and_(QuizAttempt.percentage > 20, QuizAttempt.percentage <= 40)),
+        count_where(and_(QuizAttempt.percentage > 40, QuizAttempt.percentage <= 60)),
+        count_where(and_(QuizAttempt.percentage > 60, QuizAttempt.percentage <= 80)),
+        count_where(QuizAttempt.percentage > 80),
+    ).filter(submitted).one()
+    
+    total_attempts = stats[0]
     
     if total_attempts == 0:
         return {
@@ -89,66 +110,64 @@ async def get_quiz_analytics(
         }
     
     # Calculate statistics
-    total_score = sum(attempt.total_score for attempt in attempts)
+    total_score = float(stats[1])
     average_score = total_score / total_attempts if total_attempts > 0 else 0
     
-    passing_marks = quiz.passing_marks if hasattr(quiz, 'passing_marks') and quiz.passing_marks else (quiz.total_marks * 0.5)
-    passed_count = sum(1 for attempt in attempts if attempt.total_score >= passing_marks)
+    passed_count = int(stats[2])
     pass_percentage = (passed_count / total_attempts * 100) if total_attempts > 0 else 0
     
     # Score distribution
     score_ranges = {
-        "0-20": 0,
-        "21-40": 0,
-        "41-60": 0,
-        "61-80": 0,
-        "81-100": 0,
+        "0-20": int(stats[3]),
+        "21-40": int(stats[4]),
+        "41-60": int(stats[5]),
+        "61-80": int(stats[6]),
+        "81-100": int(stats[7]),
     }
     
-    for attempt in attempts:
-        percentage = attempt.percentage
-        if percentage <= 20:
-            score_ranges["0-20"] += 1
-        elif percentage <= 40:
-            score_ranges["21-40"] += 1
-        elif percentage <= 60:
-            score_ranges["41-60"] += 1
-        elif percentage <= 80:
-            score_ranges["61-80"] += 1
-        else:
-            score_ranges["81-100"] += 1
+    results_query = db.query(
+        QuizAttempt.id,
+        QuizAttempt.user_id,
+        QuizAttempt.total_score,
+        QuizAttempt.percentage,
+        QuizAttempt.submitted_at,
+        QuizAttempt.is_auto_submitted,
+        User.email,
+        Profile.full_name,
+    ).join(
+        User, User.id == QuizAttempt.user_id
+    ).outerjoin(
+        Profile, Profile.user_id == QuizAttempt.user_id
+    ).filter(submitted)
     
     # Top performers
-    top_attempts = sorted(attempts, key=lambda x: x.total_score, reverse=True)[:10]
-    top_performers = []
-    for attempt in top_attempts:
-        user = db.query(User).filter(User.id == attempt.user_id).first()
-        profile = db.query(Profile).filter(Profile.user_id == attempt.user_id).first()
-        top_performers.append({
-            "user_id": attempt.user_id,
-            "name": profile.full_name if profile else user.email,
-            "email": user.email,
-            "score": attempt.total_score,
-            "percentage": attempt.percentage,
-            "submitted_at": attempt.submitted_at.isoformat() if attempt.submitted_at else None,
-        })
+    top_performers = [
+        {
+            "user_id": row.user_id,
+            "name": row.full_name or row.email,
+            "email": row.email,
+            "score": row.total_score,
+            "percentage": row.percentage,
+            "submitted_at": row.submitted_at.isoformat() if row.submitted_at else None,
+        }
+        for row in results_query.order_by(QuizAttempt.total_score.desc(), QuizAttempt.id).limit(10)
+    ]
     
-    # Attempt details
-    attempt_details = []
-    for attempt in attempts:
-        user = db.query(User).filter(User.id == attempt.user_id).first()
-        profile = db.query(Profile).filter(Profile.user_id == attempt.user_id).first()
-        attempt_details.append({
-            "attempt_id": attempt.id,
-            "user_id": attempt.user_id,
-            "name": profile.full_name if profile else user.email,
-            "email": user.email,
-            "score": attempt.total_score,
-            "percentage": attempt.percentage,
-            "is_passed": attempt.total_score >= passing_marks,
-            "submitted_at": attempt.submitted_at.isoformat() if attempt.submitted_at else None,
-            "is_auto_submitted": attempt.is_auto_submitted,
-        })
+    # Attempt details (one page; the export streams every attempt)
+    attempt_details = [
+        {
+            "attempt_id": row.id,
+            "user_id": row.user_id,
+            "name": row.full_name or row.email,
+            "email": row.email,
+            "score": row.total_score,
+            "percentage": row.percentage,
+            "is_passed": row.total_score >= passing_marks,
+            "submitted_at": row.submitted_at.isoformat() if row.submitted_at else None,
+            "is_auto_submitted": row.is_auto_submitted,
+        }
+        for row in results_query.order_by(QuizAttempt.id).offset(skip).limit(limit)
+    ]
     
     return {
         "quiz_id": quiz_id,
@@ -163,6 +182,8 @@ async def get_quiz_analytics(
         "score_distribution": score_ranges,
         "top_performers": top_performers,
         "attempts": attempt_details,
+        "attempts_skip": skip,
+        "attempts_limit": limit,
     }
 
 
@@ -245,10 +266,11 @@ async def get_college_quiz_analytics(
 @router.get("/quiz/{quiz_id}/export")
 async def export_quiz_results(
     quiz_id: int,
+    format: str = Query("csv", pattern="^(csv|xlsx|json)$", description="csv or xlsx download (streamed), or json (legacy csv_data payload)"),
     current_user_tuple = Depends(get_content_creator),
     db: Session = Depends(get_db)
 ):
-    """Export quiz results as CSV data"""
+    """Export quiz results, streamed row by row as CSV or XLSX"""
     current_user, user_info = current_user_tuple
     
     quiz = db.query(Quiz).filter(Quiz.id == quiz_id).first()
@@ -264,33 +286,24 @@ async def export_quiz_results(
                     detail="Not authorized"
                 )
     
-    attempts = db.query(QuizAttempt).filter(
-        QuizAttempt.quiz_id == quiz_id,
-        QuizAttempt.is_submitted == True
-    ).all()
+    # The row iterator opens its own session: the request session is closed before streaming starts
+    rows = iter_result_rows(quiz_id, quiz.total_marks, get_passing_marks(quiz))
     
-    # Generate CSV data
-    csv_rows = []
-    csv_rows.append("Student Name,Email,Score,Max Score,Percentage,Passed,Submitted At,Auto Submitted")
+    if format == "json":
+        return {
+            "quiz_id": quiz_id,
+            "quiz_title": quiz.title,
+            "csv_data": b"".join(stream_csv(rows)).decode("utf-8"),
+            "filename": export_filename(quiz_id, "csv"),
+        }
     
-    for attempt in attempts:
-        user = db.query(User).filter(User.id == attempt.user_id).first()
-        profile = db.query(Profile).filter(Profile.user_id == attempt.user_id).first()
-        
-        passing_marks = quiz.passing_marks if hasattr(quiz, 'passing_marks') and quiz.passing_marks else (quiz.total_marks * 0.5)
-        passed = "Yes" if attempt.total_score >= passing_marks else "No"
-        
-        csv_rows.append(
-            f'"{profile.full_name if profile else ""}","{user.email}",'
-            f'{attempt.total_score},{attempt.max_score or quiz.total_marks},'
-            f'{attempt.percentage}%,{passed},'
-            f'"{attempt.submitted_at.isoformat() if attempt.submitted_at else ""}",'
-            f'{"Yes" if attempt.is_auto_submitted else "No"}'
-        )
+    if format == "xlsx":
+        body, media_type, filename = stream_xlsx(rows), XLSX_MEDIA_TYPE, export_filename(quiz_id, "xlsx")
+    else:
+        body, media_type, filename = stream_csv(rows), CSV_MEDIA_TYPE, export_filename(quiz_id, "csv")
     
-    return {
-        "quiz_id": quiz_id,
-        "quiz_title": quiz.title,
-        "csv_data": "\n".join(csv_rows),
-        "filename": f"quiz_{quiz_id}_results_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.csv",
-    }
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
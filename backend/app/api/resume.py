@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from typing import Optional, List, Dict, Any
 from app.core.database import get_db
 from app.models.user import User
+from app.models.resume_analytics import StudentResume
 from app.api.auth import get_current_user
 from app.services.openai_service import optimize_resume_for_fresher, calculate_ats_score_ai
 from app.services.ollama_service import (
@@ -19,15 +20,16 @@ from app.services.advanced_ai_service import (
     extract_keywords_intelligent,
     detect_industry,
     analyze_project_relevance,
+    analyze_projects_relevance_batch,
     rank_best_projects,
     rewrite_project_descriptions,
     OptimizationLevel,
     Industry,
     check_ollama_availability as check_advanced_ollama
 )
-from app.services.pdf_service import generate_resume_pdf
+from app.services.pdf_render_service import pdf_renderer
+from app.services.ats_keyword_engine import CompiledJobDescription, compile_job_description
 from pydantic import BaseModel, Field
-import re
 import logging
 
 logger = logging.getLogger(__name__)
@@ -76,8 +78,24 @@ class CoverLetterResponse(BaseModel):
     personalized: bool = True
 
 
-def calculate_ats_score(resume_data: ResumeData, job_description: Optional[str] = None) -> ATSScoreResponse:
-    """Calculate ATS score for a resume"""
+class ATSScoreBatchRequest(BaseModel):
+    """Request for scoring many resumes against one job description"""
+    resumes: List[ResumeData] = Field(..., max_length=500)
+    job_description: Optional[str] = None
+
+
+class ATSScoreBatchResponse(BaseModel):
+    """Batch ATS score response (same order as the request)"""
+    results: List[ATSScoreResponse]
+    count: int
+
+
+def calculate_ats_score(
+    resume_data: ResumeData,
+    job_description: Optional[str] = None,
+    compiled_jd: Optional[CompiledJobDescription] = None
+) -> ATSScoreResponse:
+    """Calculate ATS score for a resume (pass compiled_jd to skip the JD cache lookup)"""
     score = 0
     breakdown = {}
     recommendations = []
@@ -178,16 +196,12 @@ def calculate_ats_score(resume_data: ResumeData, job_description: Optional[str]
     
     # 6. Keywords Matching (20 points) - if job description provided
     keyword_score = 0
-    if job_description:
-        job_keywords = extract_keywords(job_description.lower())
-        resume_text = extract_resume_text(resume_data).lower()
-        
-        matched_keywords = []
-        for keyword in job_keywords:
-            if keyword in resume_text:
-                matched_keywords.append(keyword)
-            else:
-                missing_keywords.append(keyword)
+    if job_description or compiled_jd:
+        # Precompiled automaton: word-boundary, stemmed, synonym-aware matching
+        compiled_jd = compiled_jd or compile_job_description(job_description)
+        job_keywords = compiled_jd.keywords
+        matched_keywords, missing = compiled_jd.match(extract_resume_text(resume_data))
+        missing_keywords.extend(missing)
         
         if len(job_keywords) > 0:
             keyword_score = int((len(matched_keywords) / len(job_keywords)) * 20)
@@ -222,27 +236,19 @@ def calculate_ats_score(resume_data: ResumeData, job_description: Optional[str]
 
 def extract_keywords(text: str) -> List[str]:
     """Extract important keywords from job description"""
-    # Common technical keywords
-    tech_keywords = [
-        'python', 'java', 'javascript', 'react', 'node.js', 'sql', 'mongodb',
-        'aws', 'docker', 'kubernetes', 'git', 'agile', 'scrum', 'api',
-        'machine learning', 'data science', 'frontend', 'backend', 'full stack',
-        'devops', 'ci/cd', 'rest', 'graphql', 'typescript', 'angular', 'vue'
+    return list(compile_job_description(text).keywords)
+
+
+def calculate_ats_scores_batch(
+    resumes: List[ResumeData],
+    job_description: Optional[str] = None
+) -> List[ATSScoreResponse]:
+    """Score many resumes against one job description, compiling it only once"""
+    compiled_jd = compile_job_description(job_description) if job_description else None
+    return [
+        calculate_ats_score(resume_data, job_description, compiled_jd=compiled_jd)
+        for resume_data in resumes
     ]
-    
-    # Extract words (simplified)
-    words = re.findall(r'\b\w+\b', text.lower())
-    
-    # Filter for relevant keywords
-    keywords = []
-    for word in words:
-        if len(word) > 3 and word in tech_keywords:
-            keywords.append(word)
-        elif len(word) > 5:  # Longer words are often important
-            keywords.append(word)
-    
-    # Remove duplicates and return
-    return list(set(keywords))[:20]  # Limit to 20 keywords
 
 
 def extract_resume_text(resume_data: ResumeData) -> str:
@@ -336,6 +342,56 @@ async def calculate_ats_score_endpoint(
         )
 
 
+@router.post("/ats-score-batch", response_model=ATSScoreBatchResponse)
+async def calculate_ats_score_batch_endpoint(
+    request: ATSScoreBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Calculate ATS scores for many resumes against one job description"""
+    try:
+        results = calculate_ats_scores_batch(request.resumes, request.job_description)
+        return ATSScoreBatchResponse(results=results, count=len(results))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error calculating ATS scores: {str(e)}"
+        )
+
+
+@router.put("/saved")
+async def save_resume_endpoint(
+    resume_data: ResumeData,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Save the current user's resume so placement officers can rank it against jobs"""
+    saved = db.query(StudentResume).filter(StudentResume.user_id == current_user.id).first()
+    if saved:
+        saved.resume_data = resume_data.model_dump()
+    else:
+        saved = StudentResume(user_id=current_user.id, resume_data=resume_data.model_dump())
+        db.add(saved)
+    db.commit()
+    db.refresh(saved)
+    return {"resume_data": saved.resume_data, "updated_at": saved.updated_at}
+
+
+@router.get("/saved")
+async def get_saved_resume_endpoint(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Get the current user's saved resume"""
+    saved = db.query(StudentResume).filter(StudentResume.user_id == current_user.id).first()
+    if not saved:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No saved resume found"
+        )
+    return {"resume_data": saved.resume_data, "updated_at": saved.updated_at}
+
+
 @router.post("/cover-letter", response_model=CoverLetterResponse)
 async def generate_cover_letter_endpoint(
     request: CoverLetterRequest,
@@ -574,7 +630,8 @@ async def generate_pdf_endpoint(
 ):
     """Generate PDF from resume data using selected template"""
     try:
-        pdf_bytes = generate_resume_pdf(
+        # Rendered in a worker process; unchanged resumes come from the render cache
+        pdf_bytes = await pdf_renderer.render(
             request.resume_data,
             request.template
         )
@@ -807,6 +864,18 @@ async def analyze_all_projects_relevance_endpoint(
                 "recommended_project_count": 3
             }
         
+        # Batched mode packs all projects into one prompt per context-sized chunk
+        if request.get("batched", True):
+            return {
+                "project_analyses": analyze_projects_relevance_batch(
+                    projects,
+                    target_role,
+                    job_description
+                ),
+                "needs_more_projects": len(projects) < 3,
+                "recommended_project_count": 3
+            }
+        
         # Analyze each project
         analyses = []
         for project in projects:
@@ -933,7 +1002,8 @@ async def rewrite_project_descriptions_endpoint(
         
         rewritten_projects = rewrite_project_descriptions(
             projects,
-            target_role
+            target_role,
+            batched=request.get("batched", True)
         )
         
         return {
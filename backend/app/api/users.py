@@ -1,5 +1,6 @@
 """User management API endpoints"""
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from app.core.database import get_db
@@ -8,6 +9,7 @@ from app.models.profile import Profile
 from app.api.auth import get_current_user
 from app.core.security import get_password_hash
 from app.schemas.user import UserListResponse, UserUpdateSchema, UserCreateSchema
+from app.services.user_listing import fetch_user_page, user_listing_query
 from pydantic import BaseModel, Field
 from typing import List as TypingList
 
@@ -215,65 +217,42 @@ async def update_current_user_profile(
 
 @router.get("/all-students", response_model=List[UserListResponse])
 async def get_all_students(
+    response: Response,
     skip: int = 0,
-    limit: int = 1000,
+    limit: int = Query(1000, ge=1, le=5000),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Send the total in X-Total-Count"),
     college_id: Optional[int] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all students across all colleges (or filtered by college)"""
-    # Get all student user IDs
-    query = db.query(UserRole.user_id).filter(
-        UserRole.role == RoleEnum.STUDENT
-    )
+    student_user_ids = select(UserRole.user_id).where(UserRole.role == RoleEnum.STUDENT)
+    query = user_listing_query(db, profile_required=True).filter(User.id.in_(student_user_ids))
     
     if college_id:
         # Filter by college
-        profile_user_ids = db.query(Profile.user_id).filter(
-            Profile.college_id == college_id
-        ).subquery()
-        query = query.filter(UserRole.user_id.in_(profile_user_ids))
-    
-    student_user_ids = query.subquery()
-    
-    # Get users
-    users = db.query(User).filter(
-        User.id.in_(student_user_ids)
-    ).offset(skip).limit(limit).all()
-    
-    result = []
-    for user in users:
-        profile = db.query(Profile).filter(Profile.user_id == user.id).first()
-        roles = db.query(UserRole).filter(
-            UserRole.user_id == user.id,
-            UserRole.role == RoleEnum.STUDENT
-        ).all()
-        
-        if profile:
-            result.append(UserListResponse(
-                id=user.id,
-                email=user.email,
-                full_name=profile.full_name,
-                department=profile.department,
-                section=profile.section,
-                roll_number=profile.roll_number,
-                college_id=profile.college_id,
-                present_year=profile.present_year,
-                roles=[{"role": r.role.value, "college_id": r.college_id} for r in roles],
-                is_active=user.is_active == "true",
-                created_at=user.created_at
-            ))
-    
-    return result
+        query = query.filter(Profile.college_id == college_id)
+    
+    return fetch_user_page(
+        db, query, response, limit,
+        cursor=cursor,
+        skip=skip,
+        role_filter=RoleEnum.STUDENT,
+        count_key=("all-students", college_id) if include_total else None
+    )
 
 
 @router.get("/", response_model=List[UserListResponse])
 async def list_users(
+    response: Response,
     college_id: Optional[int] = Query(None, description="Filter by college ID"),
     institution_id: Optional[int] = Query(None, description="Filter by institution ID"),
     role: Optional[str] = Query(None, description="Filter by role"),
     skip: int = 0,
     limit: int = Query(100, ge=1, le=500),  # Optimized limit for performance (max 500 per request)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Send the total in X-Total-Count"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -283,9 +262,17 @@ async def list_users(
     - College Admin: Can see users in their college
     - Institution Admin: Can see users in their institution
     - HOD: Can only see students and faculty in their department
+    
+    Pages are ordered by (created_at, id); pass the X-Next-Cursor header of a
+    page as cursor to get the next one.
     """
     print(f"[List Users] Request - college_id: {college_id}, institution_id: {institution_id}, role: {role}, current_user: {current_user.email}")
     
+    try:
+        role_enum = RoleEnum(role) if role else None
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid role: {role}")
+    
     # Check if current user is HOD
     user_roles = db.query(UserRole).filter(UserRole.user_id == current_user.id).all()
     role_names = [r.role for r in user_roles]
@@ -294,7 +281,6 @@ async def list_users(
     
     # Get HOD's department if HOD
     hod_department = None
-    hod_department_id = None
     if is_hod:
         from app.models.academic import Department
         hod_department = db.query(Department).filter(Department.hod_id == current_user.id).first()
@@ -304,32 +290,26 @@ async def list_users(
                 hod_department = db.query(Department).filter(
                     Department.name == current_user_profile.department
                 ).first()
-        if hod_department:
-            hod_department_id = hod_department.id
-            print(f"[List Users] HOD detected - department: {hod_department.name} (ID: {hod_department_id})")
     
     # Start with all users
-    users_query = db.query(User)
+    query = user_listing_query(db)
+    scope = None
     
     # Apply filters based on user role
     if is_hod and hod_department:
-        # HOD: Filter by department - only show students and faculty in their department
-        # Get user IDs from profiles with this department
-        profile_user_ids = db.query(Profile.user_id).filter(
-            Profile.department == hod_department.name
-        ).subquery()
-        users_query = users_query.filter(User.id.in_(profile_user_ids))
-        
-        # Further filter to only students and faculty (exclude HODs, admins, and super admins)
-        student_faculty_user_ids = db.query(UserRole.user_id).filter(
-            UserRole.role.in_([RoleEnum.STUDENT, RoleEnum.FACULTY])
-        ).subquery()
-        users_query = users_query.filter(User.id.in_(student_faculty_user_ids))
-        
-        # Exclude current HOD themselves from the list
-        users_query = users_query.filter(User.id != current_user.id)
-        
-        print(f"[List Users] HOD filtering - department: {hod_department.name}, found {users_query.count()} users")
+        # HOD: only students and faculty in their department,
+        # excluding HODs, admins, super admins and the HOD themselves
+        query = query.filter(
+            Profile.department == hod_department.name,
+            User.id.in_(select(UserRole.user_id).where(
+                UserRole.role.in_([RoleEnum.STUDENT, RoleEnum.FACULTY])
+            )),
+            User.id.notin_(select(UserRole.user_id).where(
+                UserRole.role.in_([RoleEnum.HOD, RoleEnum.ADMIN, RoleEnum.SUPER_ADMIN])
+            )),
+            User.id != current_user.id
+        )
+        scope = ("hod", hod_department.name, current_user.id)
     elif not is_super_admin:
         # College Admin: Filter by college
         current_user_profile = db.query(Profile).filter(Profile.user_id == current_user.id).first()
@@ -338,94 +318,28 @@ async def list_users(
             if college_id and college_id != admin_college_id:
                 # Admin can only see users from their college
                 return []
-            # Get user IDs from profiles with this college
-            profile_user_ids = db.query(Profile.user_id).filter(
-                Profile.college_id == admin_college_id
-            ).subquery()
-            users_query = users_query.filter(User.id.in_(profile_user_ids))
-            print(f"[List Users] Admin filtering - college_id: {admin_college_id}")
+            query = query.filter(Profile.college_id == admin_college_id)
+            scope = ("college", admin_college_id)
     
     # Apply additional filters if provided
     if college_id and not is_hod:
-        # Get user IDs from profiles with this college
-        profile_user_ids = db.query(Profile.user_id).filter(
-            Profile.college_id == college_id
-        ).subquery()
-        users_query = users_query.filter(User.id.in_(profile_user_ids))
-        print(f"[List Users] Filtered by college_id={college_id}")
+        query = query.filter(Profile.college_id == college_id)
     
     if institution_id:
-        # Get user IDs from profiles with this institution
-        profile_user_ids = db.query(Profile.user_id).filter(
-            Profile.institution_id == institution_id
-        ).subquery()
-        users_query = users_query.filter(User.id.in_(profile_user_ids))
-        print(f"[List Users] Filtered by institution_id={institution_id}")
-    
-    if role:
-        # Get user IDs with this role
-        role_user_ids = db.query(UserRole.user_id).filter(
-            UserRole.role == RoleEnum(role)
-        ).subquery()
-        users_query = users_query.filter(User.id.in_(role_user_ids))
-    
-    users = users_query.offset(skip).limit(limit).all()
-    print(f"[List Users] Found {len(users)} users after query")
-    
-    result = []
-    for user in users:
-        profile = db.query(Profile).filter(Profile.user_id == user.id).first()
-        roles = db.query(UserRole).filter(UserRole.user_id == user.id).all()
-        
-        # Additional filtering for HOD - ensure user is in their department
-        if is_hod and hod_department:
-            # Exclude current HOD themselves
-            if user.id == current_user.id:
-                continue
-            if not profile or profile.department != hod_department.name:
-                continue
-            # Only include students and faculty (exclude HODs, admins, super admins)
-            user_role_names = [r.role for r in roles]
-            if not (RoleEnum.STUDENT in user_role_names or RoleEnum.FACULTY in user_role_names):
-                continue
-            # Explicitly exclude HODs, admins, and super admins
-            if RoleEnum.HOD in user_role_names or RoleEnum.ADMIN in user_role_names or RoleEnum.SUPER_ADMIN in user_role_names:
-                continue
-        
-        # Apply additional filters if needed
-        if college_id and not is_hod and (not profile or profile.college_id != college_id):
-            continue
-        if institution_id and (not profile or profile.institution_id != institution_id):
-            continue
-        if role and not any(r.role == RoleEnum(role) for r in roles):
-            continue
-        
-        # Parse handled_years and handled_sections from comma-separated strings
-        handled_years_list = None
-        handled_sections_list = None
-        if profile:
-            if profile.handled_years:
-                handled_years_list = [y.strip() for y in profile.handled_years.split(',') if y.strip()]
-            if profile.handled_sections:
-                handled_sections_list = [s.strip() for s in profile.handled_sections.split(',') if s.strip()]
-        
-        result.append(UserListResponse(
-            id=user.id,
-            email=user.email,
-            full_name=profile.full_name if profile else None,
-            department=profile.department if profile else None,
-            section=profile.section if profile else None,
-            roll_number=profile.roll_number if profile else None,
-            college_id=profile.college_id if profile else None,
-            present_year=profile.present_year if profile else None,
-            roles=[{"role": r.role.value, "college_id": r.college_id} for r in roles],
-            is_active=user.is_active == "true",
-            created_at=user.created_at,
-            handled_years=handled_years_list,
-            handled_sections=handled_sections_list
-        ))
-    
-    return result
+        query = query.filter(Profile.institution_id == institution_id)
+    
+    if role_enum:
+        query = query.filter(User.id.in_(select(UserRole.user_id).where(UserRole.role == role_enum)))
+    
+    return fetch_user_page(
+        db, query, response, limit,
+        cursor=cursor,
+        skip=skip,
+        include_handled=True,
+        count_key=(
+            "users", scope, None if is_hod else college_id, institution_id, role
+        ) if include_total else None
+    )
 
 
 @router.post("/", response_model=UserListResponse)
@@ -1256,8 +1170,11 @@ async def update_user(
 @router.get("/colleges/{college_id}/students", response_model=List[UserListResponse])
 async def get_college_students(
     college_id: int,
+    response: Response,
     skip: int = 0,
-    limit: int = 10000,  # Increased limit to show all students (was 100)
+    limit: int = Query(10000, ge=1, le=10000),  # Increased limit to show all students (was 100)
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    include_total: bool = Query(False, description="Send the total in X-Total-Count"),
     department: Optional[str] = None,
     section: Optional[str] = None,
     present_year: Optional[str] = None,
@@ -1267,22 +1184,12 @@ async def get_college_students(
     db: Session = Depends(get_db)
 ):
     """Get all students for a specific college with enhanced filtering"""
-    # Fix: Use explicit join with select_from
-    from sqlalchemy import and_, or_
+    from sqlalchemy import or_
     from app.core.year_utils import parse_year, format_year
     
-    # Get student user IDs for this college - fix the join
-    query = db.query(UserRole.user_id).select_from(
-        UserRole
-    ).join(
-        Profile, UserRole.user_id == Profile.user_id
-    ).join(
-        User, User.id == UserRole.user_id
-    ).filter(
-        and_(
-            UserRole.role == RoleEnum.STUDENT,
-            Profile.college_id == college_id
-        )
+    query = user_listing_query(db, profile_required=True).filter(
+        Profile.college_id == college_id,
+        User.id.in_(select(UserRole.user_id).where(UserRole.role == RoleEnum.STUDENT))
     )
     
     # Apply filters
@@ -1290,38 +1197,17 @@ async def get_college_students(
         query = query.filter(Profile.department == department)
     if section:
         query = query.filter(Profile.section == section)
+    year_formats_list = []
     if present_year:
         # Normalize present_year filter to handle both numeric ("1", "2", "3") and formatted ("1st", "2nd", "3rd") values
         # The database might have either format, so we need to check both
         normalized_year = parse_year(present_year)
         formatted_version = format_year(normalized_year) if normalized_year else None
         
-        # Build list of possible year formats to match in database
-        # Always check both numeric and formatted versions
-        year_formats_to_match = set()
-        
-        if normalized_year:
-            year_formats_to_match.add(normalized_year)  # e.g., "1"
-        
-        if formatted_version:
-            year_formats_to_match.add(formatted_version)  # e.g., "1st"
-        
-        # Include original if it's different (handles edge cases)
-        if present_year:
-            year_formats_to_match.add(present_year)
-        
-        # Remove None values
-        year_formats_to_match = {y for y in year_formats_to_match if y}
-        
-        # Convert to list for SQLAlchemy
-        year_formats_list = list(year_formats_to_match)
-        
         # Filter by all possible year formats (e.g., filtering "1" matches both "1" and "1st" in DB)
+        year_formats_list = sorted({y for y in (normalized_year, formatted_version, present_year) if y})
         if year_formats_list:
-            print(f"DEBUG Year Filter - Input: '{present_year}', Normalized: '{normalized_year}', Formatted: '{formatted_version}', Matching: {year_formats_list}")
-            conditions = [Profile.present_year == fmt for fmt in year_formats_list]
-            query = query.filter(or_(*conditions))
-            print(f"DEBUG Year Filter - Applied OR conditions: {[str(c) for c in conditions]}")
+            query = query.filter(or_(*[Profile.present_year == fmt for fmt in year_formats_list]))
     if search:
         # Search in name, email, roll_number
         query = query.filter(
@@ -1339,52 +1225,16 @@ async def get_college_students(
         elif is_active.lower() == 'false':
             query = query.filter(User.is_active == "false")
     
-    student_user_ids = [row[0] for row in query.all()]
-    
-    if not student_user_ids:
-        return []
-    
-    # Get users and their profiles
-    users = db.query(User).filter(
-        User.id.in_(student_user_ids)
-    ).offset(skip).limit(limit).all()
-    
-    result = []
-    for user in users:
-        profile = db.query(Profile).filter(Profile.user_id == user.id).first()
-        roles = db.query(UserRole).filter(
-            UserRole.user_id == user.id,
-            UserRole.role == RoleEnum.STUDENT
-        ).all()
-        
-        if profile and profile.college_id == college_id:
-            # Apply year filter again at profile level to ensure consistency
-            if present_year:
-                # Re-check year format matching (in case query filter didn't catch it)
-                normalized_year = parse_year(present_year)
-                formatted_version = format_year(normalized_year) if normalized_year else None
-                year_formats_to_match = {normalized_year, formatted_version, present_year}
-                year_formats_to_match = {y for y in year_formats_to_match if y}  # Remove None values
-                
-                # If profile year doesn't match any of the expected formats, skip
-                if profile.present_year and profile.present_year not in year_formats_to_match:
-                    continue  # Skip this student if year doesn't match
-            
-            result.append(UserListResponse(
-                id=user.id,
-                email=user.email,
-                full_name=profile.full_name,
-                department=profile.department,
-                section=profile.section,
-                roll_number=profile.roll_number,
-                college_id=profile.college_id,
-                present_year=profile.present_year,
-                roles=[{"role": r.role.value, "college_id": r.college_id} for r in roles],
-                is_active=user.is_active == "true",
-                created_at=user.created_at
-            ))
-    
-    return result
+    return fetch_user_page(
+        db, query, response, limit,
+        cursor=cursor,
+        skip=skip,
+        role_filter=RoleEnum.STUDENT,
+        count_key=(
+            "college-students", college_id, department, section, tuple(year_formats_list),
+            search, (is_active or "").lower()
+        ) if include_total else None
+    )
 
 
 class BulkEditRequest(BaseModel):
@@ -0,0 +1,130 @@
+"""Process-local caches kept in step with committed ORM writes
+
+CommitWatcher collects changes to a set of models on the session that makes
+them (mapper after_insert/after_update/after_delete hooks) and hands them
+to a callback once the session commits; rolled back changes are discarded.
+Writes that skip the mapper hooks (raw SQL, bulk UPDATEs) are reported with
+mark_changed(session).
+
+VersionedCache is a bounded LRU of values built from the database. Every
+commit that touches a watched model bumps its version, which drops all
+entries; a value built while the version moved is returned but not stored.
+The hooks only see this worker's writes, so entries also expire after
+ttl_seconds: that is how long a change committed by another worker (or
+outside the ORM without mark_changed) can stay invisible.
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, List, Optional, Tuple, Type
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+
+class CommitWatcher:
+    """Calls on_commit(changes) after a session that changed a watched model commits
+
+    Each change is record(target, deleted) for ORM writes, or the value given
+    to mark_changed(); without record, changes are just True.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        models: Iterable[Type] = (),
+        on_commit: Optional[Callable[[List[Any]], None]] = None,
+        record: Optional[Callable[[Any, bool], Any]] = None,
+    ):
+        self.key = f"commit_watcher:{name}"
+        self.on_commit = on_commit
+        self.record = record
+        for model in models:
+            event.listen(model, "after_insert", self._saved)
+            event.listen(model, "after_update", self._saved)
+            event.listen(model, "after_delete", self._deleted)
+        event.listen(Session, "after_commit", self._committed)
+        event.listen(Session, "after_soft_rollback", self._rolled_back)
+
+    def mark_changed(self, session: Session, change: Any = True) -> None:
+        """Report a change made through session; for writes that skip the mapper hooks"""
+        session.info.setdefault(self.key, []).append(change)
+
+    def _record(self, target: Any, deleted: bool) -> None:
+        session = object_session(target)
+        if session is not None:
+            self.mark_changed(session, self.record(target, deleted) if self.record else True)
+
+    def _saved(self, mapper, connection, target) -> None:
+        self._record(target, False)
+
+    def _deleted(self, mapper, connection, target) -> None:
+        self._record(target, True)
+
+    def _committed(self, session: Session) -> None:
+        changes = session.info.pop(self.key, None)
+        if changes and self.on_commit is not None:
+            self.on_commit(changes)
+
+    def _rolled_back(self, session: Session, previous_transaction) -> None:
+        session.info.pop(self.key, None)
+
+
+class VersionedCache:
+    """Bounded LRU of DB-built values, dropped when a watched model's changes commit"""
+
+    def __init__(self, name: str, models: Iterable[Type] = (), ttl_seconds: float = 60, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.version = 0
+        # key -> (version, loaded_at, value)
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._watcher = CommitWatcher(name, models, on_commit=lambda changes: self.invalidate())
+
+    def get(self, key: Hashable, build: Callable[[], Any], deep_copy: bool = False) -> Any:
+        """Cached value for key, or build() (called without the lock held)
+
+        deep_copy returns a copy taken under the lock, for values that callers
+        modify or that update() mutates in place.
+        """
+        with self._lock:
+            cached = self._entries.get(key)
+            if (
+                cached is not None and cached[0] == self.version
+                and time.monotonic() - cached[1] < self.ttl_seconds
+            ):
+                self._entries.move_to_end(key)
+                return copy.deepcopy(cached[2]) if deep_copy else cached[2]
+            version = self.version
+
+        value = build()
+        with self._lock:
+            # Skip caching if the data changed while building
+            if self.version == version:
+                self._entries[key] = (version, time.monotonic(), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            return copy.deepcopy(value) if deep_copy else value
+
+    def update(self, key: Hashable, apply: Callable[[Any], None]) -> None:
+        """Mutate a cached value in place under the cache lock (no-op if not cached)"""
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None and cached[0] == self.version:
+                apply(cached[2])
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one entry, or bump the version and drop them all"""
+        with self._lock:
+            if key is not None:
+                self._entries.pop(key, None)
+                return
+            self.version += 1
+            self._entries.clear()
+
+    def mark_changed(self, session: Session) -> None:
+        """Invalidate when session commits; for writes that skip the mapper hooks"""
+        self._watcher.mark_changed(session)
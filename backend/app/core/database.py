@@ -1,76 +1,270 @@
-"""Database connection and session management"""
-from sqlalchemy import create_engine
+"""Database connection and session management
+
+Requests are served from two bounded pools so that a heavy report cannot
+starve latency-critical traffic (quiz submissions, judge results):
+
+- interactive (engine, SessionLocal): everything by default
+- reporting (reporting_engine, ReportingSessionLocal): read-only analytics
+  routes, which opt in with the use_reporting_db dependency. It connects
+  to DATABASE_REPLICA_URL when set (a read replica), otherwise to the
+  primary through its own smaller pool. Sessions are read-only and
+  statements get a longer timeout.
+
+Endpoints on get_async_db use a third pool (async_engine,
+AsyncSessionLocal) sized by ASYNC_DB_POOL_SIZE / ASYNC_DB_MAX_OVERFLOW.
+A worker can hold the sum of every pool's size plus overflow on the
+primary (the reporting pool counts only without a replica): 60 + 15 + 10
+= 85 with the defaults. Times the worker count, that has to stay below
+the server's max_connections (151 by default on MySQL).
+
+The interactive and reporting pools each have a statement timeout (0 =
+none), enforced by the database: statement_timeout on PostgreSQL,
+max_execution_time (SELECTs) on MySQL, a progress-handler deadline on
+SQLite.
+"""
+import contextvars
+import logging
+import time
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 from app.config import get_settings
+from app.core.metrics import timed_pool_class, watch_pool
+from app.core import query_tracking  # noqa: F401 - SQL timing events on every engine
 import os
 
+logger = logging.getLogger(__name__)
+
 settings = get_settings()
 
+# Interactive pool; its statement timeout is off by default because migrations,
+# bulk uploads and background jobs run on it too
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "40"))
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+# Reporting pool: small, fails fast when full, long statement timeout
+REPORTING_POOL_SIZE = int(os.getenv("REPORTING_POOL_SIZE", "5"))
+REPORTING_MAX_OVERFLOW = int(os.getenv("REPORTING_MAX_OVERFLOW", "5"))
+REPORTING_POOL_TIMEOUT = float(os.getenv("REPORTING_POOL_TIMEOUT", "10"))
+REPORTING_STATEMENT_TIMEOUT_MS = int(os.getenv("REPORTING_STATEMENT_TIMEOUT_MS", "120000"))
+# Async pool (get_async_db): connections are held only while a query awaits
+ASYNC_DB_POOL_SIZE = int(os.getenv("ASYNC_DB_POOL_SIZE", "5"))
+ASYNC_DB_MAX_OVERFLOW = int(os.getenv("ASYNC_DB_MAX_OVERFLOW", "10"))
+SQLITE_PROGRESS_STEPS = 10000  # SQLite VM instructions between statement deadline checks
+
 # Determine database type
 is_sqlite = settings.DATABASE_URL.startswith("sqlite")
 is_mysql = "mysql" in settings.DATABASE_URL.lower() or "pymysql" in settings.DATABASE_URL.lower()
 is_postgresql = "postgresql" in settings.DATABASE_URL.lower() or "postgres" in settings.DATABASE_URL.lower()
 
-# Create database engine
-if is_sqlite:
-    # SQLite configuration (for development)
-    engine = create_engine(
-        settings.DATABASE_URL,
-        connect_args={"check_same_thread": False},  # Required for SQLite
-    )
-elif is_mysql:
-    # MySQL configuration (for Hostinger) - Optimized for 10k+ users
-    engine = create_engine(
-        settings.DATABASE_URL,
-        pool_pre_ping=True,  # Verify connections before using
-        pool_size=20,  # Increased for high concurrency
-        max_overflow=40,  # Increased for peak loads
-        pool_recycle=3600,  # Recycle connections after 1 hour
-        echo=False,  # Disable SQL logging in production
-        connect_args={
-            "connect_timeout": 10,
-            "read_timeout": 30,
-            "write_timeout": 30,
-        } if "pymysql" in settings.DATABASE_URL.lower() else {}
-    )
-elif is_postgresql:
-    # PostgreSQL configuration (for production) - Optimized for 10k+ users
-    engine = create_engine(
-        settings.DATABASE_URL,
-        pool_pre_ping=True,  # Verify connections before using
-        pool_size=20,  # Increased for high concurrency
-        max_overflow=40,  # Increased for peak loads
-        pool_recycle=3600,  # Recycle connections after 1 hour
-        echo=False,  # Disable SQL logging in production
-        connect_args={
+
+def _limit_sqlite_statements(engine, timeout_ms: int, read_only: bool) -> None:
+    """Interrupt statements running longer than timeout_ms; make connections query-only"""
+    @event.listens_for(engine, "connect")
+    def _configure(dbapi_connection, connection_record):
+        deadline = connection_record.info.setdefault("statement_deadline", [None])
+        if timeout_ms:
+            dbapi_connection.set_progress_handler(
+                lambda: 1 if deadline[0] is not None and time.monotonic() > deadline[0] else 0,
+                SQLITE_PROGRESS_STEPS
+            )
+        if read_only:
+            dbapi_connection.execute("PRAGMA query_only = ON")
+
+    if timeout_ms:
+        @event.listens_for(engine, "before_cursor_execute")
+        def _start_deadline(conn, cursor, statement, parameters, context, executemany):
+            conn.info["statement_deadline"][0] = time.monotonic() + timeout_ms / 1000
+
+
+def _limit_mysql_statements(engine, timeout_ms: int, read_only: bool) -> None:
+    """Per-session SELECT time limit and read-only transactions (skipped where unsupported, e.g. MariaDB)"""
+    statements = []
+    if timeout_ms:
+        statements.append(f"SET SESSION max_execution_time = {int(timeout_ms)}")
+    if read_only:
+        statements.append("SET SESSION TRANSACTION READ ONLY")
+
+    @event.listens_for(engine, "connect")
+    def _configure(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                try:
+                    cursor.execute(statement)
+                except Exception as e:
+                    logger.warning(f"{engine.url.render_as_string()}: {statement} failed: {e}")
+        finally:
+            cursor.close()
+
+
+def build_engine(url: str, pool_name: str, pool_size: int, max_overflow: int,
+                 statement_timeout_ms: int = 0, read_only: bool = False, pool_timeout: float = 30):
+    """Engine for url with its own bounded pool and statement timeout"""
+    lowered = url.lower()
+    if lowered.startswith("sqlite"):
+        # SQLite configuration (for development); file databases get the same bounded pools
+        pool_args = {} if make_url(url).database in (None, "", ":memory:") else {
+            "poolclass": timed_pool_class(QueuePool, pool_name),
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+        }
+        engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},  # Required for SQLite
+            **pool_args
+        )
+        _limit_sqlite_statements(engine, statement_timeout_ms, read_only)
+    elif "mysql" in lowered:
+        # MySQL configuration (for Hostinger) - Optimized for 10k+ users
+        engine = create_engine(
+            url,
+            poolclass=timed_pool_class(QueuePool, pool_name),  # Records checkout wait (db_pool_checkout_wait_seconds)
+            pool_pre_ping=True,  # Verify connections before using
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=3600,  # Recycle connections after 1 hour
+            echo=False,  # Disable SQL logging in production
+            connect_args={
+                "connect_timeout": 10,
+                "read_timeout": max(30, statement_timeout_ms // 1000 + 5),
+                "write_timeout": 30,
+            } if "pymysql" in lowered else {}
+        )
+        if statement_timeout_ms or read_only:
+            _limit_mysql_statements(engine, statement_timeout_ms, read_only)
+    else:
+        # PostgreSQL configuration (for production, and the default if unclear) - Optimized for 10k+ users
+        options = []
+        if statement_timeout_ms:
+            options.append(f"-c statement_timeout={int(statement_timeout_ms)}")
+        if read_only:
+            options.append("-c default_transaction_read_only=on")
+        connect_args = {
             "connect_timeout": 10,
-            "application_name": "elevate_edu_api",
+            "application_name": f"elevate_edu_api_{pool_name}",
         }
+        if options:
+            connect_args["options"] = " ".join(options)
+        engine = create_engine(
+            url,
+            poolclass=timed_pool_class(QueuePool, pool_name),  # Records checkout wait (db_pool_checkout_wait_seconds)
+            pool_pre_ping=True,  # Verify connections before using
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=3600,  # Recycle connections after 1 hour
+            echo=False,  # Disable SQL logging in production
+            connect_args=connect_args if "postgres" in lowered else {}
+        )
+    watch_pool(engine, pool_name)
+    return engine
+
+
+# Create database engines
+engine = build_engine(
+    settings.DATABASE_URL, "interactive", DB_POOL_SIZE, DB_MAX_OVERFLOW,
+    statement_timeout_ms=DB_STATEMENT_TIMEOUT_MS
+)
+reporting_engine = build_engine(
+    settings.DATABASE_REPLICA_URL or settings.DATABASE_URL, "reporting",
+    REPORTING_POOL_SIZE, REPORTING_MAX_OVERFLOW,
+    statement_timeout_ms=REPORTING_STATEMENT_TIMEOUT_MS, read_only=True, pool_timeout=REPORTING_POOL_TIMEOUT
+)
+
+# Create session factories
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReportingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=reporting_engine)
+
+# Asyncio drivers by backend, for the async engine
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+
+def async_database_url(url: str) -> str:
+    """DATABASE_URL with its driver swapped for the backend's asyncio driver"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name(), "asyncpg")
+    return parsed.set(drivername=f"{parsed.get_backend_name()}+{driver}").render_as_string(hide_password=False)
+
+
+# Async engine on the same database, for endpoints using get_async_db: queries
+# wait on the event loop instead of blocking it (and the worker) while they run
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+
+if is_sqlite:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+elif is_mysql:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=timed_pool_class(AsyncAdaptedQueuePool, "async"),
+        pool_pre_ping=True,
+        pool_size=ASYNC_DB_POOL_SIZE,
+        max_overflow=ASYNC_DB_MAX_OVERFLOW,
+        pool_recycle=3600,
+        connect_args={"connect_timeout": 10},
     )
 else:
-    # Default to PostgreSQL if unclear - Optimized for 10k+ users
-    engine = create_engine(
-        settings.DATABASE_URL,
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=timed_pool_class(AsyncAdaptedQueuePool, "async"),
         pool_pre_ping=True,
-        pool_size=20,
-        max_overflow=40,
+        pool_size=ASYNC_DB_POOL_SIZE,
+        max_overflow=ASYNC_DB_MAX_OVERFLOW,
         pool_recycle=3600,
-        echo=False,
+        connect_args={
+            "timeout": 10,
+            "server_settings": {"application_name": "elevate_edu_api"},
+        },
     )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+watch_pool(async_engine, "async")
+
+if not is_sqlite:
+    # Each worker process opens up to this many connections to the primary
+    primary_ceiling = DB_POOL_SIZE + DB_MAX_OVERFLOW + ASYNC_DB_POOL_SIZE + ASYNC_DB_MAX_OVERFLOW
+    if not settings.DATABASE_REPLICA_URL:
+        primary_ceiling += REPORTING_POOL_SIZE + REPORTING_MAX_OVERFLOW
+    logger.info(f"Database connections per worker: up to {primary_ceiling} on the primary")
+
+# expire_on_commit=False: attributes cannot lazy-load after a commit in async code
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
 
 
+# Pool serving get_db in the current request ("interactive" or "reporting")
+_workload: contextvars.ContextVar[str] = contextvars.ContextVar("db_workload", default="interactive")
+
+
+async def use_reporting_db() -> None:
+    """Route dependency: serve the request's get_db sessions (auth lookups included) from the reporting pool
+
+    List it before other dependencies (router or route `dependencies=`) and
+    only on routes that do not write.
+    """
+    _workload.set("reporting")
+
+
 def get_db():
     """Dependency for getting database session"""
-    db = SessionLocal()
+    db = ReportingSessionLocal() if _workload.get() == "reporting" else SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+
+async def get_async_db():
+    """Dependency for getting an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,7 +1,6 @@
 """Database utility functions for safe queries and error handling"""
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import ProgrammingError, InternalError
-from sqlalchemy import text, inspect
 from typing import Callable, TypeVar, Optional, Any
 import logging
 import traceback
@@ -53,63 +52,6 @@ def safe_query(
         return fallback_value
 
 
-def ensure_column_exists(
-    engine,
-    table_name: str,
-    column_name: str,
-    column_type: str = "VARCHAR(255)"
-) -> bool:
-    """
-    Ensure a column exists in a table. Add it if missing.
-    
-    Args:
-        engine: SQLAlchemy engine
-        table_name: Name of the table
-        column_name: Name of the column to check/add
-        column_type: SQL type for the column (default: VARCHAR(255))
-    
-    Returns:
-        True if column exists or was added, False otherwise
-    """
-    try:
-        inspector = inspect(engine)
-        if table_name not in inspector.get_table_names():
-            return False
-        
-        columns = [col['name'] for col in inspector.get_columns(table_name)]
-        if column_name in columns:
-            return True
-        
-        # Column doesn't exist, add it
-        print(f"[MIGRATION] Adding {column_name} column to {table_name}...", file=sys.stderr)
-        sys.stderr.flush()
-        
-        conn = engine.connect()
-        trans = conn.begin()
-        try:
-            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"))
-            trans.commit()
-            print(f"[MIGRATION] ✅ Added {column_name} column to {table_name}", file=sys.stderr)
-            sys.stderr.flush()
-            return True
-        except Exception as add_error:
-            trans.rollback()
-            error_msg = str(add_error).lower()
-            if "already exists" not in error_msg and "duplicate" not in error_msg:
-                print(f"[MIGRATION] ⚠️  Error adding {column_name}: {add_error}", file=sys.stderr)
-                sys.stderr.flush()
-                return False
-            else:
-                # Column was added by another process
-                return True
-        finally:
-            conn.close()
-    except Exception as e:
-        print(f"[MIGRATION] ⚠️  Error checking/adding column: {e}", file=sys.stderr)
-        sys.stderr.flush()
-        return False
-
-
 def safe_list_query(
     db: Session,
     query,
@@ -0,0 +1,397 @@
+"""Metrics - Prometheus counters, gauges and histograms served at GET /metrics
+
+Metrics live in process memory; recording one is a dict lookup and a few
+additions under a lock, cheap enough for every request. /metrics renders
+them in the Prometheus text exposition format (0.0.4).
+
+With several workers (uvicorn --workers, gunicorn) set METRICS_MULTIPROC_DIR
+to a directory shared by the workers of the host. Each worker writes a
+snapshot of its metrics there every METRICS_FLUSH_SECONDS, and the worker
+serving a scrape merges all snapshots with its own live values: counters and
+histograms are summed over every worker (including ones that have exited),
+gauges over the workers still running.
+
+Gauges read from other objects (pool size, open WebSockets) are set by
+collectors registered with metrics_registry.add_collector(), which run
+before each scrape or snapshot.
+"""
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+from sqlalchemy.pool import QueuePool
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+METRICS_FLUSH_SECONDS = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[str, ...]
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, Any] = {}
+        self._lock = threading.Lock()
+        metrics_registry.register(self)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            values = [[list(labels), value] for labels, value in self._values.items()]
+        return {
+            "kind": self.kind,
+            "documentation": self.documentation,
+            "labelnames": list(self.labelnames),
+            "values": values
+        }
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = float(value)
+
+    @contextmanager
+    def track_inprogress(self, *labels: str) -> Iterator[None]:
+        self.inc(*labels)
+        try:
+            yield
+        finally:
+            self.dec(*labels)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        # Per-bucket (not cumulative) counts with +Inf last, then the sum
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            values = [[list(labels), list(state)] for labels, state in self._values.items()]
+        snapshot = super().snapshot()
+        snapshot.update(values=values, buckets=list(self.buckets))
+        return snapshot
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsRegistry:
+    """All metrics of the process, their collectors and the multi-worker snapshots"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        self._collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector {collector.__name__} failed: {e}")
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    # Multi-worker snapshots
+
+    @staticmethod
+    def _directory() -> str:
+        return get_settings().METRICS_MULTIPROC_DIR
+
+    def _snapshot_path(self, directory: str, pid: int) -> str:
+        return os.path.join(directory, f"metrics_{pid}.json")
+
+    def write_snapshot(self) -> None:
+        directory = self._directory()
+        if not directory:
+            return
+        os.makedirs(directory, exist_ok=True)
+        path = self._snapshot_path(directory, os.getpid())
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as snapshot_file:
+            json.dump(self.snapshot(), snapshot_file)
+        os.replace(temp_path, path)  # Readers never see a partial file
+
+    def _worker_snapshots(self) -> List[Tuple[bool, Dict[str, Dict[str, Any]]]]:
+        """(live, snapshot) of this worker and every other worker that wrote one"""
+        snapshots = [(True, self.snapshot())]
+        directory = self._directory()
+        if not directory:
+            return snapshots
+        own_path = self._snapshot_path(directory, os.getpid())
+        for path in glob.glob(os.path.join(directory, "metrics_*.json")):
+            if path == own_path:
+                continue
+            try:
+                pid = int(os.path.basename(path)[len("metrics_"):-len(".json")])
+                with open(path) as snapshot_file:
+                    snapshots.append((_pid_alive(pid), json.load(snapshot_file)))
+            except (ValueError, OSError) as e:
+                logger.warning(f"Skipping metrics snapshot {path}: {e}")
+        return snapshots
+
+    def render(self) -> str:
+        """All metrics, merged over the host's workers, in the Prometheus text format"""
+        merged: Dict[str, Dict[str, Any]] = {}
+        for live, snapshot in self._worker_snapshots():
+            for name, metric in snapshot.items():
+                if metric["kind"] == "gauge" and not live:
+                    continue
+                target = merged.setdefault(name, {**metric, "values": {}})
+                for labels, value in metric["values"]:
+                    key = tuple(labels)
+                    if metric["kind"] == "histogram":
+                        if metric.get("buckets") != target.get("buckets"):
+                            continue  # Written by a worker with different buckets (mid-deploy)
+                        current = target["values"].get(key)
+                        target["values"][key] = value if current is None else [a + b for a, b in zip(current, value)]
+                    else:
+                        target["values"][key] = target["values"].get(key, 0.0) + value
+
+        lines = []
+        for name in sorted(merged):
+            metric = merged[name]
+            labelnames = metric["labelnames"]
+            lines.append(f"# HELP {name} {_escape(metric['documentation'])}")
+            lines.append(f"# TYPE {name} {metric['kind']}")
+            for labels, value in sorted(metric["values"].items()):
+                if metric["kind"] != "histogram":
+                    lines.append(f"{name}{_format_labels(labelnames, labels)} {_format_value(value)}")
+                    continue
+                cumulative = 0
+                for bound, count in zip(list(metric["buckets"]) + [float("inf")], value[:-1]):
+                    cumulative += count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{name}_bucket{_format_labels(labelnames, labels, le)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, labels)} {_format_value(value[-1])}")
+                lines.append(f"{name}_count{_format_labels(labelnames, labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def start(self) -> None:
+        """Start writing this worker's snapshots (only with METRICS_MULTIPROC_DIR)"""
+        if not self._directory() or METRICS_FLUSH_SECONDS <= 0:
+            return
+        if self._flusher is None or not self._flusher.is_alive():
+            with self._lock:
+                if self._flusher is None or not self._flusher.is_alive():
+                    self._stop.clear()
+                    self._flusher = threading.Thread(target=self._flush_loop, name="metrics-flusher", daemon=True)
+                    self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(METRICS_FLUSH_SECONDS):
+            try:
+                self.write_snapshot()
+            except Exception as e:
+                logger.error(f"Metrics snapshot failed: {e}")
+
+    def shutdown(self) -> None:
+        """Stop the flusher and leave the final counters for the other workers to report"""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join(5)
+        try:
+            self.write_snapshot()
+        except Exception as e:
+            logger.error(f"Metrics snapshot failed: {e}")
+
+
+metrics_registry = MetricsRegistry()
+
+
+# HTTP (PerformanceMiddleware); routes are labelled by template, e.g. /api/v1/jobs/{job_id}
+http_requests_total = Counter(
+    "http_requests_total", "HTTP requests by method, route template and status code",
+    ("method", "route", "status")
+)
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template",
+    ("method", "route")
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "HTTP requests being handled", ("method",)
+)
+
+# Database connection pool
+db_pool_checkout_wait_seconds = Histogram(
+    "db_pool_checkout_wait_seconds", "Time to get a pooled DB connection (waiting or connecting)", ("pool",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+)
+http_request_db_queries = Histogram(
+    "http_request_db_queries", "SQL statements per HTTP request (query tracking)", ("method", "route"),
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+)
+http_request_db_seconds = Histogram(
+    "http_request_db_seconds", "Time spent in SQL statements per HTTP request (query tracking)", ("method", "route")
+)
+db_repeated_query_requests_total = Counter(
+    "db_repeated_query_requests_total", "Requests that ran one statement shape QUERY_REPEAT_THRESHOLD+ times (N+1)",
+    ("method", "route")
+)
+db_slow_queries_total = Counter(
+    "db_slow_queries_total", "SQL statements slower than QUERY_SLOW_MS"
+)
+db_pool_connections = Gauge(
+    "db_pool_connections", "DB connections by pool and state (checked_out, idle, overflow)", ("pool", "state")
+)
+
+# Code execution (judge)
+judge_executions_in_progress = Gauge(
+    "judge_executions_in_progress", "Code executions waiting for or running in a sandbox", ("backend",)
+)
+judge_execution_duration_seconds = Histogram(
+    "judge_execution_duration_seconds", "Code execution time including sandbox startup", ("backend",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+
+# LLM calls
+llm_request_duration_seconds = Histogram(
+    "llm_request_duration_seconds", "LLM API call latency by provider, model and outcome",
+    ("provider", "model", "outcome"),
+    buckets=(0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+)
+
+# WebSockets
+websocket_connections = Gauge(
+    "websocket_connections", "Open WebSocket connections by endpoint", ("endpoint",)
+)
+
+
+@contextmanager
+def track_judge_execution(backend: str) -> Iterator[None]:
+    """Count and time a code execution; usable as a decorator on sync functions"""
+    judge_executions_in_progress.inc(backend)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        judge_executions_in_progress.dec(backend)
+        judge_execution_duration_seconds.observe(time.perf_counter() - started, backend)
+
+
+@contextmanager
+def track_llm_call(provider: str, model: str) -> Iterator[None]:
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        llm_request_duration_seconds.observe(time.perf_counter() - started, provider, model or "unknown", outcome)
+
+
+def timed_pool_class(base: Type[QueuePool], name: str) -> Type[QueuePool]:
+    """Subclass of a QueuePool class recording how long each checkout takes to get a connection"""
+    class TimedPool(base):
+        def _do_get(self):
+            started = time.perf_counter()
+            try:
+                return super()._do_get()
+            finally:
+                db_pool_checkout_wait_seconds.observe(time.perf_counter() - started, name)
+
+    TimedPool.__name__ = TimedPool.__qualname__ = f"Timed{base.__name__}"
+    return TimedPool
+
+
+
+def watch_pool(engine, name: str) -> None:
+    """Report the engine's pool usage at each scrape"""
+    def collect_pool_connections() -> None:
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            db_pool_connections.set(pool.checkedout(), name, "checked_out")
+            db_pool_connections.set(pool.checkedin(), name, "idle")
+            db_pool_connections.set(max(pool.overflow(), 0), name, "overflow")
+    metrics_registry.add_collector(collect_pool_connections)
@@ -0,0 +1,54 @@
+"""Versioned schema migrations (Alembic, revisions in backend/migrations/versions)
+
+Run once per deploy, before the API starts:
+
+    cd backend && alembic upgrade head        # or: python scripts/migrate.py
+
+Alembic records the applied revision in the alembic_version table, so
+re-running is a no-op once the database is at head.
+"""
+import logging
+import os
+from typing import Optional
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ALEMBIC_INI = os.path.join(BACKEND_DIR, "alembic.ini")
+
+
+def alembic_config() -> Config:
+    config = Config(ALEMBIC_INI)
+    # Paths in alembic.ini are relative to backend/
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    config.set_main_option("version_locations", os.path.join(BACKEND_DIR, "migrations", "versions"))
+    config.set_main_option("prepend_sys_path", BACKEND_DIR)
+    return config
+
+
+def current_revision() -> Optional[str]:
+    with engine.connect() as connection:
+        return MigrationContext.configure(connection).get_current_revision()
+
+
+def head_revision() -> Optional[str]:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+def run_migrations(revision: str = "head") -> None:
+    """Upgrade the database to revision and reset the cached schema map"""
+    from app.core.schema import schema_capabilities
+
+    config = alembic_config()
+    # Keep the caller's logging setup instead of alembic.ini's
+    config.attributes["configure_logger"] = False
+    command.upgrade(config, revision)
+    schema_capabilities.refresh()
+    logger.info(f"Database schema at revision {current_revision()}")
@@ -0,0 +1,183 @@
+"""Query Tracking - per-request SQL counts and time, repeated-query (N+1) detection, slow-query log
+
+Cursor execute events of every engine are timed and added to the QueryStats
+of the current context. PerformanceMiddleware opens one per request, then
+reports it as X-DB-Query-Count / X-DB-Query-Time headers and as metrics,
+and logs statements that ran QUERY_REPEAT_THRESHOLD times or more in the
+request with the same shape (same SQL once literals and IN lists are
+collapsed). That is usually a query inside a loop over rows (N+1).
+
+Statements slower than QUERY_SLOW_MS are logged with their bound
+parameters redacted to their types.
+
+Tracking is on with QUERY_TRACKING_ENABLED and can be switched at runtime
+with set_query_tracking(). Tests can check query budgets with
+track_queries() / assert_max_queries(), or from the X-DB-Query-Count header
+of a TestClient response.
+"""
+import contextvars
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import get_settings
+from app.core.metrics import (
+    db_repeated_query_requests_total, db_slow_queries_total, http_request_db_queries, http_request_db_seconds
+)
+
+logger = logging.getLogger(__name__)
+
+QUERY_REPEAT_THRESHOLD = int(os.getenv("QUERY_REPEAT_THRESHOLD", "10"))
+QUERY_SLOW_MS = float(os.getenv("QUERY_SLOW_MS", "500"))
+_MAX_LOGGED_SQL = 2000
+
+_enabled = get_settings().QUERY_TRACKING_ENABLED
+_current: contextvars.ContextVar[Optional["QueryStats"]] = contextvars.ContextVar("query_stats", default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|:\w+|\$\d+|\?")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint(statement: str) -> str:
+    """The statement's shape: literals and placeholders as ?, IN lists as (?+)"""
+    shape = _STRING_LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _VALUE_LIST.sub("(?+)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+def _redact(parameters: Any) -> Any:
+    """Bound parameters with values replaced by their type names"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany: the first rows' shapes are enough
+            redacted = [_redact(row) for row in parameters[:3]]
+            return redacted + [f"... {len(parameters)} rows"] if len(parameters) > 3 else redacted
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+class QueryStats:
+    """Statements executed in one request (or track_queries() block)"""
+
+    __slots__ = ("count", "duration", "by_fingerprint")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.by_fingerprint: Dict[str, int] = {}
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        shape = fingerprint(statement)
+        self.by_fingerprint[shape] = self.by_fingerprint.get(shape, 0) + 1
+
+    def repeated(self, threshold: int = QUERY_REPEAT_THRESHOLD) -> List[Tuple[str, int]]:
+        """(fingerprint, executions) of shapes run at least threshold times, most first"""
+        return sorted(
+            ((shape, count) for shape, count in self.by_fingerprint.items() if count >= threshold),
+            key=lambda item: -item[1]
+        )
+
+    def summary(self, limit: int = 5) -> str:
+        top = sorted(self.by_fingerprint.items(), key=lambda item: -item[1])[:limit]
+        lines = [f"{self.count} queries in {self.duration * 1000:.1f} ms"]
+        lines += [f"  {count} x {shape[:300]}" for shape, count in top]
+        return "\n".join(lines)
+
+
+def query_tracking_enabled() -> bool:
+    return _enabled
+
+
+def set_query_tracking(enabled: bool) -> None:
+    """Switch request query tracking and the slow-query log on or off at runtime"""
+    global _enabled
+    _enabled = enabled
+
+
+def begin_request() -> Tuple[Optional[QueryStats], Optional[contextvars.Token]]:
+    """Start collecting the current request's queries (None, None when tracking is off)"""
+    if not _enabled:
+        return None, None
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def end_request(stats: QueryStats, token: contextvars.Token, method: str, route: str) -> None:
+    """Stop collecting, record the request's query metrics and log repeated statements"""
+    _current.reset(token)
+    http_request_db_queries.observe(stats.count, method, route)
+    http_request_db_seconds.observe(stats.duration, method, route)
+    repeated = stats.repeated()
+    if repeated:
+        db_repeated_query_requests_total.inc(method, route)
+        shape, count = repeated[0]
+        logger.warning(
+            f"Repeated query ({count} x, possible N+1) in {method} {route}, "
+            f"{stats.count} queries total: {shape[:_MAX_LOGGED_SQL]}"
+        )
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the queries run in this block (whether or not tracking is enabled)"""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int) -> Iterator[QueryStats]:
+    """Fail with the most frequent statements if the block runs more than limit queries"""
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        raise AssertionError(f"Expected at most {limit} queries, got {stats.summary()}")
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    if _enabled or _current.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("query_start_time")
+    if not started:
+        return  # Tracking was switched on while this statement ran
+    duration = time.perf_counter() - started.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, duration)
+    if _enabled and duration * 1000 >= QUERY_SLOW_MS:
+        db_slow_queries_total.inc()
+        sql = _WHITESPACE.sub(" ", statement).strip()[:_MAX_LOGGED_SQL]
+        logger.warning(f"Slow query ({duration * 1000:.0f} ms): {sql} params={_redact(parameters)}")
+
+
+@event.listens_for(Engine, "handle_error")
+def _discard_failed_query(exception_context):
+    # after_cursor_execute does not run for failed statements
+    connection = exception_context.connection
+    if connection is not None and connection.info.get("query_start_time"):
+        connection.info["query_start_time"].pop()
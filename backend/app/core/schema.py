@@ -0,0 +1,76 @@
+"""Process-cached schema capability map
+
+Code that has to cope with databases not yet migrated asks this map which
+tables, columns and indexes exist instead of running an inspector on every request.
+Each table is inspected once per process, on first use; run migrations
+before starting the API so the map reflects the final schema.
+"""
+import logging
+import threading
+from typing import Dict, FrozenSet, Iterable, Optional
+
+from sqlalchemy import inspect
+
+from app.core.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+class SchemaCapabilities:
+    """Tables, columns and indexes of the connected database, inspected once per process"""
+
+    def __init__(self, bind=engine):
+        self._bind = bind
+        self._tables: Optional[FrozenSet[str]] = None
+        self._columns: Dict[str, FrozenSet[str]] = {}
+        self._indexes: Dict[str, FrozenSet[str]] = {}
+        self._lock = threading.Lock()
+
+    def tables(self) -> FrozenSet[str]:
+        if self._tables is None:
+            with self._lock:
+                if self._tables is None:
+                    self._tables = frozenset(inspect(self._bind).get_table_names())
+        return self._tables
+
+    def columns(self, table_name: str) -> FrozenSet[str]:
+        columns = self._columns.get(table_name)
+        if columns is None:
+            if table_name in self.tables():
+                columns = frozenset(column["name"] for column in inspect(self._bind).get_columns(table_name))
+            else:
+                columns = frozenset()
+            with self._lock:
+                self._columns[table_name] = columns
+        return columns
+
+    def indexes(self, table_name: str) -> FrozenSet[str]:
+        indexes = self._indexes.get(table_name)
+        if indexes is None:
+            if table_name in self.tables():
+                indexes = frozenset(index["name"] for index in inspect(self._bind).get_indexes(table_name))
+            else:
+                indexes = frozenset()
+            with self._lock:
+                self._indexes[table_name] = indexes
+        return indexes
+
+    def has_table(self, table_name: str) -> bool:
+        return table_name in self.tables()
+
+    def has_column(self, table_name: str, column_name: str) -> bool:
+        return column_name in self.columns(table_name)
+
+    def missing_columns(self, table_name: str, column_names: Iterable[str]) -> list:
+        columns = self.columns(table_name)
+        return [name for name in column_names if name not in columns]
+
+    def refresh(self) -> None:
+        """Forget the inspected schema (e.g. after running migrations)"""
+        with self._lock:
+            self._tables = None
+            self._columns.clear()
+            self._indexes.clear()
+
+
+schema_capabilities = SchemaCapabilities()
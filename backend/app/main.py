@@ -15,9 +15,8 @@ from app.core.database import get_db
 from app.api.auth import get_current_user
 from app.models.user import User
 from app.config import get_settings
-from app.core.database import engine, Base
 from app.api import auth, jobs, users, colleges, institutions, global_content, bulk_upload, promotion, training_sessions, attendance, academic, resume, mock_interviews, hall_tickets, notifications, announcements, coding_labs, proctoring, lab_management, intelligent_lab, coding_problems, analytics, migration, company_training, comprehensive_analytics, analytics_drilldown, resume_analytics, job_rounds, job_analytics, job_applications
-from app.api import mock_interview_ai, question_bank, quiz_analytics
+from app.api import mock_interview_ai, question_bank, quiz_analytics, applicant_ranking, metrics
 
 settings = get_settings()
 
@@ -218,6 +217,7 @@ app.include_router(auth.router, prefix=settings.API_V1_STR)
 app.include_router(job_analytics.router, prefix=settings.API_V1_STR)
 app.include_router(job_rounds.router, prefix=settings.API_V1_STR)
 app.include_router(job_applications.router, prefix=settings.API_V1_STR)
+app.include_router(applicant_ranking.router, prefix=settings.API_V1_STR)
 app.include_router(jobs.router, prefix=settings.API_V1_STR)
 app.include_router(users.router, prefix=settings.API_V1_STR)
 app.include_router(colleges.router, prefix=settings.API_V1_STR)
@@ -247,7 +247,9 @@ app.include_router(company_training.router, prefix=settings.API_V1_STR)
 app.include_router(resume_analytics.router, prefix=settings.API_V1_STR)
 app.include_router(question_bank.router, prefix=settings.API_V1_STR)
 app.include_router(quiz_analytics.router, prefix=settings.API_V1_STR)
-# Note: job_analytics, job_rounds, and job_applications are registered above before jobs.router
+# Prometheus scrape target, at the root like /health
+app.include_router(metrics.router)
+# Note: job_analytics, job_rounds, job_applications, and applicant_ranking are registered above before jobs.router
 
 # WebSocket endpoint for coding labs monitoring
 @app.websocket("/ws/coding-labs/{lab_id}")
@@ -285,8 +287,20 @@ async def websocket_coding_labs(
             await websocket.close(code=1008, reason="Invalid user")
             return
         
+        # Faculty/admins monitor the lab; everyone else is a student being monitored
+        from app.models.user import UserRole, RoleEnum
+        db = SessionLocal()
+        try:
+            role_names = [r.role for r in db.query(UserRole).filter(UserRole.user_id == user_id).all()]
+        finally:
+            db.close()
+        is_monitor = any(
+            role in role_names
+            for role in (RoleEnum.FACULTY, RoleEnum.HOD, RoleEnum.ADMIN, RoleEnum.SUPER_ADMIN)
+        )
+        
         # Connect to monitoring manager
-        await manager.connect(websocket, lab_id, user_id)
+        await manager.connect(websocket, lab_id, user_id, is_monitor=is_monitor)
         
         # Handle WebSocket messages
         try:
@@ -298,6 +312,7 @@ async def websocket_coding_labs(
                     await manager.send_personal_message({"type": "pong"}, websocket)
                 
                 elif message_type == "activity_update":
+                    # Coalesced: monitors receive changed students on the next broadcast tick
                     manager.update_activity(
                         lab_id=lab_id,
                         user_id=user_id,
@@ -307,21 +322,19 @@ async def websocket_coding_labs(
                         tab_switches=data.get("tab_switches", 0),
                         fullscreen_exits=data.get("fullscreen_exits", 0)
                     )
-                    
-                    # Broadcast update
-                    activities = manager.get_lab_activities(lab_id)
-                    await manager.broadcast_to_lab(lab_id, {
-                        "type": "activity_update",
-                        "activities": [a.dict() for a in activities]
-                    })
                 
                 elif message_type == "get_activities":
-                    activities = manager.get_lab_activities(lab_id)
                     await manager.send_personal_message({
                         "type": "activities",
-                        "activities": [a.dict() for a in activities]
+                        "activities": await manager.get_activity_snapshot(lab_id, user_id, is_monitor)
                     }, websocket)
                 
+                elif message_type == "get_code" and is_monitor:
+                    # Full code is only sent to monitors, on demand
+                    student_code = await manager.get_student_code(lab_id, data.get("user_id"))
+                    if student_code:
+                        await manager.send_personal_message(student_code, websocket)
+                
                 elif message_type == "code_change":
                     manager.update_activity(
                         lab_id=lab_id,
@@ -342,86 +355,35 @@ async def websocket_coding_labs(
         logger.error(f"WebSocket authentication error: {e}", exc_info=True)
         await websocket.close(code=1008, reason="Authentication failed")
 
-# Create database tables
+# Schema migrations run once per deploy (alembic upgrade head / scripts/migrate.py)
 @app.on_event("startup")
 async def startup():
-    """Create database tables on startup and run migrations"""
-    import sys
-    Base.metadata.create_all(bind=engine)
-    
-    # Add missing columns if they don't exist (migration)
-    # CRITICAL: Run this synchronously and ensure it completes before app accepts requests
-    try:
-        from sqlalchemy import text, inspect
-        from sqlalchemy.exc import ProgrammingError, OperationalError
-        
-        inspector = inspect(engine)
-        
-        if 'coding_problems' in inspector.get_table_names():
-            columns = [col['name'] for col in inspector.get_columns('coding_problems')]
-            print(f"[MIGRATION] Current columns in coding_problems: {columns}", file=sys.stderr)
-            sys.stderr.flush()
-            
-            # Add problem_code column if missing
-            if 'problem_code' not in columns:
-                print("🔄 Adding problem_code column to coding_problems table...", file=sys.stderr)
-                sys.stderr.flush()
-                try:
-                    with engine.begin() as conn:  # Use begin() for automatic transaction management
-                        conn.execute(text("""
-                            ALTER TABLE coding_problems 
-                            ADD COLUMN IF NOT EXISTS problem_code VARCHAR(100)
-                        """))
-                        conn.execute(text("""
-                            CREATE INDEX IF NOT EXISTS idx_coding_problems_problem_code 
-                            ON coding_problems(problem_code)
-                        """))
-                    print("✅ Added problem_code column and index", file=sys.stderr)
-                    sys.stderr.flush()
-                except (ProgrammingError, OperationalError) as e:
-                    # Column might already exist or other error
-                    if "already exists" not in str(e).lower() and "duplicate" not in str(e).lower():
-                        print(f"⚠️  Error adding problem_code: {e}", file=sys.stderr)
-                        sys.stderr.flush()
-            
-            # Add year_str column if missing - CRITICAL FIX
-            if 'year_str' not in columns:
-                print("🔄 Adding year_str column to coding_problems table...", file=sys.stderr)
-                sys.stderr.flush()
-                try:
-                    # Use explicit connection with commit
-                    conn = engine.connect()
-                    trans = conn.begin()
-                    try:
-                        conn.execute(text("ALTER TABLE coding_problems ADD COLUMN year_str VARCHAR(20)"))
-                        trans.commit()
-                        print("✅ Added year_str column", file=sys.stderr)
-                        sys.stderr.flush()
-                    except Exception as add_error:
-                        trans.rollback()
-                        error_msg = str(add_error).lower()
-                        if "already exists" not in error_msg and "duplicate" not in error_msg:
-                            raise add_error
-                        else:
-                            print("ℹ️  year_str column already exists", file=sys.stderr)
-                            sys.stderr.flush()
-                    finally:
-                        conn.close()
-                except Exception as e:
-                    error_msg = str(e).lower()
-                    if "already exists" not in error_msg and "duplicate" not in error_msg:
-                        print(f"⚠️  Error adding year_str: {e}", file=sys.stderr)
-                        import traceback
-                        print(f"⚠️  Traceback:\n{traceback.format_exc()}", file=sys.stderr)
-                        sys.stderr.flush()
-            else:
-                print("ℹ️  year_str column already exists", file=sys.stderr)
-                sys.stderr.flush()
-    except Exception as e:
-        import traceback
-        print(f"⚠️  Migration error: {e}", file=sys.stderr)
-        print(f"⚠️  Traceback:\n{traceback.format_exc()}", file=sys.stderr)
-        sys.stderr.flush()
+    """Optionally bring the schema to head (RUN_MIGRATIONS_ON_STARTUP, for local dev); start the email sender"""
+    if settings.RUN_MIGRATIONS_ON_STARTUP:
+        from starlette.concurrency import run_in_threadpool
+        from app.core.migrations import run_migrations
+        await run_in_threadpool(run_migrations)
+    from app.services.email_delivery import email_sender
+    from app.core.metrics import metrics_registry
+    email_sender.start()  # Delivers emails queued before a restart
+    metrics_registry.start()
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Release the lab monitoring backplane, persist buffered quiz answers, stop the email sender and PDF render pool, close async DB connections"""
+    from app.services.websocket_monitor import manager
+    from app.services.quiz_attempt_engine import quiz_attempt_engine
+    from app.services.email_delivery import email_sender
+    from app.services.pdf_render_service import pdf_renderer
+    from app.core.metrics import metrics_registry
+    from app.core.database import async_engine
+    await manager.close()
+    quiz_attempt_engine.shutdown()
+    email_sender.shutdown()
+    pdf_renderer.shutdown()
+    metrics_registry.shutdown()
+    await async_engine.dispose()
 
 
 @app.get("/")
@@ -7,13 +7,14 @@ from app.models.notification import Notification
 from app.models.user_notification import UserNotification
 from app.models.job import Job, JobApplication
 from app.models.job_round import JobRound, JobApplicationRound
+from app.models.email_outbox import EmailOutbox
 from app.models.audit_log import AuditLog
 from app.models.quiz import Quiz, CodingProblem, QuizAttempt
 from app.models.question_bank import QuestionBank
 from app.models.coding_submission import CodingSubmission
 from app.models.user_saved_code import UserSavedCode
 from app.models.training_session import TrainingSession
-from app.models.attendance import Attendance
+from app.models.attendance import Attendance, AttendanceDailyCube
 from app.models.academic import (
     AcademicYear,
     Department,
@@ -74,8 +75,12 @@ from app.models.user_analytics import (
 )
 from app.models.resume_analytics import (
     ResumeAnalytics,
-    StudentResumeProgress
+    StudentResumeProgress,
+    StudentResume,
+    JobRankingRun,
+    JobApplicantScore
 )
+from app.models.proctoring import ProctoringViolation, ProctoringSession
 
 __all__ = [
     "User",
@@ -95,6 +100,7 @@ __all__ = [
     "JobApplication",
     "JobRound",
     "JobApplicationRound",
+    "EmailOutbox",
     "AuditLog",
     "Quiz",
     "CodingProblem",
@@ -104,6 +110,7 @@ __all__ = [
     "CodingSubmission",
     "TrainingSession",
     "Attendance",
+    "AttendanceDailyCube",
     "AcademicYear",
     "Department",
     "Semester",
@@ -150,5 +157,10 @@ __all__ = [
     "RoundType",
     "ResumeAnalytics",
     "StudentResumeProgress",
+    "StudentResume",
+    "JobRankingRun",
+    "JobApplicantScore",
+    "ProctoringViolation",
+    "ProctoringSession",
 ]
 
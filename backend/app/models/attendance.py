@@ -1,5 +1,5 @@
 """Attendance model"""
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Date, UniqueConstraint, Text, Boolean
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Date, UniqueConstraint, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -54,3 +54,37 @@ class Attendance(Base):
     section_rel = relationship("Section", foreign_keys=[section_id])
     approver = relationship("User", foreign_keys=[approved_by])
 
+
+
+class AttendanceDailyCube(Base):
+    """Attendance status counts per student, subject and day (pre-aggregated for analytics)
+
+    One row per (college, department, section, subject, student, date) combination
+    present in the attendance table; maintained from Attendance writes when
+    ATTENDANCE_CUBE_ENABLED is set.
+    """
+    __tablename__ = "attendance_daily_cube"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    college_id = Column(Integer, nullable=True)
+    department_id = Column(Integer, nullable=True)
+    section_id = Column(Integer, nullable=True)
+    subject_id = Column(Integer, nullable=True)
+    student_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    date = Column(Date, nullable=False)
+    
+    # Status counts (one attendance record per period)
+    total = Column(Integer, default=0, nullable=False)
+    present = Column(Integer, default=0, nullable=False)
+    absent = Column(Integer, default=0, nullable=False)
+    late = Column(Integer, default=0, nullable=False)
+    excused = Column(Integer, default=0, nullable=False)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        Index("idx_attendance_cube_student_date", "student_id", "date"),
+        Index("idx_attendance_cube_college_date", "college_id", "date"),
+        Index("idx_attendance_cube_department_date", "department_id", "date"),
+        Index("idx_attendance_cube_subject_date", "subject_id", "date"),
+    )
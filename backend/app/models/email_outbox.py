@@ -0,0 +1,33 @@
+"""Email outbox model - emails queued for background SMTP delivery"""
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class EmailOutbox(Base):
+    """An email waiting to be sent (or sent / given up on) by the outbox sender"""
+    __tablename__ = "email_outbox"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    to_emails = Column(JSON, nullable=False)  # List of recipient addresses
+    subject = Column(String(500), nullable=False)
+    html_body = Column(Text, nullable=False)
+    text_body = Column(Text, nullable=True)
+    
+    # Delivery state
+    status = Column(String(20), nullable=False, default="pending")  # "pending", "sending", "sent", "failed"
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text, nullable=True)
+    
+    # Set while a sender holds the message, so other workers skip it
+    claim_token = Column(String(64), nullable=True)
+    claimed_at = Column(DateTime(timezone=True), nullable=True)
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        # Due messages are picked by (status, next_attempt_at)
+        Index("idx_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
@@ -1,5 +1,5 @@
 """Intelligent Lab Module - Enhanced Models for CodeTantra-like System"""
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, Enum, JSON, Date, Time
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Boolean, Float, Enum, JSON, Date, Time, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -352,6 +352,11 @@ class StudentLabProgress(Base):
     lab = relationship("CodingLab", backref="student_progress")
     user = relationship("User", backref="lab_progress")
     current_session = relationship("LabSessionEnhanced", foreign_keys=[current_session_id])
+    
+    # Leaderboard load: one lab's rows in rank order
+    __table_args__ = (
+        Index("idx_student_lab_progress_lab_rank", "lab_id", "overall_percentage"),
+    )
 
 
 class CodePlayback(Base):
@@ -19,7 +19,7 @@ class Profile(Base):
     department_id = Column(Integer, ForeignKey("departments.id", ondelete="SET NULL"), nullable=True, index=True)  # Link to Department
     section = Column(String(100), nullable=True)  # Backward compatibility - section name
     section_id = Column(Integer, ForeignKey("sections.id", ondelete="SET NULL"), nullable=True, index=True)  # Link to Section
-    roll_number = Column(String(50), nullable=True)
+    roll_number = Column(String(50), nullable=True, index=True)
     staff_id = Column(String(50), nullable=True, index=True)  # Staff ID for faculty/HOD/admin (used as login ID)
     present_year = Column(String(20), nullable=True)  # e.g., "1st", "2nd", "3rd", "4th", "5th"
     # For faculty/HOD: years and sections they handle (stored as comma-separated strings)
@@ -1,5 +1,5 @@
 """Resume Analytics Models - Track resume usage, ATS scores, and optimizations"""
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, JSON, Float
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, JSON, Float, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -98,3 +98,61 @@ class StudentResumeProgress(Base):
         {'sqlite_autoincrement': True},
     )
 
+
+
+class StudentResume(Base):
+    """Latest resume data saved by a student (used for server-side ATS ranking)"""
+    __tablename__ = "student_resumes"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, unique=True, index=True)
+    
+    resume_data = Column(JSON, nullable=False)  # Same shape as the resume builder's ResumeData
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    
+    # Relationships
+    user = relationship("User", backref="saved_resume")
+
+
+class JobRankingRun(Base):
+    """A batch run that scores every applicant of a job with the rule-based ATS scorer"""
+    __tablename__ = "job_ranking_runs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    status = Column(String(20), nullable=False, default="PENDING")  # PENDING, RUNNING, COMPLETED, FAILED
+    total = Column(Integer, default=0, nullable=False)  # Applicants to score
+    processed = Column(Integer, default=0, nullable=False)  # Applicants scored so far
+    error_message = Column(Text, nullable=True)
+    
+    started_by = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Last progress write by the worker
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class JobApplicantScore(Base):
+    """Persisted ATS score of one application, ranked within its job"""
+    __tablename__ = "job_applicant_scores"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), nullable=False, index=True)
+    job_application_id = Column(Integer, ForeignKey("job_applications.id", ondelete="CASCADE"), nullable=False, unique=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    run_id = Column(Integer, ForeignKey("job_ranking_runs.id", ondelete="SET NULL"), nullable=True)
+    
+    score = Column(Integer, nullable=False)  # ATS score (0-100)
+    rank = Column(Integer, nullable=False)  # 1 = best within the job
+    breakdown = Column(JSON, nullable=True)
+    missing_keywords = Column(JSON, nullable=True)
+    has_resume = Column(Boolean, default=False, nullable=False)  # False = scored from profile only
+    
+    scored_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    __table_args__ = (
+        Index("idx_job_applicant_scores_job_rank", "job_id", "rank"),
+    )
@@ -1,5 +1,5 @@
 """User authentication and role models"""
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -26,12 +26,17 @@ class User(Base):
     password_hash = Column(String(255), nullable=False)
     is_active = Column(String(10), default="true")
     is_verified = Column(String(10), default="false")
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     roles = relationship("UserRole", back_populates="user", cascade="all, delete-orphan")
     profile = relationship("Profile", back_populates="user", uselist=False, cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Keyset pagination of user listings
+        Index("idx_users_created_at_id", "created_at", "id"),
+    )
 
 
 class UserRole(Base):
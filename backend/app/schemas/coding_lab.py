@@ -415,7 +415,7 @@ class LabAnalyticsResponse(BaseModel):
 class StudentActivity(BaseModel):
     user_id: int
     lab_id: int
-    problem_id: Optional[int]
+    problem_id: Optional[int] = None
     current_code: Optional[str] = None
     language: Optional[str] = None
     time_spent_seconds: int = 0
@@ -120,7 +120,8 @@ class QuizAttemptCreate(BaseModel):
 
 
 class QuizAttemptUpdate(BaseModel):
-    answers: Optional[List[QuizAnswerSchema]] = None
+    answers: Optional[List[QuizAnswerSchema]] = None  # Full list - replaces all answers
+    answer_deltas: Optional[Dict[int, Optional[QuizAnswerSchema]]] = None  # question_index -> answer (null clears)
 
 
 class QuizAttemptResponse(BaseModel):
@@ -142,6 +143,14 @@ class QuizAttemptResponse(BaseModel):
         from_attributes = True
 
 
+class QuizGradingResponse(BaseModel):
+    quiz_id: int
+    answer_key_version: str
+    graded: int  # Submitted attempts (re)graded
+    auto_submitted: int  # Expired open attempts submitted and graded
+    regrade: bool
+
+
 class CodingProblemBase(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
     description: str
@@ -378,6 +378,9 @@ class LabLeaderboardResponse(BaseModel):
     average_score: float
     top_score: float
     last_updated: datetime
+    skip: int = 0
+    limit: Optional[int] = None
+    my_rank: Optional[LeaderboardEntry] = None
 
     class Config:
         from_attributes = True
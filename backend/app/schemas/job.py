@@ -95,3 +95,43 @@ class JobApplicationResponse(JobApplicationBase):
     class Config:
         from_attributes = True
 
+
+
+class JobRankingRunResponse(BaseModel):
+    """Schema for an applicant ranking run (progress = processed / total)"""
+    id: int
+    job_id: int
+    status: str
+    total: int
+    processed: int
+    error_message: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class RankedApplicantResponse(BaseModel):
+    """Schema for one applicant in a job's ATS ranking"""
+    rank: int
+    score: int
+    job_application_id: int
+    user_id: int
+    full_name: Optional[str] = None
+    email: Optional[str] = None
+    roll_number: Optional[str] = None
+    department: Optional[str] = None
+    has_resume: bool
+    breakdown: Optional[dict] = None
+    missing_keywords: Optional[List[str]] = None
+    scored_at: datetime
+
+
+class RankedApplicantPage(BaseModel):
+    """Paginated ATS ranking of a job's applicants"""
+    job_id: int
+    total: int
+    skip: int
+    limit: int
+    items: List[RankedApplicantResponse]
@@ -13,6 +13,7 @@ from enum import Enum
 from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
 from functools import lru_cache
 import hashlib
+from app.core.metrics import track_llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,21 @@ AVAILABLE_MODELS = [
     "llama3.2:1b",      # Ultra-fast, basic quality
 ]
 
+# Context window sizes (tokens) used to size batched prompts
+MODEL_CONTEXT_TOKENS = {
+    "llama3.1:8b": 8192,
+    "mistral:7b": 8192,
+    "llama3.2:3b": 8192,
+    "llama3.2:1b": 8192,
+}
+DEFAULT_CONTEXT_TOKENS = 4096  # Conservative default for unknown models
+CHARS_PER_TOKEN = 4  # Rough estimate for English text
+MAX_BATCH_SIZE = int(os.getenv("AI_MAX_BATCH_SIZE", "8"))  # Projects per batched call
+
+# Expected output tokens per item in batched calls
+REWRITE_OUTPUT_TOKENS = 400
+RELEVANCE_OUTPUT_TOKENS = 250
+
 class OptimizationLevel(str, Enum):
     """Optimization intensity levels"""
     BASIC = "basic"          # Quick enhancements
@@ -115,7 +131,8 @@ def _call_ollama_advanced(
         }
         
         logger.info(f"Calling Ollama Chat API with model: {model}")
-        response = requests.post(url, json=payload, timeout=OLLAMA_TIMEOUT)
+        with track_llm_call("ollama", model):
+            response = requests.post(url, json=payload, timeout=OLLAMA_TIMEOUT)
         
         if response.status_code != 200:
             # Fallback to /api/generate if chat API not available
@@ -135,7 +152,8 @@ def _call_ollama_advanced(
                     "repeat_penalty": 1.15,
                 }
             }
-            response = requests.post(url, json=payload, timeout=OLLAMA_TIMEOUT)
+            with track_llm_call("ollama", model):
+                response = requests.post(url, json=payload, timeout=OLLAMA_TIMEOUT)
         
         if response.status_code != 200:
             error_msg = f"Ollama API error: {response.status_code} - {response.text}"
@@ -181,6 +199,84 @@ def _call_ollama_advanced(
         raise
 
 
+@lru_cache(maxsize=16)
+def _load_prompt(filename: str, default: str) -> str:
+    """Read a prompt template from app/prompts once per process"""
+    prompt_file = os.path.join(os.path.dirname(__file__), "..", "prompts", filename)
+    if os.path.exists(prompt_file):
+        with open(prompt_file, 'r', encoding='utf-8') as f:
+            return f.read()
+    return default
+
+
+def _chunk_for_context(
+    blocks: List[str],
+    fixed_chars: int,
+    output_tokens_per_item: int,
+    model: Optional[str] = None,
+    max_items: int = MAX_BATCH_SIZE
+) -> List[List[int]]:
+    """
+    Split prompt blocks into chunks that fit the model's context window.
+    Each chunk reserves room for the fixed prompt text and the JSON output
+    of every item. Returns lists of indexes into blocks.
+    """
+    context_tokens = MODEL_CONTEXT_TOKENS.get(model or "", DEFAULT_CONTEXT_TOKENS)
+    budget = context_tokens - fixed_chars // CHARS_PER_TOKEN
+    
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    used = 0
+    for idx, block in enumerate(blocks):
+        cost = len(block) // CHARS_PER_TOKEN + output_tokens_per_item
+        if current and (used + cost > budget or len(current) >= max_items):
+            chunks.append(current)
+            current, used = [], 0
+        current.append(idx)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _call_ollama_batch(
+    prompt: str,
+    system_prompt: str,
+    count: int,
+    temperature: float = 0.5,
+    max_tokens: int = 4000,
+    model: Optional[str] = None
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Call Ollama with a batched prompt that asks for {"results": [{"index": i, ...}]}.
+    Returns items keyed by index; items missing or malformed in the response are omitted
+    so callers can retry just those individually.
+    """
+    result = _call_ollama_advanced(
+        prompt=prompt,
+        system_prompt=system_prompt,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        model=model
+    )
+    items = result.get("results") if isinstance(result, dict) else result
+    if not isinstance(items, list):
+        logger.warning(f"Batched response has no results array: {type(items)}")
+        return {}
+    
+    by_index: Dict[int, Dict[str, Any]] = {}
+    for position, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        try:
+            idx = int(item.get("index", position))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= idx < count and idx not in by_index:
+            by_index[idx] = item
+    return by_index
+
+
 def detect_industry(resume_data: Dict[str, Any], job_description: Optional[str] = None) -> Industry:
     """
     Intelligently detect the target industry from resume and job description
@@ -481,6 +577,9 @@ Return JSON format:
         }
 
 
+RELEVANCE_SYSTEM_PROMPT = "You are an expert career advisor analyzing project relevance for job applications. Be fair and realistic."
+
+
 def analyze_project_relevance(
     project: Dict[str, Any],
     target_role: str,
@@ -491,13 +590,10 @@ def analyze_project_relevance(
     Returns: project_title, relevant (bool), relevance_score (0-100), reason, suggestion
     """
     try:
-        # Read the prompt template
-        prompt_file = os.path.join(os.path.dirname(__file__), "..", "prompts", "projectRelevanceAnalysis.prompt.txt")
-        system_prompt = "You are an expert career advisor analyzing project relevance for job applications. Be fair and realistic."
-        
-        if os.path.exists(prompt_file):
-            with open(prompt_file, 'r', encoding='utf-8') as f:
-                system_prompt = f.read()
+        system_prompt = _load_prompt(
+            "projectRelevanceAnalysis.prompt.txt",
+            RELEVANCE_SYSTEM_PROMPT
+        )
         
         project_title = project.get('project_title', 'Untitled Project')
         project_description = project.get('description', '')
@@ -537,24 +633,7 @@ Return JSON only (no markdown, no code blocks):
             logger.warning(f"Unexpected result type: {type(result)}, defaulting to relevant")
             result = {}
         
-        # Ensure all required fields exist with safe defaults (defaulting to relevant)
-        analysis = {
-            "project_title": project_title,
-            "relevant": result.get("relevant", True),  # Default to relevant if unclear
-            "relevance_score": result.get("relevance_score", 75),
-            "reason": result.get("reason", "Project demonstrates relevant skills"),
-            "suggestion": result.get("suggestion", "This project strengthens your resume")
-        }
-        
-        # If score is >= 40, mark as relevant (lenient threshold)
-        # This ensures AI-suggested projects (which typically score 80-100) are always marked relevant
-        if analysis["relevance_score"] >= 40:
-            analysis["relevant"] = True
-        
-        # Ensure boolean type
-        analysis["relevant"] = bool(analysis["relevant"])
-        
-        return analysis
+        return _normalize_relevance_analysis(project_title, result)
         
     except Exception as e:
         logger.error(f"Project relevance analysis failed: {e}")
@@ -568,6 +647,132 @@ Return JSON only (no markdown, no code blocks):
         }
 
 
+def _normalize_relevance_analysis(project_title: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill defaults for a relevance result and apply the lenient relevance threshold"""
+    # Ensure all required fields exist with safe defaults (defaulting to relevant)
+    analysis = {
+        "project_title": project_title,
+        "relevant": result.get("relevant", True),  # Default to relevant if unclear
+        "relevance_score": result.get("relevance_score", 75),
+        "reason": result.get("reason", "Project demonstrates relevant skills"),
+        "suggestion": result.get("suggestion", "This project strengthens your resume")
+    }
+    
+    # If score is >= 40, mark as relevant (lenient threshold)
+    # This ensures AI-suggested projects (which typically score 80-100) are always marked relevant
+    if analysis["relevance_score"] >= 40:
+        analysis["relevant"] = True
+    
+    # Ensure boolean type
+    analysis["relevant"] = bool(analysis["relevant"])
+    
+    return analysis
+
+
+def _is_valid_batch_relevance(item: Dict[str, Any]) -> bool:
+    """A batched relevance result is usable when it has a numeric 0-100 score"""
+    score = item.get("relevance_score")
+    return isinstance(score, (int, float)) and not isinstance(score, bool) and 0 <= score <= 100
+
+
+def analyze_projects_relevance_batch(
+    projects: List[Dict[str, Any]],
+    target_role: str,
+    job_description: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Analyze relevance of many projects with one LLM call per context-sized chunk.
+    The system prompt and job description are sent once per chunk instead of once
+    per project. Items that fail validation fall back to analyze_project_relevance.
+    Returns analyses in the same order as projects.
+    """
+    if not projects:
+        return []
+    
+    system_prompt = _load_prompt("projectRelevanceAnalysis.prompt.txt", RELEVANCE_SYSTEM_PROMPT)
+    jd_text = f'Job Description (first 1000 chars): {job_description[:1000]}' if job_description else 'No job description provided'
+    
+    blocks = []
+    for project in projects:
+        technologies = project.get('technologies_used', [])
+        contributions = project.get('contributions', [])
+        blocks.append(
+            f"- Title: {project.get('project_title', 'Untitled Project')}\n"
+            f"- Description: {project.get('description', '')}\n"
+            f"- Technologies: {', '.join(technologies) if technologies else 'Not specified'}\n"
+            f"- Contributions: {', '.join(contributions[:3]) if contributions else 'Not specified'}"
+        )
+    
+    model = _find_best_available_model()
+    chunks = _chunk_for_context(
+        blocks,
+        fixed_chars=len(system_prompt) + len(jd_text) + 1000,
+        output_tokens_per_item=RELEVANCE_OUTPUT_TOKENS,
+        model=model
+    )
+    
+    analyses: List[Optional[Dict[str, Any]]] = [None] * len(projects)
+    for chunk in chunks:
+        projects_text = "\n\n".join(
+            f"Project [{local_idx}]:\n{blocks[idx]}" for local_idx, idx in enumerate(chunk)
+        )
+        user_prompt = f"""Target Role: {target_role}
+
+{jd_text}
+
+Projects to Analyze ({len(chunk)}):
+{projects_text}
+
+Analyze if each project is relevant for the {target_role} role. Be FAIR - a project is relevant if it demonstrates ANY useful skills or technologies for the role, even if not a perfect match.
+
+Return JSON only (no markdown, no code blocks), with exactly one entry per project, keeping the bracketed index:
+{{
+  "results": [
+    {{
+      "index": 0,
+      "project_title": "exact title",
+      "relevant": true/false,
+      "relevance_score": 0-100,
+      "reason": "detailed explanation",
+      "suggestion": "actionable advice"
+    }}
+  ]
+}}"""
+        try:
+            results = _call_ollama_batch(
+                prompt=user_prompt,
+                system_prompt=system_prompt,
+                count=len(chunk),
+                temperature=0.5,
+                max_tokens=RELEVANCE_OUTPUT_TOKENS * len(chunk),
+                model=model
+            )
+        except Exception as e:
+            logger.warning(f"Batched relevance analysis failed for {len(chunk)} project(s): {e}")
+            results = {}
+        
+        for local_idx, idx in enumerate(chunk):
+            item = results.get(local_idx)
+            if item is not None and _is_valid_batch_relevance(item):
+                analyses[idx] = _normalize_relevance_analysis(
+                    projects[idx].get('project_title', 'Untitled Project'), item
+                )
+    
+    # Per-item fallback only for projects the batch could not answer
+    retry_indexes = [idx for idx, analysis in enumerate(analyses) if analysis is None]
+    if retry_indexes:
+        logger.info(f"Batched relevance: {len(retry_indexes)} project(s) need individual calls")
+        with ThreadPoolExecutor(max_workers=min(4, len(retry_indexes))) as executor:
+            futures = {
+                idx: executor.submit(analyze_project_relevance, projects[idx], target_role, job_description)
+                for idx in retry_indexes
+            }
+            for idx, future in futures.items():
+                analyses[idx] = future.result()
+    
+    return analyses
+
+
 def rank_best_projects(
     projects: List[Dict[str, Any]],
     target_role: str,
@@ -728,25 +933,233 @@ def _get_cache_key(project: Dict[str, Any], target_role: Optional[str]) -> str:
     key_str = json.dumps(key_data, sort_keys=True)
     return hashlib.md5(key_str.encode()).hexdigest()
 
+
+def _cache_project(cache_key: str, project: Dict[str, Any]) -> None:
+    """Store a rewritten project, evicting the oldest entry when full"""
+    if len(_project_cache) >= _cache_max_size:
+        # Remove oldest entry (simple FIFO)
+        oldest_key = next(iter(_project_cache))
+        del _project_cache[oldest_key]
+    _project_cache[cache_key] = project
+
+
+def _find_fast_model() -> str:
+    """Pick the fastest installed model for short generations (falls back to the best model)"""
+    best_model = _find_best_available_model()
+    fast_models = ['llama3.2:3b', 'llama3.2:1b', 'mistral:7b', 'llama3.1:8b']
+    try:
+        response = requests.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=2)
+        if response.status_code == 200:
+            available_names = [m.get("name", "") for m in response.json().get("models", [])]
+            for model_name in fast_models:
+                if model_name in available_names:
+                    return model_name
+    except Exception:
+        pass  # Use best_model if check fails
+    return best_model
+
+
+def _split_sentences(text: str) -> List[str]:
+    """Split a description into sentences, dropping list markers and fragments"""
+    sentences = [s.strip() for s in text.replace('!', '.').replace('?', '.').split('.') if s.strip()]
+    return [s for s in sentences if len(s) > 10 and not s.strip().startswith(('-', '•', '*', '1.', '2.', '3.'))]
+
+
+def _finalize_project_rewrite(project: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Enforce the 3-sentence format on an AI rewrite and merge it into the original project"""
+    project_title = project.get('project_title') or project.get('title', 'Untitled Project')
+    current_description = project.get('description', '')
+    duration_start = project.get('duration_start')
+    duration_end = project.get('duration_end')
+
+    # Extract and validate description
+    new_description = result.get("description", current_description)
+
+    # Validate and enforce exactly 3 sentences
+    if new_description:
+        # Clean bullet points and list formatting
+        new_description = new_description.replace('•', '').replace('- ', '').replace('* ', '')
+        new_description = new_description.replace('\n', ' ').replace('\r', ' ')
+        # Remove multiple spaces
+        new_description = ' '.join(new_description.split())
+
+        sentences = _split_sentences(new_description)
+
+        if len(sentences) != 3:
+            logger.warning(f"Project {project_title}: Expected 3 sentences, got {len(sentences)}. Fixing...")
+
+            # Fix sentence count
+            if len(sentences) < 3:
+                # Add generic impactful sentences if needed
+                while len(sentences) < 3:
+                    if len(sentences) == 0:
+                        sentences.append(f"Developed {project_title} to address critical business needs and deliver measurable value.")
+                    elif len(sentences) == 1:
+                        sentences.append(f"Implemented using modern technologies and best practices to ensure scalability and performance.")
+                    else:
+                        sentences.append(f"Achieved significant impact with measurable improvements in efficiency and user satisfaction.")
+            elif len(sentences) > 3:
+                # Combine extra sentences intelligently
+                # Keep first 2 sentences, combine rest into third
+                first_two = sentences[:2]
+                remaining = '. '.join(sentences[2:])
+                sentences = first_two + [remaining]
+
+            # Ensure we have exactly 3
+            sentences = sentences[:3]
+            while len(sentences) < 3:
+                sentences.append("Delivered measurable results and improved overall system performance.")
+
+            new_description = '. '.join(sentences) + '.'
+
+        # Final validation - ensure exactly 3 sentences
+        final_sentences = [s.strip() for s in new_description.split('.') if s.strip() and len(s.strip()) > 10]
+        if len(final_sentences) != 3:
+            logger.error(f"Project {project_title}: Still not 3 sentences after fix ({len(final_sentences)}). Using fallback.")
+            # Fallback: create 3 sentences from original description
+            if current_description:
+                words = current_description.split()[:50]  # First 50 words
+                chunk_size = len(words) // 3
+                new_description = '. '.join([
+                    ' '.join(words[:chunk_size]) + '.',
+                    ' '.join(words[chunk_size:chunk_size*2]) + '.',
+                    ' '.join(words[chunk_size*2:]) + ' Achieved significant impact and improved system performance.'
+                ])
+            else:
+                new_description = f"Developed {project_title} to address business requirements. Implemented using modern technologies and best practices. Achieved significant impact with measurable improvements in performance and user satisfaction."
+
+    # Final cleanup: ensure no bullet points or list formatting
+    final_description = (new_description or current_description or '').strip()
+    # Remove any remaining bullet points or list markers (Python string operations)
+    final_description = final_description.replace('•', '').replace('- ', '').replace('* ', '')
+    final_description = final_description.replace('\n', ' ').replace('\r', ' ')
+    # Remove multiple spaces
+    final_description = ' '.join(final_description.split()).strip()
+
+    return {
+        **project,  # Keep all original fields
+        "description": final_description,
+        "duration_start": result.get("duration_start") or duration_start,
+        "duration_end": result.get("duration_end") or duration_end,
+    }
+
+
+def _is_valid_batch_rewrite(item: Dict[str, Any]) -> bool:
+    """A batched rewrite is usable when it carries a multi-sentence description"""
+    description = item.get("description")
+    return isinstance(description, str) and len(_split_sentences(description)) >= 2
+
+
+def _format_project_for_rewrite(project: Dict[str, Any]) -> str:
+    """Compact project block used inside batched rewrite prompts"""
+    technologies = project.get('technologies_used', [])
+    contributions = project.get('contributions', [])
+    duration_start = project.get('duration_start')
+    duration_end = project.get('duration_end')
+    return (
+        f"Project Title: {project.get('project_title') or project.get('title', 'Untitled Project')}\n"
+        f"Current Description: {project.get('description', '')}\n"
+        f"Technologies: {', '.join(technologies) if technologies else 'Not specified'}\n"
+        f"Key Contributions: {'; '.join(contributions[:3]) if contributions else 'Not specified'}\n"
+        f"{f'Duration: {duration_start} to {duration_end}' if duration_start else 'No duration specified'}"
+    )
+
+
+def _rewrite_projects_batched(
+    projects_to_process: List[Tuple[Dict[str, Any], str]],
+    target_role: Optional[str],
+    system_prompt: str
+) -> Tuple[Dict[str, Dict[str, Any]], List[Tuple[Dict[str, Any], str]]]:
+    """
+    Rewrite many projects with one LLM call per context-sized chunk.
+    Returns (rewritten projects by cache key, projects that still need a per-item call)
+    """
+    model = _find_fast_model()
+    blocks = [_format_project_for_rewrite(project) for project, _ in projects_to_process]
+    chunks = _chunk_for_context(
+        blocks,
+        fixed_chars=len(system_prompt) + 1500,
+        output_tokens_per_item=REWRITE_OUTPUT_TOKENS,
+        model=model
+    )
+
+    rewritten: Dict[str, Dict[str, Any]] = {}
+    failed: List[Tuple[Dict[str, Any], str]] = []
+
+    for chunk in chunks:
+        projects_text = "\n\n".join(
+            f"[{local_idx}]\n{blocks[idx]}" for local_idx, idx in enumerate(chunk)
+        )
+        user_prompt = f"""Rewrite each of the {len(chunk)} project descriptions below to be consistent, professional, and EXACTLY 3 sentences (not more, not less).
+
+{f'Target Role: {target_role}' if target_role else ''}
+
+Every description must follow the same structure:
+1. Sentence 1: Explains what the project does and its purpose
+2. Sentence 2: Highlights technologies used and key features/functionality
+3. Sentence 3: Mentions quantifiable impact, scale, or notable achievements (MANDATORY)
+
+Projects:
+{projects_text}
+
+Return JSON only, with exactly one entry per project, keeping the bracketed index:
+{{
+  "results": [
+    {{
+      "index": 0,
+      "project_title": "exact project title",
+      "description": "EXACTLY 3 sentences separated by periods",
+      "duration_start": "preserve original",
+      "duration_end": "preserve original"
+    }}
+  ]
+}}"""
+
+        try:
+            results = _call_ollama_batch(
+                prompt=user_prompt,
+                system_prompt=system_prompt,
+                count=len(chunk),
+                temperature=0.5,
+                max_tokens=REWRITE_OUTPUT_TOKENS * len(chunk),
+                model=model
+            )
+        except Exception as e:
+            logger.warning(f"Batched project rewrite failed for {len(chunk)} project(s): {e}")
+            results = {}
+
+        for local_idx, idx in enumerate(chunk):
+            project, cache_key = projects_to_process[idx]
+            item = results.get(local_idx)
+            if item is None or not _is_valid_batch_rewrite(item):
+                failed.append((project, cache_key))
+                continue
+            rewritten_project = _finalize_project_rewrite(project, item)
+            _cache_project(cache_key, rewritten_project)
+            rewritten[cache_key] = rewritten_project
+
+    return rewritten, failed
+
+
 def rewrite_project_descriptions(
     projects: List[Dict[str, Any]],
-    target_role: Optional[str] = None
+    target_role: Optional[str] = None,
+    batched: bool = False
 ) -> List[Dict[str, Any]]:
     """
     Rewrite project descriptions to be consistent, professional, and impactful (3 sentences)
-    Uses parallel processing and caching for maximum speed
+    Uses parallel processing and caching for maximum speed.
+    With batched=True, uncached projects are packed into one prompt per context-sized chunk
+    and only items whose batched output fails validation get an individual call.
     """
     try:
         if not projects:
             return []
         
-        # Read the prompt template once (cached by Python's import system)
-        prompt_file = os.path.join(os.path.dirname(__file__), "..", "prompts", "rewriteProjectDescription.prompt.txt")
-        system_prompt = "You are an expert resume writer creating consistent, professional project descriptions."
-        
-        if os.path.exists(prompt_file):
-            with open(prompt_file, 'r', encoding='utf-8') as f:
-                system_prompt = f.read()
+        system_prompt = _load_prompt(
+            "rewriteProjectDescription.prompt.txt",
+            "You are an expert resume writer creating consistent, professional project descriptions."
+        )
         
         # Check cache first - HUGE speed boost for repeated requests
         cached_results = {}
@@ -765,6 +1178,14 @@ def rewrite_project_descriptions(
         if not projects_to_process:
             return [cached_results[key] for key in cache_order]
         
+        processed_results = {}
+        if batched:
+            processed_results, projects_to_process = _rewrite_projects_batched(
+                projects_to_process, target_role, system_prompt
+            )
+            if projects_to_process:
+                logger.info(f"Batched rewrite: {len(projects_to_process)} project(s) need individual calls")
+        
         # Process remaining projects in parallel for speed
         def rewrite_single_project(project_data: Tuple[Dict[str, Any], str]) -> Tuple[str, Dict[str, Any]]:
             """Rewrite a single project with timeout protection"""
@@ -802,30 +1223,12 @@ Return JSON only:
   "duration_end": "{duration_end or ''}"
 }}"""
 
-                # Use best available model for better quality
-                best_model = _find_best_available_model()
-                
-                # Use faster model for speed (prioritize speed over quality for this use case)
-                # Try smaller models first for faster response
-                fast_models = ['llama3.2:3b', 'llama3.2:1b', 'mistral:7b', 'llama3.1:8b']
-                model_to_use = best_model
-                try:
-                    response = requests.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=2)
-                    if response.status_code == 200:
-                        available_names = [m.get("name", "") for m in response.json().get("models", [])]
-                        for model_name in fast_models:
-                            if model_name in available_names:
-                                model_to_use = model_name
-                                break
-                except:
-                    pass  # Use best_model if check fails
-                
                 result = _call_ollama_advanced(
                     prompt=user_prompt,
                     system_prompt=system_prompt,
                     temperature=0.5,  # Lower temperature for more consistent, professional output
-                    max_tokens=400,   # Reduced for faster generation (3 sentences don't need 600 tokens)
-                    model=model_to_use  # Use fastest available model
+                    max_tokens=REWRITE_OUTPUT_TOKENS,  # 3 sentences don't need 600 tokens
+                    model=_find_fast_model()  # Prioritize speed over quality for this use case
                 )
                 
                 # Ensure result is a dict
@@ -833,87 +1236,8 @@ Return JSON only:
                     logger.warning(f"Unexpected result type for project rewrite: {type(result)}")
                     result = {}
                 
-                # Extract and validate description
-                new_description = result.get("description", current_description)
-                
-                # Validate and enforce exactly 3 sentences
-                if new_description:
-                    # Split by periods and clean up
-                    # Clean bullet points and list formatting
-                    new_description = new_description.replace('•', '').replace('- ', '').replace('* ', '')
-                    new_description = new_description.replace('\n', ' ').replace('\r', ' ')
-                    # Remove multiple spaces
-                    new_description = ' '.join(new_description.split())
-                    
-                    sentences = [s.strip() for s in new_description.replace('!', '.').replace('?', '.').split('.') if s.strip()]
-                    
-                    # Remove empty sentences and filter out bullet-like patterns
-                    sentences = [s for s in sentences if len(s) > 10 and not s.strip().startswith(('-', '•', '*', '1.', '2.', '3.'))]  # Minimum 10 chars per sentence
-                    
-                    if len(sentences) != 3:
-                        logger.warning(f"Project {project_title}: Expected 3 sentences, got {len(sentences)}. Fixing...")
-                        
-                        # Fix sentence count
-                        if len(sentences) < 3:
-                            # Add generic impactful sentences if needed
-                            while len(sentences) < 3:
-                                if len(sentences) == 0:
-                                    sentences.append(f"Developed {project_title} to address critical business needs and deliver measurable value.")
-                                elif len(sentences) == 1:
-                                    sentences.append(f"Implemented using modern technologies and best practices to ensure scalability and performance.")
-                                else:
-                                    sentences.append(f"Achieved significant impact with measurable improvements in efficiency and user satisfaction.")
-                        elif len(sentences) > 3:
-                            # Combine extra sentences intelligently
-                            # Keep first 2 sentences, combine rest into third
-                            first_two = sentences[:2]
-                            remaining = '. '.join(sentences[2:])
-                            sentences = first_two + [remaining]
-                        
-                        # Ensure we have exactly 3
-                        sentences = sentences[:3]
-                        while len(sentences) < 3:
-                            sentences.append("Delivered measurable results and improved overall system performance.")
-                        
-                        new_description = '. '.join(sentences) + '.'
-                    
-                    # Final validation - ensure exactly 3 sentences
-                    final_sentences = [s.strip() for s in new_description.split('.') if s.strip() and len(s.strip()) > 10]
-                    if len(final_sentences) != 3:
-                        logger.error(f"Project {project_title}: Still not 3 sentences after fix ({len(final_sentences)}). Using fallback.")
-                        # Fallback: create 3 sentences from original description
-                        if current_description:
-                            words = current_description.split()[:50]  # First 50 words
-                            chunk_size = len(words) // 3
-                            new_description = '. '.join([
-                                ' '.join(words[:chunk_size]) + '.',
-                                ' '.join(words[chunk_size:chunk_size*2]) + '.',
-                                ' '.join(words[chunk_size*2:]) + ' Achieved significant impact and improved system performance.'
-                            ])
-                        else:
-                            new_description = f"Developed {project_title} to address business requirements. Implemented using modern technologies and best practices. Achieved significant impact with measurable improvements in performance and user satisfaction."
-                
-                # Final cleanup: ensure no bullet points or list formatting
-                final_description = (new_description or current_description or '').strip()
-                # Remove any remaining bullet points or list markers (Python string operations)
-                final_description = final_description.replace('•', '').replace('- ', '').replace('* ', '')
-                final_description = final_description.replace('\n', ' ').replace('\r', ' ')
-                # Remove multiple spaces
-                final_description = ' '.join(final_description.split()).strip()
-                
-                rewritten_project = {
-                    **project,  # Keep all original fields
-                    "description": final_description,
-                    "duration_start": result.get("duration_start") or duration_start,
-                    "duration_end": result.get("duration_end") or duration_end,
-                }
-                
-                # Cache the result
-                if len(_project_cache) >= _cache_max_size:
-                    # Remove oldest entry (simple FIFO)
-                    oldest_key = next(iter(_project_cache))
-                    del _project_cache[oldest_key]
-                _project_cache[cache_key] = rewritten_project
+                rewritten_project = _finalize_project_rewrite(project, result)
+                _cache_project(cache_key, rewritten_project)
                 
                 return (cache_key, rewritten_project)
                 
@@ -933,48 +1257,46 @@ Return JSON only:
                         fallback_project['description'] = '. '.join(sentences[:3]) + '.'
                 return (cache_key, fallback_project)
         
-        # Process projects in parallel with timeout
-        processed_results = {}
-        max_workers = min(4, len(projects_to_process))  # Limit concurrent requests
-        
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_key = {
-                executor.submit(rewrite_single_project, project_data): project_data[1]
-                for project_data in projects_to_process
-            }
+        if projects_to_process:
+            # Process projects in parallel with timeout
+            max_workers = min(4, len(projects_to_process))  # Limit concurrent requests
             
-            # Collect results with timeout
-            for future in as_completed(future_to_key, timeout=60):  # 60 second overall timeout
-                try:
-                    cache_key, rewritten_project = future.result(timeout=15)  # 15 sec per project
-                    processed_results[cache_key] = rewritten_project
-                except FuturesTimeoutError:
-                    cache_key = future_to_key[future]
-                    logger.warning(f"Project rewrite timed out for {cache_key}, using original")
-                    # Find original project
-                    original_project = next((p[0] for p in projects_to_process if p[1] == cache_key), None)
-                    if original_project:
-                        processed_results[cache_key] = original_project
-                except Exception as e:
-                    cache_key = future_to_key[future]
-                    logger.error(f"Error processing project {cache_key}: {e}")
-                    original_project = next((p[0] for p in projects_to_process if p[1] == cache_key), None)
-                    if original_project:
-                        processed_results[cache_key] = original_project
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # Submit all tasks
+                future_to_key = {
+                    executor.submit(rewrite_single_project, project_data): project_data[1]
+                    for project_data in projects_to_process
+                }
+                
+                # Collect results with timeout
+                for future in as_completed(future_to_key, timeout=60):  # 60 second overall timeout
+                    try:
+                        cache_key, rewritten_project = future.result(timeout=15)  # 15 sec per project
+                        processed_results[cache_key] = rewritten_project
+                    except FuturesTimeoutError:
+                        cache_key = future_to_key[future]
+                        logger.warning(f"Project rewrite timed out for {cache_key}, using original")
+                        # Find original project
+                        original_project = next((p[0] for p in projects_to_process if p[1] == cache_key), None)
+                        if original_project:
+                            processed_results[cache_key] = original_project
+                    except Exception as e:
+                        cache_key = future_to_key[future]
+                        logger.error(f"Error processing project {cache_key}: {e}")
+                        original_project = next((p[0] for p in projects_to_process if p[1] == cache_key), None)
+                        if original_project:
+                            processed_results[cache_key] = original_project
         
         # Combine cached and processed results in original order
         rewritten_projects = []
-        for key in cache_order:
+        for project, key in zip(projects, cache_order):
             if key in cached_results:
                 rewritten_projects.append(cached_results[key])
             elif key in processed_results:
                 rewritten_projects.append(processed_results[key])
             else:
-                # Fallback: find original project
-                original = next((p[0] for p in projects_to_process if p[1] == key), None)
-                if original:
-                    rewritten_projects.append(original)
+                # Fallback: keep original project
+                rewritten_projects.append(project)
         
         logger.info(f"Completed rewriting {len(rewritten_projects)}/{len(projects)} projects (cached: {len(cached_results)}, processed: {len(processed_results)})")
         return rewritten_projects
@@ -0,0 +1,238 @@
+"""Applicant Ranking Service - batch ATS scoring of every applicant to a job
+
+A ranking run loads all applications of a job together with the students'
+saved resumes in one query, scores them with the rule-based ATS scorer
+(the job description is compiled once per worker) and persists the
+ranked scores. Runs execute in a background thread; large cohorts are
+split into chunks scored in a process pool, and progress is written to
+the JobRankingRun row after every chunk so any worker can report it.
+Every progress write also stamps heartbeat_at; a PENDING/RUNNING run
+without one for RANKING_RUN_STALE_SECONDS lost its worker (restart,
+crash) and is marked FAILED when the job is ranked again.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.job import Job, JobApplication
+from app.models.profile import Profile
+from app.models.resume_analytics import JobApplicantScore, JobRankingRun, StudentResume
+
+logger = logging.getLogger(__name__)
+
+RANKING_WORKERS = int(os.getenv("RANKING_WORKERS", str(min(4, os.cpu_count() or 1))))
+RANKING_CHUNK_SIZE = int(os.getenv("RANKING_CHUNK_SIZE", "250"))
+RANKING_RUN_STALE_SECONDS = int(os.getenv("RANKING_RUN_STALE_SECONDS", "600"))
+
+# Runs are I/O + orchestration; scoring itself goes to the process pool
+_run_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="job-ranking")
+_score_pool: Optional[ProcessPoolExecutor] = None
+_score_pool_lock = threading.Lock()
+
+
+def _get_score_pool() -> ProcessPoolExecutor:
+    """Lazily start the scoring process pool (spawned, so it is safe to create from threads)"""
+    global _score_pool
+    with _score_pool_lock:
+        if _score_pool is None:
+            _score_pool = ProcessPoolExecutor(
+                max_workers=RANKING_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _score_pool
+
+
+def _reset_score_pool() -> None:
+    """Drop a broken pool so the next run starts a fresh one"""
+    global _score_pool
+    with _score_pool_lock:
+        if _score_pool is not None:
+            _score_pool.shutdown(wait=False, cancel_futures=True)
+            _score_pool = None
+
+
+def score_resume_chunk(job_description: str, resumes: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Score a chunk of resume dicts against one job description (runs in worker processes)"""
+    from app.api.resume import ResumeData, calculate_ats_scores_batch
+
+    parsed = []
+    for resume in resumes:
+        try:
+            parsed.append(ResumeData(**(resume or {})))
+        except Exception:
+            parsed.append(ResumeData())
+
+    return [
+        {
+            "score": result.score,
+            "breakdown": result.breakdown,
+            "missing_keywords": result.missing_keywords,
+        }
+        for result in calculate_ats_scores_batch(parsed, job_description or None)
+    ]
+
+
+def build_job_description(job: Job) -> str:
+    """Text the applicants are scored against: title, role, description and requirements"""
+    parts = [job.title, job.role, job.description or ""]
+    if job.requirements:
+        parts.extend(str(req) for req in job.requirements)
+    return "\n".join(part for part in parts if part)
+
+
+def is_stale(run: JobRankingRun) -> bool:
+    """Whether an unfinished run has gone RANKING_RUN_STALE_SECONDS without progress"""
+    last_seen = run.heartbeat_at or run.created_at
+    if last_seen is None:
+        return False
+    if last_seen.tzinfo is None:  # SQLite returns naive UTC
+        last_seen = last_seen.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - last_seen > timedelta(seconds=RANKING_RUN_STALE_SECONDS)
+
+
+def fail_if_stale(db: Session, run: JobRankingRun) -> bool:
+    """Mark an unfinished run whose worker stopped as FAILED (committed); returns whether it was"""
+    if run.status not in ("PENDING", "RUNNING") or not is_stale(run):
+        return False
+    logger.warning(f"Ranking run {run.id} for job {run.job_id} made no progress; marking it failed")
+    run.status = "FAILED"
+    run.error_message = "Abandoned: the worker running it stopped"
+    run.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    return True
+
+
+def start_ranking_run(db: Session, job: Job, started_by: Optional[int]) -> JobRankingRun:
+    """Create a ranking run for a job and schedule it, reusing one that is still in progress"""
+    active_run = db.query(JobRankingRun).filter(
+        JobRankingRun.job_id == job.id,
+        JobRankingRun.status.in_(["PENDING", "RUNNING"])
+    ).order_by(JobRankingRun.id.desc()).first()
+    if active_run and not fail_if_stale(db, active_run):
+        return active_run
+
+    run = JobRankingRun(job_id=job.id, status="PENDING", started_by=started_by)
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+
+    _run_executor.submit(execute_ranking_run, run.id)
+    return run
+
+
+def execute_ranking_run(run_id: int) -> None:
+    """Load, score, rank and persist all applicants of the run's job"""
+    db = SessionLocal()
+    run = None
+    try:
+        run = db.query(JobRankingRun).filter(JobRankingRun.id == run_id).first()
+        if not run:
+            return
+        job = db.query(Job).filter(Job.id == run.job_id).first()
+        if not job:
+            raise ValueError(f"Job {run.job_id} not found")
+
+        # One pass: applications with their saved resume and profile
+        rows = db.query(
+            JobApplication.id,
+            JobApplication.user_id,
+            StudentResume.resume_data,
+            Profile.full_name,
+            Profile.email,
+        ).outerjoin(
+            StudentResume, StudentResume.user_id == JobApplication.user_id
+        ).outerjoin(
+            Profile, Profile.user_id == JobApplication.user_id
+        ).filter(
+            JobApplication.job_id == job.id
+        ).all()
+
+        run.status = "RUNNING"
+        run.total = len(rows)
+        run.processed = 0
+        run.heartbeat_at = datetime.now(timezone.utc)
+        db.commit()
+
+        resumes = [
+            row.resume_data if row.resume_data else {
+                "personal_info": {"full_name": row.full_name, "email": row.email}
+            }
+            for row in rows
+        ]
+        job_description = build_job_description(job)
+        chunks = [
+            (start, resumes[start:start + RANKING_CHUNK_SIZE])
+            for start in range(0, len(resumes), RANKING_CHUNK_SIZE)
+        ]
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(rows)
+        if len(chunks) > 1 and RANKING_WORKERS > 1:
+            pool = _get_score_pool()
+            futures = [
+                (start, pool.submit(score_resume_chunk, job_description, chunk))
+                for start, chunk in chunks
+            ]
+            for start, future in futures:
+                chunk_results = future.result()
+                results[start:start + len(chunk_results)] = chunk_results
+                run.processed += len(chunk_results)
+                run.heartbeat_at = datetime.now(timezone.utc)
+                db.commit()
+        else:
+            for start, chunk in chunks:
+                chunk_results = score_resume_chunk(job_description, chunk)
+                results[start:start + len(chunk_results)] = chunk_results
+                run.processed += len(chunk_results)
+                run.heartbeat_at = datetime.now(timezone.utc)
+                db.commit()
+
+        # Highest score first; earlier applications win ties
+        order = sorted(range(len(rows)), key=lambda i: (-results[i]["score"], rows[i].id))
+        scored_at = datetime.now(timezone.utc)
+        mappings = [
+            {
+                "job_id": job.id,
+                "job_application_id": rows[i].id,
+                "user_id": rows[i].user_id,
+                "run_id": run.id,
+                "score": results[i]["score"],
+                "rank": position + 1,
+                "breakdown": results[i]["breakdown"],
+                "missing_keywords": results[i]["missing_keywords"],
+                "has_resume": bool(rows[i].resume_data),
+                "scored_at": scored_at,
+            }
+            for position, i in enumerate(order)
+        ]
+
+        # Replace the previous ranking atomically
+        db.query(JobApplicantScore).filter(
+            JobApplicantScore.job_id == job.id
+        ).delete(synchronize_session=False)
+        if mappings:
+            db.bulk_insert_mappings(JobApplicantScore, mappings)
+
+        run.status = "COMPLETED"
+        run.finished_at = datetime.now(timezone.utc)
+        db.commit()
+        logger.info(f"Ranking run {run_id}: scored {len(rows)} applicant(s) for job {job.id}")
+    except Exception as e:
+        if isinstance(e, BrokenProcessPool):
+            _reset_score_pool()
+        logger.error(f"Ranking run {run_id} failed: {e}", exc_info=True)
+        db.rollback()
+        if run is not None:
+            run.status = "FAILED"
+            run.error_message = str(e)[:1000]
+            run.finished_at = datetime.now(timezone.utc)
+            db.commit()
+    finally:
+        db.close()
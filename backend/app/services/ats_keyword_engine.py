@@ -0,0 +1,250 @@
+"""ATS Keyword Engine - precompiled job description keyword matching
+
+Job descriptions are tokenized once and compiled into a token-level
+Aho-Corasick automaton. Matching a resume is then a single pass over its
+tokens, with word boundaries, light stemming and synonym folding applied
+to both sides. Compiled job descriptions are cached by content hash so
+repeated score requests (and cohort-wide batch scoring) skip the work.
+"""
+import hashlib
+import re
+import threading
+from collections import OrderedDict, deque
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Common technical keywords (always kept, even when short)
+TECH_KEYWORDS = [
+    'python', 'java', 'javascript', 'react', 'node.js', 'sql', 'mongodb',
+    'aws', 'docker', 'kubernetes', 'git', 'agile', 'scrum', 'api',
+    'machine learning', 'data science', 'frontend', 'backend', 'full stack',
+    'devops', 'ci/cd', 'rest', 'graphql', 'typescript', 'angular', 'vue'
+]
+
+# Single-token aliases folded to a canonical form during tokenization
+TOKEN_SYNONYMS = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'nodejs': 'node.js',
+    'node': 'node.js',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'angularjs': 'angular',
+    'k8s': 'kubernetes',
+    'postgres': 'postgresql',
+    'golang': 'go',
+    'restful': 'rest',
+    'cicd': 'ci/cd',
+    'front-end': 'frontend',
+    'back-end': 'backend',
+    'fullstack': 'full stack',
+    'full-stack': 'full stack',
+}
+
+# Multi-token phrases that should match the same keyword
+PHRASE_SYNONYMS = {
+    'machine learning': ['ml'],
+    'artificial intelligence': ['ai'],
+    'aws': ['amazon web services'],
+    'ci/cd': ['continuous integration'],
+    'frontend': ['front end'],
+    'backend': ['back end'],
+}
+
+# Tokens joined by '/' or '-' that name one thing (besides the TOKEN_SYNONYMS
+# keys); any other such token is split into its parts ("python/django",
+# "docker-based")
+COMPOUND_TERMS = {'ci/cd', 'tcp/ip', 'pl/sql', 't-sql', 'i/o', 'a/b', 'e-commerce'}
+
+_TOKEN_RE = re.compile(r'[a-z0-9+#]+(?:[./-][a-z0-9+#]+)*')
+_COMPOUND_SPLIT_RE = re.compile(r'[/-]')
+_STEM_SUFFIXES = ('ations', 'ation', 'ments', 'ment', 'ings', 'ing', 'ers', 'er', 'ies', 'es', 'ed', 's')
+
+MAX_KEYWORDS = 20
+_CACHE_MAX_SIZE = 256
+
+
+def _stem(token: str) -> str:
+    """Light suffix stemmer - only applied to purely alphabetic tokens"""
+    if not token.isalpha() or len(token) <= 4:
+        return token
+    for suffix in _STEM_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 4:
+            if suffix == 'ies':
+                return token[:-3] + 'y'
+            return token[:-len(suffix)]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on word boundaries, fold synonyms and stem"""
+    if not text:
+        return []
+    tokens: List[str] = []
+    for raw in _TOKEN_RE.findall(text.lower()):
+        if raw in COMPOUND_TERMS or raw in TOKEN_SYNONYMS:
+            pieces = [raw]
+        else:
+            pieces = [piece for piece in _COMPOUND_SPLIT_RE.split(raw) if piece]
+        for piece in pieces:
+            canonical = TOKEN_SYNONYMS.get(piece, piece)
+            for part in canonical.split(' '):
+                tokens.append(_stem(part))
+    return tokens
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over token sequences (word-level patterns)"""
+
+    def __init__(self, patterns: Dict[Tuple[str, ...], int]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[int]] = [set()]
+
+        for pattern, keyword_id in patterns.items():
+            state = 0
+            for token in pattern:
+                nxt = self._goto[state].get(token)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][token] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                state = nxt
+            self._out[state].add(keyword_id)
+
+        # Breadth-first pass to build failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(token, 0)
+                # Depth-1 states fall back to the root, not to themselves
+                self._fail[nxt] = candidate if candidate != nxt else 0
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+    def find(self, tokens: Sequence[str]) -> Set[int]:
+        """Return ids of all patterns occurring in the token stream"""
+        found: Set[int] = set()
+        state = 0
+        for token in tokens:
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            if self._out[state]:
+                found |= self._out[state]
+        return found
+
+
+class CompiledJobDescription:
+    """Keywords extracted from a job description plus their matching automaton"""
+
+    def __init__(self, job_description: str):
+        self.keywords = self._extract_keywords(job_description)
+
+        patterns: Dict[Tuple[str, ...], int] = {}
+        for keyword_id, keyword in enumerate(self.keywords):
+            patterns.setdefault(tuple(tokenize(keyword)), keyword_id)
+            for alias in PHRASE_SYNONYMS.get(keyword, []):
+                patterns.setdefault(tuple(tokenize(alias)), keyword_id)
+        self._automaton = KeywordAutomaton(patterns)
+
+    @staticmethod
+    def _extract_keywords(job_description: str) -> List[str]:
+        """Pick tech keywords and longer words, deduplicated by stem, in order of appearance"""
+        text = job_description.lower()
+        candidates: List[Tuple[int, str]] = []
+
+        # Multi-word and punctuated tech keywords need a phrase search
+        phrase_spans: List[Tuple[int, int]] = []
+        for keyword in TECH_KEYWORDS:
+            if keyword.isalpha():
+                continue  # Single words are picked up by the word scan below
+            for match in re.finditer(r'(?<![a-z0-9])' + re.escape(keyword) + r'(?![a-z0-9])', text):
+                phrase_spans.append((match.start(), match.end()))
+                candidates.append((match.start(), keyword))
+
+        for match in re.finditer(r'\b\w+\b', text):
+            if any(start <= match.start() < end for start, end in phrase_spans):
+                continue  # Already covered by a phrase keyword
+            word = match.group(0)
+            if word in TECH_KEYWORDS:  # Any length: sql, aws, git, api, vue
+                candidates.append((match.start(), word))
+            elif len(word) > 5:  # Longer words are often important
+                candidates.append((match.start(), word))
+
+        keywords: List[str] = []
+        seen: Set[Tuple[str, ...]] = set()
+        for _, keyword in sorted(candidates, key=lambda c: c[0]):
+            key = tuple(tokenize(keyword))
+            if key and key not in seen:
+                seen.add(key)
+                keywords.append(keyword)
+            if len(keywords) >= MAX_KEYWORDS:
+                break
+        return keywords
+
+    def match_tokens(self, tokens: Sequence[str]) -> Tuple[List[str], List[str]]:
+        """Split keywords into (matched, missing) for an already tokenized resume"""
+        found = self._automaton.find(tokens)
+        matched = [kw for idx, kw in enumerate(self.keywords) if idx in found]
+        missing = [kw for idx, kw in enumerate(self.keywords) if idx not in found]
+        return matched, missing
+
+    def match(self, resume_text: str) -> Tuple[List[str], List[str]]:
+        """Split keywords into (matched, missing) for raw resume text"""
+        return self.match_tokens(tokenize(resume_text))
+
+
+# Compiled job descriptions keyed by content hash
+_compiled_cache: "OrderedDict[str, CompiledJobDescription]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _hash_job_description(job_description: str) -> str:
+    return hashlib.sha1(job_description.strip().lower().encode("utf-8")).hexdigest()
+
+
+def compile_job_description(job_description: str) -> CompiledJobDescription:
+    """Return the compiled automaton for a job description (cached by hash)"""
+    key = _hash_job_description(job_description)
+    with _cache_lock:
+        compiled = _compiled_cache.get(key)
+        if compiled is not None:
+            _compiled_cache.move_to_end(key)
+            return compiled
+
+    compiled = CompiledJobDescription(job_description)
+
+    with _cache_lock:
+        _compiled_cache[key] = compiled
+        if len(_compiled_cache) > _CACHE_MAX_SIZE:
+            _compiled_cache.popitem(last=False)
+    return compiled
+
+
+def match_keywords_batch(
+    job_description: str,
+    resume_texts: Sequence[str]
+) -> List[Tuple[List[str], List[str]]]:
+    """Match many resumes against one job description, compiling it only once"""
+    compiled = compile_job_description(job_description)
+    return [compiled.match(text) for text in resume_texts]
+
+
+def clear_cache(job_description: Optional[str] = None) -> None:
+    """Drop one compiled job description, or the whole cache"""
+    with _cache_lock:
+        if job_description is None:
+            _compiled_cache.clear()
+        else:
+            _compiled_cache.pop(_hash_job_description(job_description), None)
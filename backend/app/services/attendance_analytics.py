@@ -0,0 +1,347 @@
+"""Attendance Analytics - GROUP BY aggregation and the daily attendance cube
+
+build_attendance_analytics() computes every breakdown of the attendance
+analytics response (summary, subject, student, student x subject, date,
+section and period) with GROUP BY queries, so the database returns one row
+per group instead of every attendance record.
+
+With ATTENDANCE_CUBE_ENABLED the breakdowns are read from
+attendance_daily_cube, which holds status counts per (college,
+department, section, subject, student, date). Writes keep it current:
+refresh_attendance_cube() re-aggregates the affected (student, date)
+cells inside the writer's transaction. rebuild_attendance_cube()
+backfills it from the attendance table.
+"""
+import logging
+from collections import defaultdict
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.attendance import Attendance, AttendanceDailyCube
+from app.models.profile import Profile
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+STATUSES = ("present", "absent", "late", "excused")
+CUBE_DIMENSIONS = ("college_id", "department_id", "section_id", "subject_id", "student_id", "date")
+_CELL_BATCH_SIZE = 500
+
+# A filter is applied to either Attendance or AttendanceDailyCube (same column names)
+AnalyticsFilter = Callable[[Any], Any]
+
+
+def cube_enabled() -> bool:
+    return get_settings().ATTENDANCE_CUBE_ENABLED
+
+
+def _status_counts() -> List[Any]:
+    """Per-status counts over raw attendance rows"""
+    return [
+        func.count(Attendance.id).label("total"),
+        *(func.sum(case((Attendance.status == name, 1), else_=0)).label(name) for name in STATUSES),
+    ]
+
+
+def _measures(source: Any) -> List[Any]:
+    if source is AttendanceDailyCube:
+        return [
+            func.sum(AttendanceDailyCube.total).label("total"),
+            *(func.sum(getattr(AttendanceDailyCube, name)).label(name) for name in STATUSES),
+        ]
+    return _status_counts()
+
+
+def _counts(row: Any) -> Dict[str, int]:
+    return {name: int(getattr(row, name) or 0) for name in ("total",) + STATUSES}
+
+
+def _percentage(part: int, total: int) -> float:
+    return round(part / total * 100, 2) if total > 0 else 0.0
+
+
+# ---- cube maintenance ----
+
+def _cube_rows(db: Session, condition: Any) -> List[Dict[str, Any]]:
+    dimensions = [getattr(Attendance, name) for name in CUBE_DIMENSIONS]
+    rows = db.query(*dimensions, *_status_counts()).filter(condition).group_by(*dimensions).all()
+    return [
+        {**{name: getattr(row, name) for name in CUBE_DIMENSIONS}, **_counts(row)}
+        for row in rows
+    ]
+
+
+def refresh_attendance_cube(db: Session, cells: Iterable[Tuple[int, date]]) -> None:
+    """Re-aggregate the cube rows of the given (student_id, date) cells
+
+    Call before committing the attendance change so both land in one
+    transaction. No-op unless ATTENDANCE_CUBE_ENABLED is set.
+    """
+    if not cube_enabled():
+        return
+    students_by_date: Dict[date, set] = defaultdict(set)
+    for student_id, day in cells:
+        students_by_date[day].add(student_id)
+    if not students_by_date:
+        return
+
+    db.flush()
+    for day, student_ids in students_by_date.items():
+        student_ids = sorted(student_ids)
+        for start in range(0, len(student_ids), _CELL_BATCH_SIZE):
+            chunk = student_ids[start:start + _CELL_BATCH_SIZE]
+            db.query(AttendanceDailyCube).filter(
+                AttendanceDailyCube.date == day,
+                AttendanceDailyCube.student_id.in_(chunk)
+            ).delete(synchronize_session=False)
+            rows = _cube_rows(db, and_(Attendance.date == day, Attendance.student_id.in_(chunk)))
+            if rows:
+                db.execute(insert(AttendanceDailyCube), rows)
+
+
+def rebuild_attendance_cube(db: Session, college_id: Optional[int] = None) -> int:
+    """Rebuild the cube from the attendance table (all colleges or one); returns rows written"""
+    delete_query = db.query(AttendanceDailyCube)
+    if college_id is not None:
+        delete_query = delete_query.filter(AttendanceDailyCube.college_id == college_id)
+    delete_query.delete(synchronize_session=False)
+
+    dimensions = [getattr(Attendance, name) for name in CUBE_DIMENSIONS]
+    aggregate = select(*dimensions, *_status_counts()).group_by(*dimensions)
+    if college_id is not None:
+        aggregate = aggregate.where(Attendance.college_id == college_id)
+    result = db.execute(
+        insert(AttendanceDailyCube).from_select(list(CUBE_DIMENSIONS) + ["total", *STATUSES], aggregate)
+    )
+    db.commit()
+    logger.info(f"Rebuilt attendance cube ({result.rowcount} rows, college={college_id or 'all'})")
+    return result.rowcount
+
+
+# ---- analytics ----
+
+def _empty_analytics() -> Dict[str, Any]:
+    # Structure matching frontend expectations
+    return {
+        "summary": {
+            "total_records": 0,
+            "present_count": 0,
+            "absent_count": 0,
+            "late_count": 0,
+            "attendance_percentage": 0.0
+        },
+        "by_subject": {},
+        "by_date": {},
+        "by_student": []
+    }
+
+
+def build_attendance_analytics(
+    db: Session,
+    filters: List[AnalyticsFilter],
+    use_cube: bool = False
+) -> Dict[str, Any]:
+    """Attendance analytics for the records matching filters, aggregated in SQL"""
+    from app.models.academic import Section, Subject
+
+    source = AttendanceDailyCube if use_cube else Attendance
+    conditions = [make_filter(source) for make_filter in filters]
+    measures = _measures(source)
+
+    summary = db.query(
+        *measures,
+        func.count(func.distinct(source.student_id)).label("students"),
+        func.count(func.distinct(source.date)).label("dates"),
+    ).filter(*conditions).one()
+    overall = _counts(summary)
+    total_records = overall["total"]
+    if not total_records:
+        return _empty_analytics()
+    total_dates = summary.dates
+
+    # Subject-wise statistics
+    subject_rows = db.query(
+        source.subject_id, Subject.name, Subject.code, *measures,
+        func.count(func.distinct(source.student_id)).label("students"),
+    ).join(
+        Subject, Subject.id == source.subject_id
+    ).filter(*conditions).group_by(
+        source.subject_id, Subject.name, Subject.code
+    ).order_by(source.subject_id).all()
+    subject_stats = []
+    for row in subject_rows:
+        counts = _counts(row)
+        subject_stats.append({
+            "subject_id": row.subject_id,
+            "subject_name": row.name,
+            "subject_code": row.code,
+            "total_classes": total_dates,
+            "total_students": row.students,
+            "total_records": counts["total"],
+            **{name: counts[name] for name in STATUSES},
+            "present_percentage": _percentage(counts["present"], counts["total"])
+        })
+
+    # Student x subject breakdown
+    breakdown: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    breakdown_rows = db.query(
+        source.student_id, source.subject_id, Subject.name, *measures
+    ).join(
+        Subject, Subject.id == source.subject_id
+    ).filter(*conditions).group_by(
+        source.student_id, source.subject_id, Subject.name
+    ).order_by(source.student_id, source.subject_id).all()
+    for row in breakdown_rows:
+        counts = _counts(row)
+        breakdown[row.student_id].append({
+            "subject_id": row.subject_id,
+            "subject_name": row.name,
+            "total_classes": counts["total"],
+            "present": counts["present"],
+            "present_percentage": _percentage(counts["present"], counts["total"])
+        })
+
+    # Student-wise statistics (students without a profile are skipped)
+    per_student = db.query(source.student_id.label("student_id"), *measures).filter(
+        *conditions
+    ).group_by(source.student_id).subquery()
+    student_rows = db.query(
+        per_student, User.email, Profile.full_name, Profile.roll_number
+    ).join(
+        User, User.id == per_student.c.student_id
+    ).join(
+        Profile, Profile.user_id == per_student.c.student_id
+    ).order_by(per_student.c.student_id).all()
+    student_stats = []
+    for row in student_rows:
+        counts = _counts(row)
+        student_stats.append({
+            "student_id": row.student_id,
+            "student_name": row.full_name,
+            "student_email": row.email,
+            "roll_number": row.roll_number,
+            "total_classes": counts["total"],
+            **{name: counts[name] for name in STATUSES},
+            "present_percentage": _percentage(counts["present"], counts["total"]),
+            "subject_wise_breakdown": breakdown.get(row.student_id, [])
+        })
+
+    # Daily statistics
+    daily_rows = db.query(
+        source.date, *measures,
+        func.count(func.distinct(source.student_id)).label("students"),
+    ).filter(*conditions).group_by(source.date).order_by(source.date).all()
+    daily_stats = []
+    for row in daily_rows:
+        counts = _counts(row)
+        daily_stats.append({
+            "date": row.date.isoformat(),
+            "total_students": row.students,
+            "total_records": counts["total"],
+            **{name: counts[name] for name in STATUSES},
+            "present_percentage": _percentage(counts["present"], counts["total"])
+        })
+
+    # Section-wise statistics
+    section_rows = db.query(
+        source.section_id, Section.name, *measures,
+        func.count(func.distinct(source.student_id)).label("students"),
+    ).join(
+        Section, Section.id == source.section_id
+    ).filter(*conditions).group_by(
+        source.section_id, Section.name
+    ).order_by(source.section_id).all()
+    section_stats = []
+    for row in section_rows:
+        counts = _counts(row)
+        section_stats.append({
+            "section_id": row.section_id,
+            "section_name": row.name,
+            "total_students": row.students,
+            "total_records": counts["total"],
+            **{name: counts[name] for name in STATUSES},
+            "present_percentage": _percentage(counts["present"], counts["total"])
+        })
+
+    # Period-wise statistics (periods are not a cube dimension)
+    period_rows = db.query(Attendance.period_number, *_status_counts()).filter(
+        *(make_filter(Attendance) for make_filter in filters),
+        Attendance.period_number.isnot(None)
+    ).group_by(Attendance.period_number).order_by(Attendance.period_number).all()
+    period_stats = []
+    for row in period_rows:
+        counts = _counts(row)
+        period_stats.append({
+            "period_number": row.period_number,
+            "total_records": counts["total"],
+            **{name: counts[name] for name in STATUSES},
+            "present_percentage": _percentage(counts["present"], counts["total"])
+        })
+
+    # Transform data to match frontend expectations
+    by_subject = {}
+    for stat in subject_stats:
+        subject_key = stat.get("subject_name") or stat.get("subject_code") or f"Subject_{stat['subject_id']}"
+        by_subject[subject_key] = {
+            "total": stat["total_records"],
+            "present": stat["present"],
+            "absent": stat["absent"],
+            "late": stat["late"]
+        }
+
+    by_date = {
+        stat["date"]: {
+            "total": stat["total_records"],
+            "present": stat["present"],
+            "absent": stat["absent"],
+            "late": stat["late"]
+        }
+        for stat in daily_stats
+    }
+
+    by_student = [
+        {
+            "student_id": stat["student_id"],
+            "student_name": stat["student_name"],
+            "roll_number": stat["roll_number"],
+            "total": stat["total_classes"],
+            "present": stat["present"],
+            "absent": stat["absent"],
+            "late": stat["late"],
+            "percentage": stat["present_percentage"]
+        }
+        for stat in student_stats
+    ]
+
+    present_percentage = _percentage(overall["present"], total_records)
+    return {
+        "summary": {
+            "total_records": total_records,
+            "present_count": overall["present"],
+            "absent_count": overall["absent"],
+            "late_count": overall["late"],
+            "attendance_percentage": present_percentage
+        },
+        "by_subject": by_subject,
+        "by_date": by_date,
+        "by_student": by_student,
+        # Keep original structure for backward compatibility
+        "total_students": summary.students,
+        "total_classes": total_dates,
+        "overall_stats": {
+            "present": overall["present"],
+            "absent": overall["absent"],
+            "late": overall["late"],
+            "excused": overall["excused"],
+            "present_percentage": present_percentage
+        },
+        "subject_wise_stats": subject_stats,
+        "student_wise_stats": student_stats,
+        "daily_stats": daily_stats,
+        "section_wise_stats": section_stats,
+        "period_wise_stats": period_stats
+    }
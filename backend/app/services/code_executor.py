@@ -7,6 +7,7 @@ import tempfile
 import shutil
 from typing import Dict, Optional, Tuple
 from app.schemas.coding_lab import SubmissionStatus, CodeExecutionResponse
+from app.core.metrics import track_judge_execution
 import logging
 
 logger = logging.getLogger(__name__)
@@ -91,6 +92,7 @@ class CodeExecutor:
         """Get Docker client"""
         return get_docker_client()
     
+    @track_judge_execution("docker")
     def execute_code(
         self,
         code: str,
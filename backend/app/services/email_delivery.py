@@ -0,0 +1,376 @@
+"""Email Delivery - outbox table, pooled SMTP connections and a background sender
+
+Request handlers only enqueue: enqueue_email() adds an EmailOutbox row to
+the caller's session, and the sender is woken when that session commits.
+
+The sender (one thread per worker, started at app startup or on first use):
+
+- claims due messages in batches of EMAIL_BATCH_SIZE by stamping them with
+  a claim token (pending ones whose next_attempt_at has passed, and ones
+  left in "sending" for EMAIL_CLAIM_TIMEOUT_SECONDS by a worker that died),
+  so two workers never send the same message;
+- sends up to EMAIL_SEND_CONCURRENCY messages at a time, each over an
+  already authenticated connection from the SMTP pool;
+- marks them sent, or retries them after EMAIL_RETRY_BASE_SECONDS * 2^n
+  until EMAIL_MAX_ATTEMPTS (permanent 5xx rejections fail at once).
+
+Pooled connections do STARTTLS and log in once and are reused across
+messages; they are replaced after EMAIL_CONNECTION_MAX_MESSAGES messages,
+after EMAIL_CONNECTION_IDLE_SECONDS idle, or on any SMTP error.
+"""
+import logging
+import os
+import smtplib
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, event, or_
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.core.database import SessionLocal
+from app.core.schema import schema_capabilities
+from app.models.email_outbox import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+EMAIL_SEND_CONCURRENCY = int(os.getenv("EMAIL_SEND_CONCURRENCY", "4"))
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "50"))
+EMAIL_POLL_INTERVAL_SECONDS = float(os.getenv("EMAIL_POLL_INTERVAL_SECONDS", "5"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "30"))
+EMAIL_CLAIM_TIMEOUT_SECONDS = float(os.getenv("EMAIL_CLAIM_TIMEOUT_SECONDS", "300"))
+EMAIL_CONNECTION_MAX_MESSAGES = int(os.getenv("EMAIL_CONNECTION_MAX_MESSAGES", "100"))
+EMAIL_CONNECTION_IDLE_SECONDS = float(os.getenv("EMAIL_CONNECTION_IDLE_SECONDS", "60"))
+EMAIL_SMTP_TIMEOUT_SECONDS = float(os.getenv("EMAIL_SMTP_TIMEOUT_SECONDS", "30"))
+
+_QUEUED_KEY = "email_outbox_queued"
+
+
+def smtp_configured() -> bool:
+    settings = get_settings()
+    return bool(settings.SMTP_HOST and settings.SMTP_USER and settings.SMTP_PASSWORD)
+
+
+def build_message(
+    to_emails: List[str],
+    subject: str,
+    html_body: str,
+    text_body: Optional[str] = None
+) -> MIMEMultipart:
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = subject
+    msg['From'] = get_settings().SMTP_USER
+    msg['To'] = ', '.join(to_emails)
+
+    # Create text and HTML parts
+    if text_body:
+        msg.attach(MIMEText(text_body, 'plain'))
+    msg.attach(MIMEText(html_body, 'html'))
+    return msg
+
+
+def _is_permanent(error: Exception) -> bool:
+    """5xx rejections of the message or its recipients; retrying will not help"""
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return True
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False  # Configuration problem, may be fixed
+    return isinstance(error, smtplib.SMTPResponseException) and error.smtp_code >= 500
+
+
+class _PooledConnection:
+    def __init__(self, smtp: smtplib.SMTP):
+        self.smtp = smtp
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """Authenticated SMTP connections, checked out by one sending thread at a time"""
+
+    def __init__(
+        self,
+        max_messages: int = EMAIL_CONNECTION_MAX_MESSAGES,
+        idle_seconds: float = EMAIL_CONNECTION_IDLE_SECONDS
+    ):
+        self.max_messages = max_messages
+        self.idle_seconds = idle_seconds
+        self._idle: List[_PooledConnection] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> _PooledConnection:
+        settings = get_settings()
+        smtp = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=EMAIL_SMTP_TIMEOUT_SECONDS)
+        try:
+            if settings.SMTP_STARTTLS:
+                smtp.starttls()  # Enable encryption
+            smtp.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        except Exception:
+            self._close(smtp)
+            raise
+        return _PooledConnection(smtp)
+
+    def _checkout(self) -> _PooledConnection:
+        expired = []
+        connection = None
+        with self._lock:
+            while self._idle:
+                candidate = self._idle.pop()
+                if time.monotonic() - candidate.last_used < self.idle_seconds:
+                    connection = candidate
+                    break
+                expired.append(candidate)
+        for stale in expired:
+            self._close(stale.smtp)
+        return connection or self._connect()
+
+    def _checkin(self, connection: _PooledConnection) -> None:
+        connection.last_used = time.monotonic()
+        if connection.sent >= self.max_messages:
+            self._close(connection.smtp)
+            return
+        with self._lock:
+            self._idle.append(connection)
+
+    @staticmethod
+    def _close(smtp: smtplib.SMTP) -> None:
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+
+    def send(self, message: MIMEMultipart) -> None:
+        """Send over a pooled connection; raises if the server does not accept the message"""
+        connection = self._checkout()
+        try:
+            connection.smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            self._close(connection.smtp)
+            if not connection.sent:
+                raise
+            # The server dropped a reused connection while it was idle; retry once on a new one
+            connection = self._connect()
+            try:
+                connection.smtp.send_message(message)
+            except Exception:
+                self._close(connection.smtp)
+                raise
+        except Exception:
+            self._close(connection.smtp)
+            raise
+        connection.sent += 1
+        self._checkin(connection)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._close(connection.smtp)
+
+
+smtp_pool = SMTPConnectionPool()
+
+
+def enqueue_email(
+    db: Session,
+    to_emails: List[str],
+    subject: str,
+    html_body: str,
+    text_body: Optional[str] = None
+) -> EmailOutbox:
+    """Queue an email in the caller's transaction; it is sent after the session commits"""
+    message = EmailOutbox(
+        to_emails=list(to_emails),
+        subject=subject,
+        html_body=html_body,
+        text_body=text_body,
+        status="pending",
+        attempts=0,
+        next_attempt_at=datetime.utcnow()
+    )
+    db.add(message)
+    db.info[_QUEUED_KEY] = True
+    return message
+
+
+class EmailOutboxSender:
+    """Background delivery of the email outbox with bounded concurrency and retries"""
+
+    def __init__(
+        self,
+        concurrency: int = EMAIL_SEND_CONCURRENCY,
+        batch_size: int = EMAIL_BATCH_SIZE,
+        poll_interval: float = EMAIL_POLL_INTERVAL_SECONDS,
+        pool: SMTPConnectionPool = smtp_pool,
+        session_factory=SessionLocal
+    ):
+        self.concurrency = max(1, concurrency)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.pool = pool
+        self.session_factory = session_factory
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._warned = False
+
+    def start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            with self._lock:
+                if self._thread is None or not self._thread.is_alive():
+                    self._stop.clear()
+                    self._thread = threading.Thread(target=self._run, name="email-outbox-sender", daemon=True)
+                    self._thread.start()
+
+    def wake(self) -> None:
+        """Deliver newly queued messages now instead of at the next poll"""
+        self.start()
+        self._wake.set()
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.pool.close()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            delivered = 0
+            try:
+                delivered = self.deliver_due()
+            except Exception as e:
+                logger.error(f"Email outbox delivery failed: {e}", exc_info=True)
+            if delivered >= self.batch_size:
+                continue  # More may be due
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def deliver_due(self) -> int:
+        """Claim and send one batch of due messages; returns the number attempted"""
+        if not smtp_configured() or not schema_capabilities.has_table(EmailOutbox.__tablename__):
+            if not self._warned:
+                logger.warning("SMTP not configured or email_outbox missing. Queued emails are not sent.")
+                self._warned = True
+            return 0
+
+        token, messages = self._claim()
+        if not messages:
+            return 0
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="email-send")
+        outcomes = list(self._executor.map(self._send_one, messages))
+        self._record(token, messages, outcomes)
+        return len(messages)
+
+    def _due(self, now: datetime) -> Any:
+        stale = now - timedelta(seconds=EMAIL_CLAIM_TIMEOUT_SECONDS)
+        return or_(
+            and_(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now),
+            and_(EmailOutbox.status == "sending", EmailOutbox.claimed_at < stale)
+        )
+
+    def _claim(self) -> Tuple[str, List[Any]]:
+        token = uuid.uuid4().hex
+        now = datetime.utcnow()
+        db = self.session_factory()
+        try:
+            # Ids first: MySQL cannot UPDATE a table filtered by a subquery on itself
+            ids = [message_id for (message_id,) in db.query(EmailOutbox.id).filter(self._due(now)).order_by(
+                EmailOutbox.next_attempt_at, EmailOutbox.id
+            ).limit(self.batch_size)]
+            if not ids:
+                return token, []
+            # Re-check the due condition so messages claimed meanwhile by another worker are skipped
+            db.query(EmailOutbox).filter(EmailOutbox.id.in_(ids), self._due(now)).update(
+                {"status": "sending", "claim_token": token, "claimed_at": now}, synchronize_session=False
+            )
+            db.commit()
+            messages = db.query(
+                EmailOutbox.id, EmailOutbox.to_emails, EmailOutbox.subject,
+                EmailOutbox.html_body, EmailOutbox.text_body, EmailOutbox.attempts
+            ).filter(EmailOutbox.claim_token == token).order_by(EmailOutbox.id).all()
+            return token, messages
+        finally:
+            db.close()
+
+    def _send_one(self, message: Any) -> Optional[Exception]:
+        try:
+            self.pool.send(build_message(message.to_emails, message.subject, message.html_body, message.text_body))
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to send email {message.id} to {message.to_emails}: {e}")
+            return e
+
+    def _record(self, token: str, messages: List[Any], outcomes: List[Optional[Exception]]) -> None:
+        now = datetime.utcnow()
+        params = []
+        for message, error in zip(messages, outcomes):
+            attempts = message.attempts + 1
+            if error is None:
+                status, next_attempt_at = "sent", now
+            elif attempts >= EMAIL_MAX_ATTEMPTS or _is_permanent(error):
+                status, next_attempt_at = "failed", now
+            else:
+                status = "pending"
+                next_attempt_at = now + timedelta(seconds=EMAIL_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+            params.append({
+                "message_id": message.id,
+                "token": token,
+                "new_status": status,
+                "new_attempts": attempts,
+                "new_next_attempt_at": next_attempt_at,
+                "new_last_error": str(error)[:1000] if error is not None else None,
+                "new_sent_at": now if error is None else None,
+            })
+
+        table = EmailOutbox.__table__
+        db = self.session_factory()
+        try:
+            db.execute(
+                table.update()
+                .where(table.c.id == bindparam("message_id"))
+                .where(table.c.claim_token == bindparam("token"))
+                .values(
+                    status=bindparam("new_status"),
+                    attempts=bindparam("new_attempts"),
+                    next_attempt_at=bindparam("new_next_attempt_at"),
+                    last_error=bindparam("new_last_error"),
+                    sent_at=bindparam("new_sent_at"),
+                    claim_token=None,
+                    claimed_at=None
+                ),
+                params
+            )
+            db.commit()
+        finally:
+            db.close()
+
+        sent = sum(1 for error in outcomes if error is None)
+        logger.info(f"Email outbox: {sent} sent, {len(outcomes) - sent} failed of {len(outcomes)}")
+
+
+email_sender = EmailOutboxSender()
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_sender(session):
+    if session.info.pop(_QUEUED_KEY, None):
+        email_sender.wake()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back_queue(session, previous_transaction):
+    session.info.pop(_QUEUED_KEY, None)
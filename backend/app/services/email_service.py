@@ -1,13 +1,20 @@
-"""Email service for sending HTML emails using SMTP"""
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+"""Email service for sending HTML emails using SMTP
+
+send_email() sends right away over a pooled SMTP connection;
+send_interview_invitations() only queues the invitations in the email
+outbox, which the background sender delivers (app.services.email_delivery).
+"""
+from functools import lru_cache
 from typing import List, Optional
-from app.config import get_settings
+from sqlalchemy.orm import Session
+from app.services.email_delivery import build_message, enqueue_email, smtp_configured, smtp_pool
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Stands in for the student's name in cached invitation renders
+_RECIPIENT_PLACEHOLDER = "\x00recipient_name\x00"
+
 def send_email(
     to_emails: List[str],
     subject: str,
@@ -26,35 +33,14 @@ def send_email(
     Returns:
         True if email sent successfully, False otherwise
     """
-    settings = get_settings()
-    
     # Check if SMTP is configured
-    if not settings.SMTP_HOST or not settings.SMTP_USER or not settings.SMTP_PASSWORD:
+    if not smtp_configured():
         logger.warning("SMTP not configured. Skipping email send.")
         logger.info(f"Would send email to {to_emails} with subject: {subject}")
         return False
     
     try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = subject
-        msg['From'] = settings.SMTP_USER
-        msg['To'] = ', '.join(to_emails)
-        
-        # Create text and HTML parts
-        if text_body:
-            text_part = MIMEText(text_body, 'plain')
-            msg.attach(text_part)
-        
-        html_part = MIMEText(html_body, 'html')
-        msg.attach(html_part)
-        
-        # Connect to SMTP server and send
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            server.starttls()  # Enable encryption
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
-        
+        smtp_pool.send(build_message(to_emails, subject, html_body, text_body))
         logger.info(f"Email sent successfully to {to_emails}")
         return True
         
@@ -94,7 +80,36 @@ def generate_interview_invitation_email(
     
     Returns:
         HTML email body
+
+    Renders are cached; a student invitation is rendered once per interview
+    and only the student's name is filled in per recipient.
     """
+    if is_student:
+        return _render_interview_invitation(
+            _RECIPIENT_PLACEHOLDER, interviewer_name, interview_title, interview_type, scheduled_date,
+            scheduled_time, duration_minutes, meeting_link, venue, description, True
+        ).replace(_RECIPIENT_PLACEHOLDER, student_name)
+    return _render_interview_invitation(
+        student_name, interviewer_name, interview_title, interview_type, scheduled_date,
+        scheduled_time, duration_minutes, meeting_link, venue, description, False
+    )
+
+
+@lru_cache(maxsize=128)
+def _render_interview_invitation(
+    student_name: str,
+    interviewer_name: str,
+    interview_title: str,
+    interview_type: str,
+    scheduled_date: str,
+    scheduled_time: str,
+    duration_minutes: int,
+    meeting_link: Optional[str] = None,
+    venue: Optional[str] = None,
+    description: Optional[str] = None,
+    is_student: bool = True
+) -> str:
+    """Interview invitation HTML (see generate_interview_invitation_email)"""
     recipient_role = "Student" if is_student else "Interviewer"
     recipient_name = student_name if is_student else interviewer_name
     other_party_name = interviewer_name if is_student else student_name
@@ -283,6 +298,7 @@ def generate_interview_invitation_email(
 
 
 def send_interview_invitations(
+    db: Session,
     student_emails: List[str],
     student_names: List[str],
     interviewer_email: Optional[str],
@@ -296,10 +312,13 @@ def send_interview_invitations(
     description: Optional[str] = None
 ) -> dict:
     """
-    Send interview invitation emails to students and interviewer
+    Queue interview invitation emails to students and interviewer
+    
+    The emails are added to db's session and sent by the background sender
+    once the caller commits.
     
     Returns:
-        Dictionary with send status for each recipient
+        Dictionary with the queued recipients
     """
     from datetime import datetime
     
@@ -313,13 +332,11 @@ def send_interview_invitations(
         scheduled_time = scheduled_datetime.split('T')[1][:5]
     
     results = {
-        'students_sent': [],
-        'students_failed': [],
-        'interviewer_sent': False,
-        'interviewer_failed': False
+        'students_queued': [],
+        'interviewer_queued': False
     }
     
-    # Send emails to students
+    # Queue emails to students
     for email, name in zip(student_emails, student_names):
         html_body = generate_interview_invitation_email(
             student_name=name,
@@ -355,12 +372,10 @@ def send_interview_invitations(
         Please prepare accordingly.
         """
         
-        if send_email([email], subject, html_body, text_body):
-            results['students_sent'].append(email)
-        else:
-            results['students_failed'].append(email)
+        enqueue_email(db, [email], subject, html_body, text_body)
+        results['students_queued'].append(email)
     
-    # Send email to interviewer
+    # Queue email to interviewer
     if interviewer_email and interviewer_name:
         # Get first student name for interviewer email
         first_student_name = student_names[0] if student_names else "Student"
@@ -400,10 +415,8 @@ def send_interview_invitations(
         Thank you for your participation.
         """
         
-        if send_email([interviewer_email], subject, html_body, text_body):
-            results['interviewer_sent'] = True
-        else:
-            results['interviewer_failed'] = True
+        enqueue_email(db, [interviewer_email], subject, html_body, text_body)
+        results['interviewer_queued'] = True
     
     return results
 
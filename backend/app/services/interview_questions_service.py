@@ -9,6 +9,7 @@ import logging
 import os
 import json
 from typing import List, Dict, Any, Optional
+from app.core.metrics import track_llm_call
 from app.services.advanced_ai_service import _call_ollama_advanced
 
 logger = logging.getLogger(__name__)
@@ -106,16 +107,17 @@ Return JSON array format:
   {{"question": "Do you have any questions for us?", "type": "closing", "category": "behavioral", "round": "{interview_round}"}}
 ]"""
         
-        response = OPENAI_CLIENT.chat.completions.create(
-            model="gpt-4o-mini",  # Cost-efficient model ($0.15/1M input, $0.60/1M output)
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.7,
-            max_tokens=3000
-        )
+        with track_llm_call("openai", "gpt-4o-mini"):
+            response = OPENAI_CLIENT.chat.completions.create(
+                model="gpt-4o-mini",  # Cost-efficient model ($0.15/1M input, $0.60/1M output)
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.7,
+                max_tokens=3000
+            )
         
         content = response.choices[0].message.content
         if not content:
@@ -0,0 +1,222 @@
+"""Job Analytics - GROUP BY aggregation and a cache for placement dashboards
+
+build_job_analytics() computes the job analytics response (per-job
+summaries, round-wise, year-wise and branch-wise stats) with a fixed number
+of GROUP BY queries, whatever the number of jobs, rounds or applications:
+(job, status) over applications, (round, status) over round results, and
+(year, status) / (branch, status) over applications joined to the
+applicant's profile.
+
+Results are cached per (college, job) filter in a VersionedCache watching
+jobs, applications, rounds and round results, so a round status update
+shows up on the next request; profile edits and other workers' writes
+within JOB_ANALYTICS_TTL_SECONDS.
+"""
+import logging
+import os
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.cache import VersionedCache
+from app.models.academic import Department
+from app.models.job import Job, JobApplication
+from app.models.job_round import JobApplicationRound, JobRound
+from app.models.profile import Profile
+
+logger = logging.getLogger(__name__)
+
+JOB_ANALYTICS_TTL_SECONDS = float(os.getenv("JOB_ANALYTICS_TTL_SECONDS", "60"))
+_MAX_CACHED_FILTERS = 256
+
+ROUND_STATUSES = ("QUALIFIED", "REJECTED", "ABSENT", "PENDING")
+SELECTED_STATUS = "Selected"
+
+
+def empty_job_analytics() -> Dict[str, Any]:
+    return {
+        "total_jobs": 0,
+        "total_applications": 0,
+        "selected_count": 0,
+        "overall_selection_rate": 0,
+        "jobs": [],
+        "round_wise_stats": [],
+        "year_wise_stats": [],
+        "branch_wise_stats": []
+    }
+
+
+def _rate(part: int, total: int) -> float:
+    return round(part / total * 100, 2) if total > 0 else 0
+
+
+def _selection_stats(
+    rows: List[Tuple[Hashable, str, int, int]], label: str
+) -> List[Dict[str, Any]]:
+    """Merge (key, application status, count, first application id) rows into per-key stats
+
+    Keys are listed in the order their first application was made.
+    """
+    groups: Dict[Hashable, Dict[str, int]] = {}
+    for key, app_status, count, first_id in rows:
+        counts = groups.setdefault(key, {"total": 0, "selected": 0, "first_id": first_id})
+        counts["total"] += count
+        if app_status == SELECTED_STATUS:
+            counts["selected"] += count
+        counts["first_id"] = min(counts["first_id"], first_id)
+    return [
+        {
+            label: key,
+            "total_applications": counts["total"],
+            "selected": counts["selected"],
+            "selection_rate": _rate(counts["selected"], counts["total"])
+        }
+        for key, counts in sorted(groups.items(), key=lambda item: item[1]["first_id"])
+    ]
+
+
+def build_job_analytics(db: Session, college_id: Optional[int] = None, job_id: Optional[int] = None) -> Dict[str, Any]:
+    """Job analytics over the active jobs of a college (or all colleges), optionally one job"""
+    jobs_query = db.query(Job.id, Job.company, Job.role, Job.company_logo).filter(Job.is_active == True)
+    if college_id:
+        jobs_query = jobs_query.filter(Job.college_id == college_id)
+    if job_id:
+        jobs_query = jobs_query.filter(Job.id == job_id)
+    jobs = jobs_query.order_by(Job.id).all()
+    if not jobs:
+        return empty_job_analytics()
+    job_ids = [job.id for job in jobs]
+
+    # Applications per (job, status)
+    by_job: Dict[int, Dict[str, int]] = {job.id: {"total": 0, "selected": 0} for job in jobs}
+    for app_job_id, app_status, count in db.query(
+        JobApplication.job_id, JobApplication.status, func.count(JobApplication.id)
+    ).filter(
+        JobApplication.job_id.in_(job_ids)
+    ).group_by(JobApplication.job_id, JobApplication.status):
+        by_job[app_job_id]["total"] += count
+        if app_status == SELECTED_STATUS:
+            by_job[app_job_id]["selected"] += count
+    total_applications = sum(counts["total"] for counts in by_job.values())
+    selected_count = sum(counts["selected"] for counts in by_job.values())
+
+    # Round results per (round, status); rounds without results are kept
+    rounds = db.query(JobRound.id, JobRound.job_id, JobRound.name, JobRound.order).filter(
+        JobRound.job_id.in_(job_ids),
+        JobRound.is_active == True
+    ).order_by(JobRound.job_id, JobRound.order, JobRound.id).all()
+    round_counts: Dict[int, Dict[str, int]] = {round_row.id: {} for round_row in rounds}
+    if rounds:
+        for round_id, round_status, count in db.query(
+            JobApplicationRound.round_id, JobApplicationRound.status, func.count(JobApplicationRound.id)
+        ).filter(
+            JobApplicationRound.round_id.in_(list(round_counts))
+        ).group_by(JobApplicationRound.round_id, JobApplicationRound.status):
+            round_counts[round_id][round_status] = count
+
+    jobs_by_id = {job.id: job for job in jobs}
+    round_stats = []
+    for round_row in rounds:
+        counts = round_counts[round_row.id]
+        total = sum(counts.values())
+        job = jobs_by_id[round_row.job_id]
+        round_stats.append({
+            "job_id": job.id,
+            "job_title": f"{job.company} - {job.role}",
+            "round_id": round_row.id,
+            "round_name": round_row.name,
+            "round_order": round_row.order,
+            "total_students": total,
+            **{round_status.lower(): counts.get(round_status, 0) for round_status in ROUND_STATUSES},
+            "pass_rate": _rate(counts.get("QUALIFIED", 0), total)
+        })
+
+    # Applications per (applicant year, status)
+    year_rows = db.query(
+        Profile.present_year, JobApplication.status, func.count(JobApplication.id), func.min(JobApplication.id)
+    ).join(
+        Profile, Profile.user_id == JobApplication.user_id
+    ).filter(
+        JobApplication.job_id.in_(job_ids),
+        Profile.present_year.isnot(None),
+        Profile.present_year != ""
+    ).group_by(Profile.present_year, JobApplication.status).all()
+    year_stats = _selection_stats(year_rows, "year")
+
+    # Applications per (applicant branch, status); the branch is the department's code
+    # or name, or the profile's free-text department when it has no department record
+    branch_rows = db.query(
+        Department.id, Department.code, Department.name, Profile.department,
+        JobApplication.status, func.count(JobApplication.id), func.min(JobApplication.id)
+    ).join(
+        Profile, Profile.user_id == JobApplication.user_id
+    ).outerjoin(
+        Department, Department.id == Profile.department_id
+    ).filter(
+        JobApplication.job_id.in_(job_ids)
+    ).group_by(
+        Department.id, Department.code, Department.name, Profile.department, JobApplication.status
+    ).all()
+    branch_keys = [
+        (
+            ((code or name) if department_id is not None else profile_department) or "Unknown",
+            app_status, count, first_id
+        )
+        for department_id, code, name, profile_department, app_status, count, first_id in branch_rows
+    ]
+    branch_stats = _selection_stats(branch_keys, "branch")
+
+    job_summaries = [
+        {
+            "job_id": job.id,
+            "company": job.company,
+            "role": job.role,
+            "total_applications": by_job[job.id]["total"],
+            "selected": by_job[job.id]["selected"],
+            "selection_rate": _rate(by_job[job.id]["selected"], by_job[job.id]["total"]),
+            "company_logo": job.company_logo
+        }
+        for job in jobs
+    ]
+
+    return {
+        "total_jobs": len(jobs),
+        "total_applications": total_applications,
+        "selected_count": selected_count,
+        "overall_selection_rate": _rate(selected_count, total_applications),
+        "jobs": job_summaries,
+        "round_wise_stats": round_stats,
+        "year_wise_stats": year_stats,
+        "branch_wise_stats": branch_stats
+    }
+
+
+class JobAnalyticsCache:
+    """Job analytics per (college, job) filter, dropped whenever placement data changes"""
+
+    def __init__(self, ttl_seconds: float = JOB_ANALYTICS_TTL_SECONDS):
+        self._cache = VersionedCache(
+            "job_analytics", (Job, JobApplication, JobRound, JobApplicationRound),
+            ttl_seconds=ttl_seconds, max_entries=_MAX_CACHED_FILTERS
+        )
+
+    def get(self, db: Session, college_id: Optional[int] = None, job_id: Optional[int] = None) -> Dict[str, Any]:
+        return self._cache.get(
+            (college_id or None, job_id or None), lambda: build_job_analytics(db, college_id, job_id), deep_copy=True
+        )
+
+    def invalidate(self) -> None:
+        self._cache.invalidate()
+
+    def mark_changed(self, session: Session) -> None:
+        """Drop the cache when session commits; for bulk writes that bypass the ORM hooks"""
+        self._cache.mark_changed(session)
+
+
+job_analytics_cache = JobAnalyticsCache()
+
+
+def mark_placement_data_changed(session: Session) -> None:
+    """Drop the job analytics cache when session commits (bulk writes that bypass the ORM)"""
+    job_analytics_cache.mark_changed(session)
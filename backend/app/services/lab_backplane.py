@@ -0,0 +1,270 @@
+"""Lab Backplane - cross-worker pub/sub and shared activity state for lab monitoring
+
+Each worker only holds the sockets connected to it. Activity deltas are
+published on a per-lab channel and every worker with sockets in that lab
+relays them to its local clients. Student activity is kept in a store
+sharded by lab (one hash per lab); entries expire LAB_ACTIVITY_TTL_SECONDS
+after their last write, so snapshots and code requests see students
+connected to any worker without the store growing forever.
+
+The in-process backplane is the default and only spans one worker. Set
+LAB_BACKPLANE_URL (e.g. redis://localhost:6379/0) to share state across
+workers and hosts. RedisBackplane also accepts a ready client with the
+redis.asyncio API, so it can run against a local stand-in such as fakeredis.
+"""
+import asyncio
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_AVAILABLE = False
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    aioredis = None
+
+settings = get_settings()
+
+# Called with (lab_id, message) for every message published to a subscribed lab
+MessageHandler = Callable[[int, Dict[str, Any]], Awaitable[None]]
+
+
+class LabBackplane(ABC):
+    """Pub/sub channel plus shared activity store, one shard per lab"""
+
+    def __init__(self, activity_ttl_seconds: int = settings.LAB_ACTIVITY_TTL_SECONDS):
+        self.activity_ttl_seconds = activity_ttl_seconds
+        self._handlers: Dict[int, MessageHandler] = {}
+
+    @abstractmethod
+    async def subscribe(self, lab_id: int, handler: MessageHandler) -> None:
+        """Receive messages published to a lab by any worker"""
+
+    @abstractmethod
+    async def unsubscribe(self, lab_id: int) -> None:
+        ...
+
+    @abstractmethod
+    async def publish(self, lab_id: int, message: Dict[str, Any]) -> None:
+        """Deliver a message to every subscribed worker, this one included"""
+
+    @abstractmethod
+    async def save_activities(self, lab_id: int, activities: Dict[int, Dict[str, Any]]) -> None:
+        """Write activity dicts (keyed by user_id) into the lab's shard and refresh their TTL"""
+
+    @abstractmethod
+    async def load_activities(self, lab_id: int) -> Dict[int, Dict[str, Any]]:
+        """All unexpired activities of a lab, keyed by user_id"""
+
+    @abstractmethod
+    async def load_activity(self, lab_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+        ...
+
+    async def close(self) -> None:
+        self._handlers.clear()
+
+    async def _dispatch(self, lab_id: int, message: Dict[str, Any]) -> None:
+        handler = self._handlers.get(lab_id)
+        if handler is None:
+            return
+        try:
+            await handler(lab_id, message)
+        except Exception as e:
+            logger.error(f"Backplane handler failed for lab {lab_id}: {e}", exc_info=True)
+
+
+class InProcessBackplane(LabBackplane):
+    """Single-worker backplane: direct dispatch and a dict store with per-entry expiry"""
+
+    def __init__(self, activity_ttl_seconds: int = settings.LAB_ACTIVITY_TTL_SECONDS):
+        super().__init__(activity_ttl_seconds)
+        # lab_id -> user_id -> (expires_at, activity)
+        self._activities: Dict[int, Dict[int, Tuple[float, Dict[str, Any]]]] = {}
+
+    async def subscribe(self, lab_id: int, handler: MessageHandler) -> None:
+        self._handlers[lab_id] = handler
+
+    async def unsubscribe(self, lab_id: int) -> None:
+        self._handlers.pop(lab_id, None)
+
+    async def publish(self, lab_id: int, message: Dict[str, Any]) -> None:
+        await self._dispatch(lab_id, message)
+
+    async def save_activities(self, lab_id: int, activities: Dict[int, Dict[str, Any]]) -> None:
+        expires_at = time.monotonic() + self.activity_ttl_seconds
+        shard = self._activities.setdefault(lab_id, {})
+        for user_id, activity in activities.items():
+            shard[user_id] = (expires_at, activity)
+
+    def _live_shard(self, lab_id: int) -> Dict[int, Tuple[float, Dict[str, Any]]]:
+        shard = self._activities.get(lab_id)
+        if not shard:
+            return {}
+        now = time.monotonic()
+        expired = [user_id for user_id, (expires_at, _) in shard.items() if expires_at <= now]
+        for user_id in expired:
+            del shard[user_id]
+        if not shard:
+            del self._activities[lab_id]
+        return shard
+
+    async def load_activities(self, lab_id: int) -> Dict[int, Dict[str, Any]]:
+        return {user_id: activity for user_id, (_, activity) in self._live_shard(lab_id).items()}
+
+    async def load_activity(self, lab_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+        entry = self._live_shard(lab_id).get(user_id)
+        return entry[1] if entry else None
+
+    async def close(self) -> None:
+        await super().close()
+        self._activities.clear()
+
+
+class RedisBackplane(LabBackplane):
+    """Redis pub/sub backplane
+
+    Channel  {prefix}:{lab_id}:events      - JSON messages
+    Hash     {prefix}:{lab_id}:activities  - user_id -> {"expires_at", "activity"}
+
+    Hash fields carry their own expiry (checked on read) and the whole hash
+    expires once no student in the lab has been written for the TTL.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        activity_ttl_seconds: int = settings.LAB_ACTIVITY_TTL_SECONDS,
+        prefix: str = "lab"
+    ):
+        super().__init__(activity_ttl_seconds)
+        self.client = client
+        self.prefix = prefix
+        self._pubsub = None
+        self._listener: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_url(cls, url: str, **kwargs) -> "RedisBackplane":
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("LAB_BACKPLANE_URL is set but the 'redis' package is not installed")
+        return cls(aioredis.from_url(url, decode_responses=True), **kwargs)
+
+    def _channel(self, lab_id: int) -> str:
+        return f"{self.prefix}:{lab_id}:events"
+
+    def _activity_key(self, lab_id: int) -> str:
+        return f"{self.prefix}:{lab_id}:activities"
+
+    def _lab_id_from_channel(self, channel: Any) -> Optional[int]:
+        if isinstance(channel, bytes):
+            channel = channel.decode("utf-8")
+        try:
+            return int(channel.split(":")[-2])
+        except (AttributeError, IndexError, ValueError):
+            return None
+
+    async def subscribe(self, lab_id: int, handler: MessageHandler) -> None:
+        self._handlers[lab_id] = handler
+        if self._pubsub is None:
+            self._pubsub = self.client.pubsub()
+        await self._pubsub.subscribe(self._channel(lab_id))
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def unsubscribe(self, lab_id: int) -> None:
+        if self._handlers.pop(lab_id, None) is None or self._pubsub is None:
+            return
+        await self._pubsub.unsubscribe(self._channel(lab_id))
+        if not self._handlers and self._listener:
+            self._listener.cancel()
+            self._listener = None
+
+    async def _listen(self) -> None:
+        """Relay channel messages to the local handlers until cancelled"""
+        while True:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None or message.get("type") != "message":
+                    continue
+                lab_id = self._lab_id_from_channel(message.get("channel"))
+                if lab_id is None:
+                    continue
+                await self._dispatch(lab_id, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Backplane listener error: {e}", exc_info=True)
+                await asyncio.sleep(1.0)
+
+    async def publish(self, lab_id: int, message: Dict[str, Any]) -> None:
+        await self.client.publish(self._channel(lab_id), json.dumps(message, default=str))
+
+    async def save_activities(self, lab_id: int, activities: Dict[int, Dict[str, Any]]) -> None:
+        if not activities:
+            return
+        expires_at = time.time() + self.activity_ttl_seconds
+        key = self._activity_key(lab_id)
+        mapping = {
+            str(user_id): json.dumps({"expires_at": expires_at, "activity": activity}, default=str)
+            for user_id, activity in activities.items()
+        }
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, self.activity_ttl_seconds)
+            await pipe.execute()
+
+    def _decode_entry(self, raw: Any) -> Tuple[float, Optional[Dict[str, Any]]]:
+        try:
+            entry = json.loads(raw)
+            return float(entry["expires_at"]), entry["activity"]
+        except (TypeError, ValueError, KeyError):
+            return 0.0, None
+
+    async def load_activities(self, lab_id: int) -> Dict[int, Dict[str, Any]]:
+        key = self._activity_key(lab_id)
+        raw_entries = await self.client.hgetall(key)
+        now = time.time()
+        activities: Dict[int, Dict[str, Any]] = {}
+        expired = []
+        for field, raw in raw_entries.items():
+            expires_at, activity = self._decode_entry(raw)
+            if activity is None or expires_at <= now:
+                expired.append(field)
+            else:
+                activities[int(field)] = activity
+        if expired:
+            await self.client.hdel(key, *expired)
+        return activities
+
+    async def load_activity(self, lab_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+        raw = await self.client.hget(self._activity_key(lab_id), str(user_id))
+        if raw is None:
+            return None
+        expires_at, activity = self._decode_entry(raw)
+        return activity if expires_at > time.time() else None
+
+    async def close(self) -> None:
+        await super().close()
+        if self._listener:
+            self._listener.cancel()
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+        await self.client.aclose()
+
+
+def create_backplane(url: Optional[str] = None) -> LabBackplane:
+    """Backplane for the configured LAB_BACKPLANE_URL (in-process when unset)"""
+    url = settings.LAB_BACKPLANE_URL if url is None else url
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackplane.from_url(url)
+    if url:
+        raise ValueError(f"Unsupported LAB_BACKPLANE_URL scheme: {url}")
+    return InProcessBackplane()
@@ -0,0 +1,260 @@
+"""Lab Leaderboard - incrementally maintained rankings per lab
+
+Each lab's ranking is kept, per worker, as a sorted array of rank keys
+(-overall_percentage, user_id) plus the entry of every participant:
+
+- top-K pages are a slice of the array and "my rank" is one bisect
+  (O(log n)), so live leaderboards are served without recomputation;
+- participant count, average and top score are kept as running totals;
+- committed inserts, updates and deletes of StudentLabProgress rows are
+  applied to loaded rankings by a CommitWatcher (bisect remove + insert),
+  so a change shows up on the next read.
+
+A lab's ranking is loaded from the DB with one query on first use and
+re-read after LAB_LEADERBOARD_REFRESH_SECONDS, which bounds how stale a
+worker can be for changes committed by other workers or by bulk UPDATEs
+that skip the ORM.
+"""
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import CommitWatcher
+from app.models.intelligent_lab import StudentLabProgress
+from app.models.profile import Profile
+
+logger = logging.getLogger(__name__)
+
+LAB_LEADERBOARD_REFRESH_SECONDS = float(os.getenv("LAB_LEADERBOARD_REFRESH_SECONDS", "300"))
+_MAX_LOADED_LABS = 256
+
+# StudentLabProgress columns copied into leaderboard entries
+_ENTRY_FIELDS = (
+    "overall_percentage", "total_score", "completion_percentage",
+    "exercises_completed", "tests_passed",
+)
+
+RankKey = Tuple[float, int]
+
+
+def _entry_from(source: Any) -> Dict[str, Any]:
+    return {name: getattr(source, name) or 0 for name in _ENTRY_FIELDS}
+
+
+class LabRanking:
+    """Sorted ranking of one lab's participants"""
+
+    def __init__(self, lab_id: int):
+        self.lab_id = lab_id
+        self.keys: List[RankKey] = []
+        self.entries: Dict[int, Dict[str, Any]] = {}
+        self.names: Dict[int, Optional[str]] = {}
+        self.percentage_sum = 0.0
+        self.loaded_at = time.monotonic()
+        self.last_updated = datetime.now(timezone.utc)
+
+    @staticmethod
+    def rank_key(user_id: int, entry: Dict[str, Any]) -> RankKey:
+        return (-float(entry["overall_percentage"]), user_id)
+
+    def upsert(self, user_id: int, entry: Dict[str, Any]) -> None:
+        self.remove(user_id)
+        self.entries[user_id] = entry
+        insort(self.keys, self.rank_key(user_id, entry))
+        self.percentage_sum += entry["overall_percentage"]
+        self.last_updated = datetime.now(timezone.utc)
+
+    def remove(self, user_id: int) -> None:
+        entry = self.entries.pop(user_id, None)
+        if entry is None:
+            return
+        index = bisect_left(self.keys, self.rank_key(user_id, entry))
+        del self.keys[index]
+        self.percentage_sum -= entry["overall_percentage"]
+        self.last_updated = datetime.now(timezone.utc)
+
+    def apply(self, change: Tuple[int, int, Optional[Dict[str, Any]]]) -> None:
+        _, user_id, entry = change
+        if entry is None:
+            self.remove(user_id)
+        else:
+            self.upsert(user_id, entry)
+
+    def rank_of(self, user_id: int) -> Optional[int]:
+        entry = self.entries.get(user_id)
+        if entry is None:
+            return None
+        return bisect_left(self.keys, self.rank_key(user_id, entry)) + 1
+
+    def page(self, skip: int, limit: int) -> List[Tuple[int, int]]:
+        """(rank, user_id) pairs of one page"""
+        return [(skip + offset + 1, key[1]) for offset, key in enumerate(self.keys[skip:skip + limit])]
+
+    def stats(self) -> Dict[str, Any]:
+        count = len(self.keys)
+        return {
+            "total_participants": count,
+            "average_score": self.percentage_sum / count if count else 0.0,
+            "top_score": -self.keys[0][0] if count else 0.0,
+            "last_updated": self.last_updated,
+        }
+
+
+class LabLeaderboardService:
+    """Per-lab rankings kept in sync with StudentLabProgress commits"""
+
+    def __init__(self, refresh_seconds: float = LAB_LEADERBOARD_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self._rankings: "OrderedDict[int, LabRanking]" = OrderedDict()
+        # lab_id -> [loaders in progress, changes committed while loading]
+        self._loading: Dict[int, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    # ---- loading ----
+
+    def _get_ranking(self, db: Session, lab_id: int) -> LabRanking:
+        with self._lock:
+            ranking = self._rankings.get(lab_id)
+            if ranking is not None and time.monotonic() - ranking.loaded_at < self.refresh_seconds:
+                self._rankings.move_to_end(lab_id)
+                return ranking
+            loading = self._loading.setdefault(lab_id, [0, []])
+            loading[0] += 1
+
+        try:
+            ranking = self._load(db, lab_id)
+        finally:
+            with self._lock:
+                loading = self._loading[lab_id]
+                loading[0] -= 1
+                changes = loading[1] if loading[0] == 0 else list(loading[1])
+                if loading[0] == 0:
+                    del self._loading[lab_id]
+
+        with self._lock:
+            # Replay commits that may have landed after the snapshot was read
+            for change in changes:
+                ranking.apply(change)
+            self._rankings[lab_id] = ranking
+            self._rankings.move_to_end(lab_id)
+            while len(self._rankings) > _MAX_LOADED_LABS:
+                self._rankings.popitem(last=False)
+        return ranking
+
+    def _load(self, db: Session, lab_id: int) -> LabRanking:
+        rows = db.query(
+            StudentLabProgress.user_id,
+            *(getattr(StudentLabProgress, name) for name in _ENTRY_FIELDS),
+            Profile.full_name,
+        ).outerjoin(
+            Profile, Profile.user_id == StudentLabProgress.user_id
+        ).filter(
+            StudentLabProgress.lab_id == lab_id
+        ).order_by(
+            StudentLabProgress.overall_percentage.desc(), StudentLabProgress.user_id
+        ).all()
+
+        ranking = LabRanking(lab_id)
+        for row in rows:
+            entry = _entry_from(row)
+            ranking.entries[row.user_id] = entry
+            ranking.keys.append(LabRanking.rank_key(row.user_id, entry))
+            ranking.names[row.user_id] = row.full_name
+            ranking.percentage_sum += entry["overall_percentage"]
+        # Already in key order unless the driver sorts floats differently
+        ranking.keys.sort()
+        logger.info(f"Loaded leaderboard for lab {lab_id} ({len(rows)} participants)")
+        return ranking
+
+    def _resolve_names(self, db: Session, ranking: LabRanking, user_ids: List[int]) -> Dict[int, Optional[str]]:
+        with self._lock:
+            missing = [user_id for user_id in user_ids if user_id not in ranking.names]
+        if missing:
+            found = dict(db.query(Profile.user_id, Profile.full_name).filter(Profile.user_id.in_(missing)).all())
+            with self._lock:
+                for user_id in missing:
+                    ranking.names[user_id] = found.get(user_id)
+        with self._lock:
+            return {user_id: ranking.names.get(user_id) for user_id in user_ids}
+
+    # ---- queries ----
+
+    def _entry(self, ranking: LabRanking, rank: int, user_id: int, name: Optional[str]) -> Dict[str, Any]:
+        entry = ranking.entries[user_id]
+        return {
+            "user_id": user_id,
+            "user_name": name or "Unknown",
+            "rank": rank,
+            "score": entry["total_score"],
+            "completion_percentage": entry["completion_percentage"],
+            "exercises_completed": entry["exercises_completed"],
+            "tests_passed": entry["tests_passed"],
+        }
+
+    def get_page(self, db: Session, lab_id: int, skip: int = 0, limit: int = 50) -> Dict[str, Any]:
+        """One page of the leaderboard with the lab's summary stats"""
+        ranking = self._get_ranking(db, lab_id)
+        with self._lock:
+            page = ranking.page(skip, limit)
+            stats = ranking.stats()
+        names = self._resolve_names(db, ranking, [user_id for _, user_id in page])
+        with self._lock:
+            rankings = [
+                self._entry(ranking, rank, user_id, names[user_id])
+                for rank, user_id in page
+                if user_id in ranking.entries
+            ]
+        return {"lab_id": lab_id, "rankings": rankings, "skip": skip, "limit": limit, **stats}
+
+    def get_rank(self, db: Session, lab_id: int, user_id: int) -> Optional[Dict[str, Any]]:
+        """A participant's leaderboard entry, or None if they have no progress in the lab"""
+        ranking = self._get_ranking(db, lab_id)
+        with self._lock:
+            if ranking.rank_of(user_id) is None:
+                return None
+        names = self._resolve_names(db, ranking, [user_id])
+        with self._lock:
+            rank = ranking.rank_of(user_id)
+            if rank is None:
+                return None
+            return self._entry(ranking, rank, user_id, names[user_id])
+
+    def invalidate(self, lab_id: Optional[int] = None) -> None:
+        """Drop loaded rankings (e.g. after bulk changes made outside the ORM)"""
+        with self._lock:
+            if lab_id is None:
+                self._rankings.clear()
+            else:
+                self._rankings.pop(lab_id, None)
+
+    # ---- change tracking ----
+
+    def apply_changes(self, changes: List[Tuple[int, int, Optional[Dict[str, Any]]]]) -> None:
+        with self._lock:
+            for change in changes:
+                lab_id = change[0]
+                ranking = self._rankings.get(lab_id)
+                if ranking is not None:
+                    ranking.apply(change)
+                loading = self._loading.get(lab_id)
+                if loading is not None:
+                    loading[1].append(change)
+
+
+lab_leaderboard = LabLeaderboardService()
+
+
+def _progress_change(target: StudentLabProgress, deleted: bool) -> Tuple[int, int, Optional[Dict[str, Any]]]:
+    return target.lab_id, target.user_id, None if deleted else _entry_from(target)
+
+
+_progress_watcher = CommitWatcher(
+    "lab_leaderboard", (StudentLabProgress,), on_commit=lab_leaderboard.apply_changes, record=_progress_change
+)
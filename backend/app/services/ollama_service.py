@@ -4,6 +4,7 @@ import json
 import requests
 from typing import Dict, Any, Optional, List
 import logging
+from app.core.metrics import track_llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -42,7 +43,8 @@ def _call_ollama_api(prompt: str, system_prompt: Optional[str] = None, temperatu
         }
         
         logger.info(f"Calling Ollama API: {url} with model: {OLLAMA_MODEL}")
-        response = requests.post(url, json=payload, timeout=OLLAMA_TIMEOUT)
+        with track_llm_call("ollama", OLLAMA_MODEL):
+            response = requests.post(url, json=payload, timeout=OLLAMA_TIMEOUT)
         
         if response.status_code != 200:
             logger.error(f"Ollama API error: {response.status_code} - {response.text}")
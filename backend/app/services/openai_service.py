@@ -3,6 +3,7 @@ import os
 import json
 from typing import Dict, Any, Optional, List
 import logging
+from app.core.metrics import track_llm_call
 
 logger = logging.getLogger(__name__)
 
@@ -78,16 +79,17 @@ Return the optimized resume data as JSON."""
     user_message = "\n".join(user_message_parts)
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.8,  # Increased for more creative optimization
-            max_tokens=4000,  # Allow longer, more detailed responses
-        )
+        with track_llm_call("openai", "gpt-4o-mini"):
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.8,  # Increased for more creative optimization
+                max_tokens=4000,  # Allow longer, more detailed responses
+            )
         
         content = response.choices[0].message.content
         if not content:
@@ -160,16 +162,17 @@ Return JSON with:
     user_message = "\n".join(user_message_parts)
     
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_message}
-            ],
-            response_format={"type": "json_object"},
-            temperature=0.4,  # Slightly higher for more nuanced scoring
-            max_tokens=3000,  # Allow detailed feedback
-        )
+        with track_llm_call("openai", "gpt-4o-mini"):
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_message}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.4,  # Slightly higher for more nuanced scoring
+                max_tokens=3000,  # Allow detailed feedback
+            )
         
         content = response.choices[0].message.content
         if not content:
@@ -0,0 +1,137 @@
+"""Resume PDF Rendering Service - off-loop rendering with a content-addressed cache
+
+WeasyPrint/ReportLab rendering is CPU-bound, so renders run in a process
+pool whose workers pre-build fonts and stylesheets at start-up. Rendered
+PDFs are cached by (template, normalized resume_data) hash, so repeat
+downloads of an unchanged resume skip rendering entirely. Concurrent
+requests for the same resume share one render.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from app.services.pdf_service import generate_resume_pdf, warm_up
+
+logger = logging.getLogger(__name__)
+
+PDF_RENDER_WORKERS = int(os.getenv("PDF_RENDER_WORKERS", "2"))
+PDF_CACHE_MAX_BYTES = int(os.getenv("PDF_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))  # 64 MB
+
+
+def _normalize(value: Any) -> Any:
+    """Drop empty values so cosmetic differences in the payload hash the same"""
+    if isinstance(value, dict):
+        normalized = {k: _normalize(v) for k, v in value.items()}
+        return {k: v for k, v in normalized.items() if v not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def resume_cache_key(resume_data: Dict[str, Any], template: str) -> str:
+    """Content address for a rendered resume"""
+    payload = json.dumps(
+        {"template": template, "resume_data": _normalize(resume_data)},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PDFRenderService:
+    """Renders resume PDFs in a warmed process pool behind a bounded LRU cache"""
+
+    def __init__(self, workers: int = PDF_RENDER_WORKERS, cache_max_bytes: int = PDF_CACHE_MAX_BYTES):
+        self.workers = workers
+        self.cache_max_bytes = cache_max_bytes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+        self._cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._cache_bytes = 0
+        self._in_flight: Dict[str, "asyncio.Future[bytes]"] = {}
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=warm_up
+                )
+            return self._pool
+
+    def _reset_pool(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+    def get_cached(self, cache_key: str) -> Optional[bytes]:
+        pdf_bytes = self._cache.get(cache_key)
+        if pdf_bytes is not None:
+            self._cache.move_to_end(cache_key)
+        return pdf_bytes
+
+    def _store(self, cache_key: str, pdf_bytes: bytes) -> None:
+        if len(pdf_bytes) > self.cache_max_bytes:
+            return
+        self._cache[cache_key] = pdf_bytes
+        self._cache_bytes += len(pdf_bytes)
+        while self._cache_bytes > self.cache_max_bytes:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= len(evicted)
+
+    async def _render_off_loop(self, resume_data: Dict[str, Any], template: str) -> bytes:
+        loop = asyncio.get_running_loop()
+        if self.workers <= 0:
+            # No process pool configured - still keep rendering off the event loop
+            return await loop.run_in_executor(None, generate_resume_pdf, resume_data, template)
+        try:
+            return await loop.run_in_executor(self._get_pool(), generate_resume_pdf, resume_data, template)
+        except BrokenProcessPool:
+            logger.warning("PDF render pool broke, restarting it")
+            self._reset_pool()
+            return await loop.run_in_executor(self._get_pool(), generate_resume_pdf, resume_data, template)
+
+    async def render(self, resume_data: Dict[str, Any], template: str) -> bytes:
+        """Return the PDF for a resume, rendering it at most once per content hash"""
+        cache_key = resume_cache_key(resume_data, template)
+
+        cached = self.get_cached(cache_key)
+        if cached is not None:
+            return cached
+
+        in_flight = self._in_flight.get(cache_key)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future: "asyncio.Future[bytes]" = asyncio.get_running_loop().create_future()
+        self._in_flight[cache_key] = future
+        try:
+            pdf_bytes = await self._render_off_loop(resume_data, template)
+            self._store(cache_key, pdf_bytes)
+            future.set_result(pdf_bytes)
+            return pdf_bytes
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so waiters-less failures don't log "exception never retrieved"
+            future.exception()
+            raise
+        finally:
+            self._in_flight.pop(cache_key, None)
+
+    def shutdown(self) -> None:
+        self._reset_pool()
+
+
+# Global render service instance
+pdf_renderer = PDFRenderService()
@@ -3,6 +3,7 @@ import os
 import base64
 from typing import Dict, Any, Optional
 from io import BytesIO
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,6 +32,9 @@ if not WEASYPRINT_AVAILABLE:
         logger.warning("reportlab not available, PDF generation will fail")
 
 
+RESUME_TEMPLATES = ["fresher_classic", "project_focused", "skills_first", "internship_focused", "minimal_ats"]
+
+
 def generate_resume_pdf(resume_data: Dict[str, Any], template: str = "fresher_classic") -> bytes:
     """
     Generate PDF from resume data using specified template
@@ -40,12 +44,11 @@ def generate_resume_pdf(resume_data: Dict[str, Any], template: str = "fresher_cl
         try:
             # Get template HTML
             html_content = render_resume_html(resume_data, template)
-            # Generate PDF using WeasyPrint
-            font_config = FontConfiguration()
+            # Generate PDF using WeasyPrint (fonts and stylesheet are built once per process)
             html_doc = HTML(string=html_content)
             pdf_bytes = html_doc.write_pdf(
-                stylesheets=[CSS(string=get_resume_css(template))],
-                font_config=font_config
+                stylesheets=[get_weasyprint_stylesheet(template)],
+                font_config=get_font_config()
             )
             return pdf_bytes
         except Exception as e:
@@ -117,6 +120,28 @@ def render_resume_html(resume_data: Dict[str, Any], template: str) -> str:
         )
 
 
+@lru_cache(maxsize=1)
+def get_font_config():
+    """Shared WeasyPrint font configuration (font discovery is expensive)"""
+    return FontConfiguration()
+
+
+@lru_cache(maxsize=16)
+def get_weasyprint_stylesheet(template: str):
+    """Parsed WeasyPrint stylesheet for a template"""
+    return CSS(string=get_resume_css(template), font_config=get_font_config())
+
+
+def warm_up() -> None:
+    """Pre-build fonts and stylesheets for every template (called in render workers)"""
+    if WEASYPRINT_AVAILABLE:
+        for template in RESUME_TEMPLATES:
+            get_weasyprint_stylesheet(template)
+    elif REPORTLAB_AVAILABLE:
+        getSampleStyleSheet()
+
+
+@lru_cache(maxsize=16)
 def get_resume_css(template: str) -> str:
     """Get CSS for resume template"""
     base_css = """
@@ -2,6 +2,7 @@
 import requests
 import asyncio
 from typing import Dict, Optional
+from app.core.metrics import track_judge_execution
 
 PISTON_API = "https://emkc.org/api/v2/piston"
 
@@ -73,11 +74,12 @@ async def execute_with_piston(
     
     try:
         # Execute synchronously (Piston API is fast)
-        response = requests.post(
-            f"{PISTON_API}/execute",
-            json=payload,
-            timeout=time_limit + 2  # Add buffer
-        )
+        with track_judge_execution("piston"):
+            response = requests.post(
+                f"{PISTON_API}/execute",
+                json=payload,
+                timeout=time_limit + 2  # Add buffer
+            )
         response.raise_for_status()
         
         result = response.json()
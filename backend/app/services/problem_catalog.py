@@ -0,0 +1,271 @@
+"""Problem Catalog - in-memory visibility index for coding problem listings
+
+The catalog is a snapshot of every coding problem's visibility and filter
+attributes (scope, college, department, section, minimum year, tags,
+languages, ...), loaded with one narrow query - no descriptions, starter
+code or test cases. Visibility is computed once per audience bucket
+(college, department, section, present year, student year) and cached as an
+immutable tuple, so a listing is an in-memory filter plus one primary-key
+query for the rows of the requested page.
+
+The snapshot and the buckets computed from it live in a VersionedCache
+watching CodingProblem: committed changes (or mark_changed() for raw SQL
+writes) drop them, and they are reloaded after PROBLEM_CATALOG_TTL_SECONDS.
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, FrozenSet, Hashable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import null
+from sqlalchemy.orm import Session
+
+from app.core.cache import VersionedCache
+from app.core.schema import schema_capabilities
+from app.models.quiz import CodingProblem
+
+logger = logging.getLogger(__name__)
+
+PROBLEM_CATALOG_TTL_SECONDS = float(os.getenv("PROBLEM_CATALOG_TTL_SECONDS", "60"))
+_MAX_CACHED_BUCKETS = 512
+
+ALL_PROBLEMS_BUCKET = ("all",)
+NO_YEAR_BUCKET = ("no-year",)
+
+
+class CatalogEntry(NamedTuple):
+    id: int
+    created_at: Optional[datetime]
+    is_active: bool
+    expiry_date: Optional[datetime]
+    difficulty: Optional[str]
+    year: Optional[int]  # Parsed 1-4, None if unset or unparseable
+    min_year: int  # Lowest student year that can see the problem
+    scope_type: str
+    college_id: Optional[int]
+    department: Optional[str]  # Lower-cased
+    section_id: Optional[int]
+    year_str: Optional[str]  # Lower-cased
+    tags: FrozenSet[str]
+    languages: FrozenSet[str]
+
+
+def parse_year_to_int(year_str: Any) -> Optional[int]:
+    """Parse year string to integer (1-4)
+    
+    Handles formats like:
+    - "1st", "2nd", "3rd", "4th"
+    - "1", "2", "3", "4"
+    - "First", "Second", etc.
+    """
+    if isinstance(year_str, int):
+        return year_str if 1 <= year_str <= 4 else None
+    
+    if not isinstance(year_str, str):
+        return None
+    
+    year_str = year_str.strip().lower()
+    
+    # Remove ordinal suffixes
+    year_str = year_str.replace('st', '').replace('nd', '').replace('rd', '').replace('th', '')
+    
+    # Try direct number
+    try:
+        year = int(year_str)
+        if 1 <= year <= 4:
+            return year
+    except ValueError:
+        pass
+    
+    # Try word format
+    year_map = {
+        'first': 1, 'second': 2, 'third': 3, 'fourth': 4,
+        'one': 1, 'two': 2, 'three': 3, 'four': 4
+    }
+    return year_map.get(year_str)
+
+
+def _as_list(value: Any) -> List[Any]:
+    if isinstance(value, list):
+        return value
+    if isinstance(value, str) and value:
+        return [item.strip() for item in value.split(',') if item.strip()]
+    return []
+
+
+def _entry_from(row: Any) -> CatalogEntry:
+    raw_year = row.year
+    if isinstance(raw_year, int):
+        min_year = raw_year
+    else:
+        min_year = parse_year_to_int(raw_year) or 1
+    return CatalogEntry(
+        id=row.id,
+        created_at=row.created_at,
+        is_active=bool(row.is_active),
+        expiry_date=row.expiry_date,
+        difficulty=row.difficulty,
+        year=parse_year_to_int(raw_year),
+        min_year=min_year,
+        scope_type=row.scope_type or "svnapro",
+        college_id=row.college_id,
+        department=row.department.lower() if row.department else None,
+        section_id=row.section_id,
+        year_str=row.year_str.lower() if row.year_str else None,
+        tags=frozenset(_as_list(row.tags)),
+        languages=frozenset(
+            _as_list(row.allowed_languages) + _as_list(row.restricted_languages) + _as_list(row.recommended_languages)
+        ),
+    )
+
+
+def audience_bucket(profile: Any, student_year: Optional[int]) -> Hashable:
+    """Bucket key of everyone who sees the same problems as this student"""
+    if not student_year:
+        return NO_YEAR_BUCKET
+    if profile is None:
+        return ("student", None, None, None, None, student_year)
+    return (
+        "student",
+        profile.college_id,
+        profile.department.lower() if profile.department else None,
+        profile.section_id,
+        profile.present_year.lower() if profile.present_year else None,
+        student_year,
+    )
+
+
+def _visible(entry: CatalogEntry, bucket: Tuple) -> bool:
+    if bucket == ALL_PROBLEMS_BUCKET:
+        return True
+    if bucket == NO_YEAR_BUCKET:
+        # Students without a year only see SvnaPro problems
+        return entry.scope_type == "svnapro"
+
+    _, college_id, department, section_id, present_year, student_year = bucket
+    # Students see problems for their year and below
+    if entry.min_year > student_year:
+        return False
+    scope = entry.scope_type
+    if scope == "svnapro":
+        return True
+    if scope == "college":
+        if college_id and entry.college_id:
+            return college_id == entry.college_id
+        # College scope without a college behaves like SvnaPro
+        return not entry.college_id
+    if scope == "department":
+        return bool(
+            college_id and entry.college_id and college_id == entry.college_id
+            and department and entry.department and department == entry.department
+        )
+    if scope == "section":
+        if not (section_id and entry.section_id and section_id == entry.section_id):
+            return False
+        # Section problems with a year string only match that year
+        return not (entry.year_str and present_year) or entry.year_str == present_year
+    return False
+
+
+class CatalogSnapshot:
+    """One load of the catalog and the bucket views computed from it"""
+
+    def __init__(self, entries: Tuple[CatalogEntry, ...]):
+        self.entries = entries
+        self.buckets: "OrderedDict[Hashable, Tuple[CatalogEntry, ...]]" = OrderedDict()
+
+
+class ProblemCatalog:
+    """Cached catalog of problem visibility attributes with per-bucket views"""
+
+    def __init__(self, ttl_seconds: float = PROBLEM_CATALOG_TTL_SECONDS):
+        self._cache = VersionedCache("problem_catalog", (CodingProblem,), ttl_seconds=ttl_seconds, max_entries=1)
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session) -> CatalogSnapshot:
+        columns = [
+            CodingProblem.id, CodingProblem.created_at, CodingProblem.is_active, CodingProblem.expiry_date,
+            CodingProblem.difficulty, CodingProblem.year, CodingProblem.scope_type, CodingProblem.college_id,
+            CodingProblem.department, CodingProblem.section_id, CodingProblem.tags,
+            CodingProblem.allowed_languages, CodingProblem.restricted_languages, CodingProblem.recommended_languages,
+        ]
+        # year_str may be missing on databases that have not been migrated yet
+        if schema_capabilities.has_column('coding_problems', 'year_str'):
+            columns.append(CodingProblem.year_str)
+        else:
+            columns.append(null().label('year_str'))
+
+        rows = db.query(*columns).order_by(CodingProblem.created_at.desc(), CodingProblem.id.desc()).all()
+        entries = [_entry_from(row) for row in rows]
+        logger.info(f"Loaded coding problem catalog ({len(entries)} problems, version {self._cache.version})")
+        return CatalogSnapshot(tuple(entries))
+
+    def visible(self, db: Session, bucket: Hashable) -> Tuple[CatalogEntry, ...]:
+        """Problems visible to an audience bucket, newest first (immutable)"""
+        snapshot = self._cache.get("snapshot", lambda: self._load(db))
+        if bucket == ALL_PROBLEMS_BUCKET:
+            return snapshot.entries
+        with self._lock:
+            cached = snapshot.buckets.get(bucket)
+            if cached is not None:
+                snapshot.buckets.move_to_end(bucket)
+                return cached
+
+        visible = tuple(entry for entry in snapshot.entries if _visible(entry, bucket))
+        with self._lock:
+            snapshot.buckets[bucket] = visible
+            snapshot.buckets.move_to_end(bucket)
+            while len(snapshot.buckets) > _MAX_CACHED_BUCKETS:
+                snapshot.buckets.popitem(last=False)
+        return visible
+
+    def mark_changed(self, session: Session) -> None:
+        """Invalidate when `session` commits; for writes that skip the mapper hooks (raw SQL)"""
+        self._cache.mark_changed(session)
+
+    def invalidate(self) -> None:
+        """Drop the snapshot and every bucket"""
+        self._cache.invalidate()
+
+
+problem_catalog = ProblemCatalog()
+
+
+def filter_entries(
+    entries: Tuple[CatalogEntry, ...],
+    is_active: bool = True,
+    difficulty: Optional[str] = None,
+    year: Optional[int] = None,
+    language: Optional[str] = None,
+    tags: Optional[List[str]] = None,
+    scope_type: Optional[str] = None,
+    solved_ids: Optional[FrozenSet[int]] = None,
+    solved: Optional[bool] = None,
+) -> List[CatalogEntry]:
+    """Apply the listing filters to catalog entries (order is kept)"""
+    now_naive = datetime.utcnow()
+    now_aware = datetime.now(timezone.utc)
+    result = []
+    for entry in entries:
+        if entry.is_active != is_active:
+            continue
+        if entry.expiry_date is not None:
+            now = now_aware if entry.expiry_date.tzinfo else now_naive
+            if entry.expiry_date <= now:
+                continue
+        if difficulty and entry.difficulty != difficulty:
+            continue
+        if year and entry.year != year:
+            continue
+        if language and language not in entry.languages:
+            continue
+        if tags and not entry.tags.issuperset(tags):
+            continue
+        if scope_type and entry.scope_type != scope_type:
+            continue
+        if solved is not None and solved_ids is not None and (entry.id in solved_ids) != solved:
+            continue
+        result.append(entry)
+    return result
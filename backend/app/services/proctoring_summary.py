@@ -0,0 +1,115 @@
+"""Proctoring Summary Cache - per-lab violation summaries without rescanning violations
+
+A lab's summary (violation counts by type, severity and user, plus session
+counts) is built once with GROUP BY queries and then kept up to date by
+the ingest path: every committed batch of violations adds its counts to
+the cached summary, and starting or ending a session adjusts the session
+counts. Summaries are kept in a VersionedCache and rebuilt after
+PROCTORING_SUMMARY_TTL_SECONDS.
+"""
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from app.core.cache import VersionedCache
+from app.models.proctoring import ProctoringSession, ProctoringViolation
+
+logger = logging.getLogger(__name__)
+
+PROCTORING_SUMMARY_TTL_SECONDS = float(os.getenv("PROCTORING_SUMMARY_TTL_SECONDS", "30"))
+_MAX_CACHED_LABS = 512
+
+
+def _add_counts(target: Dict[Any, int], counts: Dict[Any, int]) -> None:
+    for key, count in counts.items():
+        target[key] = target.get(key, 0) + count
+
+
+class ViolationSummaryCache:
+    """Per-lab violation summaries, updated in place as violations are ingested"""
+
+    def __init__(self, ttl_seconds: float = PROCTORING_SUMMARY_TTL_SECONDS):
+        # Kept current by the ingest path rather than by commit hooks
+        self._cache = VersionedCache("proctoring_summary", ttl_seconds=ttl_seconds, max_entries=_MAX_CACHED_LABS)
+
+    def get(self, db: Session, lab_id: int) -> Dict[str, Any]:
+        return self._cache.get(lab_id, lambda: self._load(db, lab_id), deep_copy=True)
+
+    def _load(self, db: Session, lab_id: int) -> Dict[str, Any]:
+        summary = {
+            'total_violations': 0,
+            'total_sessions': 0,
+            'active_sessions': 0,
+            'by_type': {},
+            'by_severity': {},
+            'by_user': {},
+        }
+
+        grouped = db.query(
+            ProctoringViolation.user_id,
+            ProctoringViolation.violation_type,
+            ProctoringViolation.severity,
+            func.count(ProctoringViolation.id)
+        ).filter(
+            ProctoringViolation.lab_id == lab_id
+        ).group_by(
+            ProctoringViolation.user_id,
+            ProctoringViolation.violation_type,
+            ProctoringViolation.severity
+        ).all()
+        for user_id, violation_type, severity, count in grouped:
+            summary['total_violations'] += count
+            _add_counts(summary['by_type'], {violation_type.value: count})
+            _add_counts(summary['by_severity'], {severity.value: count})
+            _add_counts(summary['by_user'], {user_id: count})
+
+        total_sessions, active_sessions = db.query(
+            func.count(ProctoringSession.id),
+            func.sum(case((ProctoringSession.is_active == True, 1), else_=0))
+        ).filter(
+            ProctoringSession.lab_id == lab_id
+        ).one()
+        summary['total_sessions'] = total_sessions or 0
+        summary['active_sessions'] = int(active_sessions or 0)
+        return summary
+
+    def record_violations(
+        self,
+        lab_id: int,
+        user_id: int,
+        by_type: Dict[str, int],
+        by_severity: Dict[str, int],
+        new_session: bool = False
+    ) -> None:
+        """Add a committed batch of violations to the lab's cached summary"""
+        def apply(summary: Dict[str, Any]) -> None:
+            count = sum(by_type.values())
+            summary['total_violations'] += count
+            _add_counts(summary['by_type'], by_type)
+            _add_counts(summary['by_severity'], by_severity)
+            _add_counts(summary['by_user'], {user_id: count})
+            if new_session:
+                summary['total_sessions'] += 1
+                summary['active_sessions'] += 1
+
+        self._cache.update(lab_id, apply)
+
+    def record_session(self, lab_id: int, started: bool) -> None:
+        """Adjust session counts when a session is created (started=True) or ended"""
+        def apply(summary: Dict[str, Any]) -> None:
+            if started:
+                summary['total_sessions'] += 1
+                summary['active_sessions'] += 1
+            else:
+                summary['active_sessions'] = max(0, summary['active_sessions'] - 1)
+
+        self._cache.update(lab_id, apply)
+
+    def invalidate(self, lab_id: Optional[int] = None) -> None:
+        self._cache.invalidate(lab_id)
+
+
+violation_summary_cache = ViolationSummaryCache()
@@ -0,0 +1,389 @@
+"""Quiz Attempt Engine - exam-mode answer buffering for quiz attempts
+
+During a college-wide quiz every student autosaves and polls the timer
+continuously. The engine keeps, per worker:
+
+- quiz duration and compiled answer key cached per quiz for
+  QUIZ_CACHE_TTL_SECONDS, dropped early when the quiz is edited;
+- one state per open attempt (owner, start time, answers by question
+  index) loaded from the DB once, so timer polls and autosaves never
+  reload the attempt or its quiz;
+- answer changes since the last flush, written by a background thread
+  every QUIZ_FLUSH_INTERVAL_SECONDS in one batched read-merge-update.
+
+Flushes merge only the changed question indexes into the stored answers
+(rows locked, already submitted rows skipped), so flushes from different
+workers do not overwrite each other. Submission merges the pending changes
+into the locked attempt row, grades it and commits in one transaction, but
+it only sees the buffer of the worker handling it: an answer buffered on
+another worker is dropped once the attempt is submitted. With more than
+one worker (WEB_CONCURRENCY > 1, or QUIZ_SYNC_AUTOSAVE=1) every autosave
+is therefore written in the request that made it, and only the quiz and
+attempt caches save work.
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import bindparam
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.models.quiz import Quiz, QuizAttempt
+from app.services.quiz_grading import CompiledAnswerKey, compile_answer_key
+
+logger = logging.getLogger(__name__)
+
+QUIZ_CACHE_TTL_SECONDS = float(os.getenv("QUIZ_CACHE_TTL_SECONDS", "60"))
+QUIZ_FLUSH_INTERVAL_SECONDS = float(os.getenv("QUIZ_FLUSH_INTERVAL_SECONDS", "2"))
+# Attempts with nothing pending are dropped from memory after this long without requests
+ATTEMPT_IDLE_SECONDS = float(os.getenv("QUIZ_ATTEMPT_IDLE_SECONDS", "900"))
+# Buffering is only safe when one worker sees every request of an attempt
+QUIZ_SYNC_AUTOSAVE = os.getenv(
+    "QUIZ_SYNC_AUTOSAVE", "1" if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 else "0"
+).lower() in ("1", "true", "yes")
+FLUSH_BATCH_SIZE = 500
+
+
+def as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Compare DB timestamps with utcnow() whether or not the driver returns them tz-aware"""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@dataclass
+class CachedQuiz:
+    """The parts of a quiz needed to time and grade attempts"""
+    id: int
+    duration_minutes: int
+    answer_key: CompiledAnswerKey
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    def deadline_for(self, started_at: datetime) -> Optional[datetime]:
+        if self.duration_minutes > 0:
+            return started_at + timedelta(minutes=self.duration_minutes)
+        return None
+
+
+class AttemptState:
+    """Buffered view of one open attempt"""
+
+    def __init__(self, attempt: QuizAttempt):
+        self.id = attempt.id
+        self.quiz_id = attempt.quiz_id
+        self.user_id = attempt.user_id
+        self.started_at = as_naive_utc(attempt.started_at)
+        self.is_submitted = attempt.is_submitted
+        self.row = {c.name: getattr(attempt, c.name) for c in attempt.__table__.columns}
+        # question_index -> answer dict (this worker's view)
+        self.answers: Dict[int, Dict[str, Any]] = {
+            ans["question_index"]: ans
+            for ans in (attempt.answers or [])
+            if isinstance(ans, dict) and ans.get("question_index") is not None
+        }
+        # question_index -> change sequence, for indexes not yet persisted
+        self.pending: Dict[int, int] = {}
+        self.seq = 0
+        self.last_access = time.monotonic()
+        self.lock = threading.Lock()
+
+    def apply(self, changes: Dict[int, Optional[Dict[str, Any]]]) -> None:
+        """Record answer changes; a None value clears the answer"""
+        with self.lock:
+            for index, answer in changes.items():
+                self.seq += 1
+                self.pending[index] = self.seq
+                if answer is None:
+                    self.answers.pop(index, None)
+                else:
+                    self.answers[index] = {**answer, "question_index": index}
+            self.last_access = time.monotonic()
+
+    def replace(self, answers: Iterable[Dict[str, Any]]) -> None:
+        """Record a full answer list (legacy clients) as changes against the current view"""
+        incoming = {ans["question_index"]: ans for ans in answers if ans.get("question_index") is not None}
+        changes: Dict[int, Optional[Dict[str, Any]]] = {index: None for index in self.answers if index not in incoming}
+        changes.update(incoming)
+        self.apply(changes)
+
+    def snapshot_pending(self) -> Tuple[Dict[int, int], Dict[int, Optional[Dict[str, Any]]]]:
+        with self.lock:
+            pending = dict(self.pending)
+            return pending, {index: self.answers.get(index) for index in pending}
+
+    def mark_persisted(self, pending: Dict[int, int]) -> None:
+        """Forget changes that were written, unless they were changed again meanwhile"""
+        with self.lock:
+            for index, seq in pending.items():
+                if self.pending.get(index) == seq:
+                    del self.pending[index]
+
+    def answer_list(self) -> List[Dict[str, Any]]:
+        return [self.answers[index] for index in sorted(self.answers)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """QuizAttemptResponse payload from the buffered state"""
+        data = dict(self.row)
+        data["answers"] = self.answer_list()
+        data["is_submitted"] = self.is_submitted
+        return data
+
+
+def merge_answers(
+    stored: Optional[List[Dict[str, Any]]],
+    changes: Dict[int, Optional[Dict[str, Any]]]
+) -> List[Dict[str, Any]]:
+    """Apply answer changes on top of the stored answer list, ordered by question index"""
+    merged = {
+        ans["question_index"]: ans
+        for ans in (stored or [])
+        if isinstance(ans, dict) and ans.get("question_index") is not None
+    }
+    for index, answer in changes.items():
+        if answer is None:
+            merged.pop(index, None)
+        else:
+            merged[index] = answer
+    return [merged[index] for index in sorted(merged)]
+
+
+class QuizAttemptEngine:
+    """Per-worker cache of quizzes and open attempts with batched answer persistence"""
+
+    def __init__(
+        self,
+        flush_interval: float = QUIZ_FLUSH_INTERVAL_SECONDS,
+        quiz_ttl: float = QUIZ_CACHE_TTL_SECONDS,
+        session_factory=SessionLocal,
+        sync_autosave: bool = QUIZ_SYNC_AUTOSAVE
+    ):
+        self.flush_interval = flush_interval
+        self.quiz_ttl = quiz_ttl
+        self.sync_autosave = sync_autosave
+        self.session_factory = session_factory
+        self._quizzes: Dict[int, CachedQuiz] = {}
+        self._attempts: Dict[int, AttemptState] = {}
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    # ---- quiz cache ----
+
+    def get_quiz(self, db: Session, quiz_id: int) -> Optional[CachedQuiz]:
+        cached = self._quizzes.get(quiz_id)
+        if cached is not None and time.monotonic() - cached.loaded_at < self.quiz_ttl:
+            return cached
+
+        row = db.query(
+            Quiz.id, Quiz.questions, Quiz.duration_minutes, Quiz.allow_negative_marking
+        ).filter(Quiz.id == quiz_id).first()
+        if not row:
+            self._quizzes.pop(quiz_id, None)
+            return None
+
+        cached = CachedQuiz(
+            id=row.id,
+            duration_minutes=row.duration_minutes or 0,
+            answer_key=compile_answer_key(row.questions, row.allow_negative_marking),
+        )
+        self._quizzes[quiz_id] = cached
+        return cached
+
+    def invalidate_quiz(self, quiz_id: int) -> None:
+        """Drop a cached quiz after it is edited or deleted"""
+        self._quizzes.pop(quiz_id, None)
+
+    # ---- attempt state ----
+
+    def get_attempt(self, db: Session, attempt_id: int) -> Optional[AttemptState]:
+        """Buffered attempt state, loaded from the DB on first use"""
+        state = self._attempts.get(attempt_id)
+        if state is not None:
+            state.last_access = time.monotonic()
+            return state
+
+        attempt = db.query(QuizAttempt).filter(QuizAttempt.id == attempt_id).first()
+        if not attempt:
+            return None
+        state = AttemptState(attempt)
+        if state.is_submitted:
+            return state  # Nothing to buffer for a finished attempt
+
+        with self._lock:
+            state = self._attempts.setdefault(attempt_id, state)
+        self._ensure_flusher()
+        return state
+
+    def seconds_left(self, db: Session, state: AttemptState, now: Optional[datetime] = None) -> Optional[float]:
+        """Time left on an attempt from the cached quiz (None for untimed quizzes)"""
+        quiz = self.get_quiz(db, state.quiz_id)
+        deadline = quiz.deadline_for(state.started_at) if quiz else None
+        if deadline is None:
+            return None
+        now = now or datetime.utcnow()
+        return max(0.0, (deadline - now).total_seconds())
+
+    def record_answers(
+        self,
+        db: Session,
+        state: AttemptState,
+        changes: Optional[Dict[int, Optional[Dict[str, Any]]]] = None,
+        full_answers: Optional[List[Dict[str, Any]]] = None
+    ) -> None:
+        """Buffer answer changes and/or a full answer list; persisted by the next flush,
+        or right away through `db` with sync_autosave (state.is_submitted tells if it was too late)"""
+        if full_answers is not None:
+            state.replace(full_answers)
+        if changes:
+            state.apply(changes)
+        if self.sync_autosave and state.pending:
+            self._write_batch(db, [state])
+
+    def pending_answers(self, attempt_id: int, stored: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Stored answers with this worker's unflushed changes applied"""
+        state = self._attempts.get(attempt_id)
+        if state is None:
+            return stored or []
+        _, changes = state.snapshot_pending()
+        return merge_answers(stored, changes) if changes else (stored or [])
+
+    # ---- submission ----
+
+    def submit(self, db: Session, attempt: QuizAttempt, auto_submitted: bool = False) -> QuizAttempt:
+        """Merge pending answers into the (locked) attempt row, grade it and commit once"""
+        state = self._attempts.get(attempt.id)
+        pending: Dict[int, int] = {}
+        answers = list(attempt.answers or [])
+        if state is not None:
+            pending, changes = state.snapshot_pending()
+            answers = merge_answers(answers, changes)
+
+        now = datetime.utcnow()
+        quiz = self.get_quiz(db, attempt.quiz_id)
+        answer_key = quiz.answer_key if quiz else compile_answer_key([], False)
+        for column, value in answer_key.score_fields(answers).items():
+            setattr(attempt, column, value)
+
+        attempt.is_submitted = True
+        attempt.submitted_at = now
+        if auto_submitted:
+            attempt.is_auto_submitted = True
+            attempt.auto_submitted_at = now
+        attempt.is_graded = True
+        attempt.graded_at = now
+
+        db.commit()
+        db.refresh(attempt)
+
+        if state is not None:
+            state.mark_persisted(pending)
+            state.is_submitted = True
+        with self._lock:
+            self._attempts.pop(attempt.id, None)
+        return attempt
+
+    # ---- background persistence ----
+
+    def _ensure_flusher(self) -> None:
+        if self.flush_interval <= 0:
+            return
+        if self._flusher is None or not self._flusher.is_alive():
+            with self._lock:
+                if self._flusher is None or not self._flusher.is_alive():
+                    self._stop.clear()
+                    self._flusher = threading.Thread(
+                        target=self._flush_loop, name="quiz-attempt-flusher", daemon=True
+                    )
+                    self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+                self._evict_idle()
+            except Exception as e:
+                logger.error(f"Quiz answer flush failed: {e}", exc_info=True)
+
+    def flush(self) -> int:
+        """Persist all buffered answer changes; returns the number of attempts written"""
+        with self._flush_lock:
+            with self._lock:
+                dirty = [s for s in self._attempts.values() if s.pending and not s.is_submitted]
+            written = 0
+            for start in range(0, len(dirty), FLUSH_BATCH_SIZE):
+                written += self._flush_batch(dirty[start:start + FLUSH_BATCH_SIZE])
+            return written
+
+    def _flush_batch(self, states: List[AttemptState]) -> int:
+        db = self.session_factory()
+        try:
+            return self._write_batch(db, states)
+        finally:
+            db.close()
+
+    def _write_batch(self, db: Session, states: List[AttemptState]) -> int:
+        """Merge the states' pending changes into their rows and commit"""
+        snapshots = {state.id: (state, *state.snapshot_pending()) for state in states}
+        try:
+            # Lock the rows so a concurrent submit (or another worker's flush) can't interleave
+            rows = db.query(QuizAttempt.id, QuizAttempt.answers).filter(
+                QuizAttempt.id.in_(list(snapshots)),
+                QuizAttempt.is_submitted == False
+            ).with_for_update().all()
+
+            params = [
+                {"attempt_id": row.id, "new_answers": merge_answers(row.answers, snapshots[row.id][2])}
+                for row in rows
+            ]
+            if params:
+                table = QuizAttempt.__table__
+                db.execute(
+                    table.update()
+                    .where(table.c.id == bindparam("attempt_id"))
+                    .where(table.c.is_submitted == False)
+                    .values(answers=bindparam("new_answers")),
+                    params
+                )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+        open_ids = {row.id for row in rows}
+        for attempt_id, (state, pending, _) in snapshots.items():
+            if attempt_id in open_ids:
+                state.mark_persisted(pending)
+            else:
+                # Submitted elsewhere (another worker or auto-submit): stop buffering it
+                state.is_submitted = True
+                with self._lock:
+                    self._attempts.pop(attempt_id, None)
+        return len(params)
+
+    def _evict_idle(self) -> None:
+        cutoff = time.monotonic() - ATTEMPT_IDLE_SECONDS
+        with self._lock:
+            idle = [
+                attempt_id for attempt_id, state in self._attempts.items()
+                if not state.pending and state.last_access < cutoff
+            ]
+            for attempt_id in idle:
+                del self._attempts[attempt_id]
+
+    def shutdown(self) -> None:
+        """Stop the flusher and write whatever is still buffered"""
+        self._stop.set()
+        if self._flusher is not None:
+            self._flusher.join(timeout=self.flush_interval + 5)
+            self._flusher = None
+        self.flush()
+
+
+# Global attempt engine instance
+quiz_attempt_engine = QuizAttemptEngine()
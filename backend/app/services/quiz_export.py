@@ -0,0 +1,129 @@
+"""Quiz Results Export - streamed CSV/XLSX exports of quiz attempts
+
+Rows come from one QuizAttempt + User + Profile query read through a
+server-side cursor (yield_per), so only EXPORT_BATCH_SIZE rows are held at
+a time however many students took the quiz. CSV is encoded and yielded in
+batches as it is read. XLSX rows go through an openpyxl write-only
+workbook (rows spill to a temp file) and the finished file is streamed
+from disk in chunks.
+"""
+import csv
+import io
+import logging
+import tempfile
+from datetime import datetime
+from typing import Any, Iterator, List
+
+from app.core.database import ReportingSessionLocal
+from app.models.profile import Profile
+from app.models.quiz import Quiz, QuizAttempt
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+EXPORT_BATCH_SIZE = 1000
+FILE_CHUNK_SIZE = 64 * 1024
+
+EXPORT_HEADERS = [
+    "Student Name", "Email", "Score", "Max Score", "Percentage",
+    "Passed", "Submitted At", "Auto Submitted",
+]
+
+CSV_MEDIA_TYPE = "text/csv"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def get_passing_marks(quiz: Quiz) -> float:
+    """Passing marks of a quiz (half the total when not set)"""
+    return quiz.passing_marks if quiz.passing_marks else (quiz.total_marks * 0.5)
+
+
+def export_filename(quiz_id: int, extension: str) -> str:
+    return f"quiz_{quiz_id}_results_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{extension}"
+
+
+def iter_result_rows(quiz_id: int, total_marks: int, passing_marks: float) -> Iterator[List[Any]]:
+    """Export rows of a quiz's submitted attempts, read in batches from a server-side cursor"""
+    db = ReportingSessionLocal()
+    try:
+        query = db.query(
+            Profile.full_name,
+            User.email,
+            QuizAttempt.total_score,
+            QuizAttempt.max_score,
+            QuizAttempt.percentage,
+            QuizAttempt.submitted_at,
+            QuizAttempt.is_auto_submitted,
+        ).join(
+            User, User.id == QuizAttempt.user_id
+        ).outerjoin(
+            Profile, Profile.user_id == QuizAttempt.user_id
+        ).filter(
+            QuizAttempt.quiz_id == quiz_id,
+            QuizAttempt.is_submitted == True
+        ).order_by(
+            QuizAttempt.id
+        ).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+        for row in query:
+            yield [
+                row.full_name or "",
+                row.email,
+                row.total_score,
+                row.max_score or total_marks,
+                f"{row.percentage}%",
+                "Yes" if row.total_score >= passing_marks else "No",
+                row.submitted_at.isoformat() if row.submitted_at else "",
+                "Yes" if row.is_auto_submitted else "No",
+            ]
+    finally:
+        db.close()
+
+
+def stream_csv(rows: Iterator[List[Any]]) -> Iterator[bytes]:
+    """Encode rows as CSV, yielding one chunk per EXPORT_BATCH_SIZE rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADERS)
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= EXPORT_BATCH_SIZE:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue().encode("utf-8")
+
+
+def stream_xlsx(rows: Iterator[List[Any]]) -> Iterator[bytes]:
+    """Write rows to a write-only workbook on disk, then stream the file in chunks"""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font, PatternFill
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title="Results")
+
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    header_font = Font(bold=True, color="FFFFFF")
+    header = []
+    for title in EXPORT_HEADERS:
+        cell = WriteOnlyCell(sheet, value=title)
+        cell.fill = header_fill
+        cell.font = header_font
+        header.append(cell)
+    sheet.append(header)
+
+    for row in rows:
+        sheet.append(row)
+
+    with tempfile.TemporaryFile(suffix=".xlsx") as output:
+        workbook.save(output)
+        output.seek(0)
+        while True:
+            chunk = output.read(FILE_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
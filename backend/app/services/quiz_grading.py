@@ -0,0 +1,270 @@
+"""Quiz Grading - compiled answer keys and bulk grading
+
+A quiz's questions are compiled once per version (content hash of the
+questions and the negative-marking flag) into parallel arrays indexed by
+question: question kind, normalized correct answer, marks and the
+penalty for a wrong answer. Grading an attempt is then one pass over its
+answers with array lookups instead of re-reading the question dicts.
+
+grade_quiz_attempts() grades every pending attempt of a quiz (submitted
+but ungraded, plus timed attempts past their deadline) in one pass and
+writes the scores back with a single executemany UPDATE. With
+regrade=True it re-scores all submitted attempts, e.g. after an answer key
+is corrected.
+"""
+import hashlib
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import bindparam, or_
+from sqlalchemy.orm import Session
+
+from app.models.quiz import Quiz, QuizAttempt
+
+logger = logging.getLogger(__name__)
+
+# Question kinds in CompiledAnswerKey.kinds
+KIND_SKIP = 0  # Malformed question - not graded, no marks
+KIND_MCQ = 1
+KIND_TRUE_FALSE = 2
+KIND_FILL_BLANK = 3
+KIND_UNGRADED = 4  # Counted in max score, never auto-awarded (e.g. coding)
+
+_KINDS_BY_TYPE = {
+    'mcq': KIND_MCQ,
+    'true_false': KIND_TRUE_FALSE,
+    'fill_blank': KIND_FILL_BLANK,
+}
+_TRUE_STRINGS = frozenset(['true', 't', '1', 'yes'])
+_WHITESPACE_RE = re.compile(r'\s+')
+
+GRADE_BATCH_SIZE = 1000
+_CACHE_MAX_SIZE = 256
+
+
+def normalize_fill_blank_answer(text: Any) -> str:
+    """Case-insensitive, trimmed, no periods, single spaces"""
+    if not text:
+        return ""
+    normalized = str(text).strip().lower()
+    normalized = normalized.replace('.', '')
+    normalized = _WHITESPACE_RE.sub(' ', normalized)
+    return normalized.strip()
+
+
+def _as_bool(value: Any) -> Optional[bool]:
+    """True/false answers arrive as booleans or strings"""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        return value.lower() in _TRUE_STRINGS
+    if value is not None:
+        return bool(value)
+    return None
+
+
+class CompiledAnswerKey:
+    """Answer key of one quiz version as per-question arrays"""
+
+    def __init__(self, questions: List[Any], allow_negative_marking: bool, version: str):
+        self.version = version
+        self.kinds: List[int] = []
+        self.keys: List[Any] = []
+        self.marks: List[float] = []
+        self.penalties: List[float] = []
+
+        for question in questions:
+            if not isinstance(question, dict):
+                self.kinds.append(KIND_SKIP)
+                self.keys.append(None)
+                self.marks.append(0)
+                self.penalties.append(0.0)
+                continue
+
+            kind = _KINDS_BY_TYPE.get(question.get('question_type', 'mcq'), KIND_UNGRADED)
+            if kind == KIND_MCQ:
+                key = str(question.get('correct_answer') or '').upper()
+            elif kind == KIND_TRUE_FALSE:
+                key = bool(question.get('is_true', False))
+            elif kind == KIND_FILL_BLANK:
+                key = normalize_fill_blank_answer(question.get('correct_answer_text', ''))
+            else:
+                key = None
+
+            negative_marking = question.get('negative_marking') or 0.0
+            # Fill-in-the-blank answers are never penalised
+            penalty = negative_marking if (
+                allow_negative_marking and negative_marking > 0 and kind in (KIND_MCQ, KIND_TRUE_FALSE)
+            ) else 0.0
+
+            self.kinds.append(kind)
+            self.keys.append(key)
+            self.marks.append(question.get('marks', 1))
+            self.penalties.append(penalty)
+
+        self.max_score = float(sum(self.marks))
+
+    def _points(self, index: int, user_answer: Any) -> float:
+        kind = self.kinds[index]
+        penalty = self.penalties[index]
+        if kind == KIND_MCQ:
+            if user_answer and str(user_answer).upper() == self.keys[index]:
+                return self.marks[index]
+            return -penalty if penalty else 0.0
+        if kind == KIND_TRUE_FALSE:
+            user_bool = _as_bool(user_answer)
+            if user_bool is not None and user_bool == self.keys[index]:
+                return self.marks[index]
+            return -penalty if penalty else 0.0
+        if kind == KIND_FILL_BLANK:
+            normalized = normalize_fill_blank_answer(str(user_answer) if user_answer else '')
+            if normalized and normalized == self.keys[index]:
+                return self.marks[index]
+        return 0.0
+
+    def grade(self, answers: Optional[List[Any]]) -> Tuple[float, float, List[Any]]:
+        """Grade a copy of the answers; returns (total_score, max_score, graded answers)"""
+        graded = [dict(ans) if isinstance(ans, dict) else ans for ans in (answers or [])]
+        # Last answer per question index wins
+        answer_map = {ans.get('question_index'): ans for ans in graded if isinstance(ans, dict)}
+
+        total_score = 0.0
+        question_count = len(self.kinds)
+        for index in sorted(i for i in answer_map if isinstance(i, int) and 0 <= i < question_count):
+            answer = answer_map[index]
+            if not answer or self.kinds[index] == KIND_SKIP:
+                continue
+            points_earned = self._points(index, answer.get('answer'))
+            answer['points_earned'] = points_earned
+            answer['max_points'] = self.marks[index]
+            answer['is_correct'] = points_earned > 0
+            total_score += points_earned
+
+        return total_score, self.max_score, graded
+
+    def score_fields(self, answers: Optional[List[Any]]) -> Dict[str, Any]:
+        """Column values for a graded attempt"""
+        total_score, max_score, graded = self.grade(answers)
+        # Score doesn't go below 0 (even with negative marking)
+        total_score = max(0, total_score)
+        return {
+            "total_score": total_score,
+            "max_score": max_score,
+            "percentage": (total_score / max_score * 100) if max_score > 0 else 0,
+            "answers": graded,
+        }
+
+
+def answer_key_version(questions: Any, allow_negative_marking: bool) -> str:
+    payload = json.dumps(
+        {"questions": questions, "allow_negative_marking": bool(allow_negative_marking)},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+# Compiled answer keys keyed by version
+_key_cache: "OrderedDict[str, CompiledAnswerKey]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def compile_answer_key(questions: Any, allow_negative_marking: bool) -> CompiledAnswerKey:
+    """Compiled answer key for a quiz version (cached by content hash)"""
+    questions = questions if isinstance(questions, list) else []
+    version = answer_key_version(questions, allow_negative_marking)
+    with _cache_lock:
+        compiled = _key_cache.get(version)
+        if compiled is not None:
+            _key_cache.move_to_end(version)
+            return compiled
+
+    compiled = CompiledAnswerKey(questions, bool(allow_negative_marking), version)
+
+    with _cache_lock:
+        _key_cache[version] = compiled
+        if len(_key_cache) > _CACHE_MAX_SIZE:
+            _key_cache.popitem(last=False)
+    return compiled
+
+
+def grade_quiz_attempts(db: Session, quiz: Quiz, regrade: bool = False) -> Dict[str, Any]:
+    """Grade all pending attempts of a quiz (or re-grade all submitted ones) in bulk
+
+    Pending means submitted but not graded, or still open on a timed quiz
+    whose duration has run out; the latter are auto-submitted. Buffered
+    answers in the attempt engine should be flushed before calling this.
+    """
+    answer_key = compile_answer_key(quiz.questions, quiz.allow_negative_marking)
+    now = datetime.utcnow()
+
+    if regrade:
+        conditions = [QuizAttempt.is_submitted == True]
+    else:
+        conditions = [(QuizAttempt.is_submitted == True) & (QuizAttempt.is_graded == False)]
+    if quiz.duration_minutes and quiz.duration_minutes > 0:
+        expired_before = now - timedelta(minutes=quiz.duration_minutes)
+        conditions.append(
+            (QuizAttempt.is_submitted == False) & (QuizAttempt.started_at <= expired_before)
+        )
+
+    rows = db.query(
+        QuizAttempt.id, QuizAttempt.answers, QuizAttempt.is_submitted
+    ).filter(
+        QuizAttempt.quiz_id == quiz.id,
+        or_(*conditions)
+    ).with_for_update().all()
+
+    graded_params = []
+    expired_params = []
+    for row in rows:
+        params = {"attempt_id": row.id, **answer_key.score_fields(row.answers)}
+        (graded_params if row.is_submitted else expired_params).append(params)
+
+    table = QuizAttempt.__table__
+    values = dict(
+        total_score=bindparam("total_score"),
+        max_score=bindparam("max_score"),
+        percentage=bindparam("percentage"),
+        answers=bindparam("answers"),
+        is_graded=True,
+        graded_at=now,
+    )
+    for start in range(0, len(graded_params), GRADE_BATCH_SIZE):
+        db.execute(
+            table.update().where(table.c.id == bindparam("attempt_id")).values(**values),
+            graded_params[start:start + GRADE_BATCH_SIZE]
+        )
+    for start in range(0, len(expired_params), GRADE_BATCH_SIZE):
+        db.execute(
+            table.update()
+            .where(table.c.id == bindparam("attempt_id"))
+            .where(table.c.is_submitted == False)
+            .values(
+                **values,
+                is_submitted=True,
+                is_auto_submitted=True,
+                submitted_at=now,
+                auto_submitted_at=now,
+            ),
+            expired_params[start:start + GRADE_BATCH_SIZE]
+        )
+    db.commit()
+
+    logger.info(
+        f"Graded {len(graded_params)} and auto-submitted {len(expired_params)} attempt(s) "
+        f"of quiz {quiz.id} (answer key {answer_key.version[:12]}, regrade={regrade})"
+    )
+    return {
+        "quiz_id": quiz.id,
+        "answer_key_version": answer_key.version,
+        "graded": len(graded_params),
+        "auto_submitted": len(expired_params),
+        "regrade": regrade,
+    }
@@ -0,0 +1,417 @@
+"""Round Results - set-based ingestion of round result sheets and promotions
+
+A results sheet is resolved with a fixed number of queries, whatever its
+length: profiles by roll number, department codes, the job's applications
+for those students, and their statuses in the previous, current and next
+round (IN batches of _IN_BATCH_SIZE). Rows are then validated and their
+status transitions (including auto-advancing QUALIFIED students to the next
+round) applied in memory, in sheet order, so a later row for the same
+student sees the earlier one exactly as before. The outcome is written
+with one batched INSERT and one bulk UPDATE per table in the caller's
+transaction.
+
+Bulk writes bypass the ORM hooks of the job analytics cache, so both paths
+flag the session with mark_placement_data_changed().
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.core.year_utils import parse_year
+from app.models.academic import Department
+from app.models.job import Job, JobApplication
+from app.models.job_round import JobApplicationRound, JobRound
+from app.models.profile import Profile
+from app.services.job_analytics import mark_placement_data_changed
+
+logger = logging.getLogger(__name__)
+
+_IN_BATCH_SIZE = 500
+RESULT_STATUSES = ("QUALIFIED", "REJECTED", "ABSENT")
+EXTERNAL_APPLICATION_NOTE = "Application created automatically - student applied externally"
+
+
+def _chunks(values: Iterable[Any], size: int = _IN_BATCH_SIZE) -> Iterator[List[Any]]:
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _profiles_by_roll_number(db: Session, roll_numbers: Iterable[str]) -> Dict[str, Any]:
+    """roll_number -> profile row (user_id, present_year, department, department_id)"""
+    profiles: Dict[str, Any] = {}
+    for chunk in _chunks(set(roll_numbers)):
+        for row in db.query(
+            Profile.roll_number, Profile.user_id, Profile.present_year, Profile.department, Profile.department_id
+        ).filter(Profile.roll_number.in_(chunk)).order_by(Profile.id):
+            profiles.setdefault(row.roll_number, row)
+    return profiles
+
+
+def _department_codes(db: Session, department_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+    codes: Dict[int, Optional[str]] = {}
+    for chunk in _chunks(set(department_ids)):
+        codes.update(db.query(Department.id, Department.code).filter(Department.id.in_(chunk)).all())
+    return codes
+
+
+def _applications_by_user(db: Session, job_id: int, user_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """user_id -> the student's (first) application for the job, as a mutable dict"""
+    applications: Dict[int, Dict[str, Any]] = {}
+    for chunk in _chunks(set(user_ids)):
+        for row in db.query(
+            JobApplication.id, JobApplication.user_id, JobApplication.status, JobApplication.current_round
+        ).filter(
+            JobApplication.job_id == job_id,
+            JobApplication.user_id.in_(chunk)
+        ).order_by(JobApplication.id):
+            applications.setdefault(row.user_id, {
+                "id": row.id, "status": row.status, "current_round": row.current_round, "changed": False
+            })
+    return applications
+
+
+def _round_statuses(
+    db: Session, application_ids: Iterable[int], round_ids: Sequence[int]
+) -> Dict[Tuple[int, int], Dict[str, Any]]:
+    """(application_id, round_id) -> the (first) round status, as a mutable dict"""
+    statuses: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    if not round_ids:
+        return statuses
+    for chunk in _chunks(set(application_ids)):
+        for row in db.query(
+            JobApplicationRound.id, JobApplicationRound.job_application_id, JobApplicationRound.round_id,
+            JobApplicationRound.status, JobApplicationRound.remarks
+        ).filter(
+            JobApplicationRound.job_application_id.in_(chunk),
+            JobApplicationRound.round_id.in_(list(round_ids))
+        ).order_by(JobApplicationRound.id):
+            statuses.setdefault((row.job_application_id, row.round_id), {
+                "id": row.id, "status": row.status, "remarks": row.remarks, "changed": False
+            })
+    return statuses
+
+
+def _year_eligible(job: Job, present_year: Optional[str]) -> bool:
+    if not job.eligible_years or not present_year:
+        return True
+    user_year_normalized = parse_year(present_year)
+    eligible_years_list = job.eligible_years if isinstance(job.eligible_years, list) else [job.eligible_years]
+    for eligible_year in eligible_years_list:
+        if eligible_year is None:
+            continue
+        eligible_year_normalized = parse_year(str(eligible_year))
+        if user_year_normalized and eligible_year_normalized and user_year_normalized == eligible_year_normalized:
+            return True
+        if str(present_year).upper().strip() == str(eligible_year).upper().strip():
+            return True
+    return False
+
+
+def _branch_eligible(job: Job, department: Optional[str], department_code: Optional[str]) -> bool:
+    if job.eligibility_type != "branch" or not job.eligible_branches:
+        return True
+    eligible_branches_list = job.eligible_branches if isinstance(job.eligible_branches, list) else [job.eligible_branches]
+    for branch in eligible_branches_list:
+        if branch is None:
+            continue
+        branch_normalized = str(branch).upper().strip()
+        if department and department.upper().strip() == branch_normalized:
+            return True
+        if department_code and department_code.upper().strip() == branch_normalized:
+            return True
+    return False
+
+
+def _active_rounds(db: Session, job_id: int) -> List[JobRound]:
+    return db.query(JobRound).filter(
+        JobRound.job_id == job_id,
+        JobRound.is_active == True
+    ).order_by(JobRound.order).all()
+
+
+def _roll_number(normalized_row: Dict[str, Any]) -> str:
+    # Roll Number is the primary identifier; 'student_id' is the legacy column name
+    return (normalized_row.get('roll_number') or '').strip() or (normalized_row.get('student_id') or '').strip()
+
+
+def ingest_round_results(
+    db: Session,
+    job: Job,
+    round_obj: JobRound,
+    data: List[Dict[str, Any]],
+    updated_by: int
+) -> Dict[str, Any]:
+    """Apply a parsed results sheet (one dict per row) to a round; does not commit
+
+    Returns {"success": [...], "failed": [...], "total": n} with the sheet
+    row number of every entry (row 1 is the header).
+    """
+    round_id = round_obj.id
+    results = {
+        "success": [],
+        "failed": [],
+        "total": len(data)
+    }
+
+    # Determine previous / next round
+    all_rounds = _active_rounds(db, job.id)
+    current_round_index = next((i for i, r in enumerate(all_rounds) if r.id == round_id), -1)
+    next_round = all_rounds[current_round_index + 1] if current_round_index >= 0 and current_round_index + 1 < len(all_rounds) else None
+    prev_round = all_rounds[current_round_index - 1] if current_round_index > 0 else None
+
+    # Normalize keys
+    rows = [(idx, row, {str(k).lower().strip(): v for k, v in row.items()}) for idx, row in enumerate(data, start=2)]
+
+    # Prefetch everything the rows refer to
+    profiles = _profiles_by_roll_number(db, filter(None, (_roll_number(normalized) for _, _, normalized in rows)))
+    department_codes = _department_codes(
+        db, (profile.department_id for profile in profiles.values() if profile.department_id)
+    )
+    applications = _applications_by_user(db, job.id, (profile.user_id for profile in profiles.values()))
+    round_ids = [r.id for r in (prev_round, round_obj, next_round) if r is not None]
+    statuses_by_application = _round_statuses(
+        db, (application["id"] for application in applications.values()), round_ids
+    )
+    # Keyed by student so applications created below need no id yet
+    application_users = {application["id"]: user_id for user_id, application in applications.items()}
+    statuses = {
+        (application_users[application_id], status_round_id): round_status
+        for (application_id, status_round_id), round_status in statuses_by_application.items()
+    }
+    now = datetime.utcnow()
+
+    for idx, row, normalized_row in rows:
+        try:
+            # Validate Round ID if provided (for consistency check)
+            round_id_str = str(normalized_row.get('round_id') or '').strip()
+            if round_id_str:
+                try:
+                    provided_round_id = int(round_id_str)
+                    if provided_round_id != round_id:
+                        results["failed"].append({
+                            "row": idx,
+                            "error": f"Round ID mismatch: Template has Round ID {provided_round_id}, but uploading to Round ID {round_id}. Please use the correct template for this round.",
+                            "data": row
+                        })
+                        continue
+                except ValueError:
+                    # Round ID is optional, so invalid format is not critical
+                    pass
+
+            roll_number = _roll_number(normalized_row)
+            if not roll_number:
+                results["failed"].append({
+                    "row": idx,
+                    "error": "Missing roll_number (required - this is the primary identifier for tracking)",
+                    "data": row
+                })
+                continue
+
+            profile = profiles.get(roll_number)
+            if not profile:
+                results["failed"].append({
+                    "row": idx,
+                    "error": f"Student not found with roll number: {roll_number}",
+                    "data": row
+                })
+                continue
+
+            student_id = profile.user_id
+
+            status_value = str(normalized_row.get('status') or '').strip().upper()
+            if status_value not in RESULT_STATUSES:
+                results["failed"].append({
+                    "row": idx,
+                    "error": f"Invalid status: {status_value}. Must be QUALIFIED, REJECTED, or ABSENT",
+                    "data": row
+                })
+                continue
+
+            remarks = str(normalized_row.get('remarks') or '').strip() or None
+
+            # Get or create application (students who applied externally get one, even if not eligible)
+            application = applications.get(student_id)
+            if application is None:
+                application = {"id": None, "status": "Applied", "current_round": None, "changed": True}
+                applications[student_id] = application
+
+            # Verify student eligibility (year/branch)
+            if not _year_eligible(job, profile.present_year):
+                results["failed"].append({
+                    "row": idx,
+                    "error": f"Student {student_id} is not eligible for this job (year mismatch)",
+                    "data": row
+                })
+                continue
+            department_code = department_codes.get(profile.department_id) if profile.department_id else None
+            if not _branch_eligible(job, profile.department, department_code):
+                results["failed"].append({
+                    "row": idx,
+                    "error": f"Student {student_id} is not eligible for this job (branch mismatch)",
+                    "data": row
+                })
+                continue
+
+            # Check if student was in previous round (if not first round)
+            if prev_round is not None:
+                prev_round_status = statuses.get((student_id, prev_round.id))
+                if not prev_round_status or prev_round_status["status"] != "QUALIFIED":
+                    results["failed"].append({
+                        "row": idx,
+                        "error": f"Student {student_id} did not qualify in previous round",
+                        "data": row
+                    })
+                    continue
+
+            # Create or update round status
+            round_status = statuses.get((student_id, round_id))
+            if round_status is None:
+                statuses[(student_id, round_id)] = {
+                    "id": None, "status": status_value, "remarks": remarks, "changed": True
+                }
+            else:
+                round_status.update(status=status_value, remarks=remarks, changed=True)
+
+            # If qualified and there's a next round, auto-create entry for next round
+            if status_value == "QUALIFIED" and next_round:
+                statuses.setdefault((student_id, next_round.id), {
+                    "id": None, "status": "PENDING", "remarks": None, "changed": True
+                })
+
+            # Update application status
+            if status_value == "QUALIFIED" and next_round:
+                application.update(current_round=next_round.name, changed=True)
+            elif status_value in ["REJECTED", "ABSENT"]:
+                application.update(status="Rejected", current_round=round_obj.name, changed=True)
+
+            results["success"].append({
+                "row": idx,
+                "student_id": student_id,
+                "status": status_value
+            })
+
+        except Exception as e:
+            results["failed"].append({
+                "row": idx,
+                "error": str(e),
+                "data": row
+            })
+
+    _write_applications(db, job, applications)
+    application_ids = {user_id: application["id"] for user_id, application in applications.items()}
+    _write_round_statuses(db, statuses, application_ids, updated_by, now)
+    mark_placement_data_changed(db)
+    return results
+
+
+def _write_applications(db: Session, job: Job, applications: Dict[int, Dict[str, Any]]) -> None:
+    """Insert new applications (filling in their ids) and bulk update changed ones"""
+    changed = [
+        {"id": application["id"], "status": application["status"], "current_round": application["current_round"]}
+        for application in applications.values()
+        if application["changed"] and application["id"] is not None
+    ]
+    if changed:
+        db.execute(update(JobApplication), changed)
+
+    new_applications = [
+        (application, JobApplication(
+            job_id=job.id,
+            user_id=user_id,
+            status=application["status"],
+            current_round=application["current_round"],
+            notes=EXTERNAL_APPLICATION_NOTE
+        ))
+        for user_id, application in applications.items() if application["id"] is None
+    ]
+    if new_applications:
+        # One flush, batched into multi-row INSERTs where the backend supports it
+        db.add_all([record for _, record in new_applications])
+        db.flush()
+        for application, record in new_applications:
+            application["id"] = record.id
+
+
+def _write_round_statuses(
+    db: Session,
+    statuses: Dict[Tuple[int, int], Dict[str, Any]],
+    application_ids: Dict[int, int],
+    updated_by: int,
+    now: datetime
+) -> None:
+    new_statuses = []
+    changed = []
+    for (user_id, round_id), round_status in statuses.items():
+        if not round_status["changed"]:
+            continue
+        if round_status["id"] is None:
+            new_statuses.append({
+                "job_application_id": application_ids[user_id],
+                "round_id": round_id,
+                "status": round_status["status"],
+                "remarks": round_status["remarks"],
+                "updated_by": updated_by
+            })
+        else:
+            changed.append({
+                "id": round_status["id"],
+                "status": round_status["status"],
+                "remarks": round_status["remarks"],
+                "updated_by": updated_by,
+                "updated_at": now
+            })
+    if new_statuses:
+        db.execute(insert(JobApplicationRound), new_statuses)
+    if changed:
+        db.execute(update(JobApplicationRound), changed)
+
+
+def promote_round_students(
+    db: Session,
+    round_id: int,
+    next_round: JobRound,
+    updated_by: int,
+    application_ids: Optional[List[int]] = None
+) -> Tuple[int, int]:
+    """Add every student of a round (or the given applications) to next_round; does not commit
+
+    Returns (promoted, already in next round).
+    """
+    current = []
+    for chunk in (_chunks(application_ids) if application_ids else [None]):
+        query = db.query(JobApplicationRound.job_application_id).filter(JobApplicationRound.round_id == round_id)
+        if chunk is not None:
+            query = query.filter(JobApplicationRound.job_application_id.in_(chunk))
+        current.extend(application_id for (application_id,) in query.order_by(JobApplicationRound.id))
+
+    in_next_round = {
+        application_id for (application_id,) in db.query(JobApplicationRound.job_application_id).filter(
+            JobApplicationRound.round_id == next_round.id
+        )
+    }
+    promoted = []
+    already_promoted = 0
+    for application_id in current:
+        if application_id in in_next_round:
+            already_promoted += 1
+        else:
+            in_next_round.add(application_id)
+            promoted.append(application_id)
+
+    if promoted:
+        db.execute(insert(JobApplicationRound), [
+            {"job_application_id": application_id, "round_id": next_round.id, "status": "PENDING", "updated_by": updated_by}
+            for application_id in promoted
+        ])
+        values = {"current_round": next_round.name}
+        # If promoted to "Selected" round, mark as job cracked
+        if next_round.name.lower() == "selected":
+            values["status"] = "Selected"
+        for chunk in _chunks(promoted):
+            db.query(JobApplication).filter(JobApplication.id.in_(chunk)).update(values, synchronize_session=False)
+        mark_placement_data_changed(db)
+    return len(promoted), already_promoted
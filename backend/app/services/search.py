@@ -0,0 +1,207 @@
+"""Full-text search over problems, quizzes, jobs and the question bank
+
+One interface, one index per searchable table, backed by the database's own
+full-text engine:
+
+- SQLite: an FTS5 table (search_<table>) kept in sync by triggers, ranked by bm25
+- PostgreSQL: a GIN index on to_tsvector('simple', <fields>), ranked by ts_rank
+- MySQL: a FULLTEXT index on the fields, ranked by MATCH ... AGAINST
+
+All search terms must match as whole words, except the last one, which is
+matched as a word prefix ("binary arr" finds "Binary array search"), so
+results keep up with a user who is still typing. Scoring every match is what makes broad searches slow, so
+when a search matches more than SEARCH_RANK_LIMIT rows the matches are
+returned newest first instead of by relevance. The indexes are created by the 0002 migration
+(create_search_indexes); on a database without them searches fall back to
+ILIKE over the same fields.
+
+    query = apply_search(db.query(Job), Job, "jobs", search, db)
+
+filters a query to the matches and orders it by relevance (best first);
+later order_by() calls act as tie-breakers.
+"""
+import logging
+import os
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import column, func, literal, literal_column, or_, select, table, text
+from sqlalchemy.orm import Query, Session
+
+from app.core.schema import SchemaCapabilities, schema_capabilities
+
+logger = logging.getLogger(__name__)
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+_MAX_TERMS = 8
+SEARCH_RANK_LIMIT = int(os.getenv("SEARCH_RANK_LIMIT", "1000"))
+
+
+class SearchIndex(NamedTuple):
+    table: str
+    fields: Tuple[str, ...]
+
+    @property
+    def name(self) -> str:
+        # FTS5 table on SQLite, index name on PostgreSQL / MySQL
+        return f"search_{self.table}"
+
+
+SEARCH_INDEXES: Dict[str, SearchIndex] = {
+    "coding_problems": SearchIndex("coding_problems", ("title", "description")),
+    "quizzes": SearchIndex("quizzes", ("title", "description", "subject")),
+    "jobs": SearchIndex("jobs", ("title", "company", "role")),
+    "question_banks": SearchIndex("question_banks", ("question_text", "topic", "subject")),
+}
+
+
+def search_terms(search: Optional[str]) -> List[str]:
+    """Lower-cased word tokens of a search string"""
+    if not search:
+        return []
+    return _TOKEN.findall(search.lower())[:_MAX_TERMS]
+
+
+def _pg_vector(index: SearchIndex, qualified: bool = True) -> str:
+    prefix = f"{index.table}." if qualified else ""
+    document = " || ' ' || ".join(f"coalesce({prefix}{field}, '')" for field in index.fields)
+    return f"to_tsvector('simple', {document})"
+
+
+def _has_index(dialect: str, index: SearchIndex) -> bool:
+    if dialect == "sqlite":
+        return schema_capabilities.has_table(index.name)
+    return index.name in schema_capabilities.indexes(index.table)
+
+
+def _matches(dialect: str, index: SearchIndex, terms: List[str], ranked: bool = True):
+    """(id, rank) rows matching all terms; lower rank = better match (0 for all if not ranked)"""
+    if dialect == "sqlite":
+        fts = table(index.name, column("rowid"))
+        expression = " ".join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*'
+        rank = literal_column(f"bm25({index.name})") if ranked else literal(0)
+        return select(
+            literal_column("rowid").label("id"),
+            rank.label("rank"),
+        ).select_from(fts).where(
+            text(f"{index.name} MATCH :search_{index.table}").bindparams(**{f"search_{index.table}": expression})
+        )
+
+    base = table(index.table, column("id"), *(column(field) for field in index.fields))
+    if dialect == "postgresql":
+        vector = literal_column(_pg_vector(index))
+        query = func.to_tsquery(literal_column("'simple'"), " & ".join(terms[:-1] + [f"{terms[-1]}:*"]))
+        rank = -func.ts_rank(vector, query) if ranked else literal(0)
+        return select(base.c.id.label("id"), rank.label("rank")).where(vector.op("@@")(query))
+
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import match
+
+        score = match(*(base.c[field] for field in index.fields), against=" ".join([f"+{term}" for term in terms[:-1]] + [f"+{terms[-1]}*"]))
+        score = score.in_boolean_mode()
+        rank = -score if ranked else literal(0)
+        return select(base.c.id.label("id"), rank.label("rank")).where(score)
+
+    raise ValueError(dialect)
+
+
+def _fallback(index: SearchIndex, terms: List[str]):
+    base = table(index.table, column("id"), *(column(field) for field in index.fields))
+    return select(base.c.id.label("id"), literal(0).label("rank")).where(
+        *(or_(*(base.c[field].ilike(f"%{term}%") for field in index.fields)) for term in terms)
+    )
+
+
+def search_matches(db: Session, index_name: str, search: Optional[str]):
+    """Subquery of (id, rank) for the rows matching search, or None if search has no terms"""
+    terms = search_terms(search)
+    if not terms:
+        return None
+    index = SEARCH_INDEXES[index_name]
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql", "mysql") and _has_index(dialect, index):
+        # Finding matches is cheap, scoring them is not: probe for match number SEARCH_RANK_LIMIT + 1
+        probe = _matches(dialect, index, terms, ranked=False).limit(1).offset(SEARCH_RANK_LIMIT)
+        ranked = db.execute(probe).first() is None
+        return _matches(dialect, index, terms, ranked).subquery(f"{index.name}_matches")
+    return _fallback(index, terms).subquery(f"{index.name}_matches")
+
+
+def apply_search(query: Query, model: Any, index_name: str, search: Optional[str], db: Session) -> Query:
+    """Filter query to rows matching search, best matches first"""
+    matches = search_matches(db, index_name, search)
+    if matches is None:
+        return query
+    return query.join(matches, matches.c.id == model.id).order_by(matches.c.rank)
+
+
+def search_ids(db: Session, index_name: str, search: Optional[str], limit: Optional[int] = None) -> List[int]:
+    """Ids of rows matching search, best matches first (ties newest first)"""
+    matches = search_matches(db, index_name, search)
+    if matches is None:
+        return []
+    query = select(matches.c.id).order_by(matches.c.rank, matches.c.id.desc())
+    if limit:
+        query = query.limit(limit)
+    return list(db.execute(query).scalars())
+
+
+# ---- index maintenance (used by migrations) ----
+
+def _sqlite_statements(index: SearchIndex) -> List[str]:
+    fields = ", ".join(index.fields)
+    new_values = ", ".join(f"new.{field}" for field in index.fields)
+    old_values = ", ".join(f"old.{field}" for field in index.fields)
+    # Prefix indexes up to 8 characters keep prefix queries on common words from merging long posting lists
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {index.name} USING fts5("
+        f"{fields}, content='{index.table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3 4 5 6 7 8')",
+        f"CREATE TRIGGER IF NOT EXISTS {index.name}_ai AFTER INSERT ON {index.table} BEGIN "
+        f"INSERT INTO {index.name}(rowid, {fields}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {index.name}_ad AFTER DELETE ON {index.table} BEGIN "
+        f"INSERT INTO {index.name}({index.name}, rowid, {fields}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {index.name}_au AFTER UPDATE OF {fields} ON {index.table} BEGIN "
+        f"INSERT INTO {index.name}({index.name}, rowid, {fields}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {index.name}(rowid, {fields}) VALUES (new.id, {new_values}); END",
+        # Index the rows that already exist
+        f"INSERT INTO {index.name}({index.name}) VALUES ('rebuild')",
+    ]
+
+
+def create_search_indexes(connection) -> None:
+    """Create (or rebuild) the full-text index of every searchable table"""
+    dialect = connection.dialect.name
+    existing_tables = SchemaCapabilities(connection).tables()
+    for index in SEARCH_INDEXES.values():
+        if index.table not in existing_tables:
+            continue
+        if dialect == "sqlite":
+            statements = _sqlite_statements(index)
+        elif dialect == "postgresql":
+            statements = [
+                f"CREATE INDEX IF NOT EXISTS {index.name} ON {index.table} "
+                f"USING GIN ({_pg_vector(index, qualified=False)})"
+            ]
+        elif dialect == "mysql":
+            statements = [f"ALTER TABLE {index.table} ADD FULLTEXT INDEX {index.name} ({', '.join(index.fields)})"]
+        else:
+            logger.warning(f"No full-text index support for {dialect}; {index.table} search uses ILIKE")
+            continue
+        for statement in statements:
+            connection.execute(text(statement))
+        logger.info(f"Created full-text index {index.name}")
+
+
+def drop_search_indexes(connection) -> None:
+    dialect = connection.dialect.name
+    for index in SEARCH_INDEXES.values():
+        if dialect == "sqlite":
+            for suffix in ("_ai", "_ad", "_au"):
+                connection.execute(text(f"DROP TRIGGER IF EXISTS {index.name}{suffix}"))
+            connection.execute(text(f"DROP TABLE IF EXISTS {index.name}"))
+        elif dialect == "postgresql":
+            connection.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+        elif dialect == "mysql":
+            if index.name in SchemaCapabilities(connection).indexes(index.table):
+                connection.execute(text(f"ALTER TABLE {index.table} DROP INDEX {index.name}"))
@@ -0,0 +1,193 @@
+"""User Listing - keyset-paginated, N+1-free user listings
+
+Listings select a flat projection of users outer-joined to their
+profile (no ORM objects) and load the roles of a whole page with one
+IN query. Pages are ordered by (created_at, id) and continue from an
+opaque cursor naming the last user of the previous page: the next page
+is an index range scan on users(created_at, id) starting at that user,
+so page N costs the same as page 1. The anchor's created_at is read in
+SQL, so cursors compare DB values with DB values on every backend. If the
+anchor user has since been deleted, the page continues from the user with
+the next lower id instead (ids follow creation order), which can repeat a
+few rows but never skips any.
+
+Total counts are optional and cached per filter for
+USER_COUNT_CACHE_TTL_SECONDS.
+"""
+import base64
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Query, Session
+
+from app.models.profile import Profile
+from app.models.user import RoleEnum, User, UserRole
+from app.schemas.user import UserListResponse
+
+logger = logging.getLogger(__name__)
+
+USER_COUNT_CACHE_TTL_SECONDS = float(os.getenv("USER_COUNT_CACHE_TTL_SECONDS", "60"))
+_COUNT_CACHE_MAX_SIZE = 1024
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# Columns of a listing row
+LISTING_COLUMNS = (
+    User.id,
+    User.email,
+    User.is_active,
+    User.created_at,
+    Profile.full_name,
+    Profile.department,
+    Profile.section,
+    Profile.roll_number,
+    Profile.college_id,
+    Profile.institution_id,
+    Profile.present_year,
+    Profile.handled_years,
+    Profile.handled_sections,
+)
+
+
+def user_listing_query(db: Session, profile_required: bool = False) -> Query:
+    """Projection query of users joined to their profile"""
+    query = db.query(*LISTING_COLUMNS).select_from(User)
+    if profile_required:
+        return query.join(Profile, Profile.user_id == User.id)
+    return query.outerjoin(Profile, Profile.user_id == User.id)
+
+
+def encode_cursor(user_id: int) -> str:
+    return base64.urlsafe_b64encode(f"u:{user_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        prefix, user_id = base64.urlsafe_b64decode(padded.encode()).decode().split(":", 1)
+        if prefix != "u":
+            raise ValueError(prefix)
+        return int(user_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def _after_cursor(query: Query, anchor_id: int) -> Query:
+    # The anchor itself, else the closest surviving user before it, else the start
+    anchor_created_at = func.coalesce(
+        select(User.created_at).where(User.id <= anchor_id).order_by(User.id.desc()).limit(1).scalar_subquery(),
+        select(func.min(User.created_at)).scalar_subquery()
+    )
+    return query.filter(
+        or_(
+            User.created_at > anchor_created_at,
+            and_(User.created_at == anchor_created_at, User.id > anchor_id)
+        )
+    )
+
+
+def _split_csv(value: Optional[str]) -> Optional[List[str]]:
+    if not value:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def fetch_user_page(
+    db: Session,
+    query: Query,
+    response: Response,
+    limit: int,
+    cursor: Optional[str] = None,
+    skip: int = 0,
+    role_filter: Optional[RoleEnum] = None,
+    include_handled: bool = False,
+    count_key: Optional[Hashable] = None,
+) -> List[UserListResponse]:
+    """One page of a listing query as UserListResponse items
+
+    With a cursor the page starts after that user; otherwise skip is
+    honoured (offset) for older clients. The next page's cursor is sent in
+    the X-Next-Cursor header, and with count_key the (cached) total in
+    X-Total-Count. role_filter limits the roles reported per user.
+    """
+    if count_key is not None:
+        response.headers[TOTAL_COUNT_HEADER] = str(user_count_cache.get(count_key, query))
+
+    page_query = query.order_by(User.created_at, User.id)
+    if cursor:
+        page_query = _after_cursor(page_query, decode_cursor(cursor))
+    elif skip:
+        page_query = page_query.offset(skip)
+    rows = page_query.limit(limit + 1).all()
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more and rows:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].id)
+
+    roles_by_user: Dict[int, List[Dict[str, Any]]] = {row.id: [] for row in rows}
+    if rows:
+        roles_query = db.query(UserRole.user_id, UserRole.role, UserRole.college_id).filter(
+            UserRole.user_id.in_(list(roles_by_user))
+        )
+        if role_filter is not None:
+            roles_query = roles_query.filter(UserRole.role == role_filter)
+        for user_id, role, role_college_id in roles_query.order_by(UserRole.id):
+            roles_by_user[user_id].append({"role": role.value, "college_id": role_college_id})
+
+    return [
+        UserListResponse(
+            id=row.id,
+            email=row.email,
+            full_name=row.full_name,
+            department=row.department,
+            section=row.section,
+            roll_number=row.roll_number,
+            college_id=row.college_id,
+            present_year=row.present_year,
+            roles=roles_by_user[row.id],
+            is_active=row.is_active == "true",
+            created_at=row.created_at,
+            handled_years=_split_csv(row.handled_years) if include_handled else None,
+            handled_sections=_split_csv(row.handled_sections) if include_handled else None
+        )
+        for row in rows
+    ]
+
+
+class UserCountCache:
+    """Total row counts of listing queries, cached per filter key"""
+
+    def __init__(self, ttl_seconds: float = USER_COUNT_CACHE_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, query: Query) -> int:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and time.monotonic() - cached[0] < self.ttl_seconds:
+                return cached[1]
+
+        total = query.order_by(None).count()
+        with self._lock:
+            self._entries[key] = (time.monotonic(), total)
+            self._entries.move_to_end(key)
+            while len(self._entries) > _COUNT_CACHE_MAX_SIZE:
+                self._entries.popitem(last=False)
+        return total
+
+    def clear(self) -> None:
+        """Forget all counts (e.g. after users are created or deleted)"""
+        with self._lock:
+            self._entries.clear()
+
+
+user_count_cache = UserCountCache()
@@ -1,65 +1,143 @@
 """WebSocket Service for Real-Time Monitoring"""
 from fastapi import WebSocket, WebSocketDisconnect, Depends
 from sqlalchemy.orm import Session
-from typing import Dict, List, Set
+from starlette.websockets import WebSocketState
+from typing import Dict, List, Optional, Set
 from datetime import datetime
+import asyncio
 import json
 import logging
+import os
 
 from app.core.database import get_db
+from app.core.metrics import metrics_registry, websocket_connections
 from app.models.coding_lab import CodingLab, LabSubmission
 from app.models.user import User
 from app.schemas.coding_lab import StudentActivity, LabMonitoringResponse
+from app.services.lab_backplane import LabBackplane, create_backplane
 
 logger = logging.getLogger(__name__)
 
 
+# Coalescing window for activity broadcasts (seconds)
+BROADCAST_INTERVAL_SECONDS = float(os.getenv("WS_BROADCAST_INTERVAL", "0.5"))
+# Messages buffered per socket before it is treated as a slow consumer and dropped
+SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", "32"))
+# Characters of code included in activity deltas; full code is sent on request
+CODE_PREVIEW_CHARS = 200
+
+
+class Subscriber:
+    """A connected socket with its own bounded send queue"""
+    
+    def __init__(self, websocket: WebSocket, user_id: int, lab_id: int, is_monitor: bool):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.lab_id = lab_id
+        self.is_monitor = is_monitor  # Faculty/admin watching the lab
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.sender_task: Optional[asyncio.Task] = None
+
+
 class ConnectionManager:
-    """Manages WebSocket connections"""
+    """Manages WebSocket connections
+    
+    Activity updates only mark a student as changed. A per-lab tick task
+    coalesces the changes every BROADCAST_INTERVAL_SECONDS and sends one
+    delta (changed students, code preview only) to the lab's monitors.
+    Every socket drains its own bounded queue, so one slow client never
+    delays the others; a client whose queue overflows is disconnected.
+    
+    Deltas and activity state go through the backplane, so monitors on
+    one worker see students connected to any other. student_activities
+    only holds the students connected to this worker.
+    """
     
-    def __init__(self):
+    def __init__(self, backplane: Optional[LabBackplane] = None):
+        self.backplane = backplane or create_backplane()
         # lab_id -> Set[WebSocket]
         self.active_connections: Dict[int, Set[WebSocket]] = {}
         # WebSocket -> (user_id, lab_id)
         self.connection_info: Dict[WebSocket, tuple] = {}
         # lab_id -> Dict[user_id, StudentActivity]
         self.student_activities: Dict[int, Dict[int, StudentActivity]] = {}
+        # WebSocket -> Subscriber
+        self.subscribers: Dict[WebSocket, Subscriber] = {}
+        # lab_id -> user_ids changed since the last tick
+        self._dirty: Dict[int, Set[int]] = {}
+        # lab_id -> broadcast tick task
+        self._tick_tasks: Dict[int, asyncio.Task] = {}
     
-    async def connect(self, websocket: WebSocket, lab_id: int, user_id: int):
+    async def connect(self, websocket: WebSocket, lab_id: int, user_id: int, is_monitor: bool = False):
         """Connect a client"""
-        await websocket.accept()
+        if websocket.client_state == WebSocketState.CONNECTING:
+            await websocket.accept()
         
-        if lab_id not in self.active_connections:
+        first_in_lab = lab_id not in self.active_connections
+        if first_in_lab:
             self.active_connections[lab_id] = set()
+        if lab_id not in self.student_activities:
             self.student_activities[lab_id] = {}
         
         self.active_connections[lab_id].add(websocket)
         self.connection_info[websocket] = (user_id, lab_id)
         
-        # Initialize activity
-        if user_id not in self.student_activities[lab_id]:
-            self.student_activities[lab_id][user_id] = StudentActivity(
-                user_id=user_id,
-                lab_id=lab_id,
-                time_spent_seconds=0,
-                attempt_count=0,
-                last_activity=datetime.now(),
-                is_active=True
-            )
+        subscriber = Subscriber(websocket, user_id, lab_id, is_monitor)
+        subscriber.sender_task = asyncio.create_task(self._sender(subscriber))
+        self.subscribers[websocket] = subscriber
+        
+        tick_task = self._tick_tasks.get(lab_id)
+        if tick_task is None or tick_task.done():
+            self._tick_tasks[lab_id] = asyncio.create_task(self._tick_loop(lab_id))
+        
+        if first_in_lab:
+            await self.backplane.subscribe(lab_id, self._deliver)
+        
+        # Initialize activity (monitors are not students being watched)
+        if not is_monitor:
+            if user_id not in self.student_activities[lab_id]:
+                # Resume counters kept by whichever worker the student was on before
+                stored = await self.backplane.load_activity(lab_id, user_id)
+                if stored:
+                    activity = StudentActivity.model_validate(stored)
+                else:
+                    activity = StudentActivity(
+                        user_id=user_id,
+                        lab_id=lab_id,
+                        time_spent_seconds=0,
+                        attempt_count=0,
+                        last_activity=datetime.now(),
+                        is_active=True
+                    )
+                self.student_activities.setdefault(lab_id, {}).setdefault(user_id, activity)
+            self.student_activities[lab_id][user_id].is_active = True
+            self._mark_dirty(lab_id, user_id)
         
-        logger.info(f"Client connected: user_id={user_id}, lab_id={lab_id}")
+        logger.info(f"Client connected: user_id={user_id}, lab_id={lab_id}, monitor={is_monitor}")
     
     def disconnect(self, websocket: WebSocket):
         """Disconnect a client"""
+        subscriber = self.subscribers.pop(websocket, None)
+        if subscriber and subscriber.sender_task and subscriber.sender_task is not asyncio.current_task():
+            subscriber.sender_task.cancel()
+        
         if websocket in self.connection_info:
             user_id, lab_id = self.connection_info[websocket]
             
-            if lab_id in self.active_connections:
-                self.active_connections[lab_id].discard(websocket)
-            
             if lab_id in self.student_activities:
                 if user_id in self.student_activities[lab_id]:
                     self.student_activities[lab_id][user_id].is_active = False
+                    self._mark_dirty(lab_id, user_id)
+            
+            if lab_id in self.active_connections:
+                self.active_connections[lab_id].discard(websocket)
+                if not self.active_connections[lab_id]:
+                    # Last local socket: publish the final changes, then leave the lab's channel
+                    del self.active_connections[lab_id]
+                    tick_task = self._tick_tasks.pop(lab_id, None)
+                    if tick_task:
+                        tick_task.cancel()
+                    asyncio.create_task(self._release_lab(lab_id))
             
             del self.connection_info[websocket]
             
@@ -73,22 +151,96 @@ class ConnectionManager:
             logger.error(f"Error sending message: {e}")
             self.disconnect(websocket)
     
-    async def broadcast_to_lab(self, lab_id: int, message: dict):
-        """Broadcast message to all clients in a lab"""
+    async def publish_to_lab(self, lab_id: int, message: dict, monitors_only: bool = False):
+        """Broadcast a message to the lab's clients on every worker"""
+        await self.backplane.publish(lab_id, {"monitors_only": monitors_only, "message": message})
+    
+    async def _deliver(self, lab_id: int, envelope: dict):
+        """Backplane handler: relay a published message to this worker's sockets"""
+        await self.broadcast_to_lab(lab_id, envelope["message"], monitors_only=envelope.get("monitors_only", False))
+    
+    async def broadcast_to_lab(self, lab_id: int, message: dict, monitors_only: bool = False):
+        """Queue a message for this worker's clients in a lab (sent concurrently by each socket's sender)"""
         if lab_id not in self.active_connections:
             return
         
-        disconnected = []
-        for websocket in self.active_connections[lab_id]:
-            try:
-                await websocket.send_json(message)
-            except Exception as e:
-                logger.error(f"Error broadcasting: {e}")
-                disconnected.append(websocket)
+        for websocket in list(self.active_connections[lab_id]):
+            subscriber = self.subscribers.get(websocket)
+            if subscriber and (subscriber.is_monitor or not monitors_only):
+                self._enqueue(subscriber, message)
+    
+    def _enqueue(self, subscriber: Subscriber, message: dict):
+        """Queue a message, dropping the client if it cannot keep up"""
+        try:
+            subscriber.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            logger.warning(f"Dropping slow WebSocket consumer: user_id={subscriber.user_id}, lab_id={subscriber.lab_id}")
+            self.disconnect(subscriber.websocket)
+            asyncio.create_task(self._close_quietly(subscriber.websocket))
+    
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket):
+        try:
+            await websocket.close(code=1013, reason="Client too slow")
+        except Exception:
+            pass
+    
+    async def _sender(self, subscriber: Subscriber):
+        """Drain one socket's queue"""
+        try:
+            while True:
+                message = await subscriber.queue.get()
+                await subscriber.websocket.send_json(message)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error broadcasting: {e}")
+            self.disconnect(subscriber.websocket)
+    
+    async def _tick_loop(self, lab_id: int):
+        """Send coalesced activity deltas to the lab's monitors every tick"""
+        try:
+            while True:
+                await asyncio.sleep(BROADCAST_INTERVAL_SECONDS)
+                await self.flush_lab(lab_id)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Broadcast tick failed for lab {lab_id}: {e}", exc_info=True)
+    
+    def _mark_dirty(self, lab_id: int, user_id: int):
+        self._dirty.setdefault(lab_id, set()).add(user_id)
+    
+    async def flush_lab(self, lab_id: int) -> Optional[dict]:
+        """Store and publish the students changed since the last tick (None if nothing changed)"""
+        changed = self._dirty.pop(lab_id, None)
+        if not changed:
+            return None
+        local = self.student_activities.get(lab_id, {})
+        activities = [local[user_id] for user_id in changed if user_id in local]
+        if not activities:
+            return None
         
-        # Clean up disconnected clients
-        for ws in disconnected:
-            self.disconnect(ws)
+        await self.backplane.save_activities(
+            lab_id,
+            {activity.user_id: activity.model_dump(mode="json") for activity in activities}
+        )
+        message = {
+            "type": "activity_delta",
+            "activities": [serialize_activity(activity) for activity in activities]
+        }
+        await self.publish_to_lab(lab_id, message, monitors_only=True)
+        return message
+    
+    async def _release_lab(self, lab_id: int):
+        """Flush a lab this worker no longer has sockets in and drop its local state"""
+        try:
+            await self.flush_lab(lab_id)
+            if lab_id not in self.active_connections:
+                self.student_activities.pop(lab_id, None)
+                await self.backplane.unsubscribe(lab_id)
+        except Exception as e:
+            logger.error(f"Releasing lab {lab_id} failed: {e}", exc_info=True)
     
     def update_activity(
         self,
@@ -100,7 +252,7 @@ class ConnectionManager:
         tab_switches: int = 0,
         fullscreen_exits: int = 0
     ):
-        """Update student activity"""
+        """Update student activity (broadcast on the next tick)"""
         if lab_id not in self.student_activities:
             self.student_activities[lab_id] = {}
         
@@ -127,25 +279,82 @@ class ConnectionManager:
         
         activity.tab_switches += tab_switches
         activity.fullscreen_exits += fullscreen_exits
+        
+        self._mark_dirty(lab_id, user_id)
     
     def increment_attempt(self, lab_id: int, user_id: int):
         """Increment attempt count"""
         if lab_id in self.student_activities:
             if user_id in self.student_activities[lab_id]:
                 self.student_activities[lab_id][user_id].attempt_count += 1
+                self._mark_dirty(lab_id, user_id)
     
     def get_lab_activities(self, lab_id: int) -> List[StudentActivity]:
-        """Get all activities for a lab"""
+        """Get activities of the students connected to this worker"""
         if lab_id not in self.student_activities:
             return []
         
         return list(self.student_activities[lab_id].values())
+    
+    async def get_activity_snapshot(self, lab_id: int, user_id: int, is_monitor: bool) -> List[dict]:
+        """Full activity list for monitors (all workers); a student only sees their own entry"""
+        local = self.student_activities.get(lab_id, {})
+        if not is_monitor:
+            activity = local.get(user_id)
+            return [serialize_activity(activity)] if activity else []
+        
+        activities = {
+            stored_id: StudentActivity.model_validate(data)
+            for stored_id, data in (await self.backplane.load_activities(lab_id)).items()
+        }
+        # Local entries may hold changes not flushed to the store yet
+        activities.update(local)
+        return [serialize_activity(a) for a in activities.values()]
+    
+    async def get_student_code(self, lab_id: int, user_id: int) -> Optional[dict]:
+        """Full current code of one student (sent to monitors on demand)"""
+        activity = self.student_activities.get(lab_id, {}).get(user_id)
+        if not activity:
+            stored = await self.backplane.load_activity(lab_id, user_id)
+            if not stored:
+                return None
+            activity = StudentActivity.model_validate(stored)
+        return {
+            "type": "student_code",
+            "user_id": user_id,
+            "problem_id": activity.problem_id,
+            "language": activity.language,
+            "current_code": activity.current_code
+        }
+
+    async def close(self):
+        """Stop broadcast ticks and release the backplane (application shutdown)"""
+        for tick_task in self._tick_tasks.values():
+            tick_task.cancel()
+        self._tick_tasks.clear()
+        await self.backplane.close()
+
+
+def serialize_activity(activity: StudentActivity) -> dict:
+    """JSON-safe activity without the full code (preview and length only)"""
+    data = activity.model_dump(mode="json", exclude={"current_code"})
+    code = activity.current_code or ""
+    data["code_preview"] = code[:CODE_PREVIEW_CHARS]
+    data["code_length"] = len(code)
+    return data
 
 
 # Global connection manager
 manager = ConnectionManager()
 
 
+def _collect_websocket_connections() -> None:
+    websocket_connections.set(len(manager.connection_info), "coding_labs")
+
+
+metrics_registry.add_collector(_collect_websocket_connections)
+
+
 async def websocket_endpoint(
     websocket: WebSocket,
     lab_id: int,
@@ -167,7 +376,7 @@ async def websocket_endpoint(
                 await manager.send_personal_message({"type": "pong"}, websocket)
             
             elif message_type == "activity_update":
-                # Update activity
+                # Update activity (monitors get it on the next broadcast tick)
                 manager.update_activity(
                     lab_id=lab_id,
                     user_id=user_id,
@@ -177,20 +386,12 @@ async def websocket_endpoint(
                     tab_switches=data.get("tab_switches", 0),
                     fullscreen_exits=data.get("fullscreen_exits", 0)
                 )
-                
-                # Broadcast update to faculty/admins
-                activities = manager.get_lab_activities(lab_id)
-                await manager.broadcast_to_lab(lab_id, {
-                    "type": "activity_update",
-                    "activities": [a.dict() for a in activities]
-                })
             
             elif message_type == "get_activities":
                 # Send current activities
-                activities = manager.get_lab_activities(lab_id)
                 await manager.send_personal_message({
                     "type": "activities",
-                    "activities": [a.dict() for a in activities]
+                    "activities": await manager.get_activity_snapshot(lab_id, user_id, is_monitor=False)
                 }, websocket)
             
             elif message_type == "code_change":
@@ -0,0 +1,1898 @@
+"""Baseline schema
+
+The schema as it stood when versioned migrations were introduced, written
+out table by table so that this revision always creates the same thing;
+every later change is its own revision. Databases created before Alembic
+(by the startup create_all and the one-off scripts in migrations/) do not
+run it: scripts/repair_legacy_schema.py brings them up to date and stamps
+them instead.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+# Enum types, created once before the tables that use them (CREATE TYPE on
+# PostgreSQL, inline column types elsewhere). Bound to their own MetaData so
+# that creating a table does not try to create its enum types again.
+_ENUM_METADATA = sa.MetaData()
+INTERVIEWTYPE = sa.Enum("TECHNICAL", "HR", "MANAGERIAL", "MOCK", "BEHAVIORAL", "GROUP_DISCUSSION", name="interviewtype", metadata=_ENUM_METADATA)
+INTERVIEWSTATUS = sa.Enum("SCHEDULED", "IN_PROGRESS", "COMPLETED", "CANCELLED", "NO_SHOW", name="interviewstatus", metadata=_ENUM_METADATA)
+ROLEENUM = sa.Enum("SUPER_ADMIN", "ADMIN", "HOD", "FACULTY", "STUDENT", "INSTITUTION_ADMIN", "INSTITUTION_STUDENT", name="roleenum", metadata=_ENUM_METADATA)
+PROMOTIONSTATUS = sa.Enum("PENDING", "APPROVED", "REJECTED", "COMPLETED", name="promotionstatus", metadata=_ENUM_METADATA)
+LABMODE = sa.Enum("PRACTICE", "ASSIGNMENT", "EXAM", name="labmode", metadata=_ENUM_METADATA)
+LABDIFFICULTY = sa.Enum("EASY", "MEDIUM", "HARD", "EXPERT", name="labdifficulty", metadata=_ENUM_METADATA)
+ROUNDTYPE = sa.Enum("QUIZ", "CODING", "GROUP_DISCUSSION", "INTERVIEW", name="roundtype", metadata=_ENUM_METADATA)
+TESTTYPE = sa.Enum("QUIZ", "CODING_TEST", "MIXED", name="testtype", metadata=_ENUM_METADATA)
+MATERIALTYPE = sa.Enum("PDF", "SLIDE", "CODE_FILE", "NOTE", "VIDEO_LINK", "DOCUMENT", name="materialtype", metadata=_ENUM_METADATA)
+SUBMISSIONSTATUS = sa.Enum("PENDING", "RUNNING", "COMPILED", "ACCEPTED", "WRONG_ANSWER", "TIME_LIMIT_EXCEEDED", "MEMORY_LIMIT_EXCEEDED", "RUNTIME_ERROR", "COMPILATION_ERROR", "INTERNAL_ERROR", name="submissionstatus", metadata=_ENUM_METADATA)
+TESTCASETYPE = sa.Enum("PUBLIC", "HIDDEN", name="testcasetype", metadata=_ENUM_METADATA)
+QUESTIONTYPE = sa.Enum("MCQ", "MULTIPLE_SELECT", "TRUE_FALSE", "SHORT_ANSWER", "CODING", name="questiontype", metadata=_ENUM_METADATA)
+ENUMS = (
+    INTERVIEWTYPE,
+    INTERVIEWSTATUS,
+    ROLEENUM,
+    PROMOTIONSTATUS,
+    LABMODE,
+    LABDIFFICULTY,
+    ROUNDTYPE,
+    TESTTYPE,
+    MATERIALTYPE,
+    SUBMISSIONSTATUS,
+    TESTCASETYPE,
+    QUESTIONTYPE,
+)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    for enum in ENUMS:
+        enum.create(bind, checkfirst=False)
+
+    op.create_table("colleges",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("code", sa.String(length=50), nullable=False),
+        sa.Column("address", sa.String(length=500), nullable=True),
+        sa.Column("city", sa.String(length=100), nullable=True),
+        sa.Column("state", sa.String(length=100), nullable=True),
+        sa.Column("pincode", sa.String(length=10), nullable=True),
+        sa.Column("is_active", sa.String(length=10), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_colleges_code", "colleges", ["code"], unique=True)
+    op.create_index("ix_colleges_id", "colleges", ["id"], unique=False)
+    op.create_table("companies",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("logo_url", sa.String(length=500), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("website", sa.String(length=255), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_companies_id", "companies", ["id"], unique=False)
+    op.create_index("ix_companies_name", "companies", ["name"], unique=True)
+    op.create_table("feature_analytics",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("feature_name", sa.String(length=100), nullable=False),
+        sa.Column("entity_type", sa.String(length=50), nullable=True),
+        sa.Column("entity_id", sa.Integer(), nullable=True),
+        sa.Column("date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("period_type", sa.String(length=20), nullable=False),
+        sa.Column("total_users", sa.Integer(), nullable=False),
+        sa.Column("active_users", sa.Integer(), nullable=False),
+        sa.Column("total_actions", sa.Integer(), nullable=False),
+        sa.Column("total_time_minutes", sa.Integer(), nullable=False),
+        sa.Column("total_completions", sa.Integer(), nullable=False),
+        sa.Column("total_successes", sa.Integer(), nullable=False),
+        sa.Column("success_rate", sa.Float(), nullable=False),
+        sa.Column("metrics", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True
+    )
+    op.create_index("ix_feature_analytics_date", "feature_analytics", ["date"], unique=False)
+    op.create_index("ix_feature_analytics_entity_id", "feature_analytics", ["entity_id"], unique=False)
+    op.create_index("ix_feature_analytics_entity_type", "feature_analytics", ["entity_type"], unique=False)
+    op.create_index("ix_feature_analytics_feature_name", "feature_analytics", ["feature_name"], unique=False)
+    op.create_index("ix_feature_analytics_id", "feature_analytics", ["id"], unique=False)
+    op.create_table("institutions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("code", sa.String(length=50), nullable=False),
+        sa.Column("address", sa.String(length=500), nullable=True),
+        sa.Column("city", sa.String(length=100), nullable=True),
+        sa.Column("state", sa.String(length=100), nullable=True),
+        sa.Column("pincode", sa.String(length=10), nullable=True),
+        sa.Column("is_active", sa.String(length=10), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_institutions_code", "institutions", ["code"], unique=True)
+    op.create_index("ix_institutions_id", "institutions", ["id"], unique=False)
+    op.create_table("users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=False),
+        sa.Column("password_hash", sa.String(length=255), nullable=False),
+        sa.Column("is_active", sa.String(length=10), nullable=True),
+        sa.Column("is_verified", sa.String(length=10), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("idx_users_created_at_id", "users", ["created_at", "id"], unique=False)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+    op.create_index("ix_users_id", "users", ["id"], unique=False)
+    op.create_table("academic_years",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("start_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("is_current", sa.Boolean(), nullable=False),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("name")
+    )
+    op.create_index("ix_academic_years_id", "academic_years", ["id"], unique=False)
+    op.create_table("announcements",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("message", sa.Text(), nullable=False),
+        sa.Column("type", sa.String(length=50), nullable=True),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("department", sa.String(length=255), nullable=True),
+        sa.Column("section", sa.String(length=50), nullable=True),
+        sa.Column("present_year", sa.String(length=50), nullable=True),
+        sa.Column("role", sa.String(length=50), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_announcements_college_id", "announcements", ["college_id"], unique=False)
+    op.create_index("ix_announcements_department", "announcements", ["department"], unique=False)
+    op.create_index("ix_announcements_id", "announcements", ["id"], unique=False)
+    op.create_index("ix_announcements_is_active", "announcements", ["is_active"], unique=False)
+    op.create_index("ix_announcements_present_year", "announcements", ["present_year"], unique=False)
+    op.create_index("ix_announcements_role", "announcements", ["role"], unique=False)
+    op.create_index("ix_announcements_section", "announcements", ["section"], unique=False)
+    op.create_table("attendance_daily_cube",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("department_id", sa.Integer(), nullable=True),
+        sa.Column("section_id", sa.Integer(), nullable=True),
+        sa.Column("subject_id", sa.Integer(), nullable=True),
+        sa.Column("student_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("present", sa.Integer(), nullable=False),
+        sa.Column("absent", sa.Integer(), nullable=False),
+        sa.Column("late", sa.Integer(), nullable=False),
+        sa.Column("excused", sa.Integer(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["student_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("idx_attendance_cube_college_date", "attendance_daily_cube", ["college_id", "date"], unique=False)
+    op.create_index("idx_attendance_cube_department_date", "attendance_daily_cube", ["department_id", "date"], unique=False)
+    op.create_index("idx_attendance_cube_student_date", "attendance_daily_cube", ["student_id", "date"], unique=False)
+    op.create_index("idx_attendance_cube_subject_date", "attendance_daily_cube", ["subject_id", "date"], unique=False)
+    op.create_index("ix_attendance_daily_cube_id", "attendance_daily_cube", ["id"], unique=False)
+    op.create_table("audit_logs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=True),
+        sa.Column("user_email", sa.String(length=255), nullable=True),
+        sa.Column("action", sa.String(length=50), nullable=False),
+        sa.Column("entity_type", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=True),
+        sa.Column("entity_name", sa.String(length=255), nullable=True),
+        sa.Column("changes", sa.JSON(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("ip_address", sa.String(length=45), nullable=True),
+        sa.Column("user_agent", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("extra_info", sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_audit_logs_created_at", "audit_logs", ["created_at"], unique=False)
+    op.create_index("ix_audit_logs_id", "audit_logs", ["id"], unique=False)
+    op.create_index("ix_audit_logs_user_id", "audit_logs", ["user_id"], unique=False)
+    op.create_table("company_roles",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("company_id", sa.Integer(), nullable=False),
+        sa.Column("role_name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("difficulty", sa.String(length=20), nullable=True),
+        sa.Column("scope_type", sa.String(length=20), nullable=False),
+        sa.Column("target_departments", sa.JSON(), nullable=True),
+        sa.Column("target_years", sa.JSON(), nullable=True),
+        sa.Column("target_sections", sa.JSON(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["company_id"], ["companies.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_company_roles_company_id", "company_roles", ["company_id"], unique=False)
+    op.create_index("ix_company_roles_created_by", "company_roles", ["created_by"], unique=False)
+    op.create_index("ix_company_roles_id", "company_roles", ["id"], unique=False)
+    op.create_table("departments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("code", sa.String(length=20), nullable=True),
+        sa.Column("branch_id", sa.String(length=50), nullable=True),
+        sa.Column("college_id", sa.Integer(), nullable=False),
+        sa.Column("hod_id", sa.Integer(), nullable=True),
+        sa.Column("number_of_years", sa.Integer(), nullable=True),
+        sa.Column("vertical", sa.String(length=100), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["hod_id"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_departments_branch_id", "departments", ["branch_id"], unique=True)
+    op.create_index("ix_departments_college_id", "departments", ["college_id"], unique=False)
+    op.create_index("ix_departments_hod_id", "departments", ["hod_id"], unique=False)
+    op.create_index("ix_departments_id", "departments", ["id"], unique=False)
+    op.create_table("hall_tickets",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("exam_id", sa.Integer(), nullable=False),
+        sa.Column("exam_type", sa.String(length=50), nullable=False),
+        sa.Column("exam_title", sa.String(length=255), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("exam_date", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("exam_time", sa.String(length=50), nullable=True),
+        sa.Column("duration_minutes", sa.Integer(), nullable=True),
+        sa.Column("venue", sa.String(length=255), nullable=True),
+        sa.Column("room_number", sa.String(length=50), nullable=True),
+        sa.Column("seat_number", sa.String(length=50), nullable=True),
+        sa.Column("address", sa.Text(), nullable=True),
+        sa.Column("instructions", sa.JSON(), nullable=True),
+        sa.Column("is_generated", sa.Boolean(), nullable=False),
+        sa.Column("generated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("generated_by", sa.Integer(), nullable=True),
+        sa.Column("pdf_url", sa.String(length=500), nullable=True),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["generated_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_hall_tickets_college_id", "hall_tickets", ["college_id"], unique=False)
+    op.create_index("ix_hall_tickets_exam_id", "hall_tickets", ["exam_id"], unique=False)
+    op.create_index("ix_hall_tickets_id", "hall_tickets", ["id"], unique=False)
+    op.create_index("ix_hall_tickets_user_id", "hall_tickets", ["user_id"], unique=False)
+    op.create_table("jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("company", sa.String(length=255), nullable=False),
+        sa.Column("role", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("location", sa.String(length=255), nullable=True),
+        sa.Column("ctc", sa.String(length=100), nullable=True),
+        sa.Column("eligibility_type", sa.String(length=50), nullable=False),
+        sa.Column("eligible_branches", sa.JSON(), nullable=True),
+        sa.Column("eligible_user_ids", sa.JSON(), nullable=True),
+        sa.Column("eligible_years", sa.JSON(), nullable=True),
+        sa.Column("job_type", sa.String(length=50), nullable=False),
+        sa.Column("requirements", sa.JSON(), nullable=True),
+        sa.Column("rounds", sa.JSON(), nullable=True),
+        sa.Column("deadline", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("posted_date", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("apply_link", sa.String(length=500), nullable=True),
+        sa.Column("company_logo", sa.String(length=500), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_jobs_college_id", "jobs", ["college_id"], unique=False)
+    op.create_index("ix_jobs_id", "jobs", ["id"], unique=False)
+    op.create_table("mock_interviews",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("interview_type", INTERVIEWTYPE, nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("student_id", sa.Integer(), nullable=True),
+        sa.Column("interviewer_id", sa.Integer(), nullable=True),
+        sa.Column("interviewer_name", sa.String(length=255), nullable=True),
+        sa.Column("scheduled_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("duration_minutes", sa.Integer(), nullable=False),
+        sa.Column("meeting_link", sa.String(length=500), nullable=True),
+        sa.Column("venue", sa.String(length=255), nullable=True),
+        sa.Column("status", INTERVIEWSTATUS, nullable=False),
+        sa.Column("feedback", sa.Text(), nullable=True),
+        sa.Column("rating", sa.Integer(), nullable=True),
+        sa.Column("strengths", sa.JSON(), nullable=True),
+        sa.Column("areas_for_improvement", sa.JSON(), nullable=True),
+        sa.Column("technical_score", sa.Integer(), nullable=True),
+        sa.Column("communication_score", sa.Integer(), nullable=True),
+        sa.Column("problem_solving_score", sa.Integer(), nullable=True),
+        sa.Column("recording_url", sa.String(length=500), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["interviewer_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["student_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_mock_interviews_college_id", "mock_interviews", ["college_id"], unique=False)
+    op.create_index("ix_mock_interviews_id", "mock_interviews", ["id"], unique=False)
+    op.create_index("ix_mock_interviews_interviewer_id", "mock_interviews", ["interviewer_id"], unique=False)
+    op.create_index("ix_mock_interviews_scheduled_at", "mock_interviews", ["scheduled_at"], unique=False)
+    op.create_index("ix_mock_interviews_status", "mock_interviews", ["status"], unique=False)
+    op.create_index("ix_mock_interviews_student_id", "mock_interviews", ["student_id"], unique=False)
+    op.create_table("notifications",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("message", sa.String(length=2000), nullable=False),
+        sa.Column("type", sa.String(length=50), nullable=True),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_notifications_college_id", "notifications", ["college_id"], unique=False)
+    op.create_index("ix_notifications_id", "notifications", ["id"], unique=False)
+    op.create_index("ix_notifications_is_active", "notifications", ["is_active"], unique=False)
+    op.create_table("periods",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("number", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=True),
+        sa.Column("start_time", sa.String(length=10), nullable=True),
+        sa.Column("end_time", sa.String(length=10), nullable=True),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_periods_college_id", "periods", ["college_id"], unique=False)
+    op.create_index("ix_periods_id", "periods", ["id"], unique=False)
+    op.create_table("resume_analytics",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("activity_type", sa.String(length=50), nullable=False),
+        sa.Column("ats_score", sa.Float(), nullable=True),
+        sa.Column("previous_ats_score", sa.Float(), nullable=True),
+        sa.Column("score_improvement", sa.Float(), nullable=True),
+        sa.Column("target_role", sa.String(length=200), nullable=True),
+        sa.Column("company_name", sa.String(length=200), nullable=True),
+        sa.Column("job_description_provided", sa.String(length=10), nullable=True),
+        sa.Column("duration_seconds", sa.Integer(), nullable=True),
+        sa.Column("tokens_used", sa.Integer(), nullable=True),
+        sa.Column("estimated_cost", sa.Float(), nullable=True),
+        sa.Column("recommendations", sa.JSON(), nullable=True),
+        sa.Column("missing_keywords", sa.JSON(), nullable=True),
+        sa.Column("strengths", sa.JSON(), nullable=True),
+        sa.Column("improvements", sa.JSON(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("extra_data", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True
+    )
+    op.create_index("ix_resume_analytics_activity_type", "resume_analytics", ["activity_type"], unique=False)
+    op.create_index("ix_resume_analytics_created_at", "resume_analytics", ["created_at"], unique=False)
+    op.create_index("ix_resume_analytics_id", "resume_analytics", ["id"], unique=False)
+    op.create_index("ix_resume_analytics_user_id", "resume_analytics", ["user_id"], unique=False)
+    op.create_table("student_progress",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("total_coding_problems_viewed", sa.Integer(), nullable=False),
+        sa.Column("total_coding_problems_attempted", sa.Integer(), nullable=False),
+        sa.Column("total_coding_problems_solved", sa.Integer(), nullable=False),
+        sa.Column("total_coding_submissions", sa.Integer(), nullable=False),
+        sa.Column("total_coding_time_minutes", sa.Integer(), nullable=False),
+        sa.Column("coding_acceptance_rate", sa.Float(), nullable=False),
+        sa.Column("total_quizzes_attempted", sa.Integer(), nullable=False),
+        sa.Column("total_quizzes_completed", sa.Integer(), nullable=False),
+        sa.Column("total_quiz_questions_answered", sa.Integer(), nullable=False),
+        sa.Column("average_quiz_score", sa.Float(), nullable=False),
+        sa.Column("total_labs_started", sa.Integer(), nullable=False),
+        sa.Column("total_labs_completed", sa.Integer(), nullable=False),
+        sa.Column("total_lab_sessions", sa.Integer(), nullable=False),
+        sa.Column("total_lab_time_minutes", sa.Integer(), nullable=False),
+        sa.Column("total_company_trainings_started", sa.Integer(), nullable=False),
+        sa.Column("total_company_rounds_completed", sa.Integer(), nullable=False),
+        sa.Column("total_company_rounds_passed", sa.Integer(), nullable=False),
+        sa.Column("total_jobs_viewed", sa.Integer(), nullable=False),
+        sa.Column("total_jobs_applied", sa.Integer(), nullable=False),
+        sa.Column("total_active_minutes", sa.Integer(), nullable=False),
+        sa.Column("total_sessions", sa.Integer(), nullable=False),
+        sa.Column("last_activity_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("problems_by_difficulty", sa.JSON(), nullable=True),
+        sa.Column("languages_used", sa.JSON(), nullable=True),
+        sa.Column("topics_covered", sa.JSON(), nullable=True),
+        sa.Column("current_streak_days", sa.Integer(), nullable=False),
+        sa.Column("longest_streak_days", sa.Integer(), nullable=False),
+        sa.Column("last_activity_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True
+    )
+    op.create_index("ix_student_progress_id", "student_progress", ["id"], unique=False)
+    op.create_index("ix_student_progress_user_id", "student_progress", ["user_id"], unique=True)
+    op.create_table("student_resume_progress",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("profile_completeness", sa.Float(), nullable=False),
+        sa.Column("sections_completed", sa.JSON(), nullable=True),
+        sa.Column("current_ats_score", sa.Float(), nullable=True),
+        sa.Column("best_ats_score", sa.Float(), nullable=True),
+        sa.Column("average_ats_score", sa.Float(), nullable=False),
+        sa.Column("total_ats_checks", sa.Integer(), nullable=False),
+        sa.Column("total_resumes_generated", sa.Integer(), nullable=False),
+        sa.Column("total_cover_letters_generated", sa.Integer(), nullable=False),
+        sa.Column("total_role_optimizations", sa.Integer(), nullable=False),
+        sa.Column("total_text_enhancements", sa.Integer(), nullable=False),
+        sa.Column("total_tokens_used", sa.Integer(), nullable=False),
+        sa.Column("total_estimated_cost", sa.Float(), nullable=False),
+        sa.Column("last_ats_check_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_resume_generated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_cover_letter_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_optimization_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True
+    )
+    op.create_index("ix_student_resume_progress_id", "student_resume_progress", ["id"], unique=False)
+    op.create_index("ix_student_resume_progress_user_id", "student_resume_progress", ["user_id"], unique=True)
+    op.create_table("student_resumes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("resume_data", sa.JSON(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_student_resumes_id", "student_resumes", ["id"], unique=False)
+    op.create_index("ix_student_resumes_user_id", "student_resumes", ["user_id"], unique=True)
+    op.create_table("training_sessions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("session_type", sa.String(length=50), nullable=False),
+        sa.Column("start_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("end_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("target_type", sa.String(length=50), nullable=False),
+        sa.Column("target_departments", sa.JSON(), nullable=True),
+        sa.Column("target_years", sa.JSON(), nullable=True),
+        sa.Column("target_sections", sa.JSON(), nullable=True),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_training_sessions_college_id", "training_sessions", ["college_id"], unique=False)
+    op.create_index("ix_training_sessions_created_by", "training_sessions", ["created_by"], unique=False)
+    op.create_index("ix_training_sessions_id", "training_sessions", ["id"], unique=False)
+    op.create_table("user_activities",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("activity_type", sa.String(length=50), nullable=False),
+        sa.Column("activity_category", sa.String(length=50), nullable=True),
+        sa.Column("entity_type", sa.String(length=50), nullable=True),
+        sa.Column("entity_id", sa.Integer(), nullable=True),
+        sa.Column("entity_name", sa.String(length=255), nullable=True),
+        sa.Column("activity_metadata", sa.JSON(), nullable=True),
+        sa.Column("duration_seconds", sa.Integer(), nullable=True),
+        sa.Column("active_time_seconds", sa.Integer(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("session_id", sa.String(length=100), nullable=True),
+        sa.Column("page_url", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True
+    )
+    op.create_index("ix_user_activities_activity_category", "user_activities", ["activity_category"], unique=False)
+    op.create_index("ix_user_activities_activity_type", "user_activities", ["activity_type"], unique=False)
+    op.create_index("ix_user_activities_created_at", "user_activities", ["created_at"], unique=False)
+    op.create_index("ix_user_activities_entity_id", "user_activities", ["entity_id"], unique=False)
+    op.create_index("ix_user_activities_entity_type", "user_activities", ["entity_type"], unique=False)
+    op.create_index("ix_user_activities_id", "user_activities", ["id"], unique=False)
+    op.create_index("ix_user_activities_session_id", "user_activities", ["session_id"], unique=False)
+    op.create_index("ix_user_activities_user_id", "user_activities", ["user_id"], unique=False)
+    op.create_table("user_roles",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("role", ROLEENUM, nullable=False),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("institution_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["institution_id"], ["institutions.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_user_roles_college_id", "user_roles", ["college_id"], unique=False)
+    op.create_index("ix_user_roles_id", "user_roles", ["id"], unique=False)
+    op.create_index("ix_user_roles_institution_id", "user_roles", ["institution_id"], unique=False)
+    op.create_index("ix_user_roles_user_id", "user_roles", ["user_id"], unique=False)
+    op.create_table("user_sessions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("session_id", sa.String(length=100), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("ended_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_activity_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("total_time_seconds", sa.Integer(), nullable=False),
+        sa.Column("active_time_seconds", sa.Integer(), nullable=False),
+        sa.Column("idle_time_seconds", sa.Integer(), nullable=False),
+        sa.Column("page_views", sa.Integer(), nullable=False),
+        sa.Column("actions_count", sa.Integer(), nullable=False),
+        sa.Column("pages_visited", sa.JSON(), nullable=True),
+        sa.Column("user_agent", sa.String(length=500), nullable=True),
+        sa.Column("ip_address", sa.String(length=45), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True
+    )
+    op.create_index("ix_user_sessions_id", "user_sessions", ["id"], unique=False)
+    op.create_index("ix_user_sessions_is_active", "user_sessions", ["is_active"], unique=False)
+    op.create_index("ix_user_sessions_session_id", "user_sessions", ["session_id"], unique=True)
+    op.create_index("ix_user_sessions_user_id", "user_sessions", ["user_id"], unique=False)
+    op.create_table("year_promotions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("from_year", sa.String(length=20), nullable=False),
+        sa.Column("to_year", sa.String(length=20), nullable=False),
+        sa.Column("fee_paid", sa.Boolean(), nullable=False),
+        sa.Column("fee_amount", sa.Numeric(precision=10, scale=2), nullable=True),
+        sa.Column("payment_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("payment_reference", sa.String(length=255), nullable=True),
+        sa.Column("payment_proof_url", sa.String(length=500), nullable=True),
+        sa.Column("status", PROMOTIONSTATUS, nullable=False),
+        sa.Column("promoted_by", sa.Integer(), nullable=True),
+        sa.Column("promoted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("rejection_reason", sa.Text(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["promoted_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_year_promotions_college_id", "year_promotions", ["college_id"], unique=False)
+    op.create_index("ix_year_promotions_id", "year_promotions", ["id"], unique=False)
+    op.create_index("ix_year_promotions_status", "year_promotions", ["status"], unique=False)
+    op.create_index("ix_year_promotions_user_id", "year_promotions", ["user_id"], unique=False)
+    op.create_table("academic_year_migrations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("from_academic_year_id", sa.Integer(), nullable=True),
+        sa.Column("to_academic_year_id", sa.Integer(), nullable=True),
+        sa.Column("college_id", sa.Integer(), nullable=False),
+        sa.Column("migration_type", sa.String(length=20), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("students_promoted", sa.Integer(), nullable=True),
+        sa.Column("sections_archived", sa.Integer(), nullable=True),
+        sa.Column("subjects_archived", sa.Integer(), nullable=True),
+        sa.Column("assignments_cleared", sa.Integer(), nullable=True),
+        sa.Column("initiated_by", sa.Integer(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("can_rollback", sa.Boolean(), nullable=True),
+        sa.Column("rollback_data", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["from_academic_year_id"], ["academic_years.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["initiated_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["to_academic_year_id"], ["academic_years.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_academic_year_migrations_college_id", "academic_year_migrations", ["college_id"], unique=False)
+    op.create_index("ix_academic_year_migrations_from_academic_year_id", "academic_year_migrations", ["from_academic_year_id"], unique=False)
+    op.create_index("ix_academic_year_migrations_id", "academic_year_migrations", ["id"], unique=False)
+    op.create_index("ix_academic_year_migrations_status", "academic_year_migrations", ["status"], unique=False)
+    op.create_index("ix_academic_year_migrations_to_academic_year_id", "academic_year_migrations", ["to_academic_year_id"], unique=False)
+    op.create_table("job_applications",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("current_round", sa.String(length=100), nullable=True),
+        sa.Column("applied_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_job_applications_id", "job_applications", ["id"], unique=False)
+    op.create_index("ix_job_applications_job_id", "job_applications", ["job_id"], unique=False)
+    op.create_index("ix_job_applications_user_id", "job_applications", ["user_id"], unique=False)
+    op.create_table("job_ranking_runs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("processed", sa.Integer(), nullable=False),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("started_by", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["started_by"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_job_ranking_runs_id", "job_ranking_runs", ["id"], unique=False)
+    op.create_index("ix_job_ranking_runs_job_id", "job_ranking_runs", ["job_id"], unique=False)
+    op.create_table("job_rounds",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("order", sa.Integer(), nullable=False),
+        sa.Column("description", sa.String(length=500), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_job_rounds_id", "job_rounds", ["id"], unique=False)
+    op.create_index("ix_job_rounds_job_id", "job_rounds", ["job_id"], unique=False)
+    op.create_table("mock_interview_students",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("interview_id", sa.Integer(), nullable=False),
+        sa.Column("student_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["interview_id"], ["mock_interviews.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["student_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_mock_interview_students_id", "mock_interview_students", ["id"], unique=False)
+    op.create_index("ix_mock_interview_students_interview_id", "mock_interview_students", ["interview_id"], unique=False)
+    op.create_index("ix_mock_interview_students_student_id", "mock_interview_students", ["student_id"], unique=False)
+    op.create_table("practice_sections",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("role_id", sa.Integer(), nullable=False),
+        sa.Column("section_name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["role_id"], ["company_roles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_practice_sections_id", "practice_sections", ["id"], unique=False)
+    op.create_index("ix_practice_sections_role_id", "practice_sections", ["role_id"], unique=False)
+    op.create_table("question_banks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("question_text", sa.Text(), nullable=False),
+        sa.Column("question_type", sa.String(length=20), nullable=False),
+        sa.Column("options", sa.JSON(), nullable=True),
+        sa.Column("correct_answer", sa.String(length=10), nullable=False),
+        sa.Column("marks", sa.Integer(), nullable=False),
+        sa.Column("difficulty", sa.String(length=20), nullable=True),
+        sa.Column("topic", sa.String(length=100), nullable=True),
+        sa.Column("subject", sa.String(length=100), nullable=True),
+        sa.Column("negative_marking", sa.Float(), nullable=False),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("department_id", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["department_id"], ["departments.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_question_banks_college_id", "question_banks", ["college_id"], unique=False)
+    op.create_index("ix_question_banks_department_id", "question_banks", ["department_id"], unique=False)
+    op.create_index("ix_question_banks_id", "question_banks", ["id"], unique=False)
+    op.create_table("semesters",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("number", sa.Integer(), nullable=False),
+        sa.Column("college_id", sa.Integer(), nullable=False),
+        sa.Column("academic_year_id", sa.Integer(), nullable=True),
+        sa.Column("start_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("end_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["academic_year_id"], ["academic_years.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_semesters_college_id", "semesters", ["college_id"], unique=False)
+    op.create_index("ix_semesters_id", "semesters", ["id"], unique=False)
+    op.create_table("user_announcements",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("announcement_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("seen_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["announcement_id"], ["announcements.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True
+    )
+    op.create_index("ix_user_announcements_announcement_id", "user_announcements", ["announcement_id"], unique=False)
+    op.create_index("ix_user_announcements_id", "user_announcements", ["id"], unique=False)
+    op.create_index("ix_user_announcements_user_id", "user_announcements", ["user_id"], unique=False)
+    op.create_table("user_notifications",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("notification_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("is_read", sa.Boolean(), nullable=True),
+        sa.Column("read_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["notification_id"], ["notifications.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True
+    )
+    op.create_index("ix_user_notifications_id", "user_notifications", ["id"], unique=False)
+    op.create_index("ix_user_notifications_is_read", "user_notifications", ["is_read"], unique=False)
+    op.create_index("ix_user_notifications_notification_id", "user_notifications", ["notification_id"], unique=False)
+    op.create_index("ix_user_notifications_user_id", "user_notifications", ["user_id"], unique=False)
+    op.create_table("job_applicant_scores",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_id", sa.Integer(), nullable=False),
+        sa.Column("job_application_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("run_id", sa.Integer(), nullable=True),
+        sa.Column("score", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("breakdown", sa.JSON(), nullable=True),
+        sa.Column("missing_keywords", sa.JSON(), nullable=True),
+        sa.Column("has_resume", sa.Boolean(), nullable=False),
+        sa.Column("scored_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["job_application_id"], ["job_applications.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["job_id"], ["jobs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["run_id"], ["job_ranking_runs.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("job_application_id")
+    )
+    op.create_index("idx_job_applicant_scores_job_rank", "job_applicant_scores", ["job_id", "rank"], unique=False)
+    op.create_index("ix_job_applicant_scores_id", "job_applicant_scores", ["id"], unique=False)
+    op.create_index("ix_job_applicant_scores_job_id", "job_applicant_scores", ["job_id"], unique=False)
+    op.create_index("ix_job_applicant_scores_user_id", "job_applicant_scores", ["user_id"], unique=False)
+    op.create_table("job_application_rounds",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("job_application_id", sa.Integer(), nullable=False),
+        sa.Column("round_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("remarks", sa.String(length=1000), nullable=True),
+        sa.Column("updated_by", sa.Integer(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["job_application_id"], ["job_applications.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["round_id"], ["job_rounds.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["updated_by"], ["users.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_job_application_rounds_id", "job_application_rounds", ["id"], unique=False)
+    op.create_index("ix_job_application_rounds_job_application_id", "job_application_rounds", ["job_application_id"], unique=False)
+    op.create_index("ix_job_application_rounds_round_id", "job_application_rounds", ["round_id"], unique=False)
+    op.create_table("sections",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=50), nullable=False),
+        sa.Column("college_id", sa.Integer(), nullable=False),
+        sa.Column("department_id", sa.Integer(), nullable=False),
+        sa.Column("semester_id", sa.Integer(), nullable=True),
+        sa.Column("year", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["department_id"], ["departments.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["semester_id"], ["semesters.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_sections_college_id", "sections", ["college_id"], unique=False)
+    op.create_index("ix_sections_department_id", "sections", ["department_id"], unique=False)
+    op.create_index("ix_sections_id", "sections", ["id"], unique=False)
+    op.create_index("ix_sections_semester_id", "sections", ["semester_id"], unique=False)
+    op.create_table("subjects",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("code", sa.String(length=20), nullable=True),
+        sa.Column("college_id", sa.Integer(), nullable=False),
+        sa.Column("department_id", sa.Integer(), nullable=True),
+        sa.Column("semester_id", sa.Integer(), nullable=True),
+        sa.Column("year", sa.String(length=20), nullable=True),
+        sa.Column("credits", sa.Integer(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["department_id"], ["departments.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["semester_id"], ["semesters.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_subjects_college_id", "subjects", ["college_id"], unique=False)
+    op.create_index("ix_subjects_department_id", "subjects", ["department_id"], unique=False)
+    op.create_index("ix_subjects_id", "subjects", ["id"], unique=False)
+    op.create_index("ix_subjects_semester_id", "subjects", ["semester_id"], unique=False)
+    op.create_table("archived_faculty_section_assignments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("original_id", sa.Integer(), nullable=False),
+        sa.Column("faculty_id", sa.Integer(), nullable=True),
+        sa.Column("section_id", sa.Integer(), nullable=True),
+        sa.Column("assigned_by", sa.Integer(), nullable=True),
+        sa.Column("academic_year_id", sa.Integer(), nullable=True),
+        sa.Column("migration_id", sa.Integer(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["academic_year_id"], ["academic_years.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["assigned_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["faculty_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["migration_id"], ["academic_year_migrations.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["section_id"], ["sections.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_archived_faculty_section_assignments_academic_year_id", "archived_faculty_section_assignments", ["academic_year_id"], unique=False)
+    op.create_index("ix_archived_faculty_section_assignments_faculty_id", "archived_faculty_section_assignments", ["faculty_id"], unique=False)
+    op.create_index("ix_archived_faculty_section_assignments_id", "archived_faculty_section_assignments", ["id"], unique=False)
+    op.create_index("ix_archived_faculty_section_assignments_migration_id", "archived_faculty_section_assignments", ["migration_id"], unique=False)
+    op.create_index("ix_archived_faculty_section_assignments_section_id", "archived_faculty_section_assignments", ["section_id"], unique=False)
+    op.create_table("archived_subject_assignments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("original_id", sa.Integer(), nullable=False),
+        sa.Column("faculty_id", sa.Integer(), nullable=True),
+        sa.Column("subject_id", sa.Integer(), nullable=True),
+        sa.Column("semester_id", sa.Integer(), nullable=True),
+        sa.Column("section", sa.String(length=50), nullable=True),
+        sa.Column("section_id", sa.Integer(), nullable=True),
+        sa.Column("assigned_by", sa.Integer(), nullable=True),
+        sa.Column("academic_year_id", sa.Integer(), nullable=True),
+        sa.Column("migration_id", sa.Integer(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["academic_year_id"], ["academic_years.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["assigned_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["faculty_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["migration_id"], ["academic_year_migrations.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["section_id"], ["sections.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["semester_id"], ["semesters.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["subject_id"], ["subjects.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_archived_subject_assignments_academic_year_id", "archived_subject_assignments", ["academic_year_id"], unique=False)
+    op.create_index("ix_archived_subject_assignments_faculty_id", "archived_subject_assignments", ["faculty_id"], unique=False)
+    op.create_index("ix_archived_subject_assignments_id", "archived_subject_assignments", ["id"], unique=False)
+    op.create_index("ix_archived_subject_assignments_migration_id", "archived_subject_assignments", ["migration_id"], unique=False)
+    op.create_index("ix_archived_subject_assignments_section_id", "archived_subject_assignments", ["section_id"], unique=False)
+    op.create_index("ix_archived_subject_assignments_semester_id", "archived_subject_assignments", ["semester_id"], unique=False)
+    op.create_index("ix_archived_subject_assignments_subject_id", "archived_subject_assignments", ["subject_id"], unique=False)
+    op.create_table("attendance",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("student_id", sa.Integer(), nullable=False),
+        sa.Column("subject_id", sa.Integer(), nullable=True),
+        sa.Column("subject", sa.String(length=100), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("semester_id", sa.Integer(), nullable=True),
+        sa.Column("period_number", sa.Integer(), nullable=True),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("section", sa.String(length=100), nullable=True),
+        sa.Column("section_id", sa.Integer(), nullable=True),
+        sa.Column("department_id", sa.Integer(), nullable=True),
+        sa.Column("marked_by", sa.Integer(), nullable=True),
+        sa.Column("approval_status", sa.String(length=20), nullable=False),
+        sa.Column("approved_by", sa.Integer(), nullable=True),
+        sa.Column("approval_notes", sa.Text(), nullable=True),
+        sa.Column("approval_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["approved_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["department_id"], ["departments.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["marked_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["section_id"], ["sections.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["semester_id"], ["semesters.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["student_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["subject_id"], ["subjects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_attendance_approved_by", "attendance", ["approved_by"], unique=False)
+    op.create_index("ix_attendance_college_id", "attendance", ["college_id"], unique=False)
+    op.create_index("ix_attendance_department_id", "attendance", ["department_id"], unique=False)
+    op.create_index("ix_attendance_id", "attendance", ["id"], unique=False)
+    op.create_index("ix_attendance_marked_by", "attendance", ["marked_by"], unique=False)
+    op.create_index("ix_attendance_section_id", "attendance", ["section_id"], unique=False)
+    op.create_index("ix_attendance_semester_id", "attendance", ["semester_id"], unique=False)
+    op.create_index("ix_attendance_student_id", "attendance", ["student_id"], unique=False)
+    op.create_index("ix_attendance_subject_id", "attendance", ["subject_id"], unique=False)
+    op.create_table("coding_labs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("instructions", sa.Text(), nullable=True),
+        sa.Column("mode", LABMODE, nullable=False),
+        sa.Column("difficulty", LABDIFFICULTY, nullable=False),
+        sa.Column("topic", sa.String(length=100), nullable=True),
+        sa.Column("created_by", sa.Integer(), nullable=False),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("subject_id", sa.Integer(), nullable=True),
+        sa.Column("department_id", sa.Integer(), nullable=True),
+        sa.Column("section_id", sa.Integer(), nullable=True),
+        sa.Column("semester_id", sa.Integer(), nullable=True),
+        sa.Column("department", sa.String(length=100), nullable=True),
+        sa.Column("section", sa.String(length=100), nullable=True),
+        sa.Column("semester", sa.String(length=50), nullable=True),
+        sa.Column("batch", sa.String(length=50), nullable=True),
+        sa.Column("academic_year_id", sa.Integer(), nullable=True),
+        sa.Column("year", sa.String(length=20), nullable=True),
+        sa.Column("allowed_languages", sa.JSON(), nullable=False),
+        sa.Column("version", sa.String(length=20), nullable=False),
+        sa.Column("parent_lab_id", sa.Integer(), nullable=True),
+        sa.Column("is_clone", sa.Boolean(), nullable=False),
+        sa.Column("is_published", sa.Boolean(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("allow_hints", sa.Boolean(), nullable=False),
+        sa.Column("allow_multiple_attempts", sa.Boolean(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=True),
+        sa.Column("requires_approval", sa.Boolean(), nullable=False),
+        sa.Column("is_approved", sa.Boolean(), nullable=False),
+        sa.Column("is_proctored", sa.Boolean(), nullable=False),
+        sa.Column("enforce_fullscreen", sa.Boolean(), nullable=False),
+        sa.Column("detect_tab_switch", sa.Boolean(), nullable=False),
+        sa.Column("camera_proctoring", sa.Boolean(), nullable=False),
+        sa.Column("time_limit_minutes", sa.Integer(), nullable=True),
+        sa.Column("total_points", sa.Float(), nullable=False),
+        sa.Column("passing_score", sa.Float(), nullable=False),
+        sa.Column("start_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("end_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["academic_year_id"], ["academic_years.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["department_id"], ["departments.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["parent_lab_id"], ["coding_labs.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["section_id"], ["sections.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["semester_id"], ["semesters.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["subject_id"], ["subjects.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_coding_labs_academic_year_id", "coding_labs", ["academic_year_id"], unique=False)
+    op.create_index("ix_coding_labs_batch", "coding_labs", ["batch"], unique=False)
+    op.create_index("ix_coding_labs_college_id", "coding_labs", ["college_id"], unique=False)
+    op.create_index("ix_coding_labs_created_by", "coding_labs", ["created_by"], unique=False)
+    op.create_index("ix_coding_labs_department", "coding_labs", ["department"], unique=False)
+    op.create_index("ix_coding_labs_department_id", "coding_labs", ["department_id"], unique=False)
+    op.create_index("ix_coding_labs_id", "coding_labs", ["id"], unique=False)
+    op.create_index("ix_coding_labs_section", "coding_labs", ["section"], unique=False)
+    op.create_index("ix_coding_labs_section_id", "coding_labs", ["section_id"], unique=False)
+    op.create_index("ix_coding_labs_semester", "coding_labs", ["semester"], unique=False)
+    op.create_index("ix_coding_labs_semester_id", "coding_labs", ["semester_id"], unique=False)
+    op.create_index("ix_coding_labs_subject_id", "coding_labs", ["subject_id"], unique=False)
+    op.create_index("ix_coding_labs_title", "coding_labs", ["title"], unique=False)
+    op.create_index("ix_coding_labs_topic", "coding_labs", ["topic"], unique=False)
+    op.create_index("ix_coding_labs_year", "coding_labs", ["year"], unique=False)
+    op.create_table("coding_problems",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("input_format", sa.Text(), nullable=True),
+        sa.Column("output_format", sa.Text(), nullable=True),
+        sa.Column("constraints", sa.Text(), nullable=True),
+        sa.Column("sample_input", sa.Text(), nullable=True),
+        sa.Column("sample_output", sa.Text(), nullable=True),
+        sa.Column("difficulty", sa.String(length=20), nullable=True),
+        sa.Column("tags", sa.JSON(), nullable=True),
+        sa.Column("year", sa.Integer(), nullable=True),
+        sa.Column("year_str", sa.String(length=20), nullable=True),
+        sa.Column("allowed_languages", sa.JSON(), nullable=False),
+        sa.Column("restricted_languages", sa.JSON(), nullable=True),
+        sa.Column("recommended_languages", sa.JSON(), nullable=True),
+        sa.Column("starter_code_python", sa.Text(), nullable=True),
+        sa.Column("starter_code_c", sa.Text(), nullable=True),
+        sa.Column("starter_code_cpp", sa.Text(), nullable=True),
+        sa.Column("starter_code_java", sa.Text(), nullable=True),
+        sa.Column("starter_code_javascript", sa.Text(), nullable=True),
+        sa.Column("time_limit", sa.Integer(), nullable=False),
+        sa.Column("memory_limit", sa.Integer(), nullable=False),
+        sa.Column("test_cases", sa.JSON(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("expiry_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("scope_type", sa.String(length=20), nullable=False),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("department", sa.String(length=100), nullable=True),
+        sa.Column("section_id", sa.Integer(), nullable=True),
+        sa.Column("problem_code", sa.String(length=100), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["section_id"], ["sections.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_coding_problems_college_id", "coding_problems", ["college_id"], unique=False)
+    op.create_index("ix_coding_problems_id", "coding_problems", ["id"], unique=False)
+    op.create_index("ix_coding_problems_problem_code", "coding_problems", ["problem_code"], unique=True)
+    op.create_index("ix_coding_problems_section_id", "coding_problems", ["section_id"], unique=False)
+    op.create_index("ix_coding_problems_year", "coding_problems", ["year"], unique=False)
+    op.create_table("faculty_section_assignments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("faculty_id", sa.Integer(), nullable=False),
+        sa.Column("section_id", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("assigned_by", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["assigned_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["faculty_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["section_id"], ["sections.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("faculty_id", "section_id", name="unique_faculty_section")
+    )
+    op.create_index("ix_faculty_section_assignments_faculty_id", "faculty_section_assignments", ["faculty_id"], unique=False)
+    op.create_index("ix_faculty_section_assignments_id", "faculty_section_assignments", ["id"], unique=False)
+    op.create_index("ix_faculty_section_assignments_section_id", "faculty_section_assignments", ["section_id"], unique=False)
+    op.create_table("profiles",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("email", sa.String(length=255), nullable=True),
+        sa.Column("full_name", sa.String(length=255), nullable=True),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("institution_id", sa.Integer(), nullable=True),
+        sa.Column("department", sa.String(length=100), nullable=True),
+        sa.Column("department_id", sa.Integer(), nullable=True),
+        sa.Column("section", sa.String(length=100), nullable=True),
+        sa.Column("section_id", sa.Integer(), nullable=True),
+        sa.Column("roll_number", sa.String(length=50), nullable=True),
+        sa.Column("staff_id", sa.String(length=50), nullable=True),
+        sa.Column("present_year", sa.String(length=20), nullable=True),
+        sa.Column("handled_years", sa.String(length=255), nullable=True),
+        sa.Column("handled_sections", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["department_id"], ["departments.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["institution_id"], ["institutions.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["section_id"], ["sections.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_profiles_college_id", "profiles", ["college_id"], unique=False)
+    op.create_index("ix_profiles_department_id", "profiles", ["department_id"], unique=False)
+    op.create_index("ix_profiles_id", "profiles", ["id"], unique=False)
+    op.create_index("ix_profiles_institution_id", "profiles", ["institution_id"], unique=False)
+    op.create_index("ix_profiles_section_id", "profiles", ["section_id"], unique=False)
+    op.create_index("ix_profiles_staff_id", "profiles", ["staff_id"], unique=False)
+    op.create_index("ix_profiles_user_id", "profiles", ["user_id"], unique=True)
+    op.create_table("quizzes",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("subject", sa.String(length=100), nullable=True),
+        sa.Column("duration_minutes", sa.Integer(), nullable=False),
+        sa.Column("total_marks", sa.Integer(), nullable=False),
+        sa.Column("questions", sa.JSON(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("start_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("end_time", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("expiry_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("scope_type", sa.String(length=20), nullable=False),
+        sa.Column("college_id", sa.Integer(), nullable=True),
+        sa.Column("department", sa.String(length=100), nullable=True),
+        sa.Column("section_id", sa.Integer(), nullable=True),
+        sa.Column("year", sa.String(length=20), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("question_timers", sa.JSON(), nullable=True),
+        sa.Column("assigned_branches", sa.JSON(), nullable=True),
+        sa.Column("assigned_sections", sa.JSON(), nullable=True),
+        sa.Column("allow_negative_marking", sa.Boolean(), nullable=False),
+        sa.Column("shuffle_questions", sa.Boolean(), nullable=False),
+        sa.Column("shuffle_options", sa.Boolean(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("passing_marks", sa.Integer(), nullable=True),
+        sa.Column("question_bank_ids", sa.JSON(), nullable=True),
+        sa.Column("use_random_questions", sa.Boolean(), nullable=False),
+        sa.Column("random_question_count", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["college_id"], ["colleges.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["section_id"], ["sections.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_quizzes_college_id", "quizzes", ["college_id"], unique=False)
+    op.create_index("ix_quizzes_id", "quizzes", ["id"], unique=False)
+    op.create_index("ix_quizzes_section_id", "quizzes", ["section_id"], unique=False)
+    op.create_table("subject_assignments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("faculty_id", sa.Integer(), nullable=False),
+        sa.Column("subject_id", sa.Integer(), nullable=False),
+        sa.Column("semester_id", sa.Integer(), nullable=True),
+        sa.Column("section", sa.String(length=50), nullable=True),
+        sa.Column("section_id", sa.Integer(), nullable=True),
+        sa.Column("year", sa.String(length=20), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("assigned_by", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["assigned_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["faculty_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["section_id"], ["sections.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["semester_id"], ["semesters.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["subject_id"], ["subjects.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("faculty_id", "subject_id", "semester_id", "section", "section_id", name="unique_faculty_subject_semester_section")
+    )
+    op.create_index("ix_subject_assignments_faculty_id", "subject_assignments", ["faculty_id"], unique=False)
+    op.create_index("ix_subject_assignments_id", "subject_assignments", ["id"], unique=False)
+    op.create_index("ix_subject_assignments_section_id", "subject_assignments", ["section_id"], unique=False)
+    op.create_index("ix_subject_assignments_semester_id", "subject_assignments", ["semester_id"], unique=False)
+    op.create_index("ix_subject_assignments_subject_id", "subject_assignments", ["subject_id"], unique=False)
+    op.create_table("coding_activity",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("problem_id", sa.Integer(), nullable=False),
+        sa.Column("problem_code", sa.String(length=100), nullable=True),
+        sa.Column("time_spent_seconds", sa.Integer(), nullable=False),
+        sa.Column("session_time_seconds", sa.Integer(), nullable=False),
+        sa.Column("action", sa.String(length=50), nullable=False),
+        sa.Column("is_final", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(["problem_id"], ["coding_problems.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True
+    )
+    op.create_index("ix_coding_activity_created_at", "coding_activity", ["created_at"], unique=False)
+    op.create_index("ix_coding_activity_id", "coding_activity", ["id"], unique=False)
+    op.create_index("ix_coding_activity_problem_code", "coding_activity", ["problem_code"], unique=False)
+    op.create_index("ix_coding_activity_problem_id", "coding_activity", ["problem_id"], unique=False)
+    op.create_index("ix_coding_activity_user_id", "coding_activity", ["user_id"], unique=False)
+    op.create_table("coding_submissions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("problem_id", sa.Integer(), nullable=False),
+        sa.Column("language", sa.String(length=20), nullable=False),
+        sa.Column("code", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("passed_tests", sa.Integer(), nullable=False),
+        sa.Column("total_tests", sa.Integer(), nullable=False),
+        sa.Column("execution_time", sa.Float(), nullable=True),
+        sa.Column("memory_used", sa.Float(), nullable=True),
+        sa.Column("test_results", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["problem_id"], ["coding_problems.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True
+    )
+    op.create_index("ix_coding_submissions_id", "coding_submissions", ["id"], unique=False)
+    op.create_index("ix_coding_submissions_problem_id", "coding_submissions", ["problem_id"], unique=False)
+    op.create_index("ix_coding_submissions_user_id", "coding_submissions", ["user_id"], unique=False)
+    op.create_table("lab_analytics",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lab_id", sa.Integer(), nullable=False),
+        sa.Column("total_students", sa.Integer(), nullable=False),
+        sa.Column("students_attempted", sa.Integer(), nullable=False),
+        sa.Column("students_completed", sa.Integer(), nullable=False),
+        sa.Column("students_passed", sa.Integer(), nullable=False),
+        sa.Column("total_submissions", sa.Integer(), nullable=False),
+        sa.Column("average_attempts", sa.Float(), nullable=False),
+        sa.Column("average_score", sa.Float(), nullable=False),
+        sa.Column("average_time_spent_minutes", sa.Float(), nullable=False),
+        sa.Column("score_distribution", sa.JSON(), nullable=True),
+        sa.Column("problem_stats", sa.JSON(), nullable=True),
+        sa.Column("difficulty_heatmap", sa.JSON(), nullable=True),
+        sa.Column("last_calculated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["lab_id"], ["coding_labs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_lab_analytics_id", "lab_analytics", ["id"], unique=False)
+    op.create_index("ix_lab_analytics_lab_id", "lab_analytics", ["lab_id"], unique=True)
+    op.create_table("lab_attendance",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lab_id", sa.Integer(), nullable=False),
+        sa.Column("faculty_id", sa.Integer(), nullable=False),
+        sa.Column("student_id", sa.Integer(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("session_number", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["faculty_id"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["lab_id"], ["coding_labs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["student_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("lab_id", "student_id", "date", name="unique_lab_student_date")
+    )
+    op.create_index("ix_lab_attendance_date", "lab_attendance", ["date"], unique=False)
+    op.create_index("ix_lab_attendance_faculty_id", "lab_attendance", ["faculty_id"], unique=False)
+    op.create_index("ix_lab_attendance_id", "lab_attendance", ["id"], unique=False)
+    op.create_index("ix_lab_attendance_lab_id", "lab_attendance", ["lab_id"], unique=False)
+    op.create_index("ix_lab_attendance_student_id", "lab_attendance", ["student_id"], unique=False)
+    op.create_table("lab_faculty_assignments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lab_id", sa.Integer(), nullable=False),
+        sa.Column("faculty_id", sa.Integer(), nullable=False),
+        sa.Column("assigned_by", sa.Integer(), nullable=True),
+        sa.Column("assigned_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("can_add_problems", sa.Boolean(), nullable=False),
+        sa.Column("can_add_sessions", sa.Boolean(), nullable=False),
+        sa.Column("can_monitor", sa.Boolean(), nullable=False),
+        sa.Column("can_grade", sa.Boolean(), nullable=False),
+        sa.ForeignKeyConstraint(["assigned_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["faculty_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["lab_id"], ["coding_labs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_lab_faculty_assignments_faculty_id", "lab_faculty_assignments", ["faculty_id"], unique=False)
+    op.create_index("ix_lab_faculty_assignments_id", "lab_faculty_assignments", ["id"], unique=False)
+    op.create_index("ix_lab_faculty_assignments_lab_id", "lab_faculty_assignments", ["lab_id"], unique=False)
+    op.create_table("lab_leaderboard",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lab_id", sa.Integer(), nullable=False),
+        sa.Column("rankings", sa.JSON(), nullable=False),
+        sa.Column("total_participants", sa.Integer(), nullable=False),
+        sa.Column("average_score", sa.Float(), nullable=False),
+        sa.Column("top_score", sa.Float(), nullable=False),
+        sa.Column("last_updated", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["lab_id"], ["coding_labs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_lab_leaderboard_id", "lab_leaderboard", ["id"], unique=False)
+    op.create_index("ix_lab_leaderboard_lab_id", "lab_leaderboard", ["lab_id"], unique=False)
+    op.create_table("lab_sessions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lab_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("instructions", sa.Text(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("allow_hints", sa.Boolean(), nullable=False),
+        sa.Column("time_limit_minutes", sa.Integer(), nullable=True),
+        sa.Column("total_points", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["lab_id"], ["coding_labs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_lab_sessions_id", "lab_sessions", ["id"], unique=False)
+    op.create_index("ix_lab_sessions_lab_id", "lab_sessions", ["lab_id"], unique=False)
+    op.create_table("lab_sessions_enhanced",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lab_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("instructions", sa.Text(), nullable=True),
+        sa.Column("session_date", sa.Date(), nullable=False),
+        sa.Column("session_time", sa.Time(), nullable=True),
+        sa.Column("duration_minutes", sa.Integer(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_completed", sa.Boolean(), nullable=False),
+        sa.Column("mode", LABMODE, nullable=False),
+        sa.Column("allow_hints", sa.Boolean(), nullable=False),
+        sa.Column("allow_multiple_attempts", sa.Boolean(), nullable=False),
+        sa.Column("max_attempts", sa.Integer(), nullable=True),
+        sa.Column("time_limit_minutes", sa.Integer(), nullable=True),
+        sa.Column("is_proctored", sa.Boolean(), nullable=False),
+        sa.Column("enforce_fullscreen", sa.Boolean(), nullable=False),
+        sa.Column("detect_tab_switch", sa.Boolean(), nullable=False),
+        sa.Column("camera_proctoring", sa.Boolean(), nullable=False),
+        sa.Column("total_points", sa.Float(), nullable=False),
+        sa.Column("passing_score", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["lab_id"], ["coding_labs.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_lab_sessions_enhanced_id", "lab_sessions_enhanced", ["id"], unique=False)
+    op.create_index("ix_lab_sessions_enhanced_lab_id", "lab_sessions_enhanced", ["lab_id"], unique=False)
+    op.create_index("ix_lab_sessions_enhanced_session_date", "lab_sessions_enhanced", ["session_date"], unique=False)
+    op.create_table("lab_student_assignments",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lab_id", sa.Integer(), nullable=False),
+        sa.Column("student_id", sa.Integer(), nullable=False),
+        sa.Column("assigned_by", sa.Integer(), nullable=True),
+        sa.Column("assigned_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("enrollment_date", sa.Date(), nullable=True),
+        sa.Column("completion_deadline", sa.Date(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["assigned_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["lab_id"], ["coding_labs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["student_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_lab_student_assignments_id", "lab_student_assignments", ["id"], unique=False)
+    op.create_index("ix_lab_student_assignments_lab_id", "lab_student_assignments", ["lab_id"], unique=False)
+    op.create_index("ix_lab_student_assignments_student_id", "lab_student_assignments", ["student_id"], unique=False)
+    op.create_table("quiz_attempts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("quiz_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("submitted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("auto_submitted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("is_submitted", sa.Boolean(), nullable=False),
+        sa.Column("is_auto_submitted", sa.Boolean(), nullable=False),
+        sa.Column("is_graded", sa.Boolean(), nullable=False),
+        sa.Column("total_score", sa.Float(), nullable=False),
+        sa.Column("max_score", sa.Float(), nullable=True),
+        sa.Column("percentage", sa.Float(), nullable=False),
+        sa.Column("answers", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("graded_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quizzes.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_quiz_attempts_id", "quiz_attempts", ["id"], unique=False)
+    op.create_index("ix_quiz_attempts_quiz_id", "quiz_attempts", ["quiz_id"], unique=False)
+    op.create_index("ix_quiz_attempts_user_id", "quiz_attempts", ["user_id"], unique=False)
+    op.create_table("rounds",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("practice_section_id", sa.Integer(), nullable=False),
+        sa.Column("round_type", ROUNDTYPE, nullable=False),
+        sa.Column("round_name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("quiz_id", sa.Integer(), nullable=True),
+        sa.Column("coding_problem_id", sa.Integer(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["coding_problem_id"], ["coding_problems.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["practice_section_id"], ["practice_sections.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["quiz_id"], ["quizzes.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_rounds_coding_problem_id", "rounds", ["coding_problem_id"], unique=False)
+    op.create_index("ix_rounds_id", "rounds", ["id"], unique=False)
+    op.create_index("ix_rounds_practice_section_id", "rounds", ["practice_section_id"], unique=False)
+    op.create_index("ix_rounds_quiz_id", "rounds", ["quiz_id"], unique=False)
+    op.create_index("ix_rounds_round_type", "rounds", ["round_type"], unique=False)
+    op.create_table("user_saved_code",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("problem_id", sa.Integer(), nullable=False),
+        sa.Column("language", sa.String(length=20), nullable=False),
+        sa.Column("code", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["problem_id"], ["coding_problems.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sqlite_autoincrement=True
+    )
+    op.create_index("ix_user_saved_code_id", "user_saved_code", ["id"], unique=False)
+    op.create_index("ix_user_saved_code_problem_id", "user_saved_code", ["problem_id"], unique=False)
+    op.create_index("ix_user_saved_code_user_id", "user_saved_code", ["user_id"], unique=False)
+    op.create_table("lab_problems",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lab_id", sa.Integer(), nullable=False),
+        sa.Column("session_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=False),
+        sa.Column("problem_statement", sa.Text(), nullable=False),
+        sa.Column("starter_code", sa.Text(), nullable=True),
+        sa.Column("solution_code", sa.Text(), nullable=True),
+        sa.Column("allowed_languages", sa.JSON(), nullable=False),
+        sa.Column("default_language", sa.String(length=20), nullable=False),
+        sa.Column("time_limit_seconds", sa.Integer(), nullable=False),
+        sa.Column("memory_limit_mb", sa.Integer(), nullable=False),
+        sa.Column("hints", sa.JSON(), nullable=True),
+        sa.Column("explanation", sa.Text(), nullable=True),
+        sa.Column("points", sa.Float(), nullable=False),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("is_approved", sa.Boolean(), nullable=False),
+        sa.Column("approved_by", sa.Integer(), nullable=True),
+        sa.Column("approved_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("rejection_reason", sa.Text(), nullable=True),
+        sa.Column("problem_type", sa.String(length=50), nullable=False),
+        sa.Column("deadline", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["approved_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["lab_id"], ["coding_labs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["session_id"], ["lab_sessions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_lab_problems_created_by", "lab_problems", ["created_by"], unique=False)
+    op.create_index("ix_lab_problems_id", "lab_problems", ["id"], unique=False)
+    op.create_index("ix_lab_problems_lab_id", "lab_problems", ["lab_id"], unique=False)
+    op.create_index("ix_lab_problems_session_id", "lab_problems", ["session_id"], unique=False)
+    op.create_table("lab_tests",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lab_id", sa.Integer(), nullable=False),
+        sa.Column("session_id", sa.Integer(), nullable=True),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("test_type", TESTTYPE, nullable=False),
+        sa.Column("start_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("end_time", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("duration_minutes", sa.Integer(), nullable=True),
+        sa.Column("auto_lock", sa.Boolean(), nullable=False),
+        sa.Column("allow_backtracking", sa.Boolean(), nullable=False),
+        sa.Column("shuffle_questions", sa.Boolean(), nullable=False),
+        sa.Column("show_results_immediately", sa.Boolean(), nullable=False),
+        sa.Column("total_points", sa.Float(), nullable=False),
+        sa.Column("passing_score", sa.Float(), nullable=False),
+        sa.Column("is_proctored", sa.Boolean(), nullable=False),
+        sa.Column("require_fullscreen", sa.Boolean(), nullable=False),
+        sa.Column("detect_tab_switch", sa.Boolean(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("is_published", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["lab_id"], ["coding_labs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["session_id"], ["lab_sessions_enhanced.id"], ondelete="SET NULL"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_lab_tests_end_time", "lab_tests", ["end_time"], unique=False)
+    op.create_index("ix_lab_tests_id", "lab_tests", ["id"], unique=False)
+    op.create_index("ix_lab_tests_lab_id", "lab_tests", ["lab_id"], unique=False)
+    op.create_index("ix_lab_tests_session_id", "lab_tests", ["session_id"], unique=False)
+    op.create_index("ix_lab_tests_start_time", "lab_tests", ["start_time"], unique=False)
+    op.create_table("round_contents",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("round_id", sa.Integer(), nullable=False),
+        sa.Column("gd_topic", sa.String(length=500), nullable=True),
+        sa.Column("gd_description", sa.Text(), nullable=True),
+        sa.Column("key_points", sa.JSON(), nullable=True),
+        sa.Column("best_points", sa.JSON(), nullable=True),
+        sa.Column("dos_and_donts", sa.JSON(), nullable=True),
+        sa.Column("question", sa.Text(), nullable=True),
+        sa.Column("expected_answer", sa.Text(), nullable=True),
+        sa.Column("question_type", sa.String(length=50), nullable=True),
+        sa.Column("tips", sa.JSON(), nullable=True),
+        sa.Column("quiz_question", sa.Text(), nullable=True),
+        sa.Column("quiz_options", sa.JSON(), nullable=True),
+        sa.Column("correct_answer", sa.String(length=10), nullable=True),
+        sa.Column("quiz_question_type", sa.String(length=50), nullable=True),
+        sa.Column("quiz_timer_seconds", sa.Integer(), nullable=True),
+        sa.Column("quiz_marks", sa.Integer(), nullable=False),
+        sa.Column("quiz_option_a", sa.Text(), nullable=True),
+        sa.Column("quiz_option_b", sa.Text(), nullable=True),
+        sa.Column("quiz_option_c", sa.Text(), nullable=True),
+        sa.Column("quiz_option_d", sa.Text(), nullable=True),
+        sa.Column("quiz_correct_answer_text", sa.Text(), nullable=True),
+        sa.Column("quiz_is_true", sa.Boolean(), nullable=True),
+        sa.Column("coding_title", sa.String(length=255), nullable=True),
+        sa.Column("coding_description", sa.Text(), nullable=True),
+        sa.Column("coding_difficulty", sa.String(length=20), nullable=True),
+        sa.Column("coding_input_format", sa.Text(), nullable=True),
+        sa.Column("coding_output_format", sa.Text(), nullable=True),
+        sa.Column("coding_constraints", sa.Text(), nullable=True),
+        sa.Column("coding_sample_input", sa.Text(), nullable=True),
+        sa.Column("coding_sample_output", sa.Text(), nullable=True),
+        sa.Column("coding_test_cases", sa.JSON(), nullable=True),
+        sa.Column("coding_starter_code_python", sa.Text(), nullable=True),
+        sa.Column("coding_starter_code_c", sa.Text(), nullable=True),
+        sa.Column("coding_starter_code_cpp", sa.Text(), nullable=True),
+        sa.Column("coding_starter_code_java", sa.Text(), nullable=True),
+        sa.Column("coding_starter_code_javascript", sa.Text(), nullable=True),
+        sa.Column("coding_time_limit", sa.Integer(), nullable=True),
+        sa.Column("coding_memory_limit", sa.Integer(), nullable=True),
+        sa.Column("coding_exam_timer_enabled", sa.Boolean(), nullable=False),
+        sa.Column("coding_exam_duration_minutes", sa.Integer(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["round_id"], ["rounds.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_round_contents_id", "round_contents", ["id"], unique=False)
+    op.create_index("ix_round_contents_round_id", "round_contents", ["round_id"], unique=False)
+    op.create_table("session_materials",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("session_id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("material_type", MATERIALTYPE, nullable=False),
+        sa.Column("file_path", sa.String(length=500), nullable=True),
+        sa.Column("file_url", sa.String(length=1000), nullable=True),
+        sa.Column("file_size", sa.Integer(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+        sa.Column("is_required", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["session_id"], ["lab_sessions_enhanced.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_session_materials_id", "session_materials", ["id"], unique=False)
+    op.create_index("ix_session_materials_session_id", "session_materials", ["session_id"], unique=False)
+    op.create_table("student_lab_progress",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lab_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("sessions_completed", sa.Integer(), nullable=False),
+        sa.Column("sessions_total", sa.Integer(), nullable=False),
+        sa.Column("completion_percentage", sa.Float(), nullable=False),
+        sa.Column("total_exercises", sa.Integer(), nullable=False),
+        sa.Column("exercises_attempted", sa.Integer(), nullable=False),
+        sa.Column("exercises_completed", sa.Integer(), nullable=False),
+        sa.Column("exercises_passed", sa.Integer(), nullable=False),
+        sa.Column("tests_attempted", sa.Integer(), nullable=False),
+        sa.Column("tests_passed", sa.Integer(), nullable=False),
+        sa.Column("average_test_score", sa.Float(), nullable=False),
+        sa.Column("total_score", sa.Float(), nullable=False),
+        sa.Column("max_score", sa.Float(), nullable=False),
+        sa.Column("overall_percentage", sa.Float(), nullable=False),
+        sa.Column("total_time_spent_minutes", sa.Float(), nullable=False),
+        sa.Column("is_completed", sa.Boolean(), nullable=False),
+        sa.Column("current_session_id", sa.Integer(), nullable=True),
+        sa.Column("first_accessed_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("last_accessed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["current_session_id"], ["lab_sessions_enhanced.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["lab_id"], ["coding_labs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("idx_student_lab_progress_lab_rank", "student_lab_progress", ["lab_id", "overall_percentage"], unique=False)
+    op.create_index("ix_student_lab_progress_id", "student_lab_progress", ["id"], unique=False)
+    op.create_index("ix_student_lab_progress_lab_id", "student_lab_progress", ["lab_id"], unique=False)
+    op.create_index("ix_student_lab_progress_user_id", "student_lab_progress", ["user_id"], unique=False)
+    op.create_table("student_session_progress",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("session_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("materials_viewed", sa.JSON(), nullable=True),
+        sa.Column("materials_completed", sa.JSON(), nullable=True),
+        sa.Column("exercises_attempted", sa.Integer(), nullable=False),
+        sa.Column("exercises_completed", sa.Integer(), nullable=False),
+        sa.Column("exercises_passed", sa.Integer(), nullable=False),
+        sa.Column("total_score", sa.Float(), nullable=False),
+        sa.Column("max_score", sa.Float(), nullable=False),
+        sa.Column("time_spent_minutes", sa.Float(), nullable=False),
+        sa.Column("first_accessed_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("last_accessed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("is_completed", sa.Boolean(), nullable=False),
+        sa.Column("completion_percentage", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["session_id"], ["lab_sessions_enhanced.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_student_session_progress_id", "student_session_progress", ["id"], unique=False)
+    op.create_index("ix_student_session_progress_session_id", "student_session_progress", ["session_id"], unique=False)
+    op.create_index("ix_student_session_progress_user_id", "student_session_progress", ["user_id"], unique=False)
+    op.create_table("lab_submissions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lab_id", sa.Integer(), nullable=False),
+        sa.Column("problem_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("code", sa.Text(), nullable=False),
+        sa.Column("language", sa.String(length=20), nullable=False),
+        sa.Column("status", SUBMISSIONSTATUS, nullable=False),
+        sa.Column("score", sa.Float(), nullable=False),
+        sa.Column("max_score", sa.Float(), nullable=True),
+        sa.Column("execution_time_ms", sa.Integer(), nullable=True),
+        sa.Column("memory_used_mb", sa.Float(), nullable=True),
+        sa.Column("test_cases_passed", sa.Integer(), nullable=False),
+        sa.Column("test_cases_total", sa.Integer(), nullable=False),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("compile_output", sa.Text(), nullable=True),
+        sa.Column("runtime_output", sa.Text(), nullable=True),
+        sa.Column("is_proctored", sa.Boolean(), nullable=False),
+        sa.Column("tab_switches", sa.Integer(), nullable=False),
+        sa.Column("fullscreen_exits", sa.Integer(), nullable=False),
+        sa.Column("suspicious_activities", sa.JSON(), nullable=True),
+        sa.Column("attempt_number", sa.Integer(), nullable=False),
+        sa.Column("is_final_submission", sa.Boolean(), nullable=False),
+        sa.Column("submitted_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("evaluated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["lab_id"], ["coding_labs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["problem_id"], ["lab_problems.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_lab_submissions_id", "lab_submissions", ["id"], unique=False)
+    op.create_index("ix_lab_submissions_lab_id", "lab_submissions", ["lab_id"], unique=False)
+    op.create_index("ix_lab_submissions_problem_id", "lab_submissions", ["problem_id"], unique=False)
+    op.create_index("ix_lab_submissions_submitted_at", "lab_submissions", ["submitted_at"], unique=False)
+    op.create_index("ix_lab_submissions_user_id", "lab_submissions", ["user_id"], unique=False)
+    op.create_table("test_attempts",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("test_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("submitted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("auto_submitted_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("is_submitted", sa.Boolean(), nullable=False),
+        sa.Column("is_auto_submitted", sa.Boolean(), nullable=False),
+        sa.Column("is_graded", sa.Boolean(), nullable=False),
+        sa.Column("total_score", sa.Float(), nullable=False),
+        sa.Column("max_score", sa.Float(), nullable=True),
+        sa.Column("percentage", sa.Float(), nullable=False),
+        sa.Column("is_passed", sa.Boolean(), nullable=False),
+        sa.Column("tab_switches", sa.Integer(), nullable=False),
+        sa.Column("fullscreen_exits", sa.Integer(), nullable=False),
+        sa.Column("suspicious_activities", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("graded_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["test_id"], ["lab_tests.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_test_attempts_id", "test_attempts", ["id"], unique=False)
+    op.create_index("ix_test_attempts_test_id", "test_attempts", ["test_id"], unique=False)
+    op.create_index("ix_test_attempts_user_id", "test_attempts", ["user_id"], unique=False)
+    op.create_table("test_cases",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("problem_id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("type", TESTCASETYPE, nullable=False),
+        sa.Column("input_data", sa.Text(), nullable=False),
+        sa.Column("expected_output", sa.Text(), nullable=False),
+        sa.Column("is_sample", sa.Boolean(), nullable=False),
+        sa.Column("points", sa.Float(), nullable=False),
+        sa.Column("time_limit_seconds", sa.Integer(), nullable=True),
+        sa.Column("memory_limit_mb", sa.Integer(), nullable=True),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["problem_id"], ["lab_problems.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_test_cases_id", "test_cases", ["id"], unique=False)
+    op.create_index("ix_test_cases_problem_id", "test_cases", ["problem_id"], unique=False)
+    op.create_table("test_questions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("test_id", sa.Integer(), nullable=False),
+        sa.Column("question_type", QUESTIONTYPE, nullable=False),
+        sa.Column("question_text", sa.Text(), nullable=False),
+        sa.Column("question_image_url", sa.String(length=1000), nullable=True),
+        sa.Column("options", sa.JSON(), nullable=True),
+        sa.Column("correct_answer", sa.Text(), nullable=True),
+        sa.Column("problem_id", sa.Integer(), nullable=True),
+        sa.Column("points", sa.Float(), nullable=False),
+        sa.Column("negative_marking", sa.Float(), nullable=False),
+        sa.Column("order_index", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["problem_id"], ["lab_problems.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["test_id"], ["lab_tests.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_test_questions_id", "test_questions", ["id"], unique=False)
+    op.create_index("ix_test_questions_test_id", "test_questions", ["test_id"], unique=False)
+    op.create_table("code_playback",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("submission_id", sa.Integer(), nullable=False),
+        sa.Column("keystrokes", sa.JSON(), nullable=False),
+        sa.Column("code_snapshots", sa.JSON(), nullable=True),
+        sa.Column("time_intervals", sa.JSON(), nullable=True),
+        sa.Column("typing_speed_wpm", sa.Float(), nullable=True),
+        sa.Column("pause_duration_seconds", sa.Float(), nullable=True),
+        sa.Column("backspace_count", sa.Integer(), nullable=False),
+        sa.Column("copy_paste_detected", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["submission_id"], ["lab_submissions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_code_playback_id", "code_playback", ["id"], unique=False)
+    op.create_index("ix_code_playback_submission_id", "code_playback", ["submission_id"], unique=False)
+    op.create_table("execution_logs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("submission_id", sa.Integer(), nullable=True),
+        sa.Column("language", sa.String(length=20), nullable=False),
+        sa.Column("code_snippet", sa.Text(), nullable=True),
+        sa.Column("status", SUBMISSIONSTATUS, nullable=False),
+        sa.Column("execution_time_ms", sa.Integer(), nullable=True),
+        sa.Column("memory_used_mb", sa.Float(), nullable=True),
+        sa.Column("container_id", sa.String(length=255), nullable=True),
+        sa.Column("worker_id", sa.String(length=100), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("stack_trace", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["submission_id"], ["lab_submissions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_execution_logs_created_at", "execution_logs", ["created_at"], unique=False)
+    op.create_index("ix_execution_logs_id", "execution_logs", ["id"], unique=False)
+    op.create_index("ix_execution_logs_submission_id", "execution_logs", ["submission_id"], unique=False)
+    op.create_table("execution_results",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("submission_id", sa.Integer(), nullable=False),
+        sa.Column("test_case_id", sa.Integer(), nullable=False),
+        sa.Column("passed", sa.Boolean(), nullable=False),
+        sa.Column("status", SUBMISSIONSTATUS, nullable=False),
+        sa.Column("actual_output", sa.Text(), nullable=True),
+        sa.Column("expected_output", sa.Text(), nullable=True),
+        sa.Column("error_message", sa.Text(), nullable=True),
+        sa.Column("execution_time_ms", sa.Integer(), nullable=True),
+        sa.Column("memory_used_mb", sa.Float(), nullable=True),
+        sa.Column("points_earned", sa.Float(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["submission_id"], ["lab_submissions.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["test_case_id"], ["test_cases.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_execution_results_id", "execution_results", ["id"], unique=False)
+    op.create_index("ix_execution_results_submission_id", "execution_results", ["submission_id"], unique=False)
+    op.create_index("ix_execution_results_test_case_id", "execution_results", ["test_case_id"], unique=False)
+    op.create_table("plagiarism_reports",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("submission_id", sa.Integer(), nullable=False),
+        sa.Column("overall_similarity", sa.Float(), nullable=False),
+        sa.Column("similar_submissions", sa.JSON(), nullable=True),
+        sa.Column("github_matches", sa.JSON(), nullable=True),
+        sa.Column("stackoverflow_matches", sa.JSON(), nullable=True),
+        sa.Column("normalized_code", sa.Text(), nullable=True),
+        sa.Column("code_fingerprint", sa.String(length=255), nullable=True),
+        sa.Column("is_analyzed", sa.Boolean(), nullable=False),
+        sa.Column("analyzed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.ForeignKeyConstraint(["submission_id"], ["lab_submissions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_plagiarism_reports_code_fingerprint", "plagiarism_reports", ["code_fingerprint"], unique=False)
+    op.create_index("ix_plagiarism_reports_id", "plagiarism_reports", ["id"], unique=False)
+    op.create_index("ix_plagiarism_reports_submission_id", "plagiarism_reports", ["submission_id"], unique=True)
+    op.create_table("test_answers",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("attempt_id", sa.Integer(), nullable=False),
+        sa.Column("question_id", sa.Integer(), nullable=False),
+        sa.Column("answer_text", sa.Text(), nullable=True),
+        sa.Column("selected_options", sa.JSON(), nullable=True),
+        sa.Column("code", sa.Text(), nullable=True),
+        sa.Column("language", sa.String(length=20), nullable=True),
+        sa.Column("is_correct", sa.Boolean(), nullable=True),
+        sa.Column("points_earned", sa.Float(), nullable=False),
+        sa.Column("max_points", sa.Float(), nullable=True),
+        sa.Column("feedback", sa.Text(), nullable=True),
+        sa.Column("answered_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("graded_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["attempt_id"], ["test_attempts.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["question_id"], ["test_questions.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_test_answers_attempt_id", "test_answers", ["attempt_id"], unique=False)
+    op.create_index("ix_test_answers_id", "test_answers", ["id"], unique=False)
+    op.create_index("ix_test_answers_question_id", "test_answers", ["question_id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table("test_answers")
+    op.drop_table("plagiarism_reports")
+    op.drop_table("execution_results")
+    op.drop_table("execution_logs")
+    op.drop_table("code_playback")
+    op.drop_table("test_questions")
+    op.drop_table("test_cases")
+    op.drop_table("test_attempts")
+    op.drop_table("lab_submissions")
+    op.drop_table("student_session_progress")
+    op.drop_table("student_lab_progress")
+    op.drop_table("session_materials")
+    op.drop_table("round_contents")
+    op.drop_table("lab_tests")
+    op.drop_table("lab_problems")
+    op.drop_table("user_saved_code")
+    op.drop_table("rounds")
+    op.drop_table("quiz_attempts")
+    op.drop_table("lab_student_assignments")
+    op.drop_table("lab_sessions_enhanced")
+    op.drop_table("lab_sessions")
+    op.drop_table("lab_leaderboard")
+    op.drop_table("lab_faculty_assignments")
+    op.drop_table("lab_attendance")
+    op.drop_table("lab_analytics")
+    op.drop_table("coding_submissions")
+    op.drop_table("coding_activity")
+    op.drop_table("subject_assignments")
+    op.drop_table("quizzes")
+    op.drop_table("profiles")
+    op.drop_table("faculty_section_assignments")
+    op.drop_table("coding_problems")
+    op.drop_table("coding_labs")
+    op.drop_table("attendance")
+    op.drop_table("archived_subject_assignments")
+    op.drop_table("archived_faculty_section_assignments")
+    op.drop_table("subjects")
+    op.drop_table("sections")
+    op.drop_table("job_application_rounds")
+    op.drop_table("job_applicant_scores")
+    op.drop_table("user_notifications")
+    op.drop_table("user_announcements")
+    op.drop_table("semesters")
+    op.drop_table("question_banks")
+    op.drop_table("practice_sections")
+    op.drop_table("mock_interview_students")
+    op.drop_table("job_rounds")
+    op.drop_table("job_ranking_runs")
+    op.drop_table("job_applications")
+    op.drop_table("academic_year_migrations")
+    op.drop_table("year_promotions")
+    op.drop_table("user_sessions")
+    op.drop_table("user_roles")
+    op.drop_table("user_activities")
+    op.drop_table("training_sessions")
+    op.drop_table("student_resumes")
+    op.drop_table("student_resume_progress")
+    op.drop_table("student_progress")
+    op.drop_table("resume_analytics")
+    op.drop_table("periods")
+    op.drop_table("notifications")
+    op.drop_table("mock_interviews")
+    op.drop_table("jobs")
+    op.drop_table("hall_tickets")
+    op.drop_table("departments")
+    op.drop_table("company_roles")
+    op.drop_table("audit_logs")
+    op.drop_table("attendance_daily_cube")
+    op.drop_table("announcements")
+    op.drop_table("academic_years")
+    op.drop_table("users")
+    op.drop_table("institutions")
+    op.drop_table("feature_analytics")
+    op.drop_table("companies")
+    op.drop_table("colleges")
+
+    bind = op.get_bind()
+    for enum in reversed(ENUMS):
+        enum.drop(bind, checkfirst=False)
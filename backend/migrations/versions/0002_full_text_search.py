@@ -0,0 +1,26 @@
+"""Full-text search indexes
+
+FTS5 tables + sync triggers on SQLite, GIN tsvector indexes on PostgreSQL,
+FULLTEXT indexes on MySQL for coding problems, quizzes, jobs and the
+question bank (see app.services.search).
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+from app.services.search import create_search_indexes, drop_search_indexes
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    create_search_indexes(op.get_bind())
+
+
+def downgrade() -> None:
+    drop_search_indexes(op.get_bind())
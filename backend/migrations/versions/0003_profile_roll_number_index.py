@@ -0,0 +1,23 @@
+"""Index profiles.roll_number
+
+Round result sheets and add-students requests resolve students by roll
+number (see app.services.round_results).
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_profiles_roll_number", "profiles", ["roll_number"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_profiles_roll_number", table_name="profiles")
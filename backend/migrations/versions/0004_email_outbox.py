@@ -0,0 +1,41 @@
+"""Email outbox table
+
+Emails are queued in email_outbox and delivered by the background sender
+(see app.services.email_delivery).
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table("email_outbox",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("to_emails", sa.JSON(), nullable=False),
+        sa.Column("subject", sa.String(length=500), nullable=False),
+        sa.Column("html_body", sa.Text(), nullable=False),
+        sa.Column("text_body", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("claim_token", sa.String(length=64), nullable=True),
+        sa.Column("claimed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("idx_email_outbox_status_next_attempt", "email_outbox", ["status", "next_attempt_at"], unique=False)
+    op.create_index("ix_email_outbox_id", "email_outbox", ["id"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table("email_outbox")
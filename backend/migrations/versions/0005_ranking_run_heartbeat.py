@@ -0,0 +1,26 @@
+"""Heartbeat on job ranking runs
+
+Ranking runs write job_ranking_runs.heartbeat_at as they progress, so a run
+whose worker died can be told apart from one still in progress (see
+app.services.applicant_ranking).
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("job_ranking_runs", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("job_ranking_runs") as batch_op:
+        batch_op.drop_column("heartbeat_at")
@@ -0,0 +1,85 @@
+"""Proctoring tables
+
+proctoring_violations and proctoring_sessions were created by the old
+startup create_all (which saw every model imported by the routers) but
+were missing from app.models, so the baseline does not have them.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table("proctoring_sessions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lab_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("ended_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("total_time_seconds", sa.Integer(), nullable=False),
+        sa.Column("total_violations", sa.Integer(), nullable=False),
+        sa.Column("tab_switches", sa.Integer(), nullable=False),
+        sa.Column("fullscreen_exits", sa.Integer(), nullable=False),
+        sa.Column("window_blurs", sa.Integer(), nullable=False),
+        sa.Column("copy_paste_events", sa.Integer(), nullable=False),
+        sa.Column("devtools_opens", sa.Integer(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("last_activity", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("violation_summary", sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(["lab_id"], ["coding_labs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_proctoring_sessions_id", "proctoring_sessions", ["id"], unique=False)
+    op.create_index("ix_proctoring_sessions_is_active", "proctoring_sessions", ["is_active"], unique=False)
+    op.create_index("ix_proctoring_sessions_lab_id", "proctoring_sessions", ["lab_id"], unique=False)
+    op.create_index("ix_proctoring_sessions_user_id", "proctoring_sessions", ["user_id"], unique=False)
+    op.create_table("proctoring_violations",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("lab_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("submission_id", sa.Integer(), nullable=True),
+        sa.Column("violation_type", sa.Enum("TAB_SWITCH", "FULLSCREEN_EXIT", "WINDOW_BLUR", "COPY_PASTE", "DEVTOOLS", "OTHER", name="violationtype"), nullable=False),
+        sa.Column("severity", sa.Enum("LOW", "MEDIUM", "HIGH", name="violationseverity"), nullable=False),
+        sa.Column("timestamp", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("details", sa.JSON(), nullable=True),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("time_spent_seconds", sa.Integer(), nullable=True),
+        sa.Column("problem_id", sa.Integer(), nullable=True),
+        sa.Column("is_reviewed", sa.Boolean(), nullable=False),
+        sa.Column("reviewed_by", sa.Integer(), nullable=True),
+        sa.Column("reviewed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("review_notes", sa.Text(), nullable=True),
+        sa.Column("session_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["lab_id"], ["coding_labs.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["problem_id"], ["lab_problems.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["reviewed_by"], ["users.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["session_id"], ["proctoring_sessions.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["submission_id"], ["lab_submissions.id"], ondelete="SET NULL"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_proctoring_violations_id", "proctoring_violations", ["id"], unique=False)
+    op.create_index("ix_proctoring_violations_lab_id", "proctoring_violations", ["lab_id"], unique=False)
+    op.create_index("ix_proctoring_violations_session_id", "proctoring_violations", ["session_id"], unique=False)
+    op.create_index("ix_proctoring_violations_severity", "proctoring_violations", ["severity"], unique=False)
+    op.create_index("ix_proctoring_violations_submission_id", "proctoring_violations", ["submission_id"], unique=False)
+    op.create_index("ix_proctoring_violations_timestamp", "proctoring_violations", ["timestamp"], unique=False)
+    op.create_index("ix_proctoring_violations_user_id", "proctoring_violations", ["user_id"], unique=False)
+    op.create_index("ix_proctoring_violations_violation_type", "proctoring_violations", ["violation_type"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table("proctoring_violations")
+    op.drop_table("proctoring_sessions")
+    bind = op.get_bind()
+    sa.Enum(name="violationseverity").drop(bind, checkfirst=False)
+    sa.Enum(name="violationtype").drop(bind, checkfirst=False)
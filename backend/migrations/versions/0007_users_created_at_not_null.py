@@ -0,0 +1,50 @@
+"""Make users.created_at NOT NULL
+
+User listings page on (created_at, id) keysets (app.services.user_listing),
+and a NULL created_at compares as neither before nor after a cursor, so
+those users never appeared in cursor pages. Rows from before the column had
+a server default are backfilled with the earliest known created_at (they
+predate every dated user), or the current time if there is none.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # Read and written back as the DB returns it, so SQLite keeps its stored format
+    earliest = bind.execute(sa.text("SELECT MIN(created_at) FROM users")).scalar()
+    if earliest is None:
+        bind.execute(sa.text("UPDATE users SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL"))
+    else:
+        bind.execute(
+            sa.text("UPDATE users SET created_at = :earliest WHERE created_at IS NULL"),
+            {"earliest": earliest}
+        )
+
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.alter_column(
+            "created_at",
+            existing_type=sa.DateTime(timezone=True),
+            existing_server_default=sa.func.now(),
+            nullable=False
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.alter_column(
+            "created_at",
+            existing_type=sa.DateTime(timezone=True),
+            existing_server_default=sa.func.now(),
+            nullable=True
+        )
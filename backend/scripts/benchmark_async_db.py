@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Benchmark: requests/sec of one worker, sync Session vs AsyncSession endpoints.
+
+Runs the app in-process on one event loop (one worker) against a scratch
+SQLite database and sends --concurrency concurrent requests to each endpoint
+twice: once through its async version (get_async_db, as served by the app)
+and once through a copy mounted under /bench-sync that runs the same
+queries on the sync SessionLocal inside `async def`, as the endpoints did
+before. Sync queries block the event loop, so the worker serves one request
+at a time while they run; async queries let it interleave requests.
+
+SQLite answers in microseconds, unlike a database across the network, so
+--db-latency-ms is added to every statement inside the driver (a trace
+callback in the thread running the statement): the sync variant waits for
+it on the event loop thread, the async one in the aiosqlite thread.
+Run with --db-latency-ms 0 to see the async overhead alone.
+
+The async numbers here are a floor: SQLite's async engine opens a new
+aiosqlite connection (and thread) per session, where the PostgreSQL and
+MySQL engines reuse pooled connections. /auth/me compares against a sync
+dependency, which FastAPI already ran in its threadpool.
+
+Usage:
+    cd backend
+    python scripts/benchmark_async_db.py
+    python scripts/benchmark_async_db.py --concurrency 64 --db-latency-ms 5
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+API = "/api/v1"
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def add_statement_latency(latency):
+    """Sleep latency[0] seconds in the driver's thread before every statement"""
+    from sqlalchemy import event
+    from app.core.database import async_engine, engine
+
+    def trace(statement):
+        if latency[0]:
+            time.sleep(latency[0])
+
+    @event.listens_for(engine, "connect")
+    def sync_connect(dbapi_connection, connection_record):
+        dbapi_connection.set_trace_callback(trace)
+
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def async_connect(dbapi_connection, connection_record):
+        dbapi_connection.await_(dbapi_connection.driver_connection.set_trace_callback(trace))
+
+    engine.dispose()  # Reconnect pooled connections with the callback
+
+
+def seed(jobs, notifications):
+    from app.core.database import SessionLocal
+    from app.core.security import get_password_hash
+    from app.models.job import Job
+    from app.models.notification import Notification
+    from app.models.profile import Profile
+    from app.models.user import RoleEnum, User, UserRole
+    from app.models.user_notification import UserNotification
+
+    db = SessionLocal()
+    try:
+        user = User(email="bench-student@example.com", password_hash=get_password_hash("Bench@12345"),
+                    is_verified="true")
+        db.add(user)
+        db.flush()
+        db.add(UserRole(user_id=user.id, role=RoleEnum.STUDENT))
+        db.add(Profile(user_id=user.id, email=user.email, full_name="Bench Student", department="CSE",
+                       present_year="2nd", roll_number="BENCH001"))
+        db.add_all([
+            Job(title=f"Role {i}", company=f"Company {i % 20}", role="Engineer", is_active=True,
+                eligibility_type="branch" if i % 3 == 0 else "all_students",
+                eligible_branches=["CSE"] if i % 2 else ["ECE"], eligible_years=["2nd"] if i % 5 == 0 else None)
+            for i in range(jobs)
+        ])
+        created = [Notification(title=f"Notice {i}", message="Benchmark notice", is_active=i % 10 != 0)
+                   for i in range(notifications)]
+        db.add_all(created)
+        db.flush()
+        db.add_all([UserNotification(notification_id=n.id, user_id=user.id) for n in created])
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def mount_sync_routes(app):
+    """The benchmarked endpoints on the sync Session, under /bench-sync"""
+    from typing import List, Optional
+
+    from fastapi import APIRouter, Depends
+    from sqlalchemy.orm import Session
+
+    from app.api.auth import get_current_user, get_optional_user
+    from app.api.jobs import _list_jobs
+    from app.core.database import get_db
+    from app.models.notification import Notification
+    from app.models.user import User
+    from app.models.user_notification import UserNotification
+    from app.schemas.auth import UserResponse
+    from app.schemas.job import JobResponse
+
+    router = APIRouter(prefix="/bench-sync")
+
+    @router.get("/auth/me", response_model=UserResponse)
+    async def me(current_user: User = Depends(get_current_user)):
+        return current_user
+
+    @router.get("/jobs/", response_model=List[JobResponse])
+    async def jobs(current_user: Optional[User] = Depends(get_optional_user), db: Session = Depends(get_db)):
+        return _list_jobs(db, 0, 100, None, None, None, current_user)
+
+    @router.get("/notifications/my")
+    async def my_notifications(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+        page = db.query(UserNotification).filter(UserNotification.user_id == current_user.id).order_by(
+            UserNotification.created_at.desc()
+        ).limit(100).all()
+        notifications = {n.id: n for n in db.query(Notification).filter(
+            Notification.id.in_({u.notification_id for u in page}), Notification.is_active == True
+        )}
+        return [{"id": u.id, "notification": notifications[u.notification_id].title}
+                for u in page if u.notification_id in notifications]
+
+    app.include_router(router)
+
+
+async def measure(client, path, headers, count, concurrency):
+    latencies = []
+    errors = 0
+    remaining = iter(range(count))
+
+    async def worker():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return count / elapsed, percentile(latencies, 50), percentile(latencies, 95), errors
+
+
+async def run(args):
+    scratch_dir = tempfile.mkdtemp(prefix="async_db_bench_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(scratch_dir, 'bench.db')}"
+    os.environ["QUERY_TRACKING_ENABLED"] = "0"  # Timed statements include the simulated latency
+    try:
+        import httpx
+        from app.core.migrations import run_migrations
+        from app.core.security import create_access_token
+
+        latency = [0.0]
+        add_statement_latency(latency)
+        run_migrations()
+        user_id = seed(args.jobs, args.notifications)
+
+        from app.core.database import async_engine
+        from app.main import app
+        mount_sync_routes(app)
+
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(user_id)})}"}
+        endpoints = ["/auth/me", "/jobs/", "/notifications/my"]
+        latency[0] = args.db_latency_ms / 1000
+        print(f"One worker, {args.requests} requests per endpoint, {args.concurrency} concurrent, "
+              f"{args.db_latency_ms} ms per statement\n")
+        print(f"{'endpoint':<22}{'session':<8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'errors':>8}")
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+            for endpoint in endpoints:
+                rates = {}
+                for variant, prefix in (("sync", "/bench-sync"), ("async", API)):
+                    await measure(client, prefix + endpoint, headers, args.concurrency, args.concurrency)  # Warm up
+                    rate, p50, p95, errors = await measure(
+                        client, prefix + endpoint, headers, args.requests, args.concurrency
+                    )
+                    rates[variant] = rate
+                    print(f"{endpoint:<22}{variant:<8}{rate:>9.1f}{p50:>9.1f}{p95:>9.1f}{errors:>8}")
+                print(f"{'':<22}{'async/sync':<12}{rates['async'] / rates['sync']:>5.2f}x\n")
+        await async_engine.dispose()
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async DB sessions per worker")
+    parser.add_argument("--requests", type=int, default=400, help="Requests per endpoint and variant")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--db-latency-ms", type=float, default=2.0, help="Simulated round trip per statement")
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--notifications", type=int, default=50)
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
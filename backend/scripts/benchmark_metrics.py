@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the request metrics overhead.
+
+A minimal FastAPI app with one parameterised route is called --requests
+times directly through ASGI (no sockets, so the numbers are not drowned in
+network noise), once bare and once wrapped in PerformanceMiddleware. The
+difference per request is the cost of the middleware: route-template
+lookup, request id, response headers, the in-flight gauge, the status
+counter and the latency histogram. The best of --rounds runs is used for
+both. The script also reports the cost of rendering /metrics, and fails if
+the overhead is above --max-us.
+
+Usage:
+    cd backend
+    python scripts/benchmark_metrics.py
+    python scripts/benchmark_metrics.py --requests 50000 --max-us 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+
+def build_app():
+    from fastapi import FastAPI
+
+    app = FastAPI()
+
+    @app.get("/api/v1/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    return app
+
+
+async def run_requests(asgi_app, count: int) -> float:
+    """Seconds per request for count GET requests"""
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    started = time.perf_counter()
+    for i in range(count):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": f"/api/v1/items/{i % 100}",
+            "raw_path": f"/api/v1/items/{i % 100}".encode(),
+            "root_path": "",
+            "query_string": b"",
+            "headers": [(b"host", b"testserver")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("testserver", 80),
+        }
+        await asgi_app(scope, receive, send)
+    return (time.perf_counter() - started) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark request metrics overhead")
+    parser.add_argument("--requests", type=int, default=20000, help="Requests per run")
+    parser.add_argument("--rounds", type=int, default=5, help="Runs per variant (best is used)")
+    parser.add_argument("--max-us", type=float, default=50.0, help="Allowed overhead per request")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", "sqlite://")
+    from app.api.optimization_middleware import PerformanceMiddleware
+    from app.core.metrics import metrics_registry
+
+    bare = build_app()
+    instrumented_app = build_app()
+    instrumented = PerformanceMiddleware(instrumented_app)
+
+    loop = asyncio.new_event_loop()
+    # Warm up both (route compilation, first-call imports)
+    loop.run_until_complete(run_requests(bare, 1000))
+    loop.run_until_complete(run_requests(instrumented, 1000))
+
+    bare_times, instrumented_times = [], []
+    for _ in range(args.rounds):
+        bare_times.append(loop.run_until_complete(run_requests(bare, args.requests)))
+        instrumented_times.append(loop.run_until_complete(run_requests(instrumented, args.requests)))
+    loop.close()
+
+    bare_us = min(bare_times) * 1e6
+    instrumented_us = min(instrumented_times) * 1e6
+    overhead_us = instrumented_us - bare_us
+
+    started = time.perf_counter()
+    exposition = metrics_registry.render()
+    render_ms = (time.perf_counter() - started) * 1000
+
+    print(f"Requests per run: {args.requests}, best of {args.rounds}")
+    print(f"  without metrics: {bare_us:8.1f} us/request")
+    print(f"  with metrics:    {instrumented_us:8.1f} us/request")
+    print(f"  /metrics render: {render_ms:8.2f} ms ({len(exposition.splitlines())} lines)")
+    print(f"\nOverhead: {overhead_us:.1f} us/request (limit {args.max_us:.1f} us)")
+    if overhead_us > args.max_us:
+        print("FAIL: metrics overhead is above the limit")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the streamed quiz results export.
+
+For each cohort size a scratch SQLite database is seeded with one quiz and
+that many submitted attempts. A fresh process then serves the app with
+uvicorn on a local port and downloads GET /api/v1/quiz-analytics/quiz/{id}/export
+from it, consuming the body chunk by chunk. The script records how
+much that process's peak RSS grew during the export, and fails if the
+largest cohort grew more than --max-growth-mb beyond the smallest one.
+
+Usage:
+    cd backend
+    python scripts/benchmark_quiz_export.py
+    python scripts/benchmark_quiz_export.py --sizes 200 50000 --format xlsx
+    python scripts/benchmark_quiz_export.py --format json   # legacy in-memory payload, for comparison
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def seed(attempts: int, questions: int = 20):
+    from app.core.database import Base, SessionLocal, engine
+    from app.models.profile import Profile
+    from app.models.quiz import Quiz, QuizAttempt
+    from app.models.user import RoleEnum, User, UserRole
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        admin = User(email="bench-admin@example.com", password_hash="x")
+        db.add(admin)
+        db.flush()
+        db.add(UserRole(user_id=admin.id, role=RoleEnum.SUPER_ADMIN))
+        quiz = Quiz(title="Export benchmark", duration_minutes=60, total_marks=questions,
+                    questions=[{"question_type": "mcq", "correct_answer": "A", "marks": 1}] * questions,
+                    is_active=True, status="published", created_by=admin.id)
+        db.add(quiz)
+        db.commit()
+
+        answers = [
+            {"question_index": i, "question_type": "mcq", "answer": "A",
+             "points_earned": 1, "max_points": 1, "is_correct": True}
+            for i in range(questions)
+        ]
+        batch = 5000
+        for start in range(0, attempts, batch):
+            count = min(batch, attempts - start)
+            db.bulk_insert_mappings(User, [
+                {"email": f"student{start + i}@example.com", "password_hash": "x"} for i in range(count)
+            ])
+            db.flush()
+            ids = [row.id for row in db.query(User.id).order_by(User.id.desc()).limit(count)]
+            db.bulk_insert_mappings(Profile, [
+                {"user_id": user_id, "email": f"student{user_id}@example.com", "full_name": f"Student {user_id}"}
+                for user_id in ids
+            ])
+            db.bulk_insert_mappings(QuizAttempt, [
+                {"quiz_id": quiz.id, "user_id": user_id, "is_submitted": True, "is_graded": True,
+                 "total_score": 15, "max_score": questions, "percentage": 75.0, "answers": answers}
+                for user_id in ids
+            ])
+            db.commit()
+        print(json.dumps({"quiz_id": quiz.id, "admin_id": admin.id}))
+    finally:
+        db.close()
+
+
+async def measure(quiz_id: int, admin_id: int, export_format: str):
+    import httpx
+    import uvicorn
+    from app.core.security import create_access_token
+    from app.main import app
+
+    # A real server: httpx's ASGI transport would buffer the whole body in memory
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning"))
+    serve_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    port = server.servers[0].sockets[0].getsockname()[1]
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin_id)})}"}
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=600) as client:
+        # Warm up imports, caches and the connection before taking the baseline
+        await client.get("/api/v1/health")
+        baseline = peak_rss_mb()
+
+        started = time.perf_counter()
+        size = 0
+        async with client.stream(
+            "GET", f"/api/v1/quiz-analytics/quiz/{quiz_id}/export",
+            params={"format": export_format}, headers=headers
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                size += len(chunk)
+        elapsed = time.perf_counter() - started
+
+    server.should_exit = True
+    await serve_task
+    print(json.dumps({
+        "baseline_mb": baseline,
+        "peak_mb": peak_rss_mb(),
+        "bytes": size,
+        "seconds": elapsed,
+    }))
+
+
+def run_child(db_path: str, *args) -> dict:
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", PYTHONPATH=backend_dir)
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), *args],
+        env=env, cwd=backend_dir, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streamed quiz result exports")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200, 50000], help="Attempt counts to compare")
+    parser.add_argument("--format", choices=["csv", "xlsx", "json"], default="csv")
+    parser.add_argument("--max-growth-mb", type=float, default=10.0,
+                        help="Allowed extra RSS growth of the largest cohort over the smallest")
+    parser.add_argument("--seed", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--measure", nargs=2, type=int, metavar=("QUIZ_ID", "ADMIN_ID"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        seed(args.seed)
+        return 0
+    if args.measure:
+        asyncio.run(measure(args.measure[0], args.measure[1], args.format))
+        return 0
+
+    scratch_dir = tempfile.mkdtemp(prefix="quiz_export_bench_")
+    results = []
+    try:
+        for size in args.sizes:
+            db_path = os.path.join(scratch_dir, f"export_{size}.db")
+            print(f"Seeding {size} attempts...", flush=True)
+            ids = run_child(db_path, "--seed", str(size))
+            stats = run_child(db_path, "--measure", str(ids["quiz_id"]), str(ids["admin_id"]), "--format", args.format)
+            growth = stats["peak_mb"] - stats["baseline_mb"]
+            results.append((size, growth, stats))
+            print(f"  {size:>7} attempts: {stats['bytes'] / 1024:,.0f} KiB in {stats['seconds']:.2f}s, "
+                  f"peak RSS {stats['peak_mb']:.1f} MB (+{growth:.1f} MB during export)", flush=True)
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    smallest, largest = min(results), max(results)
+    extra = largest[1] - smallest[1]
+    print(f"\nRSS growth difference ({largest[0]} vs {smallest[0]} attempts): {extra:.1f} MB "
+          f"(limit {args.max_growth_mb:.1f} MB)")
+    if extra > args.max_growth_mb:
+        print("FAIL: export memory grows with cohort size")
+        return 1
+    print("OK: export memory stays flat")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
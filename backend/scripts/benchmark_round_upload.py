@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark for round result uploads and bulk promotion.
+
+A scratch SQLite database is seeded with --rows students, each with a
+profile, an application for one job and a QUALIFIED result in the job's
+first round. A results sheet with one row per student (mostly QUALIFIED,
+so most rows also auto-advance to the next round) is then uploaded to the
+second round through POST /api/v1/job-rounds/rounds/{id}/bulk-upload,
+followed by a bulk promotion of the third round. The script reports both
+request times and the number of SQL statements, and fails if the upload
+takes longer than --max-seconds.
+
+Usage:
+    cd backend
+    python scripts/benchmark_round_upload.py
+    python scripts/benchmark_round_upload.py --rows 5000 --max-seconds 5
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+
+def seed(rows: int):
+    from app.core.database import SessionLocal
+    from app.models.job import Job, JobApplication
+    from app.models.job_round import JobApplicationRound, JobRound
+    from app.models.profile import Profile
+    from app.models.user import RoleEnum, User, UserRole
+
+    db = SessionLocal()
+    try:
+        admin = User(email="bench-admin@example.com", password_hash="x")
+        db.add(admin)
+        db.flush()
+        db.add(UserRole(user_id=admin.id, role=RoleEnum.SUPER_ADMIN))
+        job = Job(title="Round upload benchmark", company="Acme", role="Engineer", eligible_years=["3rd", "4th"])
+        db.add(job)
+        db.flush()
+        rounds = [JobRound(job_id=job.id, name=name, order=order)
+                  for order, name in enumerate(["Applied", "Aptitude", "Technical", "HR"])]
+        db.add_all(rounds)
+        db.commit()
+
+        db.bulk_insert_mappings(User, [
+            {"email": f"student{i}@example.com", "password_hash": "x"} for i in range(rows)
+        ])
+        db.flush()
+        user_ids = [row.id for row in db.query(User.id).filter(User.id != admin.id).order_by(User.id)]
+        db.bulk_insert_mappings(Profile, [
+            {"user_id": user_id, "email": f"student{i}@example.com", "full_name": f"Student {i}",
+             "roll_number": f"R{i:06d}", "present_year": random.choice(["3rd", "4th"])}
+            for i, user_id in enumerate(user_ids)
+        ])
+        db.bulk_insert_mappings(JobApplication, [
+            {"job_id": job.id, "user_id": user_id, "status": "Applied"} for user_id in user_ids
+        ])
+        db.flush()
+        application_ids = [row.id for row in db.query(JobApplication.id).filter(JobApplication.job_id == job.id)]
+        db.bulk_insert_mappings(JobApplicationRound, [
+            {"job_application_id": application_id, "round_id": rounds[0].id, "status": "QUALIFIED"}
+            for application_id in application_ids
+        ])
+        db.commit()
+        return admin.id, [r.id for r in rounds]
+    finally:
+        db.close()
+
+
+def results_sheet(rows: int, round_id: int) -> bytes:
+    lines = ["roll_number,status,remarks,round_id"]
+    for i in range(rows):
+        status = random.choices(["QUALIFIED", "REJECTED", "ABSENT"], weights=[70, 25, 5])[0]
+        lines.append(f"R{i:06d},{status},,{round_id}")
+    return "\n".join(lines).encode()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark round result uploads")
+    parser.add_argument("--rows", type=int, default=2000, help="Students / sheet rows")
+    parser.add_argument("--max-seconds", type=float, default=2.0, help="Allowed upload time")
+    args = parser.parse_args()
+    random.seed(42)
+
+    scratch_dir = tempfile.mkdtemp(prefix="round_upload_bench_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(scratch_dir, 'rounds.db')}"
+    try:
+        from fastapi.testclient import TestClient
+        from sqlalchemy import event
+
+        from app.core.database import engine
+        from app.core.migrations import run_migrations
+        from app.core.security import create_access_token
+        from app.main import app
+
+        run_migrations()
+        print(f"Seeding {args.rows} students...", flush=True)
+        admin_id, round_ids = seed(args.rows)
+
+        statements = [0]
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count_statement(*_):
+            statements[0] += 1
+
+        client = TestClient(app)
+        headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin_id)})}"}
+        client.get("/api/v1/health")
+
+        statements[0] = 0
+        started = time.perf_counter()
+        response = client.post(
+            f"/api/v1/job-rounds/rounds/{round_ids[1]}/bulk-upload",
+            files={"file": ("results.csv", results_sheet(args.rows, round_ids[1]), "text/csv")},
+            headers=headers
+        )
+        upload_seconds = time.perf_counter() - started
+        response.raise_for_status()
+        print(f"  upload:  {response.json()['message']}")
+        print(f"           {upload_seconds:.2f}s, {statements[0]} SQL statements")
+
+        statements[0] = 0
+        started = time.perf_counter()
+        response = client.post(f"/api/v1/job-rounds/rounds/{round_ids[2]}/bulk-promote", json={}, headers=headers)
+        promote_seconds = time.perf_counter() - started
+        response.raise_for_status()
+        print(f"  promote: {response.json()['message']}")
+        print(f"           {promote_seconds:.2f}s, {statements[0]} SQL statements")
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    print(f"\nUpload of {args.rows} rows: {upload_seconds:.2f}s (limit {args.max_seconds:.1f}s)")
+    if upload_seconds > args.max_seconds:
+        print("FAIL: upload is slower than the limit")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
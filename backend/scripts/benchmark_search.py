@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the full-text search indexes.
+
+A scratch SQLite database is seeded with --rows jobs and migrated to head
+(which builds the search_jobs FTS5 index). Each query below is then run
+--repeat times through app.services.search, once for the whole match set
+ranked by relevance and once for the first page, and the median time is
+reported. The script fails if any median is above --max-ms.
+
+Usage:
+    cd backend
+    python scripts/benchmark_search.py
+    python scripts/benchmark_search.py --rows 200000 --max-ms 20
+    python scripts/benchmark_search.py --no-index   # ILIKE fallback, for comparison
+"""
+
+import argparse
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka", "Cyberdyne", "Tyrell"]
+ROLES = ["Backend Engineer", "Frontend Developer", "Data Analyst", "DevOps Engineer", "QA Engineer",
+         "Machine Learning Engineer", "Product Manager", "Site Reliability Engineer", "Android Developer"]
+WORDS = ["python", "java", "kubernetes", "react", "postgres", "distributed", "embedded", "cloud",
+         "security", "payments", "analytics", "mobile", "platform", "compiler", "graphics", "networking"]
+QUERIES = ["kubernetes", "pyth", "backend engineer", "backend eng", "acme data", "graphics compiler", "sre"]
+
+
+def seed(rows: int) -> None:
+    from app.core.database import SessionLocal
+    from app.models.job import Job
+
+    rng = random.Random(42)
+    db = SessionLocal()
+    try:
+        batch = 10000
+        for start in range(0, rows, batch):
+            db.bulk_insert_mappings(Job, [
+                {
+                    "title": f"{rng.choice(ROLES)} - {' '.join(rng.sample(WORDS, 3))}",
+                    "company": rng.choice(COMPANIES),
+                    "role": rng.choice(ROLES),
+                    "eligibility_type": "all_students",
+                    "job_type": "On-Campus",
+                    "is_active": True,
+                }
+                for _ in range(min(batch, rows - start))
+            ])
+            db.commit()
+    finally:
+        db.close()
+
+
+def time_ms(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark full-text search queries")
+    parser.add_argument("--rows", type=int, default=100000, help="Jobs to seed")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per query (median is reported)")
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--max-ms", type=float, default=10.0, help="Allowed median time of a page query")
+    parser.add_argument("--no-index", action="store_true", help="Drop the search indexes (ILIKE fallback)")
+    args = parser.parse_args()
+
+    scratch_dir = tempfile.mkdtemp(prefix="search_bench_")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(scratch_dir, 'search.db')}"
+    try:
+        from app.core.database import SessionLocal, engine
+        from app.core.migrations import run_migrations
+        from app.core.schema import schema_capabilities
+        from app.services.search import drop_search_indexes, search_ids
+
+        run_migrations()
+        print(f"Seeding {args.rows} jobs...", flush=True)
+        started = time.perf_counter()
+        seed(args.rows)
+        print(f"  seeded (index kept in sync by triggers) in {time.perf_counter() - started:.1f}s")
+        if args.no_index:
+            with engine.begin() as connection:
+                drop_search_indexes(connection)
+            schema_capabilities.refresh()
+
+        db = SessionLocal()
+        slowest = 0.0
+        try:
+            print(f"\n{'query':<22}{'matches':>9}{'all (ms)':>11}{'page (ms)':>11}")
+            for search in QUERIES:
+                matches = len(search_ids(db, "jobs", search))
+                all_ms = time_ms(lambda: search_ids(db, "jobs", search), args.repeat)
+                page_ms = time_ms(lambda: search_ids(db, "jobs", search, limit=args.page_size), args.repeat)
+                slowest = max(slowest, page_ms)
+                print(f"{search!r:<22}{matches:>9}{all_ms:>11.2f}{page_ms:>11.2f}")
+        finally:
+            db.close()
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    print(f"\nSlowest page query: {slowest:.2f} ms (limit {args.max_ms:.1f} ms)")
+    if slowest > args.max_ms:
+        print("FAIL: search is slower than the limit")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Apply the versioned schema migrations (run once per deploy, before the API).
+
+Usage:
+    cd backend
+    python scripts/migrate.py              # upgrade to head
+    python scripts/migrate.py --status     # show current and head revision
+    python scripts/migrate.py --revision 0001
+"""
+
+import argparse
+import logging
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+from app.core.migrations import current_revision, head_revision, run_migrations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply versioned schema migrations")
+    parser.add_argument("--revision", default="head", help="Target revision (default: head)")
+    parser.add_argument("--status", action="store_true", help="Only print the current and head revision")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+
+    if args.status:
+        print(f"Current revision: {current_revision() or 'none'}")
+        print(f"Head revision:    {head_revision()}")
+        return 0
+
+    print(f"Upgrading database from {current_revision() or 'none'} to {args.revision}...")
+    run_migrations(args.revision)
+    print(f"✅ Database at revision {current_revision()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Rebuild the daily attendance cube (attendance_daily_cube) from the attendance table.
+
+Run once before setting ATTENDANCE_CUBE_ENABLED=true, and again whenever
+attendance rows were changed outside the API (imports, manual SQL). The
+table itself is created by the migrations (python scripts/migrate.py).
+
+Usage:
+    cd backend
+    python scripts/rebuild_attendance_cube.py
+    python scripts/rebuild_attendance_cube.py --college-id 3
+"""
+
+import argparse
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild the daily attendance cube")
+    parser.add_argument("--college-id", type=int, default=None, help="Only rebuild one college")
+    args = parser.parse_args()
+
+    from app.core.database import SessionLocal
+    from app.core.schema import schema_capabilities
+    from app.models.attendance import AttendanceDailyCube
+    from app.services.attendance_analytics import rebuild_attendance_cube
+
+    if not schema_capabilities.has_table(AttendanceDailyCube.__tablename__):
+        print(f"❌ Table {AttendanceDailyCube.__tablename__} is missing; run python scripts/migrate.py first")
+        return 1
+    db = SessionLocal()
+    try:
+        rows = rebuild_attendance_cube(db, college_id=args.college_id)
+    finally:
+        db.close()
+    print(f"Attendance cube rebuilt: {rows} rows")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Bring a database created before versioned migrations up to the current
+models, then stamp it at the head revision (run once, instead of migrate.py).
+
+Such databases were built by the old startup create_all and the one-off
+scripts in migrations/, so they hold some older subset of the models. This
+creates missing tables, adds missing columns (e.g. coding_problems.year_str
+and problem_code), creates missing indexes, makes columns NOT NULL where the
+models say so (filling NULLs from the column's server default) and builds
+the full-text search indexes. What it cannot repair is logged as a warning.
+Afterwards the database is at head and deploys run scripts/migrate.py.
+
+Usage:
+    cd backend
+    python scripts/repair_legacy_schema.py
+"""
+
+import logging
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+backend_dir = os.path.dirname(script_dir)
+sys.path.insert(0, backend_dir)
+
+import sqlalchemy as sa
+from alembic import command
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+
+from app.core.database import Base, engine
+from app.core.migrations import alembic_config, current_revision, head_revision
+from app.services.search import create_search_indexes
+import app.models  # noqa: F401  (registers every model on Base.metadata)
+
+logger = logging.getLogger("repair_legacy_schema")
+
+
+def add_missing_columns(connection, inspector, table: sa.Table) -> None:
+    existing = {column["name"] for column in inspector.get_columns(table.name)}
+    for column in table.columns:
+        if column.name in existing:
+            continue
+        if not column.nullable and column.server_default is None:
+            # Cannot be added to populated rows
+            logger.warning(f"Skipping NOT NULL column {table.name}.{column.name} without a server default")
+            continue
+        backfill = None
+        if connection.dialect.name == "sqlite" and isinstance(
+            getattr(column.server_default, "arg", None), sa.sql.functions.FunctionElement
+        ):
+            # SQLite rejects ADD COLUMN with a non-constant default such as
+            # CURRENT_TIMESTAMP; add it bare and fill the existing rows instead
+            backfill = column.server_default.arg
+            column = sa.Column(column.name, column.type)
+        column_sql = sa.schema.CreateColumn(column).compile(dialect=connection.dialect)
+        logger.info(f"Adding column {table.name}.{column.name}")
+        connection.execute(sa.text(f"ALTER TABLE {table.name} ADD COLUMN {column_sql}"))
+        if backfill is not None:
+            connection.execute(sa.text(
+                f"UPDATE {table.name} SET {column.name} = {backfill.compile(dialect=connection.dialect)}"
+            ))
+
+
+def add_missing_indexes(connection, inspector, table: sa.Table) -> None:
+    existing = {index["name"] for index in inspector.get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name and index.name not in existing:
+            logger.info(f"Creating index {index.name}")
+            try:
+                with connection.begin_nested():
+                    index.create(connection)
+            except sa.exc.DBAPIError as e:
+                # e.g. a unique index over existing duplicates
+                logger.warning(f"Could not create index {index.name}: {e.orig}")
+
+
+def tighten_not_null(connection, inspector, table: sa.Table) -> None:
+    nullable = {column["name"] for column in inspector.get_columns(table.name) if column["nullable"]}
+    for column in table.columns:
+        if column.nullable or column.primary_key or column.name not in nullable:
+            continue
+        if column.server_default is not None:
+            default_sql = column.server_default.arg
+            if not isinstance(default_sql, str):
+                default_sql = default_sql.compile(dialect=connection.dialect)
+            connection.execute(sa.text(
+                f"UPDATE {table.name} SET {column.name} = {default_sql} WHERE {column.name} IS NULL"
+            ))
+        nulls = connection.execute(sa.text(
+            f"SELECT COUNT(*) FROM {table.name} WHERE {column.name} IS NULL"
+        )).scalar()
+        if nulls:
+            logger.warning(f"Leaving {table.name}.{column.name} nullable: {nulls} rows are NULL")
+            continue
+        logger.info(f"Making {table.name}.{column.name} NOT NULL")
+        context = MigrationContext.configure(connection)
+        with Operations(context).batch_alter_table(table.name) as batch_op:
+            batch_op.alter_column(
+                column.name,
+                existing_type=column.type,
+                existing_server_default=column.server_default.arg if column.server_default is not None else None,
+                nullable=False
+            )
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+
+    revision = current_revision()
+    if revision is not None:
+        print(f"❌ Database is already at revision {revision}; run scripts/migrate.py instead")
+        return 1
+    existing_tables = set(sa.inspect(engine).get_table_names())
+    if not existing_tables:
+        print("❌ Database is empty; run scripts/migrate.py to create it")
+        return 1
+
+    print(f"Repairing legacy schema ({len(existing_tables)} tables)...")
+    with engine.begin() as connection:
+        Base.metadata.create_all(bind=connection)
+        inspector = sa.inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            add_missing_columns(connection, inspector, table)
+            add_missing_indexes(connection, inspector, table)
+        inspector = sa.inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            tighten_not_null(connection, inspector, table)
+        # What revision 0002 adds; legacy databases have no full-text indexes
+        create_search_indexes(connection)
+
+    command.stamp(alembic_config(), "head")
+    print(f"✅ Database stamped at revision {head_revision()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,9 +20,10 @@ import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Progress } from "@/components/ui/progress";
 import { Badge } from "@/components/ui/badge";
 import { useToast } from "@/hooks/use-toast";
-import { useState, useEffect, useMemo, useCallback, memo } from "react";
+import { useState, useEffect, useMemo, useCallback, useRef, memo } from "react";
 import { useQueryClient } from "@tanstack/react-query";
 import { resumeStorage } from "@/lib/resumeStorage";
+import { apiClient } from "@/integrations/api/client";
 import { checkOpenAIConfig } from "@/lib/resumeitnow/utils/envCheck";
 import { Textarea } from "@/components/ui/textarea";
 import { Input } from "@/components/ui/input";
@@ -315,6 +316,30 @@ export const BuildTab = memo(function BuildTab() {
     };
   }, [profile, allEducation, allProjects, allSkills, certifications, achievements, extracurricular, hobbies, resumeContent]);
 
+  // Keep the server copy of the resume current so placement officers can rank it against jobs
+  const lastSavedResume = useRef<string | null>(null);
+  useEffect(() => {
+    if (isLoading || !profile) return;
+    const resumeData = prepareResumeData();
+    const payload = {
+      personal_info: resumeData.profile,
+      education: resumeData.education,
+      projects: resumeData.projects,
+      skills: Object.values(resumeData.skills as Record<string, string[]>).flat()
+        .filter((s) => typeof s === 'string' && s.trim().length > 0),
+      certifications: resumeData.certifications,
+      achievements: resumeData.achievements,
+    };
+    const serialized = JSON.stringify(payload);
+    if (serialized === lastSavedResume.current) return;
+    const timer = setTimeout(() => {
+      apiClient.saveResume(payload)
+        .then(() => { lastSavedResume.current = serialized; })
+        .catch((error) => console.warn('Failed to save resume for job ranking:', error));
+    }, 2000);
+    return () => clearTimeout(timer);
+  }, [isLoading, profile, prepareResumeData]);
+
   // Handle resume optimization for job application
   const handleOptimizeResume = useCallback(async () => {
     if (!targetRole.trim()) {
@@ -1122,6 +1122,21 @@ class APIClient {
     });
   }
 
+  async saveResume(resume_data: {
+    personal_info?: any;
+    education?: any[];
+    experience?: any[];
+    projects?: any[];
+    skills?: string[];
+    certifications?: any[];
+    achievements?: any[];
+  }) {
+    return this.request('/resume/saved', {
+      method: 'PUT',
+      body: JSON.stringify(resume_data)
+    });
+  }
+
   async generateCoverLetter(data: {
     resume_data: {
       personal_info?: any;
@@ -1865,7 +1880,7 @@ class APIClient {
     });
   }
 
-  async updateQuizAttempt(attemptId: number, data: { answers?: any[] }) {
+  async updateQuizAttempt(attemptId: number, data: { answers?: any[]; answer_deltas?: Record<number, any> }) {
     return this.request(`/global-content/quiz-attempts/${attemptId}`, {
       method: 'PUT',
       body: JSON.stringify(data)
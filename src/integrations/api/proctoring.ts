@@ -17,6 +17,14 @@ export interface ViolationCreate {
   timestamp?: string;
 }
 
+export type ViolationEvent = Omit<ViolationCreate, 'lab_id'>;
+
+export interface ViolationBatchResponse {
+  session_id: number;
+  recorded: number;
+  total_violations: number;
+}
+
 export interface ViolationResponse {
   id: number;
   lab_id: number;
@@ -70,6 +78,16 @@ class ProctoringAPI {
     });
   }
 
+  /**
+   * Record a buffer of proctoring violations in one request
+   */
+  async recordViolations(labId: number, violations: ViolationEvent[]): Promise<ViolationBatchResponse> {
+    return apiClient.request(`/proctoring/violations/batch`, {
+      method: 'POST',
+      body: JSON.stringify({ lab_id: labId, violations }),
+    });
+  }
+
   /**
    * Get all sessions for a lab (Faculty/Admin only)
    */
@@ -925,7 +925,7 @@ export default function ManageQuizzesAdmin() {
                             try {
                               const API_BASE = getAPIBase();
                               const response = await fetch(
-                                `${API_BASE}/quiz-analytics/quiz/${quiz.id}/export`,
+                                `${API_BASE}/quiz-analytics/quiz/${quiz.id}/export?format=csv`,
                                 {
                                   headers: {
                                     Authorization: `Bearer ${localStorage.getItem("access_token")}`,
@@ -933,13 +933,14 @@ export default function ManageQuizzesAdmin() {
                                 }
                               );
                               if (response.ok) {
-                                const data = await response.json();
-                                // Create download
-                                const blob = new Blob([data.csv_data], { type: 'text/csv' });
+                                // Results are streamed as a CSV file
+                                const blob = await response.blob();
+                                const filename = response.headers.get('Content-Disposition')?.match(/filename=([^;]+)/)?.[1]
+                                  || `quiz_${quiz.id}_results.csv`;
                                 const url = URL.createObjectURL(blob);
                                 const link = document.createElement('a');
                                 link.href = url;
-                                link.download = data.filename;
+                                link.download = filename;
                                 document.body.appendChild(link);
                                 link.click();
                                 document.body.removeChild(link);
@@ -14,6 +14,8 @@ interface StudentActivity {
   lab_id: number;
   problem_id?: number;
   current_code?: string;
+  code_preview?: string;
+  code_length?: number;
   language?: string;
   time_spent_seconds: number;
   attempt_count: number;
@@ -83,6 +85,15 @@ export default function LabMonitor() {
       const data = JSON.parse(event.data);
       if (data.type === 'activities' || data.type === 'activity_update') {
         setActivities(data.activities || []);
+      } else if (data.type === 'activity_delta') {
+        // Only changed students are sent; merge them into the current list
+        setActivities((prev) => {
+          const byUser = new Map(prev.map((a) => [a.user_id, a]));
+          for (const changed of (data.activities || []) as StudentActivity[]) {
+            byUser.set(changed.user_id, { ...byUser.get(changed.user_id), ...changed });
+          }
+          return Array.from(byUser.values());
+        });
       }
     };
 
@@ -267,12 +278,12 @@ export default function LabMonitor() {
                             </div>
                           )}
                         </div>
-                        {activity.current_code && (
+                        {(activity.code_preview || activity.current_code) && (
                           <div className="mt-3">
                             <p className="text-xs text-muted-foreground mb-1">Current Code:</p>
                             <pre className="text-xs bg-muted p-2 rounded overflow-x-auto max-h-32">
-                              {activity.current_code.substring(0, 200)}
-                              {activity.current_code.length > 200 && '...'}
+                              {(activity.code_preview || activity.current_code || '').substring(0, 200)}
+                              {(activity.code_length ?? activity.current_code?.length ?? 0) > 200 && '...'}
                             </pre>
                           </div>
                         )}
@@ -237,20 +237,16 @@ export default function TakeQuiz() {
     };
     
     try {
-      const currentAnswers = attempt.answers || [];
-      const updatedAnswers = [...currentAnswers];
-      const existingIndex = updatedAnswers.findIndex(a => a.question_index === index);
+      // Send only this question; concurrent saves of other questions don't overwrite each other
+      await apiClient.updateQuizAttempt(attempt.id, { answer_deltas: { [index]: answerData } });
       
-      if (existingIndex >= 0) {
-        updatedAnswers[existingIndex] = answerData;
-      } else {
+      // Update attempt state with new answer
+      setAttempt((prev) => {
+        if (!prev) return prev;
+        const updatedAnswers = (prev.answers || []).filter(a => a.question_index !== index);
         updatedAnswers.push(answerData);
-      }
-      
-      await apiClient.updateQuizAttempt(attempt.id, { answers: updatedAnswers });
-      
-      // Update attempt state with new answers
-      setAttempt({ ...attempt, answers: updatedAnswers });
+        return { ...prev, answers: updatedAnswers };
+      });
     } catch (error: any) {
       console.error("Error saving answer:", error);
       // Don't show toast for every save error to avoid spam
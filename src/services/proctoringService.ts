@@ -3,6 +3,8 @@
  * Comprehensive real-time tracking system for student activity monitoring
  */
 
+import type { ViolationEvent } from '@/integrations/api/proctoring';
+
 export interface ProctoringConfig {
   labId: number;
   isProctored: boolean;
@@ -32,6 +34,13 @@ export interface StudentActivity {
   isActive: boolean;
 }
 
+// Violations are sent to the API in batches
+const VIOLATION_FLUSH_INTERVAL_MS = 2000;
+const VIOLATION_FLUSH_SIZE = 20;
+const MAX_VIOLATION_BATCH = 500;
+// Oldest queued violations are dropped beyond this while the API is unreachable
+const MAX_PENDING_VIOLATIONS = 2000;
+
 export class ProctoringService {
   private config: ProctoringConfig | null = null;
   private violations: ProctoringViolation[] = [];
@@ -48,6 +57,9 @@ export class ProctoringService {
   private fullscreenWarningShown = false;
   private visibilityHandlers: Map<string, () => void> = new Map();
   private isInitialized = false;
+  private pendingViolations: ViolationEvent[] = [];
+  private violationFlushTimer: NodeJS.Timeout | null = null;
+  private violationFlushInFlight: Promise<void> | null = null;
 
   /**
    * Initialize proctoring service
@@ -488,34 +500,80 @@ export class ProctoringService {
     // Send to backend via WebSocket
     this.sendActivityUpdate();
 
-    // Also send to REST API for persistence
-    this.sendViolationToAPI(violation).catch((error) => {
-      console.error('[Proctoring] Failed to send violation to API:', error);
-    });
+    // Also queue for the REST API for persistence
+    this.queueViolationForAPI(violation);
 
     console.warn('[Proctoring] Violation recorded:', violation);
   }
 
   /**
-   * Send violation to REST API for persistence
+   * Queue a violation for the REST API; the queue is flushed in batches
    */
-  private async sendViolationToAPI(violation: ProctoringViolation): Promise<void> {
+  private queueViolationForAPI(violation: ProctoringViolation): void {
     if (!this.config) return;
 
+    this.pendingViolations.push({
+      violation_type: violation.type,
+      severity: violation.severity,
+      details: violation.details,
+      description: `${violation.type} violation detected`,
+      time_spent_seconds: this.getTimeSpent(),
+      timestamp: violation.timestamp.toISOString(),
+    });
+    this.trimPendingViolations();
+
+    if (this.pendingViolations.length >= VIOLATION_FLUSH_SIZE) {
+      this.flushViolations();
+    } else if (!this.violationFlushTimer) {
+      this.violationFlushTimer = setTimeout(() => this.flushViolations(), VIOLATION_FLUSH_INTERVAL_MS) as any;
+    }
+  }
+
+  private trimPendingViolations(): void {
+    if (this.pendingViolations.length > MAX_PENDING_VIOLATIONS) {
+      this.pendingViolations.splice(0, this.pendingViolations.length - MAX_PENDING_VIOLATIONS);
+    }
+  }
+
+  /**
+   * Send queued violations to the REST API in one request (one request in flight at a time)
+   */
+  private flushViolations(): Promise<void> {
+    if (this.violationFlushTimer) {
+      clearTimeout(this.violationFlushTimer);
+      this.violationFlushTimer = null;
+    }
+    if (!this.violationFlushInFlight) {
+      this.violationFlushInFlight = this.sendViolationBatch().finally(() => {
+        this.violationFlushInFlight = null;
+        if (this.pendingViolations.length > 0 && !this.violationFlushTimer) {
+          this.violationFlushTimer = setTimeout(() => this.flushViolations(), VIOLATION_FLUSH_INTERVAL_MS) as any;
+        }
+      });
+    }
+    return this.violationFlushInFlight;
+  }
+
+  private async sendViolationBatch(): Promise<void> {
+    if (!this.config || this.pendingViolations.length === 0) return;
+
+    const labId = this.config.labId;
+    const batch = this.pendingViolations.splice(0, MAX_VIOLATION_BATCH);
+
     try {
       const { proctoringAPI } = await import('@/integrations/api/proctoring');
-      
-      await proctoringAPI.recordViolation({
-        lab_id: this.config.labId,
-        violation_type: violation.type,
-        severity: violation.severity,
-        details: violation.details,
-        description: `${violation.type} violation detected`,
-        time_spent_seconds: this.getTimeSpent(),
-        timestamp: violation.timestamp.toISOString(),
-      });
-    } catch (error) {
-      // Silently fail - violations are also tracked via WebSocket
+      await proctoringAPI.recordViolations(labId, batch);
+    } catch (error: any) {
+      const status: number | undefined = error?.status;
+      if (status !== undefined && status < 500 && status !== 408 && status !== 429) {
+        // Rejected (lab not proctored, no access, invalid event): retrying cannot succeed
+        console.error(`[Proctoring] Dropped ${batch.length} violation(s) rejected by the API (${status}):`, error);
+        return;
+      }
+      // Network error or server error: keep the events for the next flush -
+      // violations are also tracked via WebSocket
+      this.pendingViolations.unshift(...batch);
+      this.trimPendingViolations();
       console.error('[Proctoring] API error:', error);
     }
   }
@@ -652,6 +710,17 @@ export class ProctoringService {
       this.activityCheckInterval = null;
     }
 
+    // Send any violations still queued, including those queued behind a flush in flight
+    await this.flushViolations();
+    if (this.pendingViolations.length > 0) {
+      await this.flushViolations();
+    }
+    if (this.violationFlushTimer) {
+      clearTimeout(this.violationFlushTimer);
+      this.violationFlushTimer = null;
+    }
+    this.pendingViolations = [];
+
     // Close WebSocket
     if (this.wsConnection) {
       this.wsConnection.close();